@@ -11,11 +11,19 @@ from .account import Account as Account
 from .account import AccountSlot as AccountSlot
 from .account import ReferrerMemory as ReferrerMemory
 from .account import Valuation as Valuation
+from .accountcache import AccountCache as AccountCache
+from .accountcache import AccountCacheType as AccountCacheType
+from .accountcache import DiskAccountCache as DiskAccountCache
 from .accountflags import AccountFlags as AccountFlags
 from .accountinfo import AccountInfo as AccountInfo
 from .accountinfoconverter import (
     build_account_info_converter as build_account_info_converter,
 )
+from .accountprojection import AccountProjection as AccountProjection
+from .accountprojection import AccountProjectionField as AccountProjectionField
+from .accountprojection import (
+    ACCOUNT_PROJECTION_FIELDS as ACCOUNT_PROJECTION_FIELDS,
+)
 from .accountscout import AccountScout as AccountScout
 from .accountscout import ScoutReport as ScoutReport
 from .addressableaccount import AddressableAccount as AddressableAccount
@@ -52,7 +60,19 @@ from .client import (
 )
 from .client import TransactionException as TransactionException
 from .client import TransactionMonitor as TransactionMonitor
+from .columnarorderbook import ColumnarOrderBook as ColumnarOrderBook
+from .columnarorderbook import OrderBookLevels as OrderBookLevels
+from .columnarorderbook import OrderBookSideColumns as OrderBookSideColumns
+from .columnarorderbook import (
+    decode_perp_orderbook_side as decode_perp_orderbook_side,
+)
+from .columnarorderbook import (
+    decode_serum_orderbook_side as decode_serum_orderbook_side,
+)
 from .combinableinstructions import CombinableInstructions as CombinableInstructions
+from .combinableinstructions import (
+    TransactionSizeAccumulator as TransactionSizeAccumulator,
+)
 from .constants import MangoConstants as MangoConstants
 from .constants import PackageVersion as PackageVersion
 from .constants import DATA_PATH as DATA_PATH
@@ -78,6 +98,10 @@ from .group import GroupSlot as GroupSlot
 from .group import GroupSlotPerpMarket as GroupSlotPerpMarket
 from .group import GroupSlotSpotMarket as GroupSlotSpotMarket
 from .healthcheck import HealthCheck as HealthCheck
+from .healthwatchdog import AccountHealth as AccountHealth
+from .healthwatchdog import HealthBand as HealthBand
+from .healthwatchdog import HealthCrossing as HealthCrossing
+from .healthwatchdog import HealthWatchdog as HealthWatchdog
 from .idgenerator import IdGenerator as IdGenerator
 from .idgenerator import MonotonicIdGenerator as MonotonicIdGenerator
 from .idgenerator import RandomIdGenerator as RandomIdGenerator
@@ -201,6 +225,11 @@ from .instrumentlookup import SPLTokenLookup as SPLTokenLookup
 from .instrumentvalue import InstrumentValue as InstrumentValue
 from .inventory import Inventory as Inventory
 from .inventory import InventoryAccountWatcher as InventoryAccountWatcher
+from .inventory import SerumInventoryWatcher as SerumInventoryWatcher
+from .jsonbackend import available_json_backends as available_json_backends
+from .jsonbackend import json_backend as json_backend
+from .jsonbackend import json_loads as json_loads
+from .jsonbackend import set_json_backend as set_json_backend
 from .loadedmarket import Event as Event
 from .loadedmarket import FillEvent as FillEvent
 from .loadedmarket import LoadedMarket as LoadedMarket
@@ -209,6 +238,13 @@ from .lotsizeconverter import LotSizeConverter as LotSizeConverter
 from .lotsizeconverter import NullLotSizeConverter as NullLotSizeConverter
 from .lotsizeconverter import RaisingLotSizeConverter as RaisingLotSizeConverter
 from .mangoinstruction import MangoInstruction as MangoInstruction
+from .marketdatarecorder import MarketDataLogReader as MarketDataLogReader
+from .marketdatarecorder import MarketDataLogWriter as MarketDataLogWriter
+from .marketdatarecorder import MarketDataRecord as MarketDataRecord
+from .marketdatarecorder import MarketDataRecorder as MarketDataRecorder
+from .marketdatarecorder import (
+    ReplayWebSocketSubscriptionManager as ReplayWebSocketSubscriptionManager,
+)
 from .marketlookup import CompoundMarketLookup as CompoundMarketLookup
 from .marketlookup import MarketLookup as MarketLookup
 from .marketlookup import NullMarketLookup as NullMarketLookup
@@ -218,6 +254,7 @@ from .marketoperations import (
     NullMarketInstructionBuilder as NullMarketInstructionBuilder,
 )
 from .marketoperations import NullMarketOperations as NullMarketOperations
+from .marketregistry import MarketRegistry as MarketRegistry
 from .markets import InventorySource as InventorySource
 from .markets import MarketType as MarketType
 from .markets import Market as Market
@@ -225,6 +262,7 @@ from .metadata import Metadata as Metadata
 from .modelstate import EventQueue as EventQueue
 from .modelstate import NullEventQueue as NullEventQueue
 from .modelstate import ModelState as ModelState
+from .modelstate import SlotSkew as SlotSkew
 from .notification import CompoundNotificationTarget as CompoundNotificationTarget
 from .notification import ConsoleNotificationTarget as ConsoleNotificationTarget
 from .notification import DiscordNotificationTarget as DiscordNotificationTarget
@@ -232,6 +270,7 @@ from .notification import FilteringNotificationTarget as FilteringNotificationTa
 from .notification import MailjetNotificationTarget as MailjetNotificationTarget
 from .notification import NotificationHandler as NotificationHandler
 from .notification import NotificationTarget as NotificationTarget
+from .notification import QueuedNotificationTarget as QueuedNotificationTarget
 from .notification import TelegramNotificationTarget as TelegramNotificationTarget
 from .notification import parse_notification_target as parse_notification_target
 from .observables import CaptureFirstItem as CaptureFirstItem
@@ -244,6 +283,9 @@ from .observables import FunctionObserver as FunctionObserver
 from .observables import LatestItemObserverSubscriber as LatestItemObserverSubscriber
 from .observables import NullObserverSubscriber as NullObserverSubscriber
 from .observables import PrintingObserverSubscriber as PrintingObserverSubscriber
+from .observables import (
+    SlotTrackingObserverSubscriber as SlotTrackingObserverSubscriber,
+)
 from .observables import (
     TimestampedPrintingObserverSubscriber as TimestampedPrintingObserverSubscriber,
 )
@@ -297,15 +339,34 @@ from .perpopenorders import PerpOpenOrders as PerpOpenOrders
 from .placedorder import PlacedOrder as PlacedOrder
 from .placedorder import PlacedOrdersContainer as PlacedOrdersContainer
 from .porcelain import instruction_builder as instruction_builder
+from .porcelain import (
+    instruction_builder_for_market as instruction_builder_for_market,
+)
 from .porcelain import instrument as instrument
 from .porcelain import instrument_value as instrument_value
 from .porcelain import market as market
 from .porcelain import operations as operations
+from .porcelain import (
+    operations_for_instruction_builder as operations_for_instruction_builder,
+)
 from .porcelain import token as token
 from .publickey import encode_public_key_for_sorting as encode_public_key_for_sorting
+from .ratelimiter import NullRateLimiter as NullRateLimiter
+from .ratelimiter import RateLimiter as RateLimiter
+from .ratelimiter import RateLimiterStatistics as RateLimiterStatistics
+from .ratelimiter import RateLimitSettings as RateLimitSettings
+from .ratelimiter import RequestPriority as RequestPriority
+from .ratelimiter import TokenBucket as TokenBucket
+from .ratelimiter import TokenBucketRateLimiter as TokenBucketRateLimiter
+from .ratelimiter import build_rate_limiter as build_rate_limiter
+from .ratelimiter import priority_for_method as priority_for_method
+from .ratelimiter import request_priority as request_priority
 from .reconnectingwebsocket import ReconnectingWebsocket as ReconnectingWebsocket
 from .retrier import RetryWithPauses as RetryWithPauses
 from .retrier import retry_context as retry_context
+from .rpcsimulator import RPCSimulator as RPCSimulator
+from .rpcsimulator import RPCSimulatorSettings as RPCSimulatorSettings
+from .rpcsimulator import RPCSimulatorStatistics as RPCSimulatorStatistics
 from .serumeventqueue import SerumEvent as SerumEvent
 from .serumeventqueue import SerumEventFlags as SerumEventFlags
 from .serumeventqueue import SerumEventQueue as SerumEventQueue
@@ -316,11 +377,26 @@ from .serummarket import SerumMarket as SerumMarket
 from .serummarket import SerumMarketInstructionBuilder as SerumMarketInstructionBuilder
 from .serummarket import SerumMarketOperations as SerumMarketOperations
 from .serummarket import SerumMarketStub as SerumMarketStub
+from .serummarket import load_pyserum_market as load_pyserum_market
+from .serummarket import parse_pyserum_market as parse_pyserum_market
 from .serummarketlookup import SerumMarketLookup as SerumMarketLookup
+from .sharedmarketdata import SharedMarketDataEntry as SharedMarketDataEntry
+from .sharedmarketdata import SharedMarketDataPublisher as SharedMarketDataPublisher
+from .sharedmarketdata import SharedMarketDataRegion as SharedMarketDataRegion
+from .sharedmarketdata import SharedMemoryWatcher as SharedMemoryWatcher
+from .sharedmarketdata import build_shared_cache_watcher as build_shared_cache_watcher
+from .sharedmarketdata import build_shared_group_watcher as build_shared_group_watcher
+from .sharedmarketdata import build_shared_price_watcher as build_shared_price_watcher
+from .sharedmarketdata import shared_price_name as shared_price_name
 from .spotmarket import SpotMarket as SpotMarket
 from .spotmarket import SpotMarketInstructionBuilder as SpotMarketInstructionBuilder
 from .spotmarket import SpotMarketOperations as SpotMarketOperations
 from .spotmarket import SpotMarketStub as SpotMarketStub
+from .startupplanner import SnapshotAccountCache as SnapshotAccountCache
+from .startupplanner import StartupPlanner as StartupPlanner
+from .startupplanner import StartupReport as StartupReport
+from .startupplanner import StartupSnapshot as StartupSnapshot
+from .startupplanner import StartupStep as StartupStep
 from .text import indent_collection_as_str as indent_collection_as_str
 from .text import indent_item_by as indent_item_by
 from .tokenaccount import TokenAccount as TokenAccount
@@ -346,6 +422,9 @@ from .transactionmonitoring import (
 from .transactionmonitoring import (
     SignatureSubscription as SignatureSubscription,
 )
+from .transactionmonitoring import (
+    TransactionMonitorStatistics as TransactionMonitorStatistics,
+)
 from .transactionmonitoring import (
     TransactionOutcome as TransactionOutcome,
 )
@@ -383,11 +462,15 @@ from .walletbalancer import parse_target_balance as parse_target_balance
 from .walletbalancer import sort_changes_for_trades as sort_changes_for_trades
 from .watcher import LamdaUpdateWatcher as LamdaUpdateWatcher
 from .watcher import ManualUpdateWatcher as ManualUpdateWatcher
+from .watcher import SlotWatcher as SlotWatcher
 from .watcher import Watcher as Watcher
 from .watchers import build_group_watcher as build_group_watcher
 from .watchers import build_account_watcher as build_account_watcher
 from .watchers import build_cache_watcher as build_cache_watcher
 from .watchers import build_spot_open_orders_watcher as build_spot_open_orders_watcher
+from .watchers import (
+    build_serum_open_orders_subscription as build_serum_open_orders_subscription,
+)
 from .watchers import build_serum_open_orders_watcher as build_serum_open_orders_watcher
 from .watchers import build_perp_open_orders_watcher as build_perp_open_orders_watcher
 from .watchers import build_price_watcher as build_price_watcher
@@ -998,7 +998,21 @@ class Account(AddressableAccount):
         all_spot_open_orders: typing.Dict[str, OpenOrders],
         cache: Cache,
     ) -> pandas.DataFrame:
-        asset_data = []
+        frame: pandas.DataFrame = pandas.DataFrame(
+            self.to_rows(group, all_spot_open_orders, cache)
+        )
+        return frame
+
+    # The values behind `to_dataframe()`, one `dict` per slot. Building the `DataFrame` from these takes
+    # much longer than working them out, so code that needs to value a lot of accounts quickly can use
+    # these directly.
+    def to_rows(
+        self,
+        group: Group,
+        all_spot_open_orders: typing.Dict[str, OpenOrders],
+        cache: Cache,
+    ) -> typing.Sequence[typing.Dict[str, typing.Any]]:
+        asset_data: typing.List[typing.Dict[str, typing.Any]] = []
         for slot in self.slots:
             market_cache: typing.Optional[
                 MarketCache
@@ -1288,8 +1302,7 @@ class Account(AddressableAccount):
                 "PerpQuoteLotSize": perp_quote_lot_size,
             }
             asset_data += [data]
-        frame: pandas.DataFrame = pandas.DataFrame(asset_data)
-        return frame
+        return asset_data
 
     def weighted_assets(
         self, frame: pandas.DataFrame, weighting_name: str = ""
@@ -0,0 +1,342 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+import base64
+import enum
+import json
+import logging
+import os
+import threading
+import time
+import typing
+
+from dataclasses import dataclass
+from solana.publickey import PublicKey
+
+from .encoding import decode_binary
+
+
+# # 🥭 Account Cache
+#
+# Some accounts hardly ever change but are loaded at the start of every run: the `Group`, `PerpMarket`s,
+# `RootBank`s, Serum markets and the Pyth mapping and product accounts. An `AccountCache` keeps copies of
+# those accounts on disk so that `AccountInfo.load()` and `AccountInfo.load_multiple()` can skip the RPC
+# round-trips for them on the next run.
+#
+# Only accounts of the configured `AccountCacheType`s are ever cached. Everything else (`MangoAccount`s,
+# orderbooks, Pyth prices) always comes from the RPC node.
+#
+
+
+# # 🥭 AccountCacheType enum
+#
+# The kinds of account an `AccountCache` can hold.
+#
+class AccountCacheType(enum.Enum):
+    GROUP = "group"
+    PERP_MARKET = "perp-market"
+    ROOT_BANK = "root-bank"
+    SERUM_MARKET = "serum-market"
+    PYTH_MAPPING = "pyth-mapping"
+    PYTH_PRODUCT = "pyth-product"
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# The first byte of every Mango account is its `DATA_TYPE`.
+_MANGO_DATA_TYPES: typing.Dict[int, AccountCacheType] = {
+    0: AccountCacheType.GROUP,
+    2: AccountCacheType.ROOT_BANK,
+    4: AccountCacheType.PERP_MARKET,
+}
+
+# Serum market accounts are the only Serum accounts of this size (pyserum's `MARKET_LAYOUT` plus padding).
+_SERUM_MARKET_SIZE: int = 388
+
+# Pyth accounts start with a magic number, a version and then the account type.
+_PYTH_MAGIC: int = 0xA1B2C3D4
+_PYTH_ACCOUNT_TYPES: typing.Dict[int, AccountCacheType] = {
+    1: AccountCacheType.PYTH_MAPPING,
+    2: AccountCacheType.PYTH_PRODUCT,
+}
+
+
+# # 🥭 AccountCache class
+#
+# The base `AccountCache` caches nothing. It's what a `Context` uses when no cache is configured.
+#
+# `lookup()` returns the raw RPC response values (as accepted by `AccountInfo`) of any cached accounts,
+# keyed by address string. `store()` is given the same raw values, along with the slot they were fetched at
+# (or 0 if the slot isn't known).
+#
+class AccountCache:
+    def __init__(self) -> None:
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def enabled(self) -> bool:
+        return False
+
+    def lookup(
+        self,
+        addresses: typing.Sequence[PublicKey],
+        refresh: typing.Callable[[typing.Sequence[PublicKey]], typing.Any],
+    ) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        return {}
+
+    def store(
+        self, address: PublicKey, slot: int, values: typing.Dict[str, typing.Any]
+    ) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def __str__(self) -> str:
+        return "« AccountCache [disabled] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+@dataclass
+class _CachedAccount:
+    slot: int
+    cached_at: float
+    values: typing.Dict[str, typing.Any]
+    revalidated: bool
+    account_type: typing.Optional[AccountCacheType]
+
+
+# # 🥭 DiskAccountCache class
+#
+# Caches accounts as one JSON file per address, in a subdirectory of `directory` named for the cluster.
+#
+# A cached account is used until it is `ttl` seconds old, after which it's a miss and is loaded (and cached)
+# again as normal. The first time in a run that an account is served from a file written by an earlier run,
+# the `refresh` function passed to `lookup()` is called on a background thread to load it again, so the cache
+# stays fresh without making anyone wait. A store never replaces an account fetched at a later slot.
+#
+# Only the `DEFAULT_TYPES` that hardly ever change are cached unless `types` says otherwise. Root banks and perp
+# markets hold values (interest indices, funding) that move all the time, so if they're cached at all they're
+# only used for `mutable_ttl` seconds. A cached account whose type isn't in `types` is never served.
+#
+class DiskAccountCache(AccountCache):
+    DEFAULT_DIRECTORY: str = os.path.join(
+        os.path.expanduser("~"), ".cache", "mango-explorer", "accounts"
+    )
+    DEFAULT_TTL: float = 60 * 60
+    DEFAULT_MUTABLE_TTL: float = 10
+    DEFAULT_TYPES: typing.Sequence[AccountCacheType] = [
+        AccountCacheType.GROUP,
+        AccountCacheType.SERUM_MARKET,
+        AccountCacheType.PYTH_MAPPING,
+        AccountCacheType.PYTH_PRODUCT,
+    ]
+    MUTABLE_TYPES: typing.Sequence[AccountCacheType] = [
+        AccountCacheType.ROOT_BANK,
+        AccountCacheType.PERP_MARKET,
+    ]
+
+    def __init__(
+        self,
+        directory: str,
+        cluster_name: str,
+        mango_program_address: PublicKey,
+        serum_program_address: PublicKey,
+        ttl: float = DEFAULT_TTL,
+        types: typing.Optional[typing.Sequence[AccountCacheType]] = None,
+        mutable_ttl: float = DEFAULT_MUTABLE_TTL,
+    ) -> None:
+        super().__init__()
+        self.directory: str = directory
+        self.cluster_name: str = cluster_name
+        self.cluster_directory: str = os.path.join(directory, cluster_name)
+        self.mango_program_address: PublicKey = mango_program_address
+        self.serum_program_address: PublicKey = serum_program_address
+        self.ttl: float = ttl
+        self.mutable_ttl: float = min(ttl, mutable_ttl)
+        self.types: typing.Sequence[AccountCacheType] = (
+            types if types is not None else DiskAccountCache.DEFAULT_TYPES
+        )
+        self.__lock: threading.Lock = threading.Lock()
+        self.__accounts: typing.Dict[str, typing.Optional[_CachedAccount]] = {}
+        try:
+            os.makedirs(self.cluster_directory, exist_ok=True)
+            for filename in os.listdir(self.cluster_directory):
+                if filename.endswith(".json"):
+                    self.__accounts[filename[:-5]] = None
+        except OSError as exception:
+            self._logger.warning(
+                f"Could not read account cache directory {self.cluster_directory}: {exception}"
+            )
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    def lookup(
+        self,
+        addresses: typing.Sequence[PublicKey],
+        refresh: typing.Callable[[typing.Sequence[PublicKey]], typing.Any],
+    ) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        found: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        to_revalidate: typing.List[PublicKey] = []
+        now: float = time.time()
+        with self.__lock:
+            for address in addresses:
+                key: str = str(address)
+                if key not in self.__accounts:
+                    continue
+                cached: typing.Optional[_CachedAccount] = self.__accounts[key]
+                if cached is None:
+                    cached = self.__read(key)
+                    self.__accounts[key] = cached
+                if cached is None or cached.account_type not in self.types:
+                    continue
+                ttl: float = (
+                    self.mutable_ttl
+                    if cached.account_type in DiskAccountCache.MUTABLE_TYPES
+                    else self.ttl
+                )
+                if cached.cached_at < now - ttl:
+                    continue
+
+                found[key] = cached.values
+                if not cached.revalidated:
+                    cached.revalidated = True
+                    to_revalidate += [address]
+
+        if len(to_revalidate) > 0:
+            threading.Thread(
+                target=self.__revalidate, args=(to_revalidate, refresh), daemon=True
+            ).start()
+
+        return found
+
+    def store(
+        self, address: PublicKey, slot: int, values: typing.Dict[str, typing.Any]
+    ) -> None:
+        account_type: typing.Optional[AccountCacheType] = self.classify(values)
+        if account_type is None or account_type not in self.types:
+            return
+
+        key: str = str(address)
+        cached = _CachedAccount(slot, time.time(), values, True, account_type)
+        with self.__lock:
+            existing: typing.Optional[_CachedAccount] = self.__accounts.get(key)
+            if existing is not None and slot != 0 and slot < existing.slot:
+                return
+            self.__accounts[key] = cached
+            self.__write(key, cached)
+
+    def clear(self) -> None:
+        with self.__lock:
+            for key in self.__accounts:
+                try:
+                    os.remove(self.__filename(key))
+                except OSError:
+                    pass
+            self.__accounts = {}
+
+    def classify(
+        self, values: typing.Dict[str, typing.Any]
+    ) -> typing.Optional[AccountCacheType]:
+        length, header = self.__peek(values["data"])
+        owner: str = values["owner"]
+        if owner == str(self.mango_program_address):
+            if len(header) > 0:
+                return _MANGO_DATA_TYPES.get(header[0])
+            return None
+
+        if owner == str(self.serum_program_address):
+            if length == _SERUM_MARKET_SIZE:
+                return AccountCacheType.SERUM_MARKET
+            return None
+
+        if len(header) == 16 and int.from_bytes(header[0:4], "little") == _PYTH_MAGIC:
+            return _PYTH_ACCOUNT_TYPES.get(int.from_bytes(header[8:12], "little"))
+
+        return None
+
+    # Returns the data length and (up to) the first 16 bytes of the data without decoding everything when
+    # it's plain base64, since this is called for every account loaded.
+    def __peek(
+        self, data: typing.Union[str, typing.Sequence[str]]
+    ) -> typing.Tuple[int, bytes]:
+        if not isinstance(data, str) and data[1] == "base64":
+            encoded: str = data[0]
+            length: int = (len(encoded) // 4) * 3 - encoded[-2:].count("=")
+            return length, base64.b64decode(encoded[0:24])[0:16]
+
+        decoded: bytes = decode_binary(data)
+        return len(decoded), decoded[0:16]
+
+    def __revalidate(
+        self,
+        addresses: typing.Sequence[PublicKey],
+        refresh: typing.Callable[[typing.Sequence[PublicKey]], typing.Any],
+    ) -> None:
+        try:
+            refresh(addresses)
+        except Exception as exception:
+            self._logger.warning(
+                f"Could not revalidate cached accounts {addresses}: {exception}"
+            )
+
+    def __filename(self, key: str) -> str:
+        return os.path.join(self.cluster_directory, f"{key}.json")
+
+    def __read(self, key: str) -> typing.Optional[_CachedAccount]:
+        try:
+            with open(self.__filename(key)) as json_file:
+                data = json.load(json_file)
+            values: typing.Dict[str, typing.Any] = data["value"]
+            return _CachedAccount(
+                int(data["slot"]),
+                float(data["cached_at"]),
+                values,
+                False,
+                self.classify(values),
+            )
+        except (OSError, ValueError, KeyError) as exception:
+            self._logger.warning(
+                f"Ignoring unreadable cached account {key}: {exception}"
+            )
+            return None
+
+    def __write(self, key: str, cached: _CachedAccount) -> None:
+        filename: str = self.__filename(key)
+        temporary_filename: str = f"{filename}.{os.getpid()}.tmp"
+        data = {
+            "address": key,
+            "slot": cached.slot,
+            "cached_at": cached.cached_at,
+            "value": cached.values,
+        }
+        try:
+            with open(temporary_filename, "w") as json_file:
+                json.dump(data, json_file)
+            os.replace(temporary_filename, filename)
+        except OSError as exception:
+            self._logger.warning(f"Could not cache account {key}: {exception}")
+
+    def __str__(self) -> str:
+        types: str = ", ".join(map(str, self.types))
+        return f"« DiskAccountCache [{self.cluster_directory}] TTL: {self.ttl}s (mutable: {self.mutable_ttl}s), Types: {types} »"
@@ -46,15 +46,46 @@ class AccountInfo:
         self.lamports: Decimal = lamports
         self.owner: PublicKey = owner
         self.rent_epoch: Decimal = rent_epoch
-        self.data: bytes = data
+        self.__data: typing.Optional[bytes] = data
+        self.__encoded_data: typing.Union[str, typing.Sequence[str]] = ""
+
+    # Account data from an RPC response is kept in its encoded form until something asks for it,
+    # so accounts that are loaded but never parsed are never decoded.
+    @property
+    def data(self) -> bytes:
+        if self.__data is None:
+            self.__data = decode_binary(self.__encoded_data)
+            self.__encoded_data = ""
+        return self.__data
+
+    @data.setter
+    def data(self, data: bytes) -> None:
+        self.__data = data
+        self.__encoded_data = ""
 
     @property
     def sols(self) -> Decimal:
         return self.lamports / SOL_DECIMAL_DIVISOR
 
     def encoded_data(self) -> typing.Sequence[str]:
+        if (
+            self.__data is None
+            and not isinstance(self.__encoded_data, str)
+            and self.__encoded_data[1] == "base64"
+        ):
+            return self.__encoded_data
         return encode_binary(self.data)
 
+    # The reverse of `_from_response_values()` - the raw values an RPC node would return for this account.
+    def to_response_values(self) -> typing.Dict[str, typing.Any]:
+        return {
+            "data": self.encoded_data(),
+            "executable": self.executable,
+            "lamports": int(self.lamports),
+            "owner": str(self.owner),
+            "rentEpoch": int(self.rent_epoch),
+        }
+
     def save_json(self, filename: str) -> None:
         data = {
             "address": str(self.address),
@@ -62,7 +93,7 @@ class AccountInfo:
             "lamports": str(self.lamports),
             "owner": str(self.owner),
             "rent_epoch": str(self.rent_epoch),
-            "data": encode_binary(self.data),
+            "data": self.encoded_data(),
         }
         with open(filename, "w") as json_file:
             json.dump(data, json_file, indent=4)
@@ -81,10 +112,18 @@ class AccountInfo:
 
     @staticmethod
     def load(context: Context, address: PublicKey) -> typing.Optional["AccountInfo"]:
+        cached = context.account_cache.lookup(
+            [address],
+            lambda stale: AccountInfo._load_multiple_uncached(context, stale),
+        )
+        if str(address) in cached:
+            return AccountInfo._from_response_values(cached[str(address)], address)
+
         result = context.client.get_account_info(address)
         if result["value"] is None:
             return None
 
+        context.account_cache.store(address, result["context"]["slot"], result["value"])
         return AccountInfo._from_response_values(result["value"], address)
 
     @staticmethod
@@ -102,6 +141,32 @@ class AccountInfo:
     @staticmethod
     def load_multiple(
         context: Context, addresses: typing.Sequence[PublicKey]
+    ) -> typing.Sequence["AccountInfo"]:
+        cached = context.account_cache.lookup(
+            addresses,
+            lambda stale: AccountInfo._load_multiple_uncached(context, stale),
+        )
+        if len(cached) == 0:
+            return AccountInfo._load_multiple_uncached(context, addresses)
+
+        to_load = [address for address in addresses if str(address) not in cached]
+        loaded: typing.Dict[str, AccountInfo] = {
+            str(account_info.address): account_info
+            for account_info in AccountInfo._load_multiple_uncached(context, to_load)
+        }
+        multiple: typing.List[AccountInfo] = []
+        for address in addresses:
+            key: str = str(address)
+            if key in cached:
+                multiple += [AccountInfo._from_response_values(cached[key], address)]
+            else:
+                multiple += [loaded[key]]
+
+        return multiple
+
+    @staticmethod
+    def _load_multiple_uncached(
+        context: Context, addresses: typing.Sequence[PublicKey]
     ) -> typing.Sequence["AccountInfo"]:
         # This is a tricky one to get right.
         # Some errors this can generate:
@@ -123,6 +188,8 @@ class AccountInfo:
                     raise Exception(
                         f"Failed to fetch account {chunk[index]} at index {index}"
                     )
+                # getMultipleAccounts() results don't carry the slot, so the cache is told it's unknown.
+                context.account_cache.store(pair[1], 0, pair[0])
                 multiple += [AccountInfo._from_response_values(pair[0], pair[1])]
             if (sleep_between_calls > 0.0) and (counter < (len(chunks) - 1)):
                 time.sleep(sleep_between_calls)
@@ -158,8 +225,12 @@ class AccountInfo:
         lamports = Decimal(response_values["lamports"])
         owner = PublicKey(response_values["owner"])
         rent_epoch = Decimal(response_values["rentEpoch"])
-        data = decode_binary(response_values["data"])
-        return AccountInfo(address, executable, lamports, owner, rent_epoch, data)
+        account_info = AccountInfo(
+            address, executable, lamports, owner, rent_epoch, b""
+        )
+        account_info.__data = None
+        account_info.__encoded_data = response_values["data"]
+        return account_info
 
     @staticmethod
     def from_response(response: RPCResponse, address: PublicKey) -> "AccountInfo":
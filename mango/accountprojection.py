@@ -0,0 +1,330 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+import numpy
+import numpy.typing
+import pandas
+import typing
+
+from dataclasses import dataclass
+from solana.publickey import PublicKey
+from solana.rpc.types import DataSliceOpts, MemcmpOpts
+
+from .account import Account
+from .accountinfo import AccountInfo
+from .cache import Cache
+from .context import Context
+from .encoding import encode_key
+from .group import Group
+from .layouts import layouts
+
+
+# # 🥭 Account Projections
+#
+# `Account.load_all()` and friends fetch every byte of every matching Mango account and then
+# build a full `Account` for each one - perp accounts, open orders, info strings and all. That's
+# a lot of work when all that's needed is, say, the owner and whether the account is being
+# liquidated.
+#
+# An `AccountProjection` asks the RPC node for only the byte ranges needed for a chosen set of
+# fields (using `getProgramAccounts`' `dataSlice`) and decodes them into one NumPy array per
+# field. Rows that look interesting can then be loaded in full with `load_accounts()`.
+#
+# `dataSlice` only takes one range per request. Fields that are close together are fetched in
+# one slice, and fields that are far apart (like `owner` and `delegate`) are fetched with
+# separate requests whose results are joined by account address.
+#
+# `deposits` and `borrows` are the raw values stored in the account - they need multiplying by
+# the root bank's deposit or borrow index (and shifting by the token decimals) to give token
+# amounts. `perp_base_positions` are in base lots.
+#
+
+
+# Works out the offset of each named field in the `MANGO_ACCOUNT` layout.
+def _layout_offsets() -> typing.Dict[str, typing.Tuple[int, int]]:
+    offsets: typing.Dict[str, typing.Tuple[int, int]] = {}
+    offset = 0
+    for subcon in layouts.MANGO_ACCOUNT.subcons:
+        size = subcon.sizeof()
+        if subcon.name is not None:
+            offsets[subcon.name] = (offset, size)
+        offset += size
+    return offsets
+
+
+_OFFSETS: typing.Dict[str, typing.Tuple[int, int]] = _layout_offsets()
+_PERP_ACCOUNT_SIZE: int = layouts.PERP_ACCOUNT.sizeof()
+_I80F48_DIVISOR: float = float(2**48)
+
+ProjectionDecoder = typing.Callable[[numpy.typing.NDArray[numpy.uint8]], typing.Any]
+
+
+def _decode_public_keys(raw: numpy.typing.NDArray[numpy.uint8]) -> typing.Any:
+    return raw.copy()
+
+
+def _decode_flags(raw: numpy.typing.NDArray[numpy.uint8]) -> typing.Any:
+    return raw[:, 0] != 0
+
+
+def _decode_u64(raw: numpy.typing.NDArray[numpy.uint8]) -> typing.Any:
+    return numpy.ascontiguousarray(raw).view("<u8")[:, 0]
+
+
+# I80F48 values are 16-byte little-endian signed integers with 48 fractional bits. Splitting them
+# into a low unsigned and a high signed 64-bit word gives a float64 that's good to about 15
+# significant digits, which is plenty for finding accounts worth looking at more closely.
+def _decode_i80f48s(raw: numpy.typing.NDArray[numpy.uint8]) -> typing.Any:
+    words = numpy.ascontiguousarray(raw).view("<u8")
+    low = words[:, 0::2].astype(numpy.float64)
+    high = words[:, 1::2].view("<i8").astype(numpy.float64)
+    return (high * float(2**16)) + (low / _I80F48_DIVISOR)
+
+
+def _decode_booleans(raw: numpy.typing.NDArray[numpy.uint8]) -> typing.Any:
+    return raw != 0
+
+
+def _decode_perp_base_positions(raw: numpy.typing.NDArray[numpy.uint8]) -> typing.Any:
+    perp_accounts = raw.reshape(len(raw), layouts.MAX_PAIRS, _PERP_ACCOUNT_SIZE)
+    return numpy.ascontiguousarray(perp_accounts[:, :, 0:8]).view("<i8")[:, :, 0]
+
+
+# # 🥭 AccountProjectionField class
+#
+# A field that can be projected from a Mango account: where it is in the account data and how to
+# turn those bytes into a NumPy column.
+#
+@dataclass(frozen=True)
+class AccountProjectionField:
+    name: str
+    offset: int
+    size: int
+    decoder: ProjectionDecoder
+
+    @staticmethod
+    def from_layout(
+        name: str, layout_name: str, decoder: ProjectionDecoder
+    ) -> "AccountProjectionField":
+        offset, size = _OFFSETS[layout_name]
+        return AccountProjectionField(name, offset, size, decoder)
+
+    def __str__(self) -> str:
+        return f"« AccountProjectionField '{self.name}' [{self.offset}:{self.offset + self.size}] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+ACCOUNT_PROJECTION_FIELDS: typing.Dict[str, AccountProjectionField] = {
+    field.name: field
+    for field in [
+        AccountProjectionField.from_layout("owner", "owner", _decode_public_keys),
+        AccountProjectionField.from_layout(
+            "in_margin_basket", "in_margin_basket", _decode_booleans
+        ),
+        AccountProjectionField.from_layout("deposits", "deposits", _decode_i80f48s),
+        AccountProjectionField.from_layout("borrows", "borrows", _decode_i80f48s),
+        AccountProjectionField.from_layout(
+            "perp_base_positions", "perp_accounts", _decode_perp_base_positions
+        ),
+        AccountProjectionField.from_layout("msrm_amount", "msrm_amount", _decode_u64),
+        AccountProjectionField.from_layout(
+            "being_liquidated", "being_liquidated", _decode_flags
+        ),
+        AccountProjectionField.from_layout("is_bankrupt", "is_bankrupt", _decode_flags),
+        AccountProjectionField.from_layout("delegate", "delegate", _decode_public_keys),
+    ]
+}
+
+_PUBLIC_KEY_FIELDS: typing.Set[str] = {"owner", "delegate"}
+
+
+# Groups fields into as few `dataSlice` ranges as possible, only starting a new range when the
+# gap to the next field is more than `max_gap` bytes.
+def _plan_slices(
+    fields: typing.Sequence[AccountProjectionField], max_gap: int
+) -> typing.Sequence[typing.Tuple[int, int]]:
+    slices: typing.List[typing.Tuple[int, int]] = []
+    for field in sorted(fields, key=lambda field: field.offset):
+        end = field.offset + field.size
+        if len(slices) > 0 and field.offset - slices[-1][1] <= max_gap:
+            start, previous_end = slices[-1]
+            slices[-1] = (start, max(previous_end, end))
+        else:
+            slices += [(field.offset, end)]
+    return slices
+
+
+# # 🥭 AccountProjection class
+#
+# A few fields from many Mango accounts, one NumPy array per field, with one row per account in
+# the same order as `addresses`. Public key fields are `(rows, 32)` arrays of bytes - use
+# `public_key_at()` to get a `PublicKey` for a particular row.
+#
+@dataclass(frozen=True)
+class AccountProjection:
+    group: PublicKey
+    addresses: typing.Sequence[PublicKey]
+    columns: typing.Dict[str, typing.Any]
+
+    @staticmethod
+    def parse(
+        group: PublicKey,
+        fields: typing.Sequence[str],
+        slices: typing.Sequence[typing.Tuple[int, int]],
+        account_infos_by_slice: typing.Sequence[typing.Sequence[AccountInfo]],
+    ) -> "AccountProjection":
+        # Each slice is a separate request, so an account created or closed between requests can
+        # be in some responses but not others. Only accounts in all of them are kept.
+        by_address: typing.List[typing.Dict[str, bytes]] = [
+            {str(account_info.address): account_info.data for account_info in infos}
+            for infos in account_infos_by_slice
+        ]
+        addresses: typing.List[str] = [
+            str(account_info.address) for account_info in account_infos_by_slice[0]
+        ]
+        for datas in by_address[1:]:
+            addresses = [address for address in addresses if address in datas]
+
+        raw_slices: typing.List[numpy.typing.NDArray[numpy.uint8]] = []
+        for (start, end), datas in zip(slices, by_address):
+            joined = b"".join(datas[address] for address in addresses)
+            raw_slices += [
+                numpy.frombuffer(joined, dtype=numpy.uint8).reshape(
+                    len(addresses), end - start
+                )
+            ]
+
+        columns: typing.Dict[str, typing.Any] = {}
+        for name in fields:
+            field = ACCOUNT_PROJECTION_FIELDS[name]
+            for (start, end), raw in zip(slices, raw_slices):
+                if start <= field.offset and field.offset + field.size <= end:
+                    relative = field.offset - start
+                    columns[name] = field.decoder(
+                        raw[:, relative : relative + field.size]
+                    )
+                    break
+
+        return AccountProjection(
+            group, [PublicKey(address) for address in addresses], columns
+        )
+
+    @staticmethod
+    def load(
+        context: Context,
+        group: Group,
+        fields: typing.Sequence[str],
+        owner: typing.Optional[PublicKey] = None,
+        delegate: typing.Optional[PublicKey] = None,
+        max_gap: int = 256,
+    ) -> "AccountProjection":
+        unknown = [name for name in fields if name not in ACCOUNT_PROJECTION_FIELDS]
+        if len(fields) == 0 or len(unknown) > 0:
+            raise Exception(
+                f"Cannot project fields {unknown or fields} - available fields are: {list(ACCOUNT_PROJECTION_FIELDS.keys())}"
+            )
+
+        filters = [
+            MemcmpOpts(offset=_OFFSETS["group"][0], bytes=encode_key(group.address))
+        ]
+        if owner is not None:
+            filters += [
+                MemcmpOpts(offset=_OFFSETS["owner"][0], bytes=encode_key(owner))
+            ]
+        if delegate is not None:
+            filters += [
+                MemcmpOpts(offset=_OFFSETS["delegate"][0], bytes=encode_key(delegate))
+            ]
+
+        slices = _plan_slices(
+            [ACCOUNT_PROJECTION_FIELDS[name] for name in fields], max_gap
+        )
+        account_infos_by_slice = [
+            AccountInfo.load_by_program(
+                context,
+                context.mango_program_address,
+                data_slice=DataSliceOpts(offset=start, length=end - start),
+                data_size=layouts.MANGO_ACCOUNT.sizeof(),
+                memcmp_opts=filters,
+            )
+            for start, end in slices
+        ]
+
+        return AccountProjection.parse(
+            group.address, fields, slices, account_infos_by_slice
+        )
+
+    @property
+    def fields(self) -> typing.Sequence[str]:
+        return list(self.columns.keys())
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def column(self, name: str) -> typing.Any:
+        if name not in self.columns:
+            raise Exception(
+                f"Field '{name}' is not in this projection - projected fields are: {self.fields}"
+            )
+        return self.columns[name]
+
+    def public_key_at(self, name: str, index: int) -> PublicKey:
+        return PublicKey(self.column(name)[index].tobytes())
+
+    def filter(self, mask: numpy.typing.NDArray[numpy.bool_]) -> "AccountProjection":
+        return AccountProjection(
+            self.group,
+            [address for address, keep in zip(self.addresses, mask) if keep],
+            {name: column[mask] for name, column in self.columns.items()},
+        )
+
+    # Loads the full `Account` for every row. Usually called on the result of `filter()`.
+    def load_accounts(
+        self,
+        context: Context,
+        group: Group,
+        cache: typing.Optional[Cache] = None,
+    ) -> typing.Sequence[Account]:
+        if len(self.addresses) == 0:
+            return []
+        account_infos = AccountInfo.load_multiple(context, self.addresses)
+        cache = cache or group.fetch_cache(context)
+        return [
+            Account.parse(account_info, group, cache) for account_info in account_infos
+        ]
+
+    def to_dataframe(self) -> pandas.DataFrame:
+        data: typing.Dict[str, typing.Any] = {
+            "Address": [str(address) for address in self.addresses]
+        }
+        for name, column in self.columns.items():
+            if name in _PUBLIC_KEY_FIELDS:
+                data[name] = [
+                    str(self.public_key_at(name, index)) for index in range(len(self))
+                ]
+            elif column.ndim > 1:
+                for index in range(column.shape[1]):
+                    data[f"{name}_{index}"] = column[:, index]
+            else:
+                data[name] = column
+        return pandas.DataFrame(data)
+
+    def __str__(self) -> str:
+        return f"« AccountProjection of {len(self)} accounts in group {self.group}: {self.fields} »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
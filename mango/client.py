@@ -25,6 +25,7 @@ from base64 import b64decode
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from collections.abc import Mapping
+from concurrent.futures import Future
 from decimal import Decimal
 from solana.blockhash import Blockhash, BlockhashCache
 from solana.keypair import Keypair
@@ -45,7 +46,16 @@ from solana.transaction import Transaction
 from .constants import SOL_DECIMAL_DIVISOR
 from .datetimes import local_now
 from .instructionreporter import InstructionReporter
+from .jsonbackend import json_loads
 from .logmessages import expand_log_messages
+from .ratelimiter import (
+    NullRateLimiter,
+    RateLimiter,
+    RateLimiterStatistics,
+    RateLimitSettings,
+    build_rate_limiter,
+    priority_for_method,
+)
 from .text import indent_collection_as_str
 
 
@@ -405,8 +415,9 @@ class TransactionMonitor(metaclass=abc.ABCMeta):
 
         self.slot_holder: AbstractSlotHolder = slot_holder
 
+    # Implementations that track the outcome return a `Future` that completes with it.
     @abc.abstractmethod
-    def monitor(self, signature: str) -> None:
+    def monitor(self, signature: str) -> typing.Optional["Future[typing.Any]"]:
         raise NotImplementedError(
             "TransactionMonitor.monitor() is not implemented on the base type."
         )
@@ -428,8 +439,8 @@ class NullTransactionMonitor(TransactionMonitor):
             slot_holder=slot_holder,
         )
 
-    def monitor(self, signature: str) -> None:
-        pass
+    def monitor(self, signature: str) -> typing.Optional["Future[typing.Any]"]:
+        return None
 
 
 # # 🥭 RPCCaller class
@@ -446,6 +457,7 @@ class RPCCaller(HTTPProvider):
         stale_data_pauses_before_retry: typing.Sequence[float],
         slot_holder: AbstractSlotHolder,
         instruction_reporter: InstructionReporter,
+        rate_limiter: RateLimiter = NullRateLimiter(),
     ):
         super().__init__(cluster_rpc_url)
         self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
@@ -458,6 +470,7 @@ class RPCCaller(HTTPProvider):
         ] = stale_data_pauses_before_retry
         self.slot_holder: AbstractSlotHolder = slot_holder
         self.instruction_reporter: InstructionReporter = instruction_reporter
+        self.rate_limiter: RateLimiter = rate_limiter
 
     def require_data_from_fresh_slot(
         self, latest_slot: typing.Optional[int] = None
@@ -514,7 +527,10 @@ class RPCCaller(HTTPProvider):
         http_post_timeout: typing.Union[float, None] = (
             self.http_request_timeout if self.http_request_timeout >= 0 else None
         )
+        # Wait for this provider's budget rather than finding out afterwards that it's been used up.
+        self.rate_limiter.acquire(priority_for_method(method))
         raw_response = requests.post(**request_kwargs, timeout=http_post_timeout)
+        self.rate_limiter.record_response(len(raw_response.content))
 
         # Some custom exceptions specifically for rate-limiting. This allows calling code to handle this
         # specific case if they so choose.
@@ -538,8 +554,7 @@ class RPCCaller(HTTPProvider):
 
         # All seems OK, but maybe the server returned an error? If so, try to pass on as much
         # information as we can.
-        response_text: str = raw_response.text
-        response: typing.Dict[str, typing.Any] = json.loads(response_text)
+        response: typing.Dict[str, typing.Any] = json_loads(raw_response.content)
 
         # Did we get sufficiently up-to-date information? It must be from the last slot we saw or a
         # newer slot.
@@ -635,7 +650,7 @@ class RPCCaller(HTTPProvider):
                     self.cluster_rpc_url,
                     method,
                     parameters,
-                    response_text,
+                    raw_response.text,
                     error_accounts,
                     error_err,
                     error_logs,
@@ -789,6 +804,7 @@ class BetterClient:
         blockhash_cache_duration: int,
         rpc_caller: CompoundRPCCaller,
         transaction_monitor: TransactionMonitor = NullTransactionMonitor(),
+        rate_limit_settings: typing.Optional[RateLimitSettings] = None,
     ) -> None:
         self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
         self.compatible_client: Client = client
@@ -801,6 +817,9 @@ class BetterClient:
         self.blockhash_cache_duration: int = blockhash_cache_duration
         self.rpc_caller: CompoundRPCCaller = rpc_caller
         self.transaction_monitor: TransactionMonitor = transaction_monitor
+        self.rate_limit_settings: typing.Optional[
+            RateLimitSettings
+        ] = rate_limit_settings
 
     @staticmethod
     def from_configuration(
@@ -816,6 +835,7 @@ class BetterClient:
         stale_data_pauses_before_retry: typing.Sequence[float],
         instruction_reporter: InstructionReporter,
         transaction_monitor: TransactionMonitor = NullTransactionMonitor(),
+        rate_limit_settings: typing.Optional[RateLimitSettings] = None,
     ) -> "BetterClient":
         rpc_callers: typing.List[RPCCaller] = []
         for cluster_url in cluster_urls:
@@ -827,6 +847,7 @@ class BetterClient:
                 stale_data_pauses_before_retry,
                 transaction_monitor.slot_holder,
                 instruction_reporter,
+                build_rate_limiter(rate_limit_settings),
             )
             rpc_callers += [rpc_caller]
 
@@ -862,6 +883,7 @@ class BetterClient:
             blockhash_cache_duration,
             provider,
             transaction_monitor,
+            rate_limit_settings,
         )
 
     @property
@@ -899,6 +921,13 @@ class BetterClient:
     def stale_data_pauses_before_retry(self) -> typing.Sequence[float]:
         return self.rpc_caller.current.stale_data_pauses_before_retry
 
+    # How many requests each provider has made at each priority and how long they were held back.
+    def rate_limiter_statistics(self) -> typing.Dict[str, RateLimiterStatistics]:
+        return {
+            rpc_caller.cluster_rpc_url: rpc_caller.rate_limiter.statistics()
+            for rpc_caller in self.rpc_caller.all_providers
+        }
+
     def dispose(self) -> None:
         self.transaction_monitor.dispose()
 
@@ -990,6 +1019,11 @@ class BetterClient:
         response = self.compatible_client.get_recent_blockhash(resolved_commitment)
         return Blockhash(response["result"]["value"]["blockhash"])
 
+    def get_slot(self, commitment: Commitment = UnspecifiedCommitment) -> int:
+        resolved_commitment, _ = self.__resolve_defaults(commitment)
+        response = self.compatible_client.get_slot(resolved_commitment)
+        return int(response["result"])
+
     def get_token_account_balance(
         self,
         pubkey: typing.Union[str, PublicKey],
@@ -0,0 +1,447 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+import numpy
+import numpy.typing
+import pandas
+import typing
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from solana.publickey import PublicKey
+
+from .accountinfo import AccountInfo
+from .context import Context
+from .loadedmarket import LoadedMarket
+from .lotsizeconverter import LotSizeConverter
+from .markets import MarketType
+from .orders import Side
+
+
+# # 🥭 Columnar OrderBooks
+#
+# `OrderBook` holds a list of `Order` objects, and building those means parsing every node of
+# the book side through `construct` and then creating a `Decimal`-laden `Order` for each leaf.
+# That's fine for a market maker looking at the top of the book but it's far too slow for
+# archiving every update of every book.
+#
+# The decoders here view the raw book side data as a NumPy structured array and pull out the
+# leaf nodes as columns (price lots, quantity lots, sequence number, owner, client ID,
+# timestamps) without creating any per-order Python objects. Conversions to prices and
+# quantities are done on whole columns at once.
+#
+# Column values are in the same order `OrderBook` uses - best price first, and by time
+# priority within a price.
+#
+
+
+# Perp book sides are a 40-byte header (8-byte metadata, bump index, free list length, free
+# list head, root node, leaf count) followed by `MAX_BOOK_NODES` 88-byte nodes.
+_PERP_HEADER_SIZE: int = 40
+_PERP_BUMP_INDEX_OFFSET: int = 8
+_PERP_NODE_DTYPE: numpy.dtype = numpy.dtype(  # type: ignore[type-arg]
+    [
+        ("tag", "<u4"),
+        ("owner_slot", "u1"),
+        ("order_type", "u1"),
+        ("version", "u1"),
+        ("time_in_force", "u1"),
+        ("sequence_number", "<u8"),
+        ("price_lots", "<u8"),
+        ("owner", "u1", (32,)),
+        ("quantity_lots", "<i8"),
+        ("client_id", "<u8"),
+        ("best_initial", "<i8"),
+        ("timestamp", "<u8"),
+    ]
+)
+
+# Serum book sides are 5 bytes of 'serum' padding, 8 bytes of account flags and a 32-byte slab
+# header, followed by 72-byte nodes.
+_SERUM_HEADER_SIZE: int = 45
+_SERUM_BUMP_INDEX_OFFSET: int = 13
+_SERUM_NODE_DTYPE: numpy.dtype = numpy.dtype(  # type: ignore[type-arg]
+    [
+        ("tag", "<u4"),
+        ("owner_slot", "u1"),
+        ("fee_tier", "u1"),
+        ("padding", "V2"),
+        ("sequence_number", "<u8"),
+        ("price_lots", "<u8"),
+        ("owner", "u1", (32,)),
+        ("quantity_lots", "<u8"),
+        ("client_id", "<u8"),
+    ]
+)
+
+_LEAF_NODE_TAG: int = 2
+
+if _PERP_NODE_DTYPE.itemsize != 88:
+    raise Exception(
+        f"Incorrect size for perp book node: expected: 88, got: {_PERP_NODE_DTYPE.itemsize}"
+    )
+if _SERUM_NODE_DTYPE.itemsize != 72:
+    raise Exception(
+        f"Incorrect size for serum book node: expected: 72, got: {_SERUM_NODE_DTYPE.itemsize}"
+    )
+
+
+# # 🥭 OrderBookSideColumns class
+#
+# All the orders on one side of a book, one NumPy array per field. `timestamp` and `expiration`
+# are seconds since the epoch and are always 0 for Serum orders, which don't carry them. An
+# `expiration` of 0 means the order never expires.
+#
+@dataclass(frozen=True)
+class OrderBookSideColumns:
+    side: Side
+    price_lots: numpy.typing.NDArray[numpy.int64]
+    quantity_lots: numpy.typing.NDArray[numpy.int64]
+    sequence_number: numpy.typing.NDArray[numpy.uint64]
+    owner: numpy.typing.NDArray[numpy.uint8]
+    client_id: numpy.typing.NDArray[numpy.uint64]
+    timestamp: numpy.typing.NDArray[numpy.uint64]
+    expiration: numpy.typing.NDArray[numpy.uint64]
+    price: numpy.typing.NDArray[numpy.float64]
+    quantity: numpy.typing.NDArray[numpy.float64]
+
+    @staticmethod
+    def empty(side: Side) -> "OrderBookSideColumns":
+        return OrderBookSideColumns(
+            side,
+            numpy.zeros(0, dtype=numpy.int64),
+            numpy.zeros(0, dtype=numpy.int64),
+            numpy.zeros(0, dtype=numpy.uint64),
+            numpy.zeros((0, 32), dtype=numpy.uint8),
+            numpy.zeros(0, dtype=numpy.uint64),
+            numpy.zeros(0, dtype=numpy.uint64),
+            numpy.zeros(0, dtype=numpy.uint64),
+            numpy.zeros(0, dtype=numpy.float64),
+            numpy.zeros(0, dtype=numpy.float64),
+        )
+
+    # Sorts the raw columns into book order and works out prices and quantities.
+    @staticmethod
+    def from_lots(
+        side: Side,
+        lot_size_converter: LotSizeConverter,
+        price_lots: numpy.typing.NDArray[numpy.int64],
+        quantity_lots: numpy.typing.NDArray[numpy.int64],
+        sequence_number: numpy.typing.NDArray[numpy.uint64],
+        owner: numpy.typing.NDArray[numpy.uint8],
+        client_id: numpy.typing.NDArray[numpy.uint64],
+        timestamp: numpy.typing.NDArray[numpy.uint64],
+        expiration: numpy.typing.NDArray[numpy.uint64],
+    ) -> "OrderBookSideColumns":
+        # Order IDs are (price << 64 | sequence number), and `OrderBook` sorts bids by ID
+        # descending and asks by ID ascending. `lexsort()` sorts by its last key first.
+        order = numpy.lexsort((sequence_number, price_lots))
+        if side == Side.BUY:
+            order = order[::-1]
+
+        if len(order) == 0:
+            return OrderBookSideColumns.empty(side)
+
+        tick_size = float(lot_size_converter.tick_size)
+        lot_size = float(lot_size_converter.lot_size)
+        sorted_price_lots = price_lots[order]
+        sorted_quantity_lots = quantity_lots[order]
+        return OrderBookSideColumns(
+            side,
+            sorted_price_lots,
+            sorted_quantity_lots,
+            sequence_number[order],
+            owner[order],
+            client_id[order],
+            timestamp[order],
+            expiration[order],
+            sorted_price_lots * tick_size,
+            sorted_quantity_lots * lot_size,
+        )
+
+    def __len__(self) -> int:
+        return len(self.price_lots)
+
+    def filter(self, mask: numpy.typing.NDArray[numpy.bool_]) -> "OrderBookSideColumns":
+        return OrderBookSideColumns(
+            self.side,
+            self.price_lots[mask],
+            self.quantity_lots[mask],
+            self.sequence_number[mask],
+            self.owner[mask],
+            self.client_id[mask],
+            self.timestamp[mask],
+            self.expiration[mask],
+            self.price[mask],
+            self.quantity[mask],
+        )
+
+    def unexpired_at(self, cutoff: datetime) -> "OrderBookSideColumns":
+        cutoff_seconds = int(cutoff.timestamp())
+        return self.filter((self.expiration == 0) | (self.expiration > cutoff_seconds))
+
+    def owner_at(self, index: int) -> PublicKey:
+        return PublicKey(self.owner[index].tobytes())
+
+    # Aggregates orders at the same price into one level, keeping book order.
+    def levels(self, depth: typing.Optional[int] = None) -> "OrderBookLevels":
+        if len(self) == 0 or depth == 0:
+            return OrderBookLevels.empty(self.side)
+
+        # Prices are already sorted, so each level starts where the price changes.
+        starts = numpy.flatnonzero(
+            numpy.concatenate(([True], self.price_lots[1:] != self.price_lots[:-1]))
+        )
+        end = len(self)
+        if depth is not None and depth < len(starts):
+            end = int(starts[depth])
+            starts = starts[:depth]
+
+        counts = numpy.diff(numpy.append(starts, end))
+        return OrderBookLevels(
+            self.side,
+            self.price_lots[starts],
+            numpy.add.reduceat(self.quantity_lots[:end], starts),
+            self.price[starts],
+            numpy.add.reduceat(self.quantity[:end], starts),
+            counts,
+        )
+
+    def to_dataframe(self, include_owners: bool = False) -> pandas.DataFrame:
+        frame = pandas.DataFrame(
+            {
+                "Side": numpy.full(len(self), self.side.value),
+                "Price": self.price,
+                "Quantity": self.quantity,
+                "PriceLots": self.price_lots,
+                "QuantityLots": self.quantity_lots,
+                "SequenceNumber": self.sequence_number,
+                "ClientId": self.client_id,
+                "Timestamp": pandas.to_datetime(self.timestamp, unit="s", utc=True),
+                "Expiration": self.expiration,
+            }
+        )
+        if include_owners:
+            frame["Owner"] = pandas.Series(
+                [self.owner_at(index) for index in range(len(self))], dtype="object"
+            )
+        return frame
+
+    def __str__(self) -> str:
+        return f"« OrderBookSideColumns {self.side} [{len(self)} orders] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 OrderBookLevels class
+#
+# The L2 view of one side of a book: one row per price, best price first.
+#
+@dataclass(frozen=True)
+class OrderBookLevels:
+    side: Side
+    price_lots: numpy.typing.NDArray[numpy.int64]
+    quantity_lots: numpy.typing.NDArray[numpy.int64]
+    price: numpy.typing.NDArray[numpy.float64]
+    quantity: numpy.typing.NDArray[numpy.float64]
+    order_count: numpy.typing.NDArray[numpy.int64]
+
+    @staticmethod
+    def empty(side: Side) -> "OrderBookLevels":
+        return OrderBookLevels(
+            side,
+            numpy.zeros(0, dtype=numpy.int64),
+            numpy.zeros(0, dtype=numpy.int64),
+            numpy.zeros(0, dtype=numpy.float64),
+            numpy.zeros(0, dtype=numpy.float64),
+            numpy.zeros(0, dtype=numpy.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.price_lots)
+
+    def to_dataframe(self) -> pandas.DataFrame:
+        return pandas.DataFrame(
+            {
+                "Side": numpy.full(len(self), self.side.value),
+                "Price": self.price,
+                "Quantity": self.quantity,
+                "PriceLots": self.price_lots,
+                "QuantityLots": self.quantity_lots,
+                "OrderCount": self.order_count,
+            }
+        )
+
+    def __str__(self) -> str:
+        return f"« OrderBookLevels {self.side} [{len(self)} levels] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+def _leaves(
+    data: bytes, header_size: int, bump_index_offset: int, dtype: numpy.dtype  # type: ignore[type-arg]
+) -> numpy.typing.NDArray[numpy.void]:
+    bump_index = int.from_bytes(
+        data[bump_index_offset : bump_index_offset + 4], "little", signed=False
+    )
+    available = (len(data) - header_size) // dtype.itemsize
+    count = min(bump_index, available)
+    nodes = numpy.frombuffer(data, dtype=dtype, count=count, offset=header_size)
+    return typing.cast(
+        numpy.typing.NDArray[numpy.void], nodes[nodes["tag"] == _LEAF_NODE_TAG]
+    )
+
+
+# # 🥭 decode_perp_orderbook_side function
+#
+# Decodes the raw data of a Mango perp `BookSide` account into columns.
+#
+def decode_perp_orderbook_side(
+    data: bytes, side: Side, lot_size_converter: LotSizeConverter
+) -> OrderBookSideColumns:
+    leaves = _leaves(data, _PERP_HEADER_SIZE, _PERP_BUMP_INDEX_OFFSET, _PERP_NODE_DTYPE)
+    timestamp = leaves["timestamp"]
+    time_in_force = leaves["time_in_force"].astype(numpy.uint64)
+    expiration = numpy.where(time_in_force == 0, 0, timestamp + time_in_force).astype(
+        numpy.uint64
+    )
+    return OrderBookSideColumns.from_lots(
+        side,
+        lot_size_converter,
+        leaves["price_lots"].astype(numpy.int64),
+        leaves["quantity_lots"].astype(numpy.int64),
+        leaves["sequence_number"],
+        leaves["owner"],
+        leaves["client_id"],
+        timestamp,
+        expiration,
+    )
+
+
+# # 🥭 decode_serum_orderbook_side function
+#
+# Decodes the raw data of a Serum bids or asks `Slab` account into columns.
+#
+def decode_serum_orderbook_side(
+    data: bytes, side: Side, lot_size_converter: LotSizeConverter
+) -> OrderBookSideColumns:
+    leaves = _leaves(
+        data, _SERUM_HEADER_SIZE, _SERUM_BUMP_INDEX_OFFSET, _SERUM_NODE_DTYPE
+    )
+    zeroes = numpy.zeros(len(leaves), dtype=numpy.uint64)
+    return OrderBookSideColumns.from_lots(
+        side,
+        lot_size_converter,
+        leaves["price_lots"].astype(numpy.int64),
+        leaves["quantity_lots"].astype(numpy.int64),
+        leaves["sequence_number"],
+        leaves["owner"],
+        leaves["client_id"],
+        zeroes,
+        zeroes,
+    )
+
+
+# # 🥭 ColumnarOrderBook class
+#
+# A columnar equivalent of `OrderBook`, with L1/L2/L3 views computed straight from the columns.
+#
+class ColumnarOrderBook:
+    def __init__(
+        self,
+        symbol: str,
+        bids: OrderBookSideColumns,
+        asks: OrderBookSideColumns,
+    ) -> None:
+        self.symbol: str = symbol
+        self.bids: OrderBookSideColumns = bids
+        self.asks: OrderBookSideColumns = asks
+
+    @staticmethod
+    def parse(
+        market: LoadedMarket, bids: AccountInfo, asks: AccountInfo
+    ) -> "ColumnarOrderBook":
+        decoder = (
+            decode_perp_orderbook_side
+            if market.type == MarketType.PERP
+            else decode_serum_orderbook_side
+        )
+        return ColumnarOrderBook(
+            market.fully_qualified_symbol,
+            decoder(bids.data, Side.BUY, market.lot_size_converter),
+            decoder(asks.data, Side.SELL, market.lot_size_converter),
+        )
+
+    @staticmethod
+    def load(context: Context, market: LoadedMarket) -> "ColumnarOrderBook":
+        bids_address: PublicKey = market.bids_address
+        asks_address: PublicKey = market.asks_address
+        bids, asks = AccountInfo.load_multiple(context, [bids_address, asks_address])
+        return ColumnarOrderBook.parse(market, bids, asks)
+
+    def unexpired_at(self, cutoff: datetime) -> "ColumnarOrderBook":
+        return ColumnarOrderBook(
+            self.symbol, self.bids.unexpired_at(cutoff), self.asks.unexpired_at(cutoff)
+        )
+
+    @property
+    def top_bid(self) -> typing.Optional[Decimal]:
+        if len(self.bids) == 0:
+            return None
+        return Decimal(str(self.bids.price[0]))
+
+    @property
+    def top_ask(self) -> typing.Optional[Decimal]:
+        if len(self.asks) == 0:
+            return None
+        return Decimal(str(self.asks.price[0]))
+
+    def l1(self) -> typing.Tuple[OrderBookLevels, OrderBookLevels]:
+        return self.bids.levels(1), self.asks.levels(1)
+
+    def l2(
+        self, depth: typing.Optional[int] = None
+    ) -> typing.Tuple[OrderBookLevels, OrderBookLevels]:
+        return self.bids.levels(depth), self.asks.levels(depth)
+
+    def to_l1_dataframe(self) -> pandas.DataFrame:
+        bids, asks = self.l1()
+        return pandas.concat(
+            [bids.to_dataframe(), asks.to_dataframe()], ignore_index=True
+        )
+
+    def to_l2_dataframe(self, depth: typing.Optional[int] = None) -> pandas.DataFrame:
+        bids, asks = self.l2(depth)
+        return pandas.concat(
+            [bids.to_dataframe(), asks.to_dataframe()], ignore_index=True
+        )
+
+    def to_l3_dataframe(self, include_owners: bool = False) -> pandas.DataFrame:
+        return pandas.concat(
+            [
+                self.bids.to_dataframe(include_owners),
+                self.asks.to_dataframe(include_owners),
+            ],
+            ignore_index=True,
+        )
+
+    def __str__(self) -> str:
+        return f"« ColumnarOrderBook {self.symbol} [{len(self.bids)} bids, {len(self.asks)} asks] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
@@ -37,32 +37,146 @@ _PUBKEY_LENGTH = 32
 _SIGNATURE_LENGTH = 64
 
 
+def _shortvec_length(value: int) -> int:
+    return len(shortvec.encode_length(value))
+
+
+# # 🥭 TransactionSizeAccumulator class
+#
+# Keeps a running total of the size of a transaction as instructions (and signers) are added to it, so
+# that checking whether one more instruction fits costs O(keys in that instruction) instead of
+# recalculating the size of the whole transaction.
+#
+# Distinct public keys are tracked as their raw 32 bytes. The size is calculated in the same way as
+# `CombinableInstructions._calculate_transaction_size()` (see there for the details) and every signer
+# passed in counts as a signature, just as it does when the transaction is signed.
+#
+class TransactionSizeAccumulator:
+    def __init__(self, signers: typing.Sequence[Keypair] = []) -> None:
+        self.__keys: typing.Set[bytes] = set()
+        self.__signature_count: int = 0
+        self.__instruction_count: int = 0
+        self.__instructions_size: int = 0
+        for signer in signers:
+            self.add_signer(signer)
+
+    @property
+    def instruction_count(self) -> int:
+        return self.__instruction_count
+
+    @property
+    def size(self) -> int:
+        return self.__size(
+            len(self.__keys),
+            self.__signature_count,
+            self.__instruction_count,
+            self.__instructions_size,
+        )
+
+    # The size the transaction would be with these instructions and signers added, without adding them.
+    def size_with(
+        self,
+        instructions: typing.Sequence[TransactionInstruction],
+        signers: typing.Sequence[Keypair] = [],
+    ) -> int:
+        new_keys: typing.Set[bytes] = set()
+        instructions_size: int = self.__instructions_size
+        for instruction in instructions:
+            for key in TransactionSizeAccumulator.__instruction_keys(instruction):
+                if key not in self.__keys:
+                    new_keys.add(key)
+            instructions_size += TransactionSizeAccumulator.__instruction_size(
+                instruction
+            )
+        for signer in signers:
+            key = bytes(signer.public_key)
+            if key not in self.__keys:
+                new_keys.add(key)
+
+        return self.__size(
+            len(self.__keys) + len(new_keys),
+            self.__signature_count + len(signers),
+            self.__instruction_count + len(instructions),
+            instructions_size,
+        )
+
+    def add(self, instruction: TransactionInstruction) -> None:
+        self.__keys.update(TransactionSizeAccumulator.__instruction_keys(instruction))
+        self.__instruction_count += 1
+        self.__instructions_size += TransactionSizeAccumulator.__instruction_size(
+            instruction
+        )
+
+    def add_signer(self, signer: Keypair) -> None:
+        self.__keys.add(bytes(signer.public_key))
+        self.__signature_count += 1
+
+    @staticmethod
+    def __instruction_keys(
+        instruction: TransactionInstruction,
+    ) -> typing.Iterator[bytes]:
+        yield bytes(instruction.program_id)
+        for meta in instruction.keys:
+            yield bytes(meta.pubkey)
+
+    # 1 + (shortvec-length of number of keys) + (number of keys) + (shortvec-length of the data) + (length of the data)
+    @staticmethod
+    def __instruction_size(instruction: TransactionInstruction) -> int:
+        return (
+            1
+            + _shortvec_length(len(instruction.keys))
+            + len(instruction.keys)
+            + _shortvec_length(len(instruction.data))
+            + len(instruction.data)
+        )
+
+    @staticmethod
+    def __size(
+        key_count: int,
+        signature_count: int,
+        instruction_count: int,
+        instructions_size: int,
+    ) -> int:
+        # 35 + (shortvec-length of distinct public keys) + (32 * number of distinct public keys)
+        header_size = 35 + _shortvec_length(key_count) + (key_count * _PUBKEY_LENGTH)
+        instruction_count_length = _shortvec_length(instruction_count)
+        signatures_size = 1 + (signature_count * _SIGNATURE_LENGTH)
+        return (
+            header_size + instruction_count_length + instructions_size + signatures_size
+        )
+
+    def __str__(self) -> str:
+        return f"« TransactionSizeAccumulator {self.__instruction_count} instruction(s), {len(self.__keys)} key(s), {self.__signature_count} signature(s): {self.size} bytes »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
 def _split_instructions_into_chunks(
     context: Context,
     signers: typing.Sequence[Keypair],
     instructions: typing.Sequence[TransactionInstruction],
 ) -> typing.Sequence[typing.Sequence[TransactionInstruction]]:
+    signers_only = TransactionSizeAccumulator(signers)
     vetted_chunks: typing.List[typing.List[TransactionInstruction]] = []
     current_chunk: typing.List[TransactionInstruction] = []
+    current_size = TransactionSizeAccumulator(signers)
     for counter, instruction in enumerate(instructions):
-        instruction_size_on_its_own = CombinableInstructions.transaction_size(
-            signers, [instruction]
-        )
+        instruction_size_on_its_own = signers_only.size_with([instruction])
         if instruction_size_on_its_own >= _MAXIMUM_TRANSACTION_LENGTH:
             report = context.client.instruction_reporter.report(instruction)
             raise Exception(
                 f"Instruction exceeds maximum size - instruction {counter} has {len(instruction.keys)} keys and creates a transaction {instruction_size_on_its_own} bytes long:\n{report}"
             )
 
-        in_progress_chunk = current_chunk + [instruction]
-        transaction_size = CombinableInstructions.transaction_size(
-            signers, in_progress_chunk
-        )
+        transaction_size = current_size.size_with([instruction])
         if transaction_size < _MAXIMUM_TRANSACTION_LENGTH:
-            current_chunk = in_progress_chunk
+            current_chunk += [instruction]
         else:
             vetted_chunks += [current_chunk]
             current_chunk = [instruction]
+            current_size = TransactionSizeAccumulator(signers)
+        current_size.add(instruction)
 
     all_chunks = vetted_chunks + [current_chunk]
 
@@ -193,52 +307,11 @@ class CombinableInstructions:
         # * + shortvec-length of the number of signers
         # * + (number of signers * 64 bytes)
         #
-        def shortvec_length(value: int) -> int:
-            return len(shortvec.encode_length(value))
-
-        program_ids = {
-            instruction.program_id.to_base58() for instruction in instructions
-        }
-        meta_pubkeys = {
-            meta.pubkey.to_base58()
-            for instruction in instructions
-            for meta in instruction.keys
-        }
-        distinct_publickeys = set.union(
-            program_ids,
-            meta_pubkeys,
-            {signer.public_key.to_base58() for signer in signers},
-        )
-        num_distinct_publickeys = len(distinct_publickeys)
-
-        # 35 + (shortvec-length of distinct public keys) + (32 * number of distinct public keys)
-        header_size = (
-            35
-            + shortvec_length(num_distinct_publickeys)
-            + (num_distinct_publickeys * _PUBKEY_LENGTH)
-        )
-
-        instruction_count_length = shortvec_length(len(instructions))
-
-        instructions_size = 0
-        for inst in instructions:
-            # 1 + (shortvec-length of number of keys) + (number of keys) + (shortvec-length of the data) + (length of the data)
-            instructions_size += (
-                1
-                + shortvec_length(len(inst.keys))
-                + len(inst.keys)
-                + shortvec_length(len(inst.data))
-                + len(inst.data)
-            )
-
-        # Signatures
-        signatures_size = 1 + (len(signers) * _SIGNATURE_LENGTH)
-
-        # We can now calculate the total transaction size
-        calculated_transaction_size = (
-            header_size + instruction_count_length + instructions_size + signatures_size
-        )
-        return calculated_transaction_size
+        # The running totals for all this are kept by `TransactionSizeAccumulator`.
+        accumulator = TransactionSizeAccumulator(signers)
+        for instruction in instructions:
+            accumulator.add(instruction)
+        return accumulator.size
 
     # Calculate the exact size of a transaction. There's an upper limit of 1232 so we need to keep
     # all transactions below this size.
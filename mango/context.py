@@ -24,6 +24,7 @@ from rx.scheduler.threadpoolscheduler import ThreadPoolScheduler
 from solana.publickey import PublicKey
 from solana.rpc.commitment import Commitment
 
+from .accountcache import AccountCache
 from .client import (
     BetterClient,
     ClusterUrlData,
@@ -35,6 +36,7 @@ from .idgenerator import IdGenerator, MonotonicIdGenerator
 from .instructionreporter import InstructionReporter, CompoundInstructionReporter
 from .instrumentlookup import InstrumentLookup
 from .marketlookup import MarketLookup
+from .ratelimiter import RateLimitSettings
 from .text import indent_collection_as_str, indent_item_by
 from .tokens import Instrument, Token
 
@@ -66,6 +68,8 @@ class Context:
         instrument_lookup: InstrumentLookup,
         market_lookup: MarketLookup,
         transaction_monitor: TransactionMonitor = NullTransactionMonitor(),
+        account_cache: AccountCache = AccountCache(),
+        rate_limit_settings: typing.Optional[RateLimitSettings] = None,
     ) -> None:
         self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
         self.name: str = name
@@ -87,6 +91,7 @@ class Context:
             stale_data_pauses_before_retry,
             instruction_reporter,
             transaction_monitor,
+            rate_limit_settings,
         )
         self.mango_program_address: PublicKey = mango_program_address
         self.serum_program_address: PublicKey = serum_program_address
@@ -97,6 +102,7 @@ class Context:
         self.reflink: typing.Optional[PublicKey] = reflink
         self.instrument_lookup: InstrumentLookup = instrument_lookup
         self.market_lookup: MarketLookup = market_lookup
+        self.account_cache: AccountCache = account_cache
 
         self.ping_interval: int = 10
 
@@ -172,6 +178,8 @@ class Context:
     Group Address: {self.group_address}
     Mango Program Address: {self.mango_program_address}
     Serum Program Address: {self.serum_program_address}
+    Account Cache: {self.account_cache}
+    Rate Limits: {self.client.rate_limit_settings}
 »"""
 
     def __repr__(self) -> str:
@@ -22,6 +22,7 @@ from decimal import Decimal
 from solana.publickey import PublicKey
 from solana.rpc.commitment import Commitment, Finalized
 
+from .accountcache import AccountCache, AccountCacheType, DiskAccountCache
 from .client import (
     AbstractSlotHolder,
     CheckingSlotHolder,
@@ -41,6 +42,7 @@ from .instrumentlookup import (
     SPLTokenLookup,
 )
 from .marketlookup import CompoundMarketLookup, MarketLookup
+from .ratelimiter import RateLimitSettings
 from .serummarketlookup import SerumMarketLookup
 from .transactionmonitoring import (
     DequeTransactionStatusCollector,
@@ -218,9 +220,64 @@ class ContextBuilder:
             default=None,
             help="Number of seconds to pause between successive getMultipleAccounts() calls to avoid rate limiting",
         )
+        parser.add_argument(
+            "--rate-limit-requests-per-second",
+            type=float,
+            default=None,
+            help="Maximum rate of requests to send to each RPC node - requests wait for budget instead of being rate limited by the node, with order placement going ahead of data refreshes and data refreshes ahead of background scans (default: no limit)",
+        )
+        parser.add_argument(
+            "--rate-limit-request-burst",
+            type=float,
+            default=None,
+            help="Number of requests that can be sent at once to each RPC node after a quiet period (default: one second's worth of requests, or enough for the lowest priority request to go ahead)",
+        )
+        parser.add_argument(
+            "--rate-limit-bytes-per-second",
+            type=float,
+            default=None,
+            help="Maximum rate of response data to receive from each RPC node (default: no limit)",
+        )
         parser.add_argument(
             "--reflink", type=PublicKey, default=None, help="Referral public key"
         )
+        parser.add_argument(
+            "--account-cache",
+            default=False,
+            action="store_true",
+            help=f"Cache rarely-changing accounts between runs in {DiskAccountCache.DEFAULT_DIRECTORY}",
+        )
+        parser.add_argument(
+            "--account-cache-directory",
+            type=str,
+            default=None,
+            help="Directory in which to cache rarely-changing accounts between runs (implies --account-cache)",
+        )
+        parser.add_argument(
+            "--account-cache-ttl",
+            type=float,
+            default=DiskAccountCache.DEFAULT_TTL,
+            help=f"Number of seconds a cached account can be used for before it must be reloaded (default: {DiskAccountCache.DEFAULT_TTL})",
+        )
+        parser.add_argument(
+            "--account-cache-type",
+            type=AccountCacheType,
+            action="append",
+            default=None,
+            help=f"Type of account to cache (can be specified multiple times, default: {', '.join(map(str, DiskAccountCache.DEFAULT_TYPES))})",
+        )
+        parser.add_argument(
+            "--no-account-cache",
+            default=False,
+            action="store_true",
+            help="Bypass the account cache and load all accounts from the RPC node",
+        )
+        parser.add_argument(
+            "--clear-account-cache",
+            default=False,
+            action="store_true",
+            help="Remove all cached accounts for the cluster from the account cache directory before starting (whether or not the cache is used)",
+        )
 
     # This function is the converse of `add_command_line_parameters()` - it takes
     # an argument of parsed command-line parameters and expects to see the ones it added
@@ -261,6 +318,20 @@ class ContextBuilder:
         monitor_transactions_timeout: typing.Optional[
             float
         ] = args.monitor_transactions_timeout
+        account_cache_directory: typing.Optional[str] = args.account_cache_directory
+        if account_cache_directory is None and args.account_cache:
+            account_cache_directory = DiskAccountCache.DEFAULT_DIRECTORY
+        if args.no_account_cache:
+            account_cache_directory = None
+        account_cache_ttl: typing.Optional[float] = args.account_cache_ttl
+        account_cache_types: typing.Optional[
+            typing.Sequence[AccountCacheType]
+        ] = args.account_cache_type
+        rate_limit_settings: RateLimitSettings = RateLimitSettings(
+            requests_per_second=args.rate_limit_requests_per_second,
+            bytes_per_second=args.rate_limit_bytes_per_second,
+            request_burst=args.rate_limit_request_burst,
+        )
 
         # Do this here so build() only ever has to handle the sequence of retry times. (It gets messy
         # passing around the sequnce *plus* the data to reconstruct it for build().)
@@ -298,7 +369,23 @@ class ContextBuilder:
             monitor_transactions_commitment,
             monitor_transactions_timeout,
             actual_slot_holder,
-        )
+            account_cache_directory,
+            account_cache_ttl,
+            account_cache_types,
+            rate_limit_settings,
+        )
+
+        if args.clear_account_cache:
+            # Clearing the cache on disk doesn't need the cache to be used for this run.
+            account_cache: AccountCache = context.account_cache
+            if not isinstance(account_cache, DiskAccountCache):
+                account_cache = DiskAccountCache(
+                    args.account_cache_directory or DiskAccountCache.DEFAULT_DIRECTORY,
+                    context.client.cluster_name,
+                    context.mango_program_address,
+                    context.serum_program_address,
+                )
+            account_cache.clear()
 
         logging.debug(f"{context}")
 
@@ -332,6 +419,8 @@ class ContextBuilder:
             context.client.transaction_monitor.commitment,
             context.client.transaction_monitor.transaction_timeout,
             context.client.transaction_monitor.slot_holder,
+            *ContextBuilder.__account_cache_settings(context),
+            context.client.rate_limit_settings,
         )
 
     @staticmethod
@@ -358,8 +447,26 @@ class ContextBuilder:
             None,
             None,
             NullSlotHolder(),
+            *ContextBuilder.__account_cache_settings(context),
+            context.client.rate_limit_settings,
         )
 
+    @staticmethod
+    def __account_cache_settings(
+        context: Context,
+    ) -> typing.Tuple[
+        typing.Optional[str],
+        typing.Optional[float],
+        typing.Optional[typing.Sequence[AccountCacheType]],
+    ]:
+        if isinstance(context.account_cache, DiskAccountCache):
+            return (
+                context.account_cache.directory,
+                context.account_cache.ttl,
+                context.account_cache.types,
+            )
+        return (None, None, None)
+
     @staticmethod
     def build(
         name: typing.Optional[str] = None,
@@ -383,6 +490,10 @@ class ContextBuilder:
         monitor_transactions_commitment: typing.Optional[Commitment] = None,
         monitor_transactions_timeout: typing.Optional[float] = None,
         slot_holder: typing.Optional[AbstractSlotHolder] = None,
+        account_cache_directory: typing.Optional[str] = None,
+        account_cache_ttl: typing.Optional[float] = None,
+        account_cache_types: typing.Optional[typing.Sequence[AccountCacheType]] = None,
+        rate_limit_settings: typing.Optional[RateLimitSettings] = None,
     ) -> "Context":
         def __public_key_or_none(
             address: typing.Optional[str],
@@ -591,6 +702,17 @@ class ContextBuilder:
                 slot_holder=actual_slot_holder,
             )
 
+        actual_account_cache: AccountCache = AccountCache()
+        if account_cache_directory is not None:
+            actual_account_cache = DiskAccountCache(
+                account_cache_directory,
+                actual_cluster,
+                actual_program_address,
+                actual_serum_program_address,
+                account_cache_ttl or DiskAccountCache.DEFAULT_TTL,
+                account_cache_types,
+            )
+
         context = Context(
             actual_name,
             actual_cluster,
@@ -612,6 +734,8 @@ class ContextBuilder:
             instrument_lookup,
             market_lookup,
             actual_transaction_monitor,
+            actual_account_cache,
+            rate_limit_settings,
         )
 
         return context
@@ -0,0 +1,647 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+import enum
+import logging
+import queue
+import threading
+import time
+import typing
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from solana.publickey import PublicKey
+from solana.rpc.types import MemcmpOpts
+
+from .account import Account
+from .accountinfo import AccountInfo
+from .cache import Cache
+from .context import Context
+from .datetimes import local_now
+from .encoding import encode_key
+from .group import Group
+from .layouts import layouts
+from .observables import Disposable, EventSource
+from .openorders import OpenOrders
+from .tokens import Token
+from .websocketsubscription import (
+    WebSocketAccountSubscription,
+    WebSocketProgramSubscription,
+    WebSocketSubscriptionManager,
+)
+
+
+# # 🥭 Health Watchdog
+#
+# Watches the health of every account in a group and reports accounts whose health crosses the init or
+# maint thresholds.
+#
+# Loading every account with `Account.load_all()` and checking each one's `DataFrame` takes minutes for
+# a busy group. The `HealthWatchdog` loads everything once, then keeps it up to date from two
+# subscriptions - one to the Mango program (filtered to accounts in the group) and one to the group's
+# `Cache`. Health is only recalculated for the accounts that need it:
+# * an account update recalculates that account's health,
+# * a `Cache` update recalculates health for the accounts holding deposits, borrows, spot open orders or
+#   perp positions in the markets whose prices, funding or bank indices changed.
+#
+# Health is worked out from `Account.to_rows()` without building a `DataFrame`, which is what makes
+# recalculating after every price change practical.
+#
+# Account updates are handled on a worker thread rather than the websocket thread, since an account with
+# spot open orders needs its `OpenOrders` loaded (one `getMultipleAccounts` call for all the updates
+# waiting at the time) before its health can be worked out.
+#
+# Spot `OpenOrders` belong to the Serum program, so they aren't part of the program subscription. They're
+# reloaded whenever their Mango account changes, which covers placing, cancelling and settling orders.
+# Fills that happen between changes to the Mango account are picked up on its next change.
+#
+
+
+# # 🥭 HealthBand enum
+#
+# Where an account's health is relative to the init and maint thresholds, from best to worst.
+#
+class HealthBand(enum.Enum):
+    HEALTHY = enum.auto()
+    BELOW_INIT = enum.auto()
+    BELOW_MAINT = enum.auto()
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 AccountHealth class
+#
+# The health of one account, as of the slot of the update that caused it to be calculated.
+#
+@dataclass(frozen=True)
+class AccountHealth:
+    address: PublicKey
+    owner: PublicKey
+    slot: int
+    init_health: Decimal
+    maint_health: Decimal
+    init_health_ratio: Decimal
+    maint_health_ratio: Decimal
+    being_liquidated: bool
+    band: HealthBand
+
+    def __str__(self) -> str:
+        return f"« AccountHealth [{self.address}] {self.band} at slot {self.slot}: init {self.init_health_ratio:,.4f}%, maint {self.maint_health_ratio:,.4f}% »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 HealthCrossing class
+#
+# An account moving from one `HealthBand` to another.
+#
+@dataclass(frozen=True)
+class HealthCrossing:
+    previous: HealthBand
+    health: AccountHealth
+    detected_at: datetime
+
+    @property
+    def address(self) -> PublicKey:
+        return self.health.address
+
+    @property
+    def worsened(self) -> bool:
+        return self.health.band.value > self.previous.value
+
+    def __str__(self) -> str:
+        return f"« HealthCrossing [{self.health.address}] {self.previous} -> {self.health.band} at slot {self.health.slot}: init {self.health.init_health_ratio:,.4f}%, maint {self.health.maint_health_ratio:,.4f}% »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# This is `Account.weighted_assets()` working on the rows from `Account.to_rows()` instead of a `DataFrame`.
+def _weighted_assets(
+    rows: typing.Sequence[typing.Dict[str, typing.Any]],
+    quote_symbol: str,
+    weighting_name: str,
+) -> typing.Tuple[Decimal, Decimal]:
+    quote: Decimal = Decimal(0)
+    perp_health_quote: Decimal = Decimal(0)
+    quote_unsettled: Decimal = Decimal(0)
+    spot_borrow_health: Decimal = Decimal(0)
+    perp_health_base_liability: Decimal = Decimal(0)
+    spot_deposit_health: Decimal = Decimal(0)
+    perp_health_base_asset: Decimal = Decimal(0)
+    for row in rows:
+        perp_health_quote += row["PerpHealthQuote"]
+        if row["InMarginBasket"]:
+            quote_unsettled += row["QuoteUnsettled"]
+        if row["Symbol"] == quote_symbol:
+            quote += row["SpotValue"]
+            continue
+
+        spot_value: Decimal = row["SpotHealthBaseValue"]
+        if spot_value < 0:
+            spot_borrow_health += (
+                spot_value * row[f"Spot{weighting_name}LiabilityWeight"]
+            )
+        elif spot_value > 0:
+            spot_deposit_health += spot_value * row[f"Spot{weighting_name}AssetWeight"]
+
+        perp_value: Decimal = row["PerpHealthBaseValue"]
+        if perp_value < 0:
+            perp_health_base_liability += (
+                perp_value * row[f"Perp{weighting_name}LiabilityWeight"]
+            )
+        elif perp_value > 0:
+            perp_health_base_asset += (
+                perp_value * row[f"Perp{weighting_name}AssetWeight"]
+            )
+
+    quote += perp_health_quote
+    quote += quote_unsettled
+
+    assets = Decimal(0)
+    liabilities = Decimal(0)
+    if quote > 0:
+        assets = quote
+    else:
+        liabilities = quote
+
+    liabilities += spot_borrow_health + perp_health_base_liability
+    assets += spot_deposit_health + perp_health_base_asset
+
+    return assets, liabilities
+
+
+def _health_ratio(assets: Decimal, liabilities: Decimal) -> Decimal:
+    if liabilities == 0:
+        return Decimal(100)
+
+    return ((assets / -liabilities) - 1) * 100
+
+
+# Which market indices an account's health depends on - `markets` for prices and funding, `banks` for
+# the deposit and borrow indices.
+def _exposure(account: Account) -> typing.Tuple[typing.Set[int], typing.Set[int]]:
+    markets: typing.Set[int] = set()
+    banks: typing.Set[int] = set()
+    for slot in account.slots:
+        if slot.raw_deposit != 0 or slot.raw_borrow != 0:
+            markets.add(slot.index)
+            banks.add(slot.index)
+        if slot.spot_open_orders is not None:
+            markets.add(slot.index)
+        if slot.perp_account is not None and not slot.perp_account.empty:
+            markets.add(slot.index)
+    return markets, banks
+
+
+def _cached_values(
+    items: typing.Sequence[typing.Any], index: int, names: typing.Sequence[str]
+) -> typing.Optional[typing.Tuple[typing.Any, ...]]:
+    if index >= len(items) or items[index] is None:
+        return None
+    return tuple(getattr(items[index], name) for name in names)
+
+
+# Which market indices have different prices or funding (`markets`) or different deposit or borrow
+# indices (`banks`) in the two `Cache`s.
+def _changed_indices(
+    previous: Cache, current: Cache
+) -> typing.Tuple[typing.Set[int], typing.Set[int]]:
+    markets: typing.Set[int] = set()
+    banks: typing.Set[int] = set()
+    for index in range(max(len(previous.price_cache), len(current.price_cache))):
+        if _cached_values(previous.price_cache, index, ["price"]) != _cached_values(
+            current.price_cache, index, ["price"]
+        ):
+            markets.add(index)
+    funding: typing.Sequence[str] = ["long_funding", "short_funding"]
+    for index in range(
+        max(len(previous.perp_market_cache), len(current.perp_market_cache))
+    ):
+        if _cached_values(previous.perp_market_cache, index, funding) != _cached_values(
+            current.perp_market_cache, index, funding
+        ):
+            markets.add(index)
+    bank_indices: typing.Sequence[str] = ["deposit_index", "borrow_index"]
+    for index in range(
+        max(len(previous.root_bank_cache), len(current.root_bank_cache))
+    ):
+        if _cached_values(
+            previous.root_bank_cache, index, bank_indices
+        ) != _cached_values(current.root_bank_cache, index, bank_indices):
+            banks.add(index)
+    return markets, banks
+
+
+@dataclass
+class _AccountUpdate:
+    address: PublicKey
+    account: typing.Optional[Account]
+    slot: int
+
+
+# # 🥭 HealthWatchdog class
+#
+# Keeps the health of every account in the group up to date and publishes a `HealthCrossing` to
+# `crossings` whenever an account moves between `HealthBand`s.
+#
+# Thresholds are health ratios (percentages), so the defaults of 0 mean 'init health is negative' and
+# 'maint health is negative'. Raising them gives earlier warning.
+#
+# Crossings from account updates are published in the order those updates arrived. A `Cache` update can
+# move many accounts at once - those crossings are published together, least healthy (by maint health
+# ratio) first.
+#
+class HealthWatchdog(Disposable):
+    def __init__(
+        self,
+        context: Context,
+        manager: WebSocketSubscriptionManager,
+        group: Group,
+        init_threshold: Decimal = Decimal(0),
+        maint_threshold: Decimal = Decimal(0),
+    ) -> None:
+        super().__init__()
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self.context: Context = context
+        self.manager: WebSocketSubscriptionManager = manager
+        self.group: Group = group
+        self.init_threshold: Decimal = init_threshold
+        self.maint_threshold: Decimal = maint_threshold
+        self.crossings: EventSource[HealthCrossing] = EventSource[HealthCrossing]()
+        self.recalculations: int = 0
+        self.latest_slot: int = 0
+
+        self.__lock: threading.Lock = threading.Lock()
+        self.__cache: typing.Optional[Cache] = None
+        self.__accounts: typing.Dict[str, Account] = {}
+        self.__open_orders: typing.Dict[str, OpenOrders] = {}
+        self.__health: typing.Dict[str, AccountHealth] = {}
+        self.__exposure: typing.Dict[
+            str, typing.Tuple[typing.Set[int], typing.Set[int]]
+        ] = {}
+        self.__program_subscription: typing.Optional[
+            WebSocketProgramSubscription[AccountInfo]
+        ] = None
+        self.__cache_subscription: typing.Optional[
+            WebSocketAccountSubscription[Cache]
+        ] = None
+        self.__startup_accounts: typing.List[typing.Tuple[int, AccountInfo]] = []
+        self.__startup_cache: typing.Optional[typing.Tuple[int, Cache]] = None
+        self.__account_updates: "queue.Queue[_AccountUpdate]" = queue.Queue()
+        self.__stop_requested: threading.Event = threading.Event()
+        self.__worker: threading.Thread = threading.Thread(
+            target=self._run, name="HealthWatchdog", daemon=True
+        )
+
+    @property
+    def cache(self) -> Cache:
+        if self.__cache is None:
+            raise Exception("HealthWatchdog has not been started.")
+        return self.__cache
+
+    @property
+    def health(self) -> typing.Sequence[AccountHealth]:
+        with self.__lock:
+            return list(self.__health.values())
+
+    def health_for(self, address: PublicKey) -> typing.Optional[AccountHealth]:
+        with self.__lock:
+            return self.__health.get(str(address))
+
+    # Subscribes to the program and the `Cache`, opens the manager, then loads everything. Updates that
+    # arrive during the load are held until it finishes, then applied if they're from after the slot the
+    # load started at - anything up to that slot is already in the load. (Later updates may be in the load
+    # too, but applying them again in order ends up in the same place.)
+    #
+    # The manager is opened here, so callers shouldn't open it themselves.
+    def start(self) -> None:
+        group_offset: int = layouts.METADATA.sizeof()
+        filters = [
+            MemcmpOpts(offset=group_offset, bytes=encode_key(self.group.address))
+        ]
+        program_subscription = WebSocketProgramSubscription[AccountInfo](
+            self.context,
+            self.context.mango_program_address,
+            lambda account_info: account_info,
+            filters,
+            layouts.MANGO_ACCOUNT.sizeof(),
+        )
+        self.manager.add(program_subscription)
+        self.add_disposable(
+            program_subscription.publisher.subscribe(on_next=self.__on_account)
+        )
+        self.__program_subscription = program_subscription
+
+        cache_subscription = WebSocketAccountSubscription[Cache](
+            self.context, self.group.cache, Cache.parse
+        )
+        self.manager.add(cache_subscription)
+        self.add_disposable(
+            cache_subscription.publisher.subscribe(on_next=self.__on_cache)
+        )
+        self.__cache_subscription = cache_subscription
+        self.manager.open()
+
+        started_at: float = time.perf_counter()
+        loaded_slot: int = self.context.client.get_slot()
+        cache: Cache = self.group.fetch_cache(self.context)
+        account_infos = AccountInfo.load_by_program(
+            self.context,
+            self.context.mango_program_address,
+            memcmp_opts=filters,
+            data_size=layouts.MANGO_ACCOUNT.sizeof(),
+        )
+        accounts: typing.List[Account] = [
+            Account.parse(account_info, self.group, cache)
+            for account_info in account_infos
+        ]
+        open_orders = self.__load_open_orders(accounts)
+        accounts = [
+            account
+            for account in accounts
+            if self.__has_open_orders(account, open_orders)
+        ]
+        with self.__lock:
+            self.__cache = cache
+            self.__open_orders.update(open_orders)
+            self.latest_slot = max(self.latest_slot, loaded_slot)
+            for account in accounts:
+                self.__store(account)
+                self.__recalculate(account, loaded_slot)
+
+            startup_cache = self.__startup_cache
+            if startup_cache is not None and startup_cache[0] > loaded_slot:
+                self.__apply_cache(startup_cache[1], startup_cache[0])
+            held: typing.Sequence[typing.Tuple[int, AccountInfo]] = [
+                (slot, account_info)
+                for slot, account_info in self.__startup_accounts
+                if slot > loaded_slot
+            ]
+            for slot, account_info in held:
+                self.__queue_account(account_info, slot)
+            self.__startup_cache = None
+            self.__startup_accounts = []
+        self._logger.info(
+            f"Loaded {len(accounts)} accounts and {len(open_orders)} spot open orders at slot {loaded_slot} in {time.perf_counter() - started_at:.2f} seconds - {len(held)} account updates arrived during the load."
+        )
+        self.__worker.start()
+
+    def __on_account(self, account_info: AccountInfo) -> None:
+        slot: int = 0
+        if self.__program_subscription is not None:
+            slot = self.__program_subscription.latest_slot
+        with self.__lock:
+            if self.__cache is None:
+                # Still starting up - held until the load finishes.
+                self.__startup_accounts += [(slot, account_info)]
+                return
+        self.__queue_account(account_info, slot)
+
+    def __queue_account(self, account_info: AccountInfo, slot: int) -> None:
+        if len(account_info.data) != layouts.MANGO_ACCOUNT.sizeof():
+            self.__account_updates.put(_AccountUpdate(account_info.address, None, slot))
+            return
+
+        account: Account = Account.parse(account_info, self.group, self.cache)
+        if account.group_address != self.group.address:
+            return
+        self.__account_updates.put(_AccountUpdate(account.address, account, slot))
+
+    def _run(self) -> None:
+        while not self.__stop_requested.is_set():
+            try:
+                update: typing.Optional[_AccountUpdate] = self.__account_updates.get(
+                    timeout=0.25
+                )
+            except queue.Empty:
+                continue
+
+            updates: typing.List[_AccountUpdate] = []
+            while update is not None:
+                updates += [update]
+                try:
+                    update = self.__account_updates.get_nowait()
+                except queue.Empty:
+                    update = None
+
+            try:
+                self.__apply_account_updates(updates)
+            except Exception as exception:
+                self._logger.error(
+                    f"Could not apply {len(updates)} account updates: {exception}"
+                )
+
+    # Updates are applied in the order they arrived, after one load of the `OpenOrders` for all of them. An
+    # account whose `OpenOrders` can't be loaded is forgotten rather than holding up the rest.
+    def __apply_account_updates(self, updates: typing.Sequence[_AccountUpdate]) -> None:
+        open_orders = self.__load_open_orders(
+            [update.account for update in updates if update.account is not None]
+        )
+        with self.__lock:
+            self.__open_orders.update(open_orders)
+            for update in updates:
+                self.latest_slot = max(self.latest_slot, update.slot)
+                if update.account is None or not self.__has_open_orders(
+                    update.account, open_orders
+                ):
+                    self.__forget(str(update.address))
+                    continue
+
+                self.__store(update.account)
+                crossing = self.__recalculate(update.account, update.slot)
+                if crossing is not None:
+                    self.crossings.publish(crossing)
+
+    def __on_cache(self, cache: Cache) -> None:
+        slot: int = 0
+        if self.__cache_subscription is not None:
+            slot = self.__cache_subscription.latest_slot
+        with self.__lock:
+            self.latest_slot = max(self.latest_slot, slot)
+            if self.__cache is None:
+                # Still starting up - only the latest is held until the load finishes.
+                self.__startup_cache = (slot, cache)
+                return
+            self.__apply_cache(cache, slot)
+
+    # Expects the lock to already be held.
+    def __apply_cache(self, cache: Cache, slot: int) -> None:
+        started_at: float = time.perf_counter()
+        markets, banks = _changed_indices(self.cache, cache)
+        self.__cache = cache
+        if len(markets) == 0 and len(banks) == 0:
+            return
+
+        crossings: typing.List[HealthCrossing] = []
+        affected: typing.List[str] = [
+            address
+            for address, (account_markets, account_banks) in self.__exposure.items()
+            if not (
+                account_markets.isdisjoint(markets) and account_banks.isdisjoint(banks)
+            )
+        ]
+        for address in affected:
+            account: Account = self.__accounts[address]
+            if not self.__exposure[address][1].isdisjoint(banks):
+                # Deposits and borrows are worked out from the bank indices when the account is parsed.
+                account = Account.parse(account.account_info, self.group, cache)
+                self.__store(account)
+            crossing = self.__recalculate(account, slot)
+            if crossing is not None:
+                crossings += [crossing]
+
+        for crossing in sorted(
+            crossings, key=lambda crossing: crossing.health.maint_health_ratio
+        ):
+            self.crossings.publish(crossing)
+        self._logger.debug(
+            f"Cache update at slot {slot} changed markets {sorted(markets)} and banks {sorted(banks)} - recalculated {len(affected)} accounts in {time.perf_counter() - started_at:.4f} seconds."
+        )
+
+    def __load_open_orders(
+        self, accounts: typing.Sequence[Account]
+    ) -> typing.Dict[str, OpenOrders]:
+        slots = [
+            (account, slot)
+            for account in accounts
+            for slot in account.base_slots
+            if slot.spot_open_orders is not None
+        ]
+        if len(slots) == 0:
+            return {}
+
+        addresses: typing.List[PublicKey] = [
+            slot.spot_open_orders
+            for _, slot in slots
+            if slot.spot_open_orders is not None
+        ]
+        account_infos: typing.Dict[str, typing.Optional[AccountInfo]] = {}
+        try:
+            for account_info in AccountInfo.load_multiple(self.context, addresses):
+                account_infos[str(account_info.address)] = account_info
+        except Exception as exception:
+            # One missing account fails the whole load, so load them one at a time to find out which.
+            self._logger.warning(
+                f"Could not load {len(addresses)} spot open orders together, loading them one at a time: {exception}"
+            )
+            for open_orders_address in addresses:
+                account_infos[str(open_orders_address)] = AccountInfo.load(
+                    self.context, open_orders_address
+                )
+
+        open_orders: typing.Dict[str, OpenOrders] = {}
+        for account, slot in slots:
+            address: str = str(slot.spot_open_orders)
+            open_orders_account_info = account_infos.get(address)
+            if open_orders_account_info is None:
+                continue
+            try:
+                open_orders[address] = OpenOrders.parse(
+                    open_orders_account_info,
+                    Token.ensure(slot.base_instrument),
+                    Token.ensure(account.shared_quote.base_instrument),
+                )
+            except Exception as exception:
+                self._logger.warning(
+                    f"Could not parse spot open orders {address}: {exception}"
+                )
+        return open_orders
+
+    # Health can't be worked out without all of an account's spot open orders, so an account with any
+    # missing is left out until an update arrives that can be loaded.
+    def __has_open_orders(
+        self, account: Account, open_orders: typing.Dict[str, OpenOrders]
+    ) -> bool:
+        missing: typing.List[str] = [
+            str(address)
+            for address in account.spot_open_orders
+            if str(address) not in open_orders
+        ]
+        if len(missing) > 0:
+            self._logger.warning(
+                f"Leaving out account {account.address} - could not load its spot open orders {missing}."
+            )
+            return False
+        return True
+
+    # These methods expect the lock to already be held.
+    def __store(self, account: Account) -> None:
+        address: str = str(account.address)
+        self.__accounts[address] = account
+        self.__exposure[address] = _exposure(account)
+
+    def __forget(self, address: str) -> None:
+        self.__accounts.pop(address, None)
+        self.__exposure.pop(address, None)
+        self.__health.pop(address, None)
+
+    def __recalculate(
+        self, account: Account, slot: int
+    ) -> typing.Optional[HealthCrossing]:
+        self.recalculations += 1
+        open_orders: typing.Dict[str, OpenOrders] = {
+            str(address): self.__open_orders[str(address)]
+            for address in account.spot_open_orders
+        }
+        rows = account.to_rows(self.group, open_orders, self.cache)
+        quote_symbol: str = account.shared_quote_token.symbol
+        init_assets, init_liabilities = _weighted_assets(rows, quote_symbol, "Init")
+        maint_assets, maint_liabilities = _weighted_assets(rows, quote_symbol, "Maint")
+        init_health_ratio: Decimal = _health_ratio(init_assets, init_liabilities)
+        maint_health_ratio: Decimal = _health_ratio(maint_assets, maint_liabilities)
+        band: HealthBand = HealthBand.HEALTHY
+        if maint_health_ratio < self.maint_threshold:
+            band = HealthBand.BELOW_MAINT
+        elif init_health_ratio < self.init_threshold:
+            band = HealthBand.BELOW_INIT
+
+        health = AccountHealth(
+            account.address,
+            account.owner,
+            slot,
+            init_assets + init_liabilities,
+            maint_assets + maint_liabilities,
+            init_health_ratio,
+            maint_health_ratio,
+            account.being_liquidated,
+            band,
+        )
+        address: str = str(account.address)
+        previous: typing.Optional[AccountHealth] = self.__health.get(address)
+        self.__health[address] = health
+        # Accounts are only new when they're created or at startup, so they don't count as crossing.
+        if previous is None or previous.band == band:
+            return None
+        return HealthCrossing(previous.band, health, local_now())
+
+    def dispose(self) -> None:
+        self.__stop_requested.set()
+        if self.__worker.is_alive():
+            self.__worker.join()
+        self.crossings.on_completed()
+        super().dispose()
+
+    def __str__(self) -> str:
+        return f"« HealthWatchdog [{self.group.address}] {len(self.__accounts)} accounts, latest slot {self.latest_slot} »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
@@ -21,8 +21,11 @@ import typing
 from decimal import Decimal
 from solana.publickey import PublicKey
 from solana.rpc.types import TokenAccountOpts
+from spl.token.constants import TOKEN_PROGRAM_ID
 
 from .context import Context
+from .encoding import decode_binary
+from .layouts import layouts
 from .output import output
 from .tokens import Instrument, Token
 
@@ -90,6 +93,36 @@ class InstrumentValue:
             return InstrumentValue(token, Decimal(0))
         return value
 
+    # Fetches the total value of each of the `tokens` held by the owner using a single
+    # `getTokenAccountsByOwner` call for all the owner's token accounts, instead of one call (plus one
+    # balance call per token account) for each token.
+    #
+    @staticmethod
+    def fetch_total_values(
+        context: Context, account_public_key: PublicKey, tokens: typing.Sequence[Token]
+    ) -> typing.Sequence["InstrumentValue"]:
+        opts = TokenAccountOpts(program_id=TOKEN_PROGRAM_ID)
+        token_accounts = context.client.get_token_accounts_by_owner(
+            account_public_key, opts
+        )
+
+        native_totals: typing.Dict[str, Decimal] = {}
+        for token_account in token_accounts:
+            data: bytes = decode_binary(token_account["account"]["data"])
+            if len(data) != layouts.TOKEN_ACCOUNT.sizeof():
+                continue
+            layout = layouts.TOKEN_ACCOUNT.parse(data)
+            mint: str = str(layout.mint)
+            native_totals[mint] = native_totals.get(mint, Decimal(0)) + layout.amount
+
+        return [
+            InstrumentValue(
+                token,
+                token.shift_to_decimals(native_totals.get(str(token.mint), Decimal(0))),
+            )
+            for token in tokens
+        ]
+
     @staticmethod
     def report(
         values: typing.Sequence["InstrumentValue"],
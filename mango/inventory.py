@@ -26,8 +26,10 @@ from .instrumentvalue import InstrumentValue
 from .loadedmarket import LoadedMarket
 from .markets import InventorySource
 from .openorders import OpenOrders
+from .oracle import Price
 from .perpmarket import PerpMarket
 from .spotmarket import SpotMarket
+from .tokenaccount import TokenAccount
 from .watcher import Watcher
 
 
@@ -139,3 +141,89 @@ class InventoryAccountWatcher:
             base_value,
             quote_value,
         )
+
+
+# # 🥭 SerumInventoryWatcher class
+#
+# Keeps the inventory for a Serum market up to date from pushed updates of the base and quote
+# token accounts and the market's `OpenOrders` account, so reading it never needs an RPC call.
+#
+# Tokens in the `OpenOrders` account - both free (waiting to be settled) and locked (backing
+# orders on the book) - still belong to the wallet, so they're counted in the base and quote
+# inventory along with the token account balances.
+#
+# Totals are worked out when an update arrives. Only the conversion of base to quote at the
+# latest price is done when `latest` is read.
+#
+class SerumInventoryWatcher:
+    def __init__(
+        self,
+        liquidity_incentives: InstrumentValue,
+        price_watcher: Watcher[Price],
+        base_token_account: TokenAccount,
+        quote_token_account: TokenAccount,
+        open_orders: typing.Optional[OpenOrders] = None,
+    ) -> None:
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self.liquidity_incentives: InstrumentValue = liquidity_incentives
+        self.price_watcher: Watcher[Price] = price_watcher
+        self.__base_token_account: TokenAccount = base_token_account
+        self.__quote_token_account: TokenAccount = quote_token_account
+        self.__open_orders: typing.Optional[OpenOrders] = open_orders
+        self.__totals: typing.Tuple[InstrumentValue, InstrumentValue] = self.__total()
+
+    def __total(self) -> typing.Tuple[InstrumentValue, InstrumentValue]:
+        base: InstrumentValue = self.__base_token_account.value
+        quote: InstrumentValue = self.__quote_token_account.value
+        if self.__open_orders is not None:
+            base = InstrumentValue(
+                base.token, base.value + self.__open_orders.base_token_total
+            )
+            quote = InstrumentValue(
+                quote.token, quote.value + self.__open_orders.quote_token_total
+            )
+        return (base, quote)
+
+    @property
+    def base_token_account(self) -> TokenAccount:
+        return self.__base_token_account
+
+    @property
+    def quote_token_account(self) -> TokenAccount:
+        return self.__quote_token_account
+
+    @property
+    def open_orders(self) -> typing.Optional[OpenOrders]:
+        return self.__open_orders
+
+    def on_base_token_account(self, token_account: TokenAccount) -> None:
+        self.__base_token_account = token_account
+        self.__totals = self.__total()
+
+    def on_quote_token_account(self, token_account: TokenAccount) -> None:
+        self.__quote_token_account = token_account
+        self.__totals = self.__total()
+
+    def on_open_orders(self, open_orders: OpenOrders) -> None:
+        self.__open_orders = open_orders
+        self.__totals = self.__total()
+
+    @property
+    def latest(self) -> Inventory:
+        base, quote = self.__totals
+        available: Decimal = (
+            base.value * self.price_watcher.latest.mid_price
+        ) + quote.value
+        return Inventory(
+            InventorySource.SPL_TOKENS,
+            self.liquidity_incentives,
+            InstrumentValue(quote.token, available),
+            base,
+            quote,
+        )
+
+    def __str__(self) -> str:
+        return f"« SerumInventoryWatcher [base: {self.__base_token_account.address}, quote: {self.__quote_token_account.address}, open orders: {self.__open_orders.address if self.__open_orders is not None else None}] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
@@ -0,0 +1,97 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+import json
+import logging
+import typing
+
+
+# # 🥭 JSON Backends
+#
+# Every RPC response and websocket notification is JSON, and decoding it is a noticeable share of
+# the work for large `getProgramAccounts` responses and busy subscriptions. If a faster JSON
+# library is installed it is used instead of the standard library's `json`:
+#
+# * [orjson](https://github.com/ijl/orjson)
+# * [pysimdjson](https://github.com/TkTech/pysimdjson)
+#
+# Both decode straight from the response `bytes` without first decoding them to a `str`.
+#
+# Neither is a requirement. `set_json_backend()` can force a particular backend, which is mostly
+# useful for benchmarking.
+#
+_logger: logging.Logger = logging.getLogger("jsonbackend")
+
+JsonLoader = typing.Callable[[typing.Union[bytes, str]], typing.Any]
+
+_BACKENDS: typing.Dict[str, JsonLoader] = {"json": json.loads}
+
+try:
+    import orjson
+
+    _BACKENDS["orjson"] = orjson.loads
+except ImportError:
+    pass
+
+try:
+    import simdjson  # type: ignore[import-not-found]
+
+    _BACKENDS["simdjson"] = simdjson.loads
+except ImportError:
+    pass
+
+_PREFERENCE: typing.Sequence[str] = ["orjson", "simdjson", "json"]
+
+_current_name: str = next(name for name in _PREFERENCE if name in _BACKENDS)
+_current: JsonLoader = _BACKENDS[_current_name]
+
+
+# # 🥭 available_json_backends function
+#
+# Returns the names of the JSON backends that can be used here.
+#
+def available_json_backends() -> typing.Sequence[str]:
+    return [name for name in _PREFERENCE if name in _BACKENDS]
+
+
+# # 🥭 json_backend function
+#
+# Returns the name of the JSON backend currently in use.
+#
+def json_backend() -> str:
+    return _current_name
+
+
+# # 🥭 set_json_backend function
+#
+# Switches to the named JSON backend. It throws if that backend isn't installed.
+#
+def set_json_backend(name: str) -> None:
+    global _current, _current_name
+    if name not in _BACKENDS:
+        raise Exception(
+            f"JSON backend '{name}' is not available - available backends are: {available_json_backends()}"
+        )
+    _current = _BACKENDS[name]
+    _current_name = name
+    _logger.debug(f"Using JSON backend '{name}'.")
+
+
+# # 🥭 json_loads function
+#
+# Decodes JSON from `bytes` or `str` using the current backend.
+#
+def json_loads(data: typing.Union[bytes, str]) -> typing.Any:
+    return _current(data)
@@ -0,0 +1,464 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+import base64
+import glob
+import logging
+import os
+import struct
+import threading
+import time
+import typing
+import zstandard
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from rx.core.typing import Disposable as RxDisposable
+from solana.publickey import PublicKey
+
+from .accountinfo import AccountInfo
+from .context import Context
+from .datetimes import utc_now
+from .healthcheck import HealthCheck
+from .loadedmarket import LoadedMarket
+from .observables import Disposable
+from .websocketsubscription import (
+    AddressWebSocketSubscription,
+    WebSocketAccountSubscription,
+    WebSocketSubscriptionManager,
+)
+
+
+# # 🥭 Market Data Recording
+#
+# `watch-address` and `show-orderbook` print what they see, which isn't much use for tuning
+# orderchains against historical data. A `MarketDataRecorder` subscribes to the bids, asks and
+# event queue of a set of markets and appends every update - the raw account bytes, the slot
+# and the time it was received - to a zstd-compressed, append-only log.
+#
+# Log files are rotated once they reach a maximum size or age. Each file is a sequence of zstd
+# frames containing back-to-back records, so a file that was cut off by a crash can still be
+# read up to the last complete record.
+#
+# A `ReplayWebSocketSubscriptionManager` plays a log back into the same subscriptions the live
+# watchers use (e.g. from `build_orderbook_watcher()`), either at the recorded pace or as fast
+# as possible.
+#
+
+
+# address, owner, lamports, slot, received timestamp, data length
+_RECORD_HEADER: struct.Struct = struct.Struct("<32s32sQQdI")
+
+DEFAULT_FILE_PREFIX: str = "market-data"
+DEFAULT_FILE_SUFFIX: str = ".mdr.zst"
+
+
+# # 🥭 MarketDataRecord class
+#
+# One recorded account update. Updates fetched at startup rather than received over the
+# websocket have a slot of 0.
+#
+@dataclass(frozen=True)
+class MarketDataRecord:
+    address: PublicKey
+    owner: PublicKey
+    lamports: Decimal
+    slot: int
+    received: datetime
+    data: bytes
+
+    @staticmethod
+    def from_account_info(
+        account_info: AccountInfo, slot: int, received: datetime
+    ) -> "MarketDataRecord":
+        return MarketDataRecord(
+            account_info.address,
+            account_info.owner,
+            account_info.lamports,
+            slot,
+            received,
+            account_info.data,
+        )
+
+    def to_account_info(self) -> AccountInfo:
+        return AccountInfo(
+            self.address,
+            False,
+            self.lamports,
+            self.owner,
+            Decimal(0),
+            self.data,
+        )
+
+    def to_notification(self, subscription_id: int) -> typing.Dict[str, typing.Any]:
+        return {
+            "method": "accountNotification",
+            "params": {
+                "result": {
+                    "context": {"slot": self.slot},
+                    "value": {
+                        "data": [base64.b64encode(self.data).decode("ascii"), "base64"],
+                        "executable": False,
+                        "lamports": int(self.lamports),
+                        "owner": str(self.owner),
+                        "rentEpoch": 0,
+                    },
+                },
+                "subscription": subscription_id,
+            },
+        }
+
+    def encode(self) -> bytes:
+        header: bytes = _RECORD_HEADER.pack(
+            bytes(self.address),
+            bytes(self.owner),
+            int(self.lamports),
+            self.slot,
+            self.received.timestamp(),
+            len(self.data),
+        )
+        return header + self.data
+
+    def __str__(self) -> str:
+        return f"« MarketDataRecord {self.address} [slot: {self.slot}, received: {self.received}]: {len(self.data)} bytes »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 MarketDataLogWriter class
+#
+# Appends `MarketDataRecord`s to zstd-compressed files in a directory, starting a new file
+# when the current one reaches `max_file_size` compressed bytes or `max_file_age`.
+#
+# Data is flushed to disk at most `flush_interval` apart, so a crash loses at most that much.
+#
+class MarketDataLogWriter(Disposable):
+    def __init__(
+        self,
+        directory: str,
+        max_file_size: int = 64 * 1024 * 1024,
+        max_file_age: timedelta = timedelta(hours=1),
+        flush_interval: timedelta = timedelta(seconds=1),
+        compression_level: int = 3,
+        prefix: str = DEFAULT_FILE_PREFIX,
+    ) -> None:
+        super().__init__()
+        self.directory: str = directory
+        self.max_file_size: int = max_file_size
+        self.max_file_age: timedelta = max_file_age
+        self.flush_interval: timedelta = flush_interval
+        self.prefix: str = prefix
+        self.filename: typing.Optional[str] = None
+        self.records_written: int = 0
+        self.__compressor: zstandard.ZstdCompressor = zstandard.ZstdCompressor(
+            level=compression_level
+        )
+        self.__lock: threading.Lock = threading.Lock()
+        self.__file: typing.Optional[typing.BinaryIO] = None
+        self.__writer: typing.Any = None
+        self.__opened_at: float = 0
+        self.__flushed_at: float = 0
+        self.__file_counter: int = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, record: MarketDataRecord) -> None:
+        with self.__lock:
+            now: float = time.monotonic()
+            if self.__writer is None:
+                self.__open(now)
+            elif (
+                self.__file is not None and self.__file.tell() >= self.max_file_size
+            ) or (now - self.__opened_at >= self.max_file_age.total_seconds()):
+                self.__close()
+                self.__open(now)
+
+            self.__writer.write(record.encode())
+            self.records_written += 1
+            if now - self.__flushed_at >= self.flush_interval.total_seconds():
+                self.__writer.flush(zstandard.FLUSH_BLOCK)
+                self.__flushed_at = now
+
+    def write_account_info(
+        self,
+        account_info: AccountInfo,
+        slot: int,
+        received: typing.Optional[datetime] = None,
+    ) -> None:
+        self.write(
+            MarketDataRecord.from_account_info(
+                account_info, slot, received or utc_now()
+            )
+        )
+
+    def __open(self, now: float) -> None:
+        self.__file_counter += 1
+        timestamp: str = utc_now().strftime("%Y%m%dT%H%M%S")
+        self.filename = os.path.join(
+            self.directory,
+            f"{self.prefix}-{timestamp}-{self.__file_counter:06d}{DEFAULT_FILE_SUFFIX}",
+        )
+        self.__file = open(self.filename, "ab")
+        self.__writer = self.__compressor.stream_writer(self.__file, closefd=False)
+        self.__opened_at = now
+        self.__flushed_at = now
+        self._logger.info(f"Recording market data to {self.filename}")
+
+    def __close(self) -> None:
+        if self.__writer is not None:
+            self.__writer.flush(zstandard.FLUSH_FRAME)
+            self.__writer = None
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def dispose(self) -> None:
+        with self.__lock:
+            self.__close()
+        super().dispose()
+
+    def __str__(self) -> str:
+        return f"« MarketDataLogWriter {self.directory} [{self.records_written} records, current file: {self.filename}] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 MarketDataLogReader class
+#
+# Reads `MarketDataRecord`s back from one or more log files, in order.
+#
+class MarketDataLogReader:
+    def __init__(self, filenames: typing.Sequence[str]) -> None:
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self.filenames: typing.Sequence[str] = filenames
+
+    @staticmethod
+    def from_directory(
+        directory: str, prefix: str = DEFAULT_FILE_PREFIX
+    ) -> "MarketDataLogReader":
+        pattern: str = os.path.join(directory, f"{prefix}-*{DEFAULT_FILE_SUFFIX}")
+        return MarketDataLogReader(sorted(glob.glob(pattern)))
+
+    def records(self) -> typing.Iterator[MarketDataRecord]:
+        for filename in self.filenames:
+            yield from self.__records_in(filename)
+
+    # The first record for each address, which is usually the snapshot taken at startup. Useful
+    # to seed an `RPCSimulator` so watchers can load their initial state during a replay.
+    def initial_account_infos(self) -> typing.Sequence[AccountInfo]:
+        initial: typing.Dict[str, AccountInfo] = {}
+        for record in self.records():
+            if str(record.address) not in initial:
+                initial[str(record.address)] = record.to_account_info()
+        return list(initial.values())
+
+    def __records_in(self, filename: str) -> typing.Iterator[MarketDataRecord]:
+        decompressor = zstandard.ZstdDecompressor()
+        with open(filename, "rb") as file:
+            reader = decompressor.stream_reader(file, read_across_frames=True)
+            while True:
+                header: bytes = self.__read(reader, _RECORD_HEADER.size)
+                if len(header) == 0:
+                    return
+                if len(header) < _RECORD_HEADER.size:
+                    self._logger.warning(f"Truncated record at end of {filename}.")
+                    return
+
+                (
+                    address,
+                    owner,
+                    lamports,
+                    slot,
+                    received,
+                    length,
+                ) = _RECORD_HEADER.unpack(header)
+                data: bytes = self.__read(reader, length)
+                if len(data) < length:
+                    self._logger.warning(f"Truncated record at end of {filename}.")
+                    return
+
+                yield MarketDataRecord(
+                    PublicKey(address),
+                    PublicKey(owner),
+                    Decimal(lamports),
+                    slot,
+                    datetime.fromtimestamp(received, tz=timezone.utc),
+                    data,
+                )
+
+    def __read(self, reader: typing.Any, size: int) -> bytes:
+        chunks: typing.List[bytes] = []
+        remaining: int = size
+        while remaining > 0:
+            try:
+                chunk: bytes = reader.read(remaining)
+            except zstandard.ZstdError:
+                break
+            if len(chunk) == 0:
+                break
+            chunks += [chunk]
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def __str__(self) -> str:
+        return f"« MarketDataLogReader [{len(self.filenames)} files] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 MarketDataRecorder class
+#
+# Subscribes to accounts and writes every update to a `MarketDataLogWriter`. The current state
+# of each account is recorded (with slot 0) when it is added, so a log always starts with a
+# complete snapshot.
+#
+class MarketDataRecorder(Disposable):
+    def __init__(
+        self,
+        context: Context,
+        manager: WebSocketSubscriptionManager,
+        health_check: HealthCheck,
+        writer: MarketDataLogWriter,
+    ) -> None:
+        super().__init__()
+        self.context: Context = context
+        self.manager: WebSocketSubscriptionManager = manager
+        self.health_check: HealthCheck = health_check
+        self.writer: MarketDataLogWriter = writer
+
+    def add_market(self, market: LoadedMarket) -> None:
+        self.add_accounts(
+            [market.bids_address, market.asks_address, market.event_queue_address]
+        )
+
+    def add_accounts(self, addresses: typing.Sequence[PublicKey]) -> None:
+        account_infos = AccountInfo.load_multiple(self.context, addresses)
+        for account_info in account_infos:
+            self.writer.write_account_info(account_info, 0)
+            subscription = WebSocketAccountSubscription[AccountInfo](
+                self.context, account_info.address, lambda account_info: account_info
+            )
+            self.manager.add(subscription)
+            self.add_disposable(self.__subscribe(subscription))
+            self.health_check.add(
+                f"record_{account_info.address}_subscription", subscription.publisher
+            )
+
+    # The subscription's `latest_slot` is updated before each update is published, so it's the
+    # slot of the update being recorded.
+    def __subscribe(
+        self, subscription: WebSocketAccountSubscription[AccountInfo]
+    ) -> RxDisposable:
+        return subscription.publisher.subscribe(
+            on_next=lambda account_info: self.writer.write_account_info(
+                account_info, subscription.latest_slot
+            )
+        )
+
+    def __str__(self) -> str:
+        return f"« MarketDataRecorder {self.writer} »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 ReplayWebSocketSubscriptionManager class
+#
+# A `WebSocketSubscriptionManager` that doesn't connect to anything. Instead it sends recorded
+# updates to whichever of its subscriptions are for the recorded account.
+#
+# `speed` is how many times faster than the recording to play it back - 1 is the original
+# wall-clock pace. A `speed` of `None` plays it back as fast as possible.
+#
+# `open()` replays in a background thread, like a live manager's websockets. `replay()` does the
+# same work on the calling thread and returns when the log is exhausted.
+#
+class ReplayWebSocketSubscriptionManager(WebSocketSubscriptionManager):
+    def __init__(
+        self,
+        context: Context,
+        reader: MarketDataLogReader,
+        speed: typing.Optional[float] = None,
+    ) -> None:
+        super().__init__(context)
+        self.reader: MarketDataLogReader = reader
+        self.speed: typing.Optional[float] = speed
+        self.records_replayed: int = 0
+        self.__stop: threading.Event = threading.Event()
+        self.__thread: typing.Optional[threading.Thread] = None
+
+    def open(self) -> None:
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.replay, daemon=True)
+        self.__thread.start()
+
+    def close(self) -> None:
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def replay(self) -> None:
+        by_address: typing.Dict[
+            str, typing.List[AddressWebSocketSubscription[typing.Any]]
+        ] = {}
+        for subscription in self.subscriptions:
+            if isinstance(subscription, AddressWebSocketSubscription):
+                by_address.setdefault(str(subscription.address), []).append(
+                    subscription
+                )
+
+        first_received: typing.Optional[datetime] = None
+        started: float = time.monotonic()
+        for record in self.reader.records():
+            if self.__stop.is_set():
+                return
+
+            subscriptions = by_address.get(str(record.address), [])
+            if len(subscriptions) == 0:
+                continue
+
+            if self.speed is not None:
+                if first_received is None:
+                    first_received = record.received
+                offset: float = (
+                    record.received - first_received
+                ).total_seconds() / self.speed
+                delay: float = started + offset - time.monotonic()
+                if delay > 0 and self.__stop.wait(delay):
+                    return
+
+            for subscription in subscriptions:
+                subscription._on_item(
+                    record.to_notification(subscription.subscription_id)
+                )
+            self.records_replayed += 1
+
+        self._logger.info(
+            f"Replay complete - {self.records_replayed} records replayed."
+        )
+
+    def dispose(self) -> None:
+        self.close()
+        super().dispose()
+
+    def __str__(self) -> str:
+        return f"« ReplayWebSocketSubscriptionManager {self.reader} [speed: {self.speed or 'maximum'}, {self.records_replayed} records replayed] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
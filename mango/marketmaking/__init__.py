@@ -7,6 +7,10 @@
 # Each import then *must* be of the form `from .file import X as X`. (Until/unless there's
 # a better way.)
 #
+from .executionplanner import ExecutionPlan as ExecutionPlan
+from .executionplanner import ExecutionPlanner as ExecutionPlanner
+from .executionplanner import ExecutionStatistics as ExecutionStatistics
+from .executionplanner import ExecutionUnit as ExecutionUnit
 from .marketmaker import MarketMaker as MarketMaker
 from .modelstatebuilder import ModelStateBuilder as ModelStateBuilder
 from .modelstatebuilder import (
@@ -16,6 +20,9 @@ from .modelstatebuilder import PollingModelStateBuilder as PollingModelStateBuil
 from .modelstatebuilder import (
     SerumPollingModelStateBuilder as SerumPollingModelStateBuilder,
 )
+from .modelstatebuilder import (
+    SlotConsistentModelStateBuilder as SlotConsistentModelStateBuilder,
+)
 from .modelstatebuilder import (
     SpotPollingModelStateBuilder as SpotPollingModelStateBuilder,
 )
@@ -24,11 +31,19 @@ from .modelstatebuilderfactory import ModelUpdateMode as ModelUpdateMode
 from .modelstatebuilderfactory import (
     model_state_builder_factory as model_state_builder_factory,
 )
+from .indexedtoleranceorderreconciler import (
+    IndexedToleranceOrderReconciler as IndexedToleranceOrderReconciler,
+)
 from .orderreconciler import (
     AlwaysReplaceOrderReconciler as AlwaysReplaceOrderReconciler,
 )
 from .orderreconciler import NullOrderReconciler as NullOrderReconciler
 from .orderreconciler import OrderReconciler as OrderReconciler
+from .pulseprofiler import NullPulseProfiler as NullPulseProfiler
+from .pulseprofiler import PulseProfiler as PulseProfiler
+from .pulseprofiler import PulseTimingsReport as PulseTimingsReport
+from .pulseprofiler import RollingHistogram as RollingHistogram
+from .pulseprofiler import StageTimingSummary as StageTimingSummary
 from .reconciledorders import ReconciledOrders as ReconciledOrders
 from .toleranceorderreconciler import (
     ToleranceOrderReconciler as ToleranceOrderReconciler,
@@ -0,0 +1,309 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+import collections
+import logging
+import mango
+import typing
+
+from dataclasses import dataclass
+from decimal import Decimal
+from solana.keypair import Keypair
+from solana.transaction import TransactionInstruction
+
+from ..combinableinstructions import _MAXIMUM_TRANSACTION_LENGTH
+
+
+# # 🥭 ExecutionUnit class
+#
+# A group of instructions that must go in the same transaction, in order - for instance all the
+# instructions to cancel one order.
+#
+# `distance` is how far (as a fraction of the price) the order being changed is from the current price.
+# Changes nearest the price are the most price-sensitive, so the unit with the smallest `distance` goes
+# in the first transaction sent. Units that don't change orders (like cranks) have no `distance` and go
+# after all the order changes.
+#
+# `sequence` is the unit's position in the original order of instructions. Units in the same transaction
+# are always put back in that order.
+#
+# `stage` keeps units that depend on each other in order across transactions. No unit is ever put in an
+# earlier transaction than a unit from an earlier stage, so (with cancels in stage 0 and places in stage
+# 1) every cancel is sent no later than the first place, however near the price the place is.
+#
+@dataclass
+class ExecutionUnit:
+    name: str
+    instructions: mango.CombinableInstructions
+    distance: typing.Optional[Decimal] = None
+    sequence: int = 0
+    stage: int = 0
+
+    def __str__(self) -> str:
+        distance: str = "-" if self.distance is None else f"{self.distance:.6f}"
+        return f"« ExecutionUnit [{self.sequence}, stage {self.stage}] {self.name}: {len(self.instructions.instructions)} instruction(s), distance {distance} »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 _Bin class
+#
+# The units planned for one transaction, and a running total of how big that transaction is so it's
+# cheap to say how big it would be with another unit added. Signers are only counted once per
+# transaction, since the transaction is only signed once by each of them.
+#
+class _Bin:
+    def __init__(self, payer: mango.CombinableInstructions) -> None:
+        self.units: typing.List[ExecutionUnit] = []
+        self.signers: typing.Dict[bytes, Keypair] = {}
+        self.accumulator: mango.TransactionSizeAccumulator = (
+            mango.TransactionSizeAccumulator()
+        )
+        self.__add(payer)
+
+    def size_with(self, unit: typing.Optional[ExecutionUnit] = None) -> int:
+        if unit is None:
+            return self.accumulator.size
+        return self.accumulator.size_with(
+            unit.instructions.instructions, self.__new_signers(unit.instructions)
+        )
+
+    def fits(self, unit: ExecutionUnit) -> bool:
+        return self.size_with(unit) < _MAXIMUM_TRANSACTION_LENGTH
+
+    def add(self, unit: ExecutionUnit) -> None:
+        self.units += [unit]
+        self.__add(unit.instructions)
+
+    def __add(self, instructions: mango.CombinableInstructions) -> None:
+        for signer in self.__new_signers(instructions):
+            self.signers[bytes(signer.public_key)] = signer
+            self.accumulator.add_signer(signer)
+        for instruction in instructions.instructions:
+            self.accumulator.add(instruction)
+
+    def __new_signers(
+        self, instructions: mango.CombinableInstructions
+    ) -> typing.Sequence[Keypair]:
+        new_signers: typing.Dict[bytes, Keypair] = {}
+        for signer in instructions.signers:
+            key = bytes(signer.public_key)
+            if key not in self.signers:
+                new_signers[key] = signer
+        return list(new_signers.values())
+
+
+# # 🥭 ExecutionPlan class
+#
+# The transactions to send for a pulse, in the order to send them.
+#
+# `dropped` names any instructions that were deliberately left out, like a crank when there was nothing
+# to crank.
+#
+class ExecutionPlan:
+    def __init__(
+        self,
+        transactions: typing.Sequence[mango.CombinableInstructions],
+        sizes: typing.Sequence[int],
+        dropped: typing.Sequence[str] = [],
+    ) -> None:
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self.transactions: typing.Sequence[mango.CombinableInstructions] = transactions
+        self.sizes: typing.Sequence[int] = sizes
+        self.dropped: typing.Sequence[str] = dropped
+
+    @property
+    def transaction_count(self) -> int:
+        return len(self.transactions)
+
+    @property
+    def instruction_count(self) -> int:
+        return sum(len(transaction.instructions) for transaction in self.transactions)
+
+    def execute(self, context: mango.Context) -> typing.Sequence[str]:
+        signatures: typing.List[str] = []
+        for transaction in self.transactions:
+            signatures += transaction.execute(context)
+        return signatures
+
+    def __str__(self) -> str:
+        dropped: str = (
+            f", dropped: {list(self.dropped)}" if len(self.dropped) > 0 else ""
+        )
+        return f"« ExecutionPlan {self.instruction_count} instruction(s) in {self.transaction_count} transaction(s) of sizes {list(self.sizes)}{dropped} »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 ExecutionPlanner class
+#
+# Packs `ExecutionUnit`s into as few transactions as it can.
+#
+# Units are taken a stage at a time, in order of price-sensitivity within each stage, and each is put in
+# the first transaction it fits in (or a new one if it doesn't fit in any) that isn't before the last
+# transaction holding a unit from an earlier stage. Since the orders for one market all share most of their accounts, adding a unit to a
+# transaction costs little more than its own instruction data, and packing in this order fills the
+# transactions about as tightly as any other order would - while leaving the most price-sensitive changes
+# in the first transaction sent.
+#
+# The prologue goes at the start of the first transaction and the epilogue at the end of the last one.
+#
+class ExecutionPlanner:
+    def __init__(self) -> None:
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+
+    def plan(
+        self,
+        payer: mango.CombinableInstructions,
+        units: typing.Sequence[ExecutionUnit],
+        prologue: mango.CombinableInstructions = mango.CombinableInstructions.empty(),
+        epilogue: mango.CombinableInstructions = mango.CombinableInstructions.empty(),
+        dropped: typing.Sequence[str] = [],
+    ) -> ExecutionPlan:
+        to_pack: typing.List[ExecutionUnit] = []
+        for unit in units:
+            to_pack += self.__sized(payer, unit)
+
+        to_pack.sort(
+            key=lambda sized: (
+                sized.stage,
+                sized.distance is None,
+                sized.distance or Decimal(0),
+                sized.sequence,
+            )
+        )
+        bins: typing.List[_Bin] = []
+        earliest_bin: int = 0
+        current_stage: typing.Optional[int] = None
+        for sized in to_pack:
+            if sized.stage != current_stage:
+                current_stage = sized.stage
+                earliest_bin = max(len(bins) - 1, 0)
+            for existing in bins[earliest_bin:]:
+                if existing.fits(sized):
+                    existing.add(sized)
+                    break
+            else:
+                created = _Bin(payer)
+                created.add(sized)
+                bins += [created]
+
+        before_all: int = min([unit.sequence for unit in units], default=0) - 1
+        for sized in self.__sized(
+            payer, ExecutionUnit("prologue", prologue, None, before_all)
+        ):
+            if len(bins) == 0 or not bins[0].fits(sized):
+                bins.insert(0, _Bin(payer))
+            bins[0].add(sized)
+        after_all: int = max([unit.sequence for unit in units], default=0) + 1
+        for sized in self.__sized(
+            payer, ExecutionUnit("epilogue", epilogue, None, after_all)
+        ):
+            if len(bins) == 0 or not bins[-1].fits(sized):
+                bins.append(_Bin(payer))
+            bins[-1].add(sized)
+
+        transactions: typing.List[mango.CombinableInstructions] = []
+        for planned in bins:
+            instructions: typing.List[TransactionInstruction] = []
+            for planned_unit in sorted(planned.units, key=lambda sized: sized.sequence):
+                instructions += planned_unit.instructions.instructions
+            transactions += [
+                mango.CombinableInstructions(
+                    list(planned.signers.values()), instructions
+                )
+            ]
+
+        return ExecutionPlan(
+            transactions, [planned.size_with() for planned in bins], dropped
+        )
+
+    # Anything with no instructions (like an empty prologue) is left out. A unit too big for a transaction
+    # of its own is split into its separate instructions.
+    def __sized(
+        self, payer: mango.CombinableInstructions, unit: ExecutionUnit
+    ) -> typing.Sequence[ExecutionUnit]:
+        if len(unit.instructions.instructions) == 0:
+            return []
+
+        if _Bin(payer).fits(unit):
+            return [unit]
+
+        if len(unit.instructions.instructions) == 1:
+            raise Exception(
+                f"Instruction exceeds maximum size - {unit} creates a transaction {_Bin(payer).size_with(unit)} bytes long."
+            )
+
+        self._logger.warning(f"Splitting {unit} - it is too big for one transaction.")
+        split: typing.List[ExecutionUnit] = []
+        for instruction in unit.instructions.instructions:
+            split += self.__sized(
+                payer,
+                ExecutionUnit(
+                    unit.name,
+                    mango.CombinableInstructions(
+                        unit.instructions.signers, [instruction]
+                    ),
+                    unit.distance,
+                    unit.sequence,
+                    unit.stage,
+                ),
+            )
+        return split
+
+    def __str__(self) -> str:
+        return "« ExecutionPlanner »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 ExecutionStatistics class
+#
+# Counts of transactions sent per pulse, and of the cranks and settles dropped because there was
+# nothing for them to do.
+#
+class ExecutionStatistics:
+    def __init__(self) -> None:
+        self.pulses: int = 0
+        self.transactions: int = 0
+        self.maximum: int = 0
+        self.transactions_per_pulse: typing.Counter[int] = collections.Counter()
+        self.dropped: typing.Counter[str] = collections.Counter()
+
+    @property
+    def mean(self) -> float:
+        return self.transactions / self.pulses if self.pulses > 0 else 0
+
+    def record(self, plan: typing.Optional[ExecutionPlan]) -> None:
+        transaction_count: int = plan.transaction_count if plan is not None else 0
+        self.pulses += 1
+        self.transactions += transaction_count
+        self.maximum = max(self.maximum, transaction_count)
+        self.transactions_per_pulse[transaction_count] += 1
+        if plan is not None:
+            self.dropped.update(plan.dropped)
+
+    def __str__(self) -> str:
+        per_pulse: str = ", ".join(
+            f"{count}: {pulses}"
+            for count, pulses in sorted(self.transactions_per_pulse.items())
+        )
+        return f"« ExecutionStatistics {self.transactions} transaction(s) in {self.pulses} pulse(s), mean {self.mean:.2f}, max {self.maximum}, per pulse {{{per_pulse}}}, dropped {dict(self.dropped)} »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
@@ -0,0 +1,212 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+import bisect
+import collections
+import decimal
+import mango
+import typing
+
+from datetime import timedelta
+from decimal import Decimal
+
+from ..modelstate import ModelState
+from .reconciledorders import ReconciledOrders
+from .toleranceorderreconciler import ToleranceOrderReconciler
+
+
+# The price window is calculated by division, so it's widened by a tiny ratio to make sure rounding in
+# the last digits can never exclude an order on the boundary. The ratio has to be one the current
+# `Decimal` context can represent next to 1, so it's worked out from the context's precision. Every
+# order in the window is still checked with `is_within_tolderance()`, so this never lets in an order
+# that shouldn't match.
+def _window_slack() -> Decimal:
+    return Decimal(10) ** (3 - decimal.getcontext().prec)
+
+
+# # 🥭 _PriceIndex class
+#
+# Existing orders for one side of the book, sorted by price, each with its index in the original list of
+# existing orders.
+#
+class _PriceIndex:
+    def __init__(self, orders: typing.Sequence[typing.Tuple[int, mango.Order]]) -> None:
+        self.entries: typing.Sequence[typing.Tuple[int, mango.Order]] = sorted(
+            orders, key=lambda entry: entry[1].price
+        )
+        self.prices: typing.Sequence[Decimal] = [
+            order.price for _, order in self.entries
+        ]
+
+    def between(
+        self, low: Decimal, high: typing.Optional[Decimal]
+    ) -> typing.Sequence[typing.Tuple[int, mango.Order]]:
+        start: int = bisect.bisect_left(self.prices, low)
+        end: int = (
+            bisect.bisect_right(self.prices, high, start)
+            if high is not None
+            else len(self.prices)
+        )
+        return self.entries[start:end]
+
+
+# # 🥭 IndexedToleranceOrderReconciler class
+#
+# Matches orders using the same tolerances as `ToleranceOrderReconciler`, but without comparing every
+# desired order with every existing order.
+#
+# Existing orders are bucketed by side and sorted by price. An existing order at price `e` can only match a
+# desired order at price `d` if `e * (1 - price_tolerance) <= d <= e * (1 + price_tolerance)`, so for each
+# desired order a binary search finds the (usually tiny) window of existing orders with prices between
+# `d / (1 + price_tolerance)` and `d / (1 - price_tolerance)`. Only those are checked in full.
+#
+# By default matching is greedy and gives exactly the same results as `ToleranceOrderReconciler`: each
+# desired order, in turn, keeps the first remaining acceptable existing order.
+#
+# If `optimal` is `True`, the greedy matches are then improved to a maximum matching (using augmenting
+# paths), so the fewest possible orders are cancelled and placed. This can help when one existing order
+# is acceptable for two desired orders and the greedy choice leaves another existing order unmatched.
+#
+class IndexedToleranceOrderReconciler(ToleranceOrderReconciler):
+    def __init__(
+        self,
+        price_tolerance: Decimal,
+        quantity_tolerance: Decimal,
+        time_in_force_tolerance: timedelta,
+        optimal: bool = False,
+    ) -> None:
+        super().__init__(price_tolerance, quantity_tolerance, time_in_force_tolerance)
+        self.optimal: bool = optimal
+
+    def reconcile(
+        self,
+        _: ModelState,
+        existing_orders: typing.Sequence[mango.Order],
+        desired_orders: typing.Sequence[mango.Order],
+    ) -> ReconciledOrders:
+        buys: typing.List[typing.Tuple[int, mango.Order]] = []
+        sells: typing.List[typing.Tuple[int, mango.Order]] = []
+        for index, existing in enumerate(existing_orders):
+            if existing.side == mango.Side.BUY:
+                buys += [(index, existing)]
+            else:
+                sells += [(index, existing)]
+        indexes: typing.Dict[mango.Side, _PriceIndex] = {
+            mango.Side.BUY: _PriceIndex(buys),
+            mango.Side.SELL: _PriceIndex(sells),
+        }
+
+        # For each desired order, the indices of all acceptable existing orders, lowest first.
+        candidates: typing.List[typing.Sequence[int]] = [
+            self._find_acceptable_indices(desired, indexes[desired.side])
+            for desired in desired_orders
+        ]
+
+        # Greedy pass - the same choice `ToleranceOrderReconciler` would make.
+        matched_existing: typing.Dict[int, int] = {}
+        matched_desired: typing.Dict[int, int] = {}
+        for desired_index, acceptable in enumerate(candidates):
+            for existing_index in acceptable:
+                if existing_index not in matched_existing:
+                    matched_existing[existing_index] = desired_index
+                    matched_desired[desired_index] = existing_index
+                    break
+
+        if self.optimal:
+            for desired_index in range(len(desired_orders)):
+                if desired_index not in matched_desired:
+                    self._augment(
+                        desired_index, candidates, matched_existing, matched_desired
+                    )
+
+        outcomes: ReconciledOrders = ReconciledOrders()
+        for desired_index, desired in enumerate(desired_orders):
+            matched: typing.Optional[int] = matched_desired.get(desired_index)
+            if matched is None:
+                outcomes.to_place += [desired]
+            else:
+                outcomes.to_keep += [existing_orders[matched]]
+                outcomes.to_ignore += [desired]
+
+        outcomes.to_cancel = [
+            existing
+            for index, existing in enumerate(existing_orders)
+            if index not in matched_existing
+        ]
+
+        self._verify_counts(existing_orders, desired_orders, outcomes)
+
+        return outcomes
+
+    def _find_acceptable_indices(
+        self, desired: mango.Order, index: _PriceIndex
+    ) -> typing.Sequence[int]:
+        slack: Decimal = _window_slack()
+        low: Decimal = desired.price / (1 + self.price_tolerance) * (1 - slack)
+        high: typing.Optional[Decimal] = (
+            desired.price / (1 - self.price_tolerance) * (1 + slack)
+            if self.price_tolerance < 1
+            else None
+        )
+        return sorted(
+            existing_index
+            for existing_index, existing in index.between(low, high)
+            if self.is_within_tolderance(existing, desired)
+        )
+
+    # Looks for an augmenting path from an unmatched desired order: a chain of acceptable existing orders
+    # that ends at an unmatched one, where each matched existing order along the way can be handed over
+    # because its current desired order can move to the next one. If one is found, flipping the matches
+    # along the path matches one more desired order without unmatching any others.
+    def _augment(
+        self,
+        start: int,
+        candidates: typing.Sequence[typing.Sequence[int]],
+        matched_existing: typing.Dict[int, int],
+        matched_desired: typing.Dict[int, int],
+    ) -> bool:
+        reached_from: typing.Dict[int, int] = {}
+        queue: typing.Deque[int] = collections.deque([start])
+        visited: typing.Set[int] = {start}
+        end: typing.Optional[int] = None
+        while queue and end is None:
+            desired_index = queue.popleft()
+            for existing_index in candidates[desired_index]:
+                if existing_index in reached_from:
+                    continue
+                reached_from[existing_index] = desired_index
+                current: typing.Optional[int] = matched_existing.get(existing_index)
+                if current is None:
+                    end = existing_index
+                    break
+                if current not in visited:
+                    visited.add(current)
+                    queue.append(current)
+
+        if end is None:
+            return False
+
+        existing_index = end
+        while True:
+            desired_index = reached_from[existing_index]
+            previous: typing.Optional[int] = matched_desired.get(desired_index)
+            matched_desired[desired_index] = existing_index
+            matched_existing[existing_index] = desired_index
+            if desired_index == start or previous is None:
+                return True
+            existing_index = previous
+
+    def __str__(self) -> str:
+        return f"« IndexedToleranceOrderReconciler [price tolerance: {self.price_tolerance}, quantity tolerance: {self.quantity_tolerance}, time-in-force tolerance: {self.time_in_force_tolerance}, optimal: {self.optimal}] »"
@@ -16,6 +16,7 @@
 
 import logging
 import mango
+import time
 import traceback
 import typing
 
@@ -23,14 +24,29 @@ from datetime import datetime
 from decimal import Decimal
 
 from ..observables import EventSource
+from .executionplanner import (
+    ExecutionPlan,
+    ExecutionPlanner,
+    ExecutionStatistics,
+    ExecutionUnit,
+)
 from .orderreconciler import OrderReconciler
 from .orderchain.chain import Chain
+from .pulseprofiler import NullPulseProfiler, PulseProfiler
 
 
 # # 🥭 MarketMaker class
 #
 # An event-driven market-maker.
 #
+# If a `PulseProfiler` is provided, the time taken by each stage of a pulse (the order chain and each of its
+# elements, reconciliation, building instructions, and sending transactions) is recorded in it.
+#
+# Order changes are packed into as few transactions as possible by an `ExecutionPlanner`, with the most
+# price-sensitive changes sent first. The crank is left out when the event queue is empty, and settling
+# is left out when none of our orders were filled. `execution_statistics` counts the transactions sent
+# each pulse.
+#
 class MarketMaker:
     def __init__(
         self,
@@ -46,6 +62,7 @@ class MarketMaker:
         epilogue: typing.Callable[
             [mango.Context, mango.ModelState], mango.CombinableInstructions
         ] = lambda c, ma: mango.CombinableInstructions.empty(),
+        pulse_profiler: PulseProfiler = NullPulseProfiler(),
     ) -> None:
         self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
         self.wallet: mango.Wallet = wallet
@@ -63,6 +80,9 @@ class MarketMaker:
         self.epilogue: typing.Callable[
             [mango.Context, mango.ModelState], mango.CombinableInstructions
         ] = epilogue
+        self.pulse_profiler: PulseProfiler = pulse_profiler
+        self.execution_planner: ExecutionPlanner = ExecutionPlanner()
+        self.execution_statistics: ExecutionStatistics = ExecutionStatistics()
 
         self.pulse_complete: EventSource[datetime] = EventSource[datetime]()
         self.pulse_error: EventSource[Exception] = EventSource[Exception]()
@@ -78,7 +98,10 @@ class MarketMaker:
 
             payer = mango.CombinableInstructions.from_wallet(self.wallet)
 
-            desired_orders = self.desired_orders_chain.process(context, model_state)
+            with self.pulse_profiler.stage("chain"):
+                desired_orders = self.desired_orders_chain.process(
+                    context, model_state, self.pulse_profiler
+                )
 
             # This is here to give the orderchain the chance to look at state and set `not_quoting`. Any
             # element in the orderchain can set this, rather than just return an empty list of desired
@@ -97,9 +120,10 @@ class MarketMaker:
                 f"""Before reconciliation: all owned orders on current orderbook [{model_state.market.fully_qualified_symbol}]:
     {mango.indent_collection_as_str(existing_orders)}"""
             )
-            reconciled = self.order_reconciler.reconcile(
-                model_state, existing_orders, desired_orders
-            )
+            with self.pulse_profiler.stage("reconcile"):
+                reconciled = self.order_reconciler.reconcile(
+                    model_state, existing_orders, desired_orders
+                )
             self._logger.debug(
                 f"""After reconciliation
 Keep:
@@ -112,7 +136,9 @@ Ignore:
     {mango.indent_collection_as_str(reconciled.to_ignore)}"""
             )
 
-            cancellations = mango.CombinableInstructions.empty()
+            build_started_at: float = time.perf_counter()
+            reference_price: Decimal = model_state.price.mid_price
+            units: typing.List[ExecutionUnit] = []
             # Perp markets have a CANCEL_ALL instruction that Spot and Serum markets don't. Use it if we can.
             if reconciled.cancelling_all and isinstance(
                 self.market_instruction_builder, mango.PerpMarketInstructionBuilder
@@ -121,9 +147,14 @@ Ignore:
                 self._logger.info(
                     f"Cancelling all orders on {self.market.fully_qualified_symbol} - currently {len(ids)}: {ids}"
                 )
-                cancellations = (
-                    self.market_instruction_builder.build_cancel_all_orders_instructions()
-                )
+                units += [
+                    ExecutionUnit(
+                        "cancel_all",
+                        self.market_instruction_builder.build_cancel_all_orders_instructions(),
+                        Decimal(0),
+                        len(units),
+                    )
+                ]
             else:
                 for to_cancel in reconciled.to_cancel:
                     self._logger.info(
@@ -134,9 +165,15 @@ Ignore:
                             to_cancel, ok_if_missing=True
                         )
                     )
-                    cancellations += cancel
+                    units += [
+                        ExecutionUnit(
+                            "cancel",
+                            cancel,
+                            MarketMaker.__distance(to_cancel, reference_price),
+                            len(units),
+                        )
+                    ]
 
-            place_orders = mango.CombinableInstructions.empty()
             for to_place in reconciled.to_place:
                 desired_client_id: int = context.generate_client_id()
                 to_place_with_client_id = to_place.with_update(
@@ -151,42 +188,69 @@ Ignore:
                         to_place_with_client_id
                     )
                 )
-                place_orders += place_order
-
-            accounts_to_crank = list(model_state.accounts_to_crank)
-            if self.market_instruction_builder.open_orders_address is not None:
-                accounts_to_crank += [
-                    self.market_instruction_builder.open_orders_address
+                units += [
+                    ExecutionUnit(
+                        "place",
+                        place_order,
+                        MarketMaker.__distance(to_place, reference_price),
+                        len(units),
+                        1,
+                    )
                 ]
 
-            crank = self.market_instruction_builder.build_crank_instructions(
-                accounts_to_crank
-            )
-            settle = self.market_instruction_builder.build_settle_instructions()
+            # Don't bother if we have no orders to change
+            plan: typing.Optional[ExecutionPlan] = None
+            if len(units) > 0:
+                dropped: typing.List[str] = []
+                accounts_to_crank = list(model_state.accounts_to_crank)
+                if len(accounts_to_crank) > 0:
+                    open_orders_address = (
+                        self.market_instruction_builder.open_orders_address
+                    )
+                    if open_orders_address is not None and (
+                        open_orders_address not in accounts_to_crank
+                    ):
+                        accounts_to_crank += [open_orders_address]
+                    crank = self.market_instruction_builder.build_crank_instructions(
+                        accounts_to_crank
+                    )
+                    units += [ExecutionUnit("crank", crank, None, len(units), 1)]
+                else:
+                    dropped += ["crank"]
 
-            redeem = mango.CombinableInstructions.empty()
-            if (
-                self.redeem_threshold is not None
-                and model_state.inventory.liquidity_incentives.value
-                > self.redeem_threshold
-            ):
-                redeem = self.market_instruction_builder.build_redeem_instructions()
+                if self.__fills_happened(model_state):
+                    settle = self.market_instruction_builder.build_settle_instructions()
+                    units += [ExecutionUnit("settle", settle, None, len(units), 1)]
+                else:
+                    dropped += ["settle"]
 
-            # Don't bother if we have no orders to change
-            if len(cancellations.instructions) + len(place_orders.instructions) > 0:
-                prologue = self.prologue(context, model_state)
-                epilogue = self.prologue(context, model_state)
-                (
-                    payer
-                    + prologue
-                    + cancellations
-                    + place_orders
-                    + crank
-                    + settle
-                    + redeem
-                    + epilogue
-                ).execute(context)
+                if (
+                    self.redeem_threshold is not None
+                    and model_state.inventory.liquidity_incentives.value
+                    > self.redeem_threshold
+                ):
+                    redeem = self.market_instruction_builder.build_redeem_instructions()
+                    units += [ExecutionUnit("redeem", redeem, None, len(units), 1)]
 
+                plan = self.execution_planner.plan(
+                    payer,
+                    units,
+                    self.prologue(context, model_state),
+                    self.epilogue(context, model_state),
+                    dropped,
+                )
+                self._logger.debug(f"Execution plan: {plan}")
+                self.pulse_profiler.record(
+                    "build", time.perf_counter() - build_started_at
+                )
+                with self.pulse_profiler.stage("send"):
+                    plan.execute(context)
+            else:
+                self.pulse_profiler.record(
+                    "build", time.perf_counter() - build_started_at
+                )
+
+            self.execution_statistics.record(plan)
             self.pulse_complete.on_next(mango.local_now())
         except (
             mango.RateLimitException,
@@ -205,6 +269,30 @@ Ignore:
             )
             self.pulse_error.on_next(exception)
 
+    # How far the order's price is from the reference price, as a fraction of the reference price.
+    @staticmethod
+    def __distance(order: mango.Order, reference_price: Decimal) -> Decimal:
+        if reference_price == 0:
+            return Decimal(0)
+        return abs(order.price - reference_price) / reference_price
+
+    # There's only anything to settle if one of our orders was filled - either the fill is still waiting
+    # to be cranked, or it's been cranked and the proceeds are sitting in our `OpenOrders`.
+    def __fills_happened(self, model_state: mango.ModelState) -> bool:
+        ours: typing.Set[str] = {str(model_state.order_owner)}
+        if self.market_instruction_builder.open_orders_address is not None:
+            ours.add(str(self.market_instruction_builder.open_orders_address))
+        if any(str(account) in ours for account in model_state.accounts_to_crank):
+            return True
+
+        placed_orders_container = model_state.placed_orders_container
+        if isinstance(placed_orders_container, mango.OpenOrders):
+            return (
+                placed_orders_container.base_token_free > 0
+                or placed_orders_container.quote_token_free > 0
+            )
+        return False
+
     def __str__(self) -> str:
         return f"""« MarketMaker for market '{self.market.fully_qualified_symbol}' »"""
 
@@ -64,6 +64,91 @@ class WebsocketModelStateBuilder(ModelStateBuilder):
         return f"« WebsocketModelStateBuilder for market '{self.model_state.market.fully_qualified_symbol}' »"
 
 
+# # 🥭 SlotConsistentModelStateBuilder class
+#
+# Builds a `ModelState` snapshot from websocket watchers, with the slots of the watched values no more
+# than `max_skew` slots apart where possible.
+#
+# Each websocket subscription updates its watcher independently, so the latest orderbook can be from a
+# later slot than the latest account. Before taking a snapshot, this waits (for up to `max_wait` seconds)
+# for any watchers that are too far behind the newest one to catch up.
+#
+# A watcher is only notified when its account changes, so a watcher that is 'behind' may just be quiet.
+# If a watcher doesn't update at all while it's waited for, it's assumed to be quiet and isn't waited for
+# again until it updates.
+#
+# The `SlotSkew` of every snapshot is attached to it as `slot_skew` and published to `skews`.
+#
+class SlotConsistentModelStateBuilder(ModelStateBuilder):
+    def __init__(
+        self,
+        model_state: ModelState,
+        max_skew: int,
+        max_wait: float = 0.1,
+        poll_interval: float = 0.005,
+    ) -> None:
+        super().__init__()
+        self.model_state: ModelState = model_state
+        self.max_skew: int = max_skew
+        self.max_wait: float = max_wait
+        self.poll_interval: float = poll_interval
+        self.skews: mango.EventSource[mango.SlotSkew] = mango.EventSource[
+            mango.SlotSkew
+        ]()
+        self.__slot_watchers: typing.Dict[str, mango.SlotWatcher[typing.Any]] = {
+            name: watcher
+            for name, watcher in model_state.watchers.items()
+            if isinstance(watcher, mango.SlotWatcher)
+        }
+        self.__quiet: typing.Dict[str, int] = {}
+
+    def build(self, context: mango.Context) -> ModelState:
+        started_at: float = time.monotonic()
+        first_slots: typing.Optional[typing.Dict[str, int]] = None
+        while True:
+            slots: typing.Dict[str, int] = self.__slots()
+            if first_slots is None:
+                first_slots = slots
+            lagging: typing.Sequence[str] = self.__lagging(slots)
+            waited: float = time.monotonic() - started_at
+            if len(lagging) == 0 or waited >= self.max_wait:
+                break
+            time.sleep(self.poll_interval)
+
+        snapshot: ModelState = self.model_state.snapshot()
+        # Only a watcher that didn't move at all while it was waited for is quiet - one that updated but is
+        # still behind is active and worth waiting for next time.
+        for name in lagging:
+            if first_slots.get(name) == slots[name]:
+                self.__quiet[name] = slots[name]
+
+        skew = mango.SlotSkew(slots, waited, lagging)
+        snapshot.slot_skew = skew
+        self.skews.publish(skew)
+        return snapshot
+
+    def __slots(self) -> typing.Dict[str, int]:
+        slots: typing.Dict[str, int] = {}
+        for name, watcher in self.__slot_watchers.items():
+            slot: int = watcher.slot
+            if slot > 0:
+                slots[name] = slot
+        return slots
+
+    def __lagging(self, slots: typing.Dict[str, int]) -> typing.Sequence[str]:
+        if len(slots) == 0:
+            return []
+        newest: int = max(slots.values())
+        return [
+            name
+            for name, slot in slots.items()
+            if newest - slot > self.max_skew and self.__quiet.get(name) != slot
+        ]
+
+    def __str__(self) -> str:
+        return f"« SlotConsistentModelStateBuilder for market '{self.model_state.market.fully_qualified_symbol}', max skew {self.max_skew} slot(s) »"
+
+
 # # 🥭 PollingModelStateBuilder class
 #
 # Base class for building a `ModelState` through polling.
@@ -196,7 +281,7 @@ class SerumPollingModelStateBuilder(PollingModelStateBuilder):
         group: mango.Group = mango.Group.parse_with_context(context, account_infos[0])
         cache: mango.Cache = mango.Cache.parse(account_infos[1])
         account: mango.Account = mango.Account.parse(account_infos[2], group, cache)
-        placed_orders_container: mango.PlacedOrdersContainer = mango.OpenOrders.parse(
+        open_orders: mango.OpenOrders = mango.OpenOrders.parse(
             account_infos[3], self.market.base, self.market.quote
         )
 
@@ -222,19 +307,13 @@ class SerumPollingModelStateBuilder(PollingModelStateBuilder):
 
         price: mango.Price = self.oracle.fetch_price(context)
 
-        available: Decimal = (
-            base_inventory_token_account.value.value * price.mid_price
-        ) + quote_inventory_token_account.value.value
-        available_collateral: InstrumentValue = InstrumentValue(
-            quote_inventory_token_account.value.token, available
-        )
-        inventory: mango.Inventory = mango.Inventory(
-            mango.InventorySource.SPL_TOKENS,
+        inventory: mango.Inventory = mango.SerumInventoryWatcher(
             mngo_accrued,
-            available_collateral,
-            base_inventory_token_account.value,
-            quote_inventory_token_account.value,
-        )
+            mango.ManualUpdateWatcher(price),
+            base_inventory_token_account,
+            quote_inventory_token_account,
+            open_orders,
+        ).latest
 
         return self.from_values(
             self.order_owner,
@@ -242,7 +321,7 @@ class SerumPollingModelStateBuilder(PollingModelStateBuilder):
             group,
             account,
             price,
-            placed_orders_container,
+            open_orders,
             inventory,
             orderbook,
             event_queue,
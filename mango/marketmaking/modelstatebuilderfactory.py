@@ -23,6 +23,7 @@ from ..constants import SYSTEM_PROGRAM_ADDRESS
 from ..modelstate import ModelState
 from .modelstatebuilder import (
     ModelStateBuilder,
+    SlotConsistentModelStateBuilder,
     WebsocketModelStateBuilder,
     SerumPollingModelStateBuilder,
     SpotPollingModelStateBuilder,
@@ -57,6 +58,10 @@ def model_state_builder_factory(
     account: mango.Account,
     market: mango.LoadedMarket,
     oracle: mango.Oracle,
+    shared_market_data: typing.Optional[mango.SharedMarketDataRegion] = None,
+    initial_price: typing.Optional[mango.Price] = None,
+    max_slot_skew: typing.Optional[int] = None,
+    max_slot_skew_wait: float = 0.1,
 ) -> ModelStateBuilder:
     if mode == ModelUpdateMode.WEBSOCKET:
         return _websocket_model_state_builder_factory(
@@ -69,8 +74,16 @@ def model_state_builder_factory(
             account,
             market,
             oracle,
+            shared_market_data,
+            initial_price,
+            max_slot_skew,
+            max_slot_skew_wait,
         )
     else:
+        if shared_market_data is not None:
+            raise Exception(
+                f"Shared market data can only be used in {ModelUpdateMode.WEBSOCKET} update mode."
+            )
         return _polling_model_state_builder_factory(
             context, wallet, group, account, market, oracle
         )
@@ -232,31 +245,59 @@ def _websocket_model_state_builder_factory(
     account: mango.Account,
     market: mango.LoadedMarket,
     oracle: mango.Oracle,
+    shared_market_data: typing.Optional[mango.SharedMarketDataRegion],
+    initial_price: typing.Optional[mango.Price],
+    max_slot_skew: typing.Optional[int],
+    max_slot_skew_wait: float,
 ) -> ModelStateBuilder:
-    group_watcher = mango.build_group_watcher(
-        context, websocket_manager, health_check, group
-    )
     cache = mango.Cache.load(context, group.cache)
-    cache_watcher = mango.build_cache_watcher(
-        context, websocket_manager, health_check, cache, group
-    )
+    if initial_price is None:
+        initial_price = oracle.fetch_price(context)
+    group_watcher: mango.Watcher[mango.Group]
+    cache_watcher: mango.Watcher[mango.Cache]
+    latest_price_observer: mango.Watcher[mango.Price]
+    if shared_market_data is not None:
+        # A separate publisher process is subscribed to these and shares them with us.
+        group_watcher = mango.build_shared_group_watcher(
+            context, shared_market_data, group
+        )
+        cache_watcher = mango.build_shared_cache_watcher(shared_market_data, cache)
+        latest_price_observer = mango.build_shared_price_watcher(
+            shared_market_data, oracle, initial_price
+        )
+        health_check.add(
+            "shared_market_data", shared_market_data.to_liveness_observable()
+        )
+    else:
+        group_watcher = mango.build_group_watcher(
+            context, websocket_manager, health_check, group
+        )
+        cache_watcher = mango.build_cache_watcher(
+            context, websocket_manager, health_check, cache, group
+        )
+        price_feed = oracle.to_streaming_observable(context)
+        latest_price_subscriber = mango.LatestItemObserverSubscriber(initial_price)
+        price_disposable = price_feed.subscribe(latest_price_subscriber)
+        disposer.add_disposable(price_disposable)
+        health_check.add("price_subscription", price_feed)
+        latest_price_observer = latest_price_subscriber
+
     account_subscription, latest_account_observer = mango.build_account_watcher(
         context, websocket_manager, health_check, account, group_watcher, cache_watcher
     )
 
-    initial_price = oracle.fetch_price(context)
-    price_feed = oracle.to_streaming_observable(context)
-    latest_price_observer = mango.LatestItemObserverSubscriber(initial_price)
-    price_disposable = price_feed.subscribe(latest_price_observer)
-    disposer.add_disposable(price_disposable)
-    health_check.add("price_subscription", price_feed)
-
     if mango.SerumMarket.isa(market):
         serum_market = mango.SerumMarket.ensure(market)
-        order_owner: PublicKey = (
-            serum_market.find_openorders_address_for_owner(context, wallet.address)
-            or SYSTEM_PROGRAM_ADDRESS
+        (
+            open_orders_subscription,
+            latest_serum_open_orders_observer,
+        ) = mango.build_serum_open_orders_subscription(
+            context, websocket_manager, health_check, serum_market, wallet
         )
+        order_owner: PublicKey = latest_serum_open_orders_observer.latest.address
+        latest_open_orders_observer: mango.Watcher[
+            mango.PlacedOrdersContainer
+        ] = latest_serum_open_orders_observer
         price_watcher: mango.Watcher[mango.Price] = mango.build_price_watcher(
             context, websocket_manager, health_check, disposer, "market", serum_market
         )
@@ -270,11 +311,7 @@ def _websocket_model_state_builder_factory(
             wallet,
             serum_market,
             price_watcher,
-        )
-        latest_open_orders_observer: mango.Watcher[
-            mango.PlacedOrdersContainer
-        ] = mango.build_serum_open_orders_watcher(
-            context, websocket_manager, health_check, serum_market, wallet
+            (open_orders_subscription, latest_serum_open_orders_observer),
         )
         latest_orderbook_watcher: mango.Watcher[
             mango.OrderBook
@@ -367,4 +404,8 @@ def _websocket_model_state_builder_factory(
         latest_orderbook_watcher,
         latest_event_queue_watcher,
     )
+    if max_slot_skew is not None:
+        return SlotConsistentModelStateBuilder(
+            model_state, max_slot_skew, max_slot_skew_wait
+        )
     return WebsocketModelStateBuilder(model_state)
@@ -19,6 +19,7 @@ import typing
 
 from decimal import Decimal
 
+from .lotorder import LotOrder
 from .pairwiseelement import PairwiseElement
 from ...modelstate import ModelState
 
@@ -91,5 +92,43 @@ class BiasQuoteElement(PairwiseElement):
 
         return new_buy, new_sell
 
+    def process_lot_order_pair(
+        self,
+        context: mango.Context,
+        model_state: ModelState,
+        index: int,
+        buy: typing.Optional[LotOrder],
+        sell: typing.Optional[LotOrder],
+    ) -> typing.Tuple[typing.Optional[LotOrder], typing.Optional[LotOrder]]:
+        bias_factor: Decimal = (
+            self.bias_factors[index]
+            if index < len(self.bias_factors)
+            else self.bias_factors[-1]
+        )
+        if bias_factor == 1:
+            # Bias factor of 1 results in no changes to orders.
+            return buy, sell
+
+        bias_description = "BUY more" if bias_factor > 1 else "SELL more"
+        new_buy: typing.Optional[LotOrder] = None
+        new_sell: typing.Optional[LotOrder] = None
+        if buy is not None:
+            new_buy = buy.with_update(price=round(buy.price * bias_factor))
+            self._logger.debug(
+                f"""Order change - bias factor of {bias_factor} shifted price to {bias_description}:
+    Old: {buy}
+    New: {new_buy}"""
+            )
+
+        if sell is not None:
+            new_sell = sell.with_update(price=round(sell.price * bias_factor))
+            self._logger.debug(
+                f"""Order change - bias factor of {bias_factor} shifted price to {bias_description}:
+    Old: {sell}
+    New: {new_sell}"""
+            )
+
+        return new_buy, new_sell
+
     def __str__(self) -> str:
         return f"« BiasQuoteElement - bias factors: {self.bias_factors} »"
@@ -19,6 +19,8 @@ import mango
 import typing
 
 from .element import Element
+from .lotorder import LotOrder
+from ..pulseprofiler import NullPulseProfiler, PulseProfiler
 from ...modelstate import ModelState
 
 
@@ -30,17 +32,42 @@ from ...modelstate import ModelState
 # Only `Order`s returned from `process()` method are used as the final list of 'desired orders' for
 # reconciling and possibly adding to the orderbook.
 #
+# If `lot_mode` is `True`, the `Element`s are called with `process_lots()` instead, so prices and quantities
+# are passed along the chain as integer lots of the market's `LotSizeConverter`. They're only converted back
+# to `Order`s at the end of the chain, which means the final orders are always aligned to the market's lot
+# sizes (just as if the chain ended with a `RoundToLotSizeElement`).
+#
+# Each `Element` produces whole lots, so the result is the same as a `Decimal` chain with a
+# `RoundToLotSizeElement` after every element. That can be a tick away from a `Decimal` chain that carries
+# part-tick prices from one element to the next.
+#
+# The time each `Element` takes is recorded as a `chain:<element class>` stage of the `PulseProfiler`.
+#
 class Chain:
-    def __init__(self, elements: typing.Sequence[Element]) -> None:
+    def __init__(
+        self, elements: typing.Sequence[Element], lot_mode: bool = False
+    ) -> None:
         self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
         self.elements: typing.Sequence[Element] = elements
+        self.lot_mode: bool = lot_mode
 
     def process(
-        self, context: mango.Context, model_state: ModelState
+        self,
+        context: mango.Context,
+        model_state: ModelState,
+        pulse_profiler: PulseProfiler = NullPulseProfiler(),
     ) -> typing.Sequence[mango.Order]:
+        if self.lot_mode:
+            lot_orders: typing.Sequence[LotOrder] = []
+            for element in self.elements:
+                with pulse_profiler.stage(f"chain:{element.__class__.__name__}"):
+                    lot_orders = element.process_lots(context, model_state, lot_orders)
+            return LotOrder.to_orders(lot_orders, model_state.market.lot_size_converter)
+
         orders: typing.Sequence[mango.Order] = []
         for element in self.elements:
-            orders = element.process(context, model_state, orders)
+            with pulse_profiler.stage(f"chain:{element.__class__.__name__}"):
+                orders = element.process(context, model_state, orders)
         return orders
 
     def __repr__(self) -> str:
@@ -49,6 +76,7 @@ class Chain:
     def __str__(self) -> str:
         elements = "\n    ".join(map(str, self.elements)) or "None"
 
-        return f"""« Chain of {len(self.elements)} elements:
+        lot_mode: str = " (in lot mode)" if self.lot_mode else ""
+        return f"""« Chain of {len(self.elements)} elements{lot_mode}:
     {elements}
 »"""
@@ -58,6 +58,12 @@ class ChainBuilder:
             default=[],
             help="The specific order chain elements to use instead of the default chain",
         )
+        parser.add_argument(
+            "--chain-lot-mode",
+            action="store_true",
+            default=False,
+            help="run the order chain using integer price and quantity lots instead of decimal values (default: False)",
+        )
         # OrderType is used by multiple elements so specify it here rather than have them fighting over which
         # one specifies it.
         # Now add args for all the elements.
@@ -94,7 +100,8 @@ class ChainBuilder:
             element = ChainBuilder._create_element_by_name(args, name)
             elements += [element]
 
-        return Chain(elements)
+        lot_mode: bool = args.chain_lot_mode
+        return Chain(elements, lot_mode)
 
     @staticmethod
     def _create_element_by_name(args: argparse.Namespace, name: str) -> Element:
@@ -20,6 +20,7 @@ import logging
 import mango
 import typing
 
+from .lotorder import LotOrder
 from ...modelstate import ModelState
 
 
@@ -30,6 +31,11 @@ from ...modelstate import ModelState
 #
 # Only `Order`s returned from `process()` method are passed to the next element of the chain.
 #
+# When the `Chain` runs in lot mode, `process_lots()` is called instead of `process()`. It works the same
+# way but on `LotOrder`s, with prices and quantities held as integer lots. The default implementation here
+# converts the `LotOrder`s to `Order`s, calls `process()`, and converts the results back to lots, so every
+# `Element` works in lot mode. Derived classes can override it to work on the integer lots directly.
+#
 class Element(metaclass=abc.ABCMeta):
     def __init__(self) -> None:
         self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
@@ -55,6 +61,20 @@ class Element(metaclass=abc.ABCMeta):
             "Element.process() is not implemented on the base type."
         )
 
+    def process_lots(
+        self,
+        context: mango.Context,
+        model_state: ModelState,
+        orders: typing.Sequence[LotOrder],
+    ) -> typing.Sequence[LotOrder]:
+        lot_size_converter: mango.LotSizeConverter = (
+            model_state.market.lot_size_converter
+        )
+        processed: typing.Sequence[mango.Order] = self.process(
+            context, model_state, LotOrder.to_orders(orders, lot_size_converter)
+        )
+        return LotOrder.from_orders(processed, lot_size_converter)
+
     def __repr__(self) -> str:
         return f"{self}"
 
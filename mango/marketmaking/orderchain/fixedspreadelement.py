@@ -19,6 +19,7 @@ import typing
 
 from decimal import Decimal
 
+from .lotorder import LotOrder
 from .pairwiseelement import PairwiseElement
 from ...modelstate import ModelState
 
@@ -88,5 +89,43 @@ class FixedSpreadElement(PairwiseElement):
 
         return new_buy, new_sell
 
+    def process_lot_order_pair(
+        self,
+        context: mango.Context,
+        model_state: ModelState,
+        index: int,
+        buy: typing.Optional[LotOrder],
+        sell: typing.Optional[LotOrder],
+    ) -> typing.Tuple[typing.Optional[LotOrder], typing.Optional[LotOrder]]:
+        spread: Decimal = (
+            self.spreads[index] if index < len(self.spreads) else self.spreads[-1]
+        )
+        half_spread: Decimal = spread / 2
+        mid_price: Decimal = model_state.price.mid_price
+        tick_size: Decimal = model_state.market.lot_size_converter.tick_size
+        new_buy: typing.Optional[LotOrder] = None
+        new_sell: typing.Optional[LotOrder] = None
+        if buy is not None:
+            new_buy = buy.with_update(
+                price=round((mid_price - half_spread) / tick_size)
+            )
+            self._logger.debug(
+                f"""Order change - using fixed spread of {spread:,.8f} from mid price {mid_price:,.8f}:
+    Old: {buy}
+    New: {new_buy}"""
+            )
+
+        if sell is not None:
+            new_sell = sell.with_update(
+                price=round((mid_price + half_spread) / tick_size)
+            )
+            self._logger.debug(
+                f"""Order change - using fixed spread of {spread:,.8f} from mid price {mid_price:,.8f}:
+    Old: {sell}
+    New: {new_sell}"""
+            )
+
+        return new_buy, new_sell
+
     def __str__(self) -> str:
         return f"« FixedSpreadElement using spreads {self.spreads} »"
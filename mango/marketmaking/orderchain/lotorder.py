@@ -0,0 +1,107 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+import mango
+import typing
+
+from decimal import Decimal
+
+
+# # 🥭 LotOrder class
+#
+# A lightweight, mutable stand-in for an `Order` while it passes through a `Chain` running in lot mode.
+#
+# `price` is the price in integer price lots (ticks) and `quantity` is the quantity in integer base lots,
+# both using the market's `LotSizeConverter`. The original `Order` is kept as a template, and all its other
+# fields (ID, client ID, order type, expiration and so on) are carried through untouched.
+#
+# Converting between UI values and lots rounds in exactly the same way as
+# `LotSizeConverter.round_quote()` and `LotSizeConverter.round_base()`, so a `LotOrder` converted back to an
+# `Order` is identical to the original `Order` after it has been through the `RoundToLotSizeElement`.
+#
+class LotOrder:
+    __slots__ = ("order", "side", "price", "quantity")
+
+    def __init__(
+        self, order: mango.Order, side: mango.Side, price: int, quantity: int
+    ) -> None:
+        self.order: mango.Order = order
+        self.side: mango.Side = side
+        self.price: int = price
+        self.quantity: int = quantity
+
+    @property
+    def order_type(self) -> mango.OrderType:
+        return self.order.order_type
+
+    # Returns a new `LotOrder` with the provided values changed. The template `Order` is shared.
+    def with_update(
+        self, price: typing.Optional[int] = None, quantity: typing.Optional[int] = None
+    ) -> "LotOrder":
+        return LotOrder(
+            self.order,
+            self.side,
+            price if price is not None else self.price,
+            quantity if quantity is not None else self.quantity,
+        )
+
+    def to_order(self, lot_size_converter: mango.LotSizeConverter) -> mango.Order:
+        return LotOrder.to_orders([self], lot_size_converter)[0]
+
+    @staticmethod
+    def from_order(
+        order: mango.Order, lot_size_converter: mango.LotSizeConverter
+    ) -> "LotOrder":
+        return LotOrder.from_orders([order], lot_size_converter)[0]
+
+    @staticmethod
+    def from_orders(
+        orders: typing.Sequence[mango.Order],
+        lot_size_converter: mango.LotSizeConverter,
+    ) -> typing.Sequence["LotOrder"]:
+        tick_size: Decimal = lot_size_converter.tick_size
+        lot_size: Decimal = lot_size_converter.lot_size
+        return [
+            LotOrder(
+                order,
+                order.side,
+                round(order.price / tick_size),
+                round(order.quantity / lot_size),
+            )
+            for order in orders
+        ]
+
+    @staticmethod
+    def to_orders(
+        lot_orders: typing.Sequence["LotOrder"],
+        lot_size_converter: mango.LotSizeConverter,
+    ) -> typing.Sequence[mango.Order]:
+        tick_size: Decimal = lot_size_converter.tick_size
+        lot_size: Decimal = lot_size_converter.lot_size
+        orders: typing.List[mango.Order] = []
+        for lot_order in lot_orders:
+            price: Decimal = lot_order.price * tick_size
+            quantity: Decimal = lot_order.quantity * lot_size
+            order: mango.Order = lot_order.order
+            if order.price != price or order.quantity != quantity:
+                order = order.with_update(price=price, quantity=quantity)
+            orders += [order]
+        return orders
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+    def __str__(self) -> str:
+        return f"« LotOrder {self.side} for {self.quantity} lots at {self.price} ticks [{self.order.order_type}] »"
@@ -19,6 +19,7 @@ import typing
 
 from decimal import Decimal
 
+from .lotorder import LotOrder
 from .pairwiseelement import PairwiseElement
 from ...modelstate import ModelState
 
@@ -123,5 +124,65 @@ class MinimumChargeElement(PairwiseElement):
 
         return new_buy, new_sell
 
+    # Same calculation as `process_order_pair()`, but with the measurement price converted to (fractional)
+    # price lots so the charge comparisons can be made directly against the integer order prices.
+    def process_lot_order_pair(
+        self,
+        context: mango.Context,
+        model_state: ModelState,
+        index: int,
+        buy: typing.Optional[LotOrder],
+        sell: typing.Optional[LotOrder],
+    ) -> typing.Tuple[typing.Optional[LotOrder], typing.Optional[LotOrder]]:
+        minimum_charge_ratio: Decimal = (
+            self.minimumcharge_ratios[index]
+            if index < len(self.minimumcharge_ratios)
+            else self.minimumcharge_ratios[-1]
+        )
+        if minimum_charge_ratio == 0:
+            # Zero minimum charge results in no changes to orders.
+            return buy, sell
+
+        tick_size: Decimal = model_state.market.lot_size_converter.tick_size
+        new_buy: typing.Optional[LotOrder] = buy
+        new_sell: typing.Optional[LotOrder] = sell
+        measurement_lots: Decimal
+        minimum_charge_lots: Decimal
+        if buy is not None:
+            measurement_lots = (
+                model_state.price.top_bid
+                if self.minimumcharge_from_bid_ask
+                else model_state.price.mid_price
+            ) / tick_size
+            minimum_charge_lots = measurement_lots * minimum_charge_ratio
+            if measurement_lots - buy.price < minimum_charge_lots:
+                new_buy = buy.with_update(
+                    price=round(measurement_lots - minimum_charge_lots)
+                )
+                self._logger.debug(
+                    f"""Order change - old BUY price would return less than minimum charge {minimum_charge_lots:,.8f} ticks:
+    Old: {buy}
+    New: {new_buy}"""
+                )
+
+        if sell is not None:
+            measurement_lots = (
+                model_state.price.top_ask
+                if self.minimumcharge_from_bid_ask
+                else model_state.price.mid_price
+            ) / tick_size
+            minimum_charge_lots = measurement_lots * minimum_charge_ratio
+            if sell.price - measurement_lots < minimum_charge_lots:
+                new_sell = sell.with_update(
+                    price=round(measurement_lots + minimum_charge_lots)
+                )
+                self._logger.debug(
+                    f"""Order change - old SELL price would return less than minimum charge {minimum_charge_lots:,.8f} ticks:
+    Old: {sell}
+    New: {new_sell}"""
+                )
+
+        return new_buy, new_sell
+
     def __str__(self) -> str:
         return f"« MinimumChargeElement - minimum charge ratios: {self.minimumcharge_ratios} »"
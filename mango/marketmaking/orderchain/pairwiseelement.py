@@ -18,6 +18,7 @@ import mango
 import typing
 
 from .element import Element
+from .lotorder import LotOrder
 from ...modelstate import ModelState
 
 
@@ -39,6 +40,10 @@ from ...modelstate import ModelState
 # The `PairwiseElement` handles converting from an unstructured list of `Order`s into a pair-wise
 # structure, and then calls the derived class's `process_order_pair()` method to process a pair.
 #
+# In lot mode the same pairing is done on `LotOrder`s and `process_lot_order_pair()` is called instead.
+# By default that converts the pair to `Order`s and calls `process_order_pair()`, but derived classes can
+# override it to work on the integer lots directly.
+#
 class PairwiseElement(Element, metaclass=abc.ABCMeta):
     def __init__(self) -> None:
         super().__init__()
@@ -107,5 +112,69 @@ class PairwiseElement(Element, metaclass=abc.ABCMeta):
 
         return new_orders
 
+    def process_lot_order_pair(
+        self,
+        context: mango.Context,
+        model_state: ModelState,
+        index: int,
+        buy: typing.Optional[LotOrder],
+        sell: typing.Optional[LotOrder],
+    ) -> typing.Tuple[typing.Optional[LotOrder], typing.Optional[LotOrder]]:
+        lot_size_converter: mango.LotSizeConverter = (
+            model_state.market.lot_size_converter
+        )
+        (new_buy, new_sell) = self.process_order_pair(
+            context,
+            model_state,
+            index,
+            buy.to_order(lot_size_converter) if buy is not None else None,
+            sell.to_order(lot_size_converter) if sell is not None else None,
+        )
+        return (
+            LotOrder.from_order(new_buy, lot_size_converter)
+            if new_buy is not None
+            else None,
+            LotOrder.from_order(new_sell, lot_size_converter)
+            if new_sell is not None
+            else None,
+        )
+
+    # Same pairing as `process()`, but on `LotOrder`s.
+    def process_lots(
+        self,
+        context: mango.Context,
+        model_state: ModelState,
+        orders: typing.Sequence[LotOrder],
+    ) -> typing.Sequence[LotOrder]:
+        buys: typing.List[LotOrder] = [
+            order for order in orders if order.side == mango.Side.BUY
+        ]
+        buys.sort(key=lambda order: order.price, reverse=True)
+        sells: typing.List[LotOrder] = [
+            order for order in orders if order.side == mango.Side.SELL
+        ]
+        sells.sort(key=lambda order: order.price)
+
+        pair_count: int = max(len(buys), len(sells))
+        new_orders: typing.List[LotOrder] = []
+        for index in range(pair_count):
+            old_buy: typing.Optional[LotOrder] = (
+                buys[index] if index < len(buys) else None
+            )
+            old_sell: typing.Optional[LotOrder] = (
+                sells[index] if index < len(sells) else None
+            )
+
+            (new_buy, new_sell) = self.process_lot_order_pair(
+                context, model_state, index, old_buy, old_sell
+            )
+            if new_buy is not None:
+                new_orders += [new_buy]
+
+            if new_sell is not None:
+                new_orders += [new_sell]
+
+        return new_orders
+
     def __str__(self) -> str:
         return "« PairwiseElement »"
@@ -20,6 +20,7 @@ import typing
 from decimal import Decimal
 
 from .element import Element
+from .lotorder import LotOrder
 from ...modelstate import ModelState
 
 
@@ -101,5 +102,49 @@ class PreventPostOnlyCrossingBookElement(Element):
 
         return new_orders
 
+    def process_lots(
+        self,
+        context: mango.Context,
+        model_state: ModelState,
+        orders: typing.Sequence[LotOrder],
+    ) -> typing.Sequence[LotOrder]:
+        tick_size: Decimal = model_state.market.lot_size_converter.tick_size
+        top_bid: typing.Optional[mango.Order] = model_state.top_bid
+        top_ask: typing.Optional[mango.Order] = model_state.top_ask
+        # Orderbook prices should already be aligned to the tick size, but they're kept as (possibly
+        # fractional) lots here so the comparisons are exactly the same as in `process()`.
+        top_bid_lots: typing.Optional[Decimal] = (
+            top_bid.price / tick_size if top_bid is not None else None
+        )
+        top_ask_lots: typing.Optional[Decimal] = (
+            top_ask.price / tick_size if top_ask is not None else None
+        )
+        new_orders: typing.List[LotOrder] = []
+        for order in orders:
+            new_order: LotOrder = order
+            if order.order_type == mango.OrderType.POST_ONLY:
+                if (
+                    order.side == mango.Side.BUY
+                    and top_ask_lots is not None
+                    and order.price >= top_ask_lots
+                ):
+                    new_order = order.with_update(price=round(top_ask_lots - 1))
+                elif (
+                    order.side == mango.Side.SELL
+                    and top_bid_lots is not None
+                    and order.price <= top_bid_lots
+                ):
+                    new_order = order.with_update(price=round(top_bid_lots + 1))
+
+            if new_order is not order:
+                self._logger.debug(
+                    f"""Order change - would cross the orderbook {top_bid_lots} / {top_ask_lots}:
+    Old: {order}
+    New: {new_order}"""
+                )
+            new_orders += [new_order]
+
+        return new_orders
+
     def __str__(self) -> str:
         return "« PreventPostOnlyCrossingBookElement »"
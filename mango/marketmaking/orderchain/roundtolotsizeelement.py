@@ -20,6 +20,7 @@ import typing
 from decimal import Decimal
 
 from .element import Element
+from .lotorder import LotOrder
 from ...modelstate import ModelState
 
 
@@ -78,5 +79,25 @@ class RoundToLotSizeElement(Element):
 
         return new_orders
 
+    # `LotOrder`s are always aligned to the market's lot sizes, so all that's left to do in lot mode is
+    # remove any that have rounded to zero.
+    def process_lots(
+        self,
+        context: mango.Context,
+        model_state: ModelState,
+        orders: typing.Sequence[LotOrder],
+    ) -> typing.Sequence[LotOrder]:
+        new_orders: typing.List[LotOrder] = []
+        for order in orders:
+            if order.price == 0 or order.quantity == 0:
+                self._logger.debug(
+                    f"""Order removed - price or quantity rounded to zero:
+    Old: {order}"""
+                )
+            else:
+                new_orders += [order]
+
+        return new_orders
+
     def __str__(self) -> str:
         return "« RoundToLotSizeElement »"
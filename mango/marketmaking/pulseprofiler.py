@@ -0,0 +1,308 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+import cProfile
+import collections
+import contextlib
+import io
+import logging
+import os.path
+import pstats
+import signal
+import statistics
+import threading
+import time
+import types
+import typing
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from ..datetimes import local_now
+from ..observables import EventSource
+
+
+# The upper bounds (in seconds) of the histogram buckets. Anything slower goes in the last,
+# unbounded bucket.
+_BUCKET_BOUNDS: typing.Sequence[float] = [
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1,
+    5,
+]
+
+
+# # 🥭 StageTimingSummary class
+#
+# A summary of the most recent timings for one stage of a pulse. All times are in seconds.
+#
+# `buckets` holds the number of timings in each histogram bucket, keyed by the bucket's upper bound
+# (with `inf` for the last bucket).
+#
+@dataclass
+class StageTimingSummary:
+    stage: str
+    count: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    maximum: float
+    buckets: typing.Dict[float, int]
+
+    def __str__(self) -> str:
+        return f"{self.stage:<45} count: {self.count:>6,}, mean: {self.mean * 1000:>10,.3f}ms, p50: {self.p50 * 1000:>10,.3f}ms, p90: {self.p90 * 1000:>10,.3f}ms, p99: {self.p99 * 1000:>10,.3f}ms, max: {self.maximum * 1000:>10,.3f}ms"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 PulseTimingsReport class
+#
+# The timing summaries of all stages seen so far, as published by a `PulseProfiler`.
+#
+@dataclass
+class PulseTimingsReport:
+    timestamp: datetime
+    pulse_count: int
+    stages: typing.Sequence[StageTimingSummary]
+
+    def __str__(self) -> str:
+        stages = "\n    ".join(map(str, self.stages)) or "None"
+        return f"""« PulseTimingsReport after {self.pulse_count} pulses at {self.timestamp}:
+    {stages}
+»"""
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 RollingHistogram class
+#
+# Keeps the most recent `window_size` timings for a stage, and summarises them on demand.
+#
+class RollingHistogram:
+    def __init__(self, window_size: int) -> None:
+        self.timings: typing.Deque[float] = collections.deque(maxlen=window_size)
+
+    def add(self, seconds: float) -> None:
+        self.timings.append(seconds)
+
+    def summarise(self, stage: str) -> StageTimingSummary:
+        ordered: typing.Sequence[float] = sorted(self.timings)
+        buckets: typing.Dict[float, int] = {
+            bound: 0 for bound in [*_BUCKET_BOUNDS, float("inf")]
+        }
+        for timing in ordered:
+            for bound in buckets:
+                if timing <= bound:
+                    buckets[bound] += 1
+                    break
+
+        def _percentile(fraction: float) -> float:
+            if len(ordered) == 0:
+                return 0
+            return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+        return StageTimingSummary(
+            stage,
+            len(ordered),
+            statistics.mean(ordered) if len(ordered) > 0 else 0,
+            _percentile(0.5),
+            _percentile(0.9),
+            _percentile(0.99),
+            ordered[-1] if len(ordered) > 0 else 0,
+            buckets,
+        )
+
+
+# # 🥭 _StageTimer class
+#
+# Context manager that adds the time taken inside it to a stage of a `PulseProfiler`.
+#
+class _StageTimer:
+    __slots__ = ("profiler", "stage", "started_at")
+
+    def __init__(self, profiler: "PulseProfiler", stage: str) -> None:
+        self.profiler: PulseProfiler = profiler
+        self.stage: str = stage
+        self.started_at: float = 0
+
+    def __enter__(self) -> None:
+        self.started_at = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: typing.Optional[typing.Type[BaseException]],
+        exc_value: typing.Optional[BaseException],
+        traceback: typing.Optional[types.TracebackType],
+    ) -> None:
+        self.profiler.record(self.stage, time.perf_counter() - self.started_at)
+
+
+# # 🥭 PulseProfiler class
+#
+# Records how long each stage of a pulse takes, in a `RollingHistogram` per stage.
+#
+# Code being timed wraps each stage in `with profiler.stage("name"):`, and the whole pulse in
+# `with profiler.pulse():`. Every `report_every` pulses a `PulseTimingsReport` is published on the
+# `timings` observable (use 0 to only report on demand through `report()`).
+#
+# `capture_profile()` (or the signal handler set up by `install_signal_handler()`) runs `cProfile` over
+# the next few pulses and writes the stats to a file in `profile_directory`, so a running market-maker can
+# be profiled without restarting it.
+#
+class PulseProfiler:
+    def __init__(
+        self,
+        window_size: int = 1000,
+        report_every: int = 100,
+        profile_directory: str = "/var/tmp",
+    ) -> None:
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self.window_size: int = window_size
+        self.report_every: int = report_every
+        self.profile_directory: str = profile_directory
+        self.timings: EventSource[PulseTimingsReport] = EventSource[
+            PulseTimingsReport
+        ]()
+        self.pulse_count: int = 0
+
+        self.__lock: threading.Lock = threading.Lock()
+        self.__histograms: typing.Dict[str, RollingHistogram] = {}
+        self.__profile: typing.Optional[cProfile.Profile] = None
+        self.__profile_pulses_remaining: int = 0
+        self.__profile_pulses_captured: int = 0
+
+    def stage(self, name: str) -> typing.ContextManager[None]:
+        return _StageTimer(self, name)
+
+    @contextlib.contextmanager
+    def pulse(self) -> typing.Iterator[None]:
+        profile: typing.Optional[cProfile.Profile] = self.__start_profiling()
+        try:
+            with self.stage("pulse"):
+                yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                self.__finish_profiling(profile)
+
+            report: typing.Optional[PulseTimingsReport] = None
+            with self.__lock:
+                self.pulse_count += 1
+                if self.report_every > 0 and self.pulse_count % self.report_every == 0:
+                    report = self.__report()
+
+            if report is not None:
+                self.timings.publish(report)
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self.__lock:
+            histogram: typing.Optional[RollingHistogram] = self.__histograms.get(stage)
+            if histogram is None:
+                histogram = RollingHistogram(self.window_size)
+                self.__histograms[stage] = histogram
+            histogram.add(seconds)
+
+    def report(self) -> PulseTimingsReport:
+        with self.__lock:
+            return self.__report()
+
+    def capture_profile(self, pulse_count: int) -> None:
+        with self.__lock:
+            self.__profile_pulses_remaining = pulse_count
+        self._logger.info(f"Profiling the next {pulse_count} pulses.")
+
+    def install_signal_handler(
+        self, pulse_count: int, signal_number: int = signal.SIGUSR1
+    ) -> None:
+        signal.signal(signal_number, lambda _, __: self.capture_profile(pulse_count))
+
+    def __report(self) -> PulseTimingsReport:
+        return PulseTimingsReport(
+            local_now(),
+            self.pulse_count,
+            [
+                histogram.summarise(stage)
+                for stage, histogram in self.__histograms.items()
+            ],
+        )
+
+    def __start_profiling(self) -> typing.Optional[cProfile.Profile]:
+        with self.__lock:
+            if self.__profile_pulses_remaining <= 0:
+                return None
+            self.__profile_pulses_remaining -= 1
+            self.__profile_pulses_captured += 1
+            if self.__profile is None:
+                self.__profile = cProfile.Profile()
+            profile: cProfile.Profile = self.__profile
+
+        profile.enable()
+        return profile
+
+    def __finish_profiling(self, profile: cProfile.Profile) -> None:
+        with self.__lock:
+            if self.__profile_pulses_remaining > 0:
+                return
+            pulses_captured: int = self.__profile_pulses_captured
+            self.__profile = None
+            self.__profile_pulses_captured = 0
+
+        filename: str = os.path.join(
+            self.profile_directory,
+            f"mango_pulse_profile_{local_now():%Y%m%d%H%M%S}_{self.pulse_count}.prof",
+        )
+        profile.dump_stats(filename)
+
+        summary = io.StringIO()
+        pstats.Stats(profile, stream=summary).sort_stats("cumulative").print_stats(20)
+        self._logger.info(
+            f"Profile of {pulses_captured} pulses written to {filename}:\n{summary.getvalue()}"
+        )
+
+    def __str__(self) -> str:
+        return f"« PulseProfiler [pulses: {self.pulse_count}, report every: {self.report_every}, profile directory: {self.profile_directory}] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 NullPulseProfiler class
+#
+# A `PulseProfiler` that doesn't record anything.
+#
+class NullPulseProfiler(PulseProfiler):
+    def __init__(self) -> None:
+        super().__init__(report_every=0)
+
+    def stage(self, name: str) -> typing.ContextManager[None]:
+        return contextlib.nullcontext()
+
+    def pulse(self) -> typing.ContextManager[None]:  # type: ignore[override]
+        return contextlib.nullcontext()
+
+    def record(self, stage: str, seconds: float) -> None:
+        pass
+
+    def __str__(self) -> str:
+        return "« NullPulseProfiler »"
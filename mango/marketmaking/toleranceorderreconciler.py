@@ -78,6 +78,16 @@ class ToleranceOrderReconciler(OrderReconciler):
         # should be cancelled.
         outcomes.to_cancel = remaining_existing_orders
 
+        self._verify_counts(existing_orders, desired_orders, outcomes)
+
+        return outcomes
+
+    def _verify_counts(
+        self,
+        existing_orders: typing.Sequence[mango.Order],
+        desired_orders: typing.Sequence[mango.Order],
+        outcomes: ReconciledOrders,
+    ) -> None:
         in_count = len(existing_orders) + len(desired_orders)
         out_count = (
             len(outcomes.to_place)
@@ -90,8 +100,6 @@ class ToleranceOrderReconciler(OrderReconciler):
                 f"Failure processing all desired orders. Count of orders in: {in_count}. Count of orders out: {out_count}."
             )
 
-        return outcomes
-
     def find_acceptable_order(
         self, desired: mango.Order, existing_orders: typing.Sequence[mango.Order]
     ) -> typing.Optional[mango.Order]:
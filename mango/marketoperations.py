@@ -183,36 +183,48 @@ class MarketOperations(metaclass=abc.ABCMeta):
             "MarketOperations.ensure_openorders() is not implemented on the base type."
         )
 
-    def market_buy(
-        self, quantity: Decimal, max_slippage: Decimal
-    ) -> typing.Sequence[str]:
+    # Builds an IOC order that should fill immediately against the current orderbook, priced up to
+    # `max_slippage` (as a fraction) away from the best price on the other side.
+    def build_market_order(
+        self, side: Side, quantity: Decimal, max_slippage: Decimal
+    ) -> Order:
         orderbook = self.load_orderbook()
-        if orderbook.top_ask is None:
-            raise Exception(f"Could not determine top ask on {orderbook.symbol}")
+        price: Decimal
+        if side == Side.BUY:
+            if orderbook.top_ask is None:
+                raise Exception(f"Could not determine top ask on {orderbook.symbol}")
+
+            top_ask = orderbook.top_ask.price
 
-        top_ask = orderbook.top_ask.price
+            increase_factor = Decimal(1) + max_slippage
+            price = top_ask * increase_factor
+            self._logger.info(
+                f"Price {price} - adjusted by {max_slippage} from {top_ask}"
+            )
+        else:
+            if orderbook.top_bid is None:
+                raise Exception(f"Could not determine top bid on {orderbook.symbol}")
 
-        increase_factor = Decimal(1) + max_slippage
-        price = top_ask * increase_factor
-        self._logger.info(f"Price {price} - adjusted by {max_slippage} from {top_ask}")
+            top_bid = orderbook.top_bid.price
 
-        order = Order.from_values(Side.BUY, price, quantity, OrderType.IOC)
+            decrease_factor = Decimal(1) - max_slippage
+            price = top_bid * decrease_factor
+            self._logger.info(
+                f"Price {price} - adjusted by {max_slippage} from {top_bid}"
+            )
+
+        return Order.from_values(side, price, quantity, OrderType.IOC)
+
+    def market_buy(
+        self, quantity: Decimal, max_slippage: Decimal
+    ) -> typing.Sequence[str]:
+        order = self.build_market_order(Side.BUY, quantity, max_slippage)
         return self.place_order(order)
 
     def market_sell(
         self, quantity: Decimal, max_slippage: Decimal
     ) -> typing.Sequence[str]:
-        orderbook = self.load_orderbook()
-        if orderbook.top_bid is None:
-            raise Exception(f"Could not determine top bid on {orderbook.symbol}")
-
-        top_bid = orderbook.top_bid.price
-
-        decrease_factor = Decimal(1) - max_slippage
-        price = top_bid * decrease_factor
-        self._logger.info(f"Price {price} - adjusted by {max_slippage} from {top_bid}")
-
-        order = Order.from_values(Side.SELL, price, quantity, OrderType.IOC)
+        order = self.build_market_order(Side.SELL, quantity, max_slippage)
         return self.place_order(order)
 
     def __repr__(self) -> str:
@@ -0,0 +1,289 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+import logging
+import threading
+import typing
+import weakref
+
+from solana.publickey import PublicKey
+
+from .account import Account
+from .accountinfo import AccountInfo
+from .context import Context
+from .group import Group
+from .loadedmarket import LoadedMarket
+from .marketoperations import MarketInstructionBuilder, MarketOperations
+from .markets import Market
+from .perpmarket import PerpMarket, PerpMarketStub
+from .perpmarketdetails import PerpMarketDetails
+from .porcelain import (
+    instruction_builder_for_market,
+    market as load_market,
+    operations_for_instruction_builder,
+)
+from .serummarket import SerumMarket, SerumMarketStub, parse_pyserum_market
+from .spotmarket import SpotMarket, SpotMarketStub
+from .wallet import Wallet
+
+
+# # 🥭 MarketRegistry class
+#
+# The porcelain functions `market()`, `instruction_builder()` and `operations()` load everything
+# afresh every time they're called. That's fine for a one-off command, but a long-running process
+# that asks for the same market from several places ends up loading the same `Group` and market
+# accounts over and over.
+#
+# A `MarketRegistry` caches loaded `Group`s, markets, `MarketInstructionBuilder`s and
+# `MarketOperations` for a single `Context`. Use `MarketRegistry.for_context()` to get the shared
+# registry for a `Context`, `preload()` to fetch several markets with a single `load_multiple()`
+# call, and `invalidate()` to drop cached items that are known to be out of date.
+#
+class MarketRegistry:
+    __registries: "weakref.WeakKeyDictionary[Context, MarketRegistry]" = (
+        weakref.WeakKeyDictionary()
+    )
+    __registries_lock: threading.Lock = threading.Lock()
+
+    def __init__(self, context: Context) -> None:
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self.context: Context = context
+        self.__lock: threading.RLock = threading.RLock()
+        self.__groups: typing.Dict[str, Group] = {}
+        self.__markets: typing.Dict[str, LoadedMarket] = {}
+        self.__instruction_builders: typing.Dict[
+            typing.Tuple[str, str, str, bool], MarketInstructionBuilder
+        ] = {}
+        self.__operations: typing.Dict[
+            typing.Tuple[str, str, str, bool], MarketOperations
+        ] = {}
+
+    @staticmethod
+    def for_context(context: Context) -> "MarketRegistry":
+        with MarketRegistry.__registries_lock:
+            registry: typing.Optional[MarketRegistry] = MarketRegistry.__registries.get(
+                context
+            )
+            if registry is None:
+                registry = MarketRegistry(context)
+                MarketRegistry.__registries[context] = registry
+            return registry
+
+    # Markets are keyed on their address rather than the symbol they were asked for, so `BTC-PERP` and
+    # `perp:BTC-PERP` share the same cached items.
+    @staticmethod
+    def __key(market: Market) -> str:
+        return str(market.address)
+
+    def __builder_key(
+        self, symbol: str, wallet: Wallet, account: Account, dry_run: bool
+    ) -> typing.Tuple[str, str, str, bool]:
+        return (
+            MarketRegistry.__key(self.__find(symbol)),
+            str(wallet.address),
+            str(account.address),
+            dry_run,
+        )
+
+    def __find(self, symbol: str) -> Market:
+        found: typing.Optional[Market] = self.context.market_lookup.find_by_symbol(
+            symbol
+        )
+        if found is None:
+            raise Exception(f"Could not find market {symbol}")
+        return found
+
+    def group(self, address: typing.Optional[PublicKey] = None) -> Group:
+        group_address: PublicKey = address or self.context.group_address
+        with self.__lock:
+            group: typing.Optional[Group] = self.__groups.get(str(group_address))
+            if group is None:
+                group = Group.load(self.context, group_address)
+                self.__groups[str(group_address)] = group
+            return group
+
+    def market(self, symbol: str) -> LoadedMarket:
+        found: Market = self.__find(symbol)
+        key: str = MarketRegistry.__key(found)
+        with self.__lock:
+            loaded: typing.Optional[LoadedMarket] = self.__markets.get(key)
+            if loaded is None:
+                if isinstance(found, SpotMarketStub):
+                    loaded = found.load(self.context, self.group(found.group_address))
+                elif isinstance(found, PerpMarketStub):
+                    loaded = found.load(self.context, self.group(found.group_address))
+                else:
+                    loaded = load_market(self.context, symbol)
+                self.__markets[key] = loaded
+            return loaded
+
+    def instruction_builder(
+        self, wallet: Wallet, account: Account, symbol: str, dry_run: bool = False
+    ) -> MarketInstructionBuilder:
+        key = self.__builder_key(symbol, wallet, account, dry_run)
+        with self.__lock:
+            builder: typing.Optional[
+                MarketInstructionBuilder
+            ] = self.__instruction_builders.get(key)
+            if builder is None:
+                builder = instruction_builder_for_market(
+                    self.context, wallet, account, self.market(symbol), dry_run
+                )
+                self.__instruction_builders[key] = builder
+            return builder
+
+    def operations(
+        self, wallet: Wallet, account: Account, symbol: str, dry_run: bool = False
+    ) -> MarketOperations:
+        key = self.__builder_key(symbol, wallet, account, dry_run)
+        with self.__lock:
+            operations: typing.Optional[MarketOperations] = self.__operations.get(key)
+            if operations is None:
+                builder: MarketInstructionBuilder = self.instruction_builder(
+                    wallet, account, symbol, dry_run
+                )
+                operations = operations_for_instruction_builder(
+                    self.context, wallet, account, self.market(symbol), builder
+                )
+                self.__operations[key] = operations
+            return operations
+
+    # Drops everything cached for `symbol`, or everything at all (including `Group`s) if no
+    # symbol is given. The next call for an invalidated item loads it afresh.
+    def invalidate(self, symbol: typing.Optional[str] = None) -> None:
+        with self.__lock:
+            if symbol is None:
+                self.__groups.clear()
+                self.__markets.clear()
+                self.__instruction_builders.clear()
+                self.__operations.clear()
+                return
+
+            key: str = MarketRegistry.__key(self.__find(symbol))
+            self.__markets.pop(key, None)
+            for builder_key in [k for k in self.__instruction_builders if k[0] == key]:
+                del self.__instruction_builders[builder_key]
+            for operations_key in [k for k in self.__operations if k[0] == key]:
+                del self.__operations[operations_key]
+
+    # Loads all the given markets (and any `Group`s they need) that aren't already cached, fetching
+    # all their accounts in a single `AccountInfo.load_multiple()` call.
+    def preload(self, symbols: typing.Sequence[str]) -> None:
+        with self.__lock:
+            to_load: typing.Dict[str, Market] = {}
+            for symbol in symbols:
+                found: Market = self.__find(symbol)
+                key: str = MarketRegistry.__key(found)
+                if key in self.__markets or key in to_load:
+                    continue
+                if isinstance(found, LoadedMarket):
+                    self.__markets[key] = found
+                elif isinstance(
+                    found, (SerumMarketStub, SpotMarketStub, PerpMarketStub)
+                ):
+                    to_load[key] = found
+                else:
+                    raise Exception(f"Market {found} could not be loaded.")
+
+            if len(to_load) == 0:
+                return
+
+            group_addresses: typing.List[PublicKey] = []
+            for found in to_load.values():
+                if isinstance(found, (SpotMarketStub, PerpMarketStub)):
+                    group_key: str = str(found.group_address)
+                    if (
+                        group_key not in self.__groups
+                        and found.group_address not in group_addresses
+                    ):
+                        group_addresses += [found.group_address]
+
+            market_addresses: typing.List[PublicKey] = [
+                found.address for found in to_load.values()
+            ]
+            account_infos: typing.Sequence[AccountInfo] = AccountInfo.load_multiple(
+                self.context, group_addresses + market_addresses
+            )
+            by_address: typing.Dict[str, AccountInfo] = {
+                str(account_info.address): account_info
+                for account_info in account_infos
+            }
+
+            for group_address in group_addresses:
+                group_account_info: typing.Optional[AccountInfo] = by_address.get(
+                    str(group_address)
+                )
+                if group_account_info is None:
+                    raise Exception(
+                        f"Group account not found at address '{group_address}'"
+                    )
+                self.__groups[str(group_address)] = Group.parse_with_context(
+                    self.context, group_account_info
+                )
+
+            for key, found in to_load.items():
+                account_info: typing.Optional[AccountInfo] = by_address.get(
+                    str(found.address)
+                )
+                if account_info is None:
+                    raise Exception(
+                        f"Market account not found at address '{found.address}'"
+                    )
+                self.__markets[key] = self.__parse_market(found, account_info)
+
+            self._logger.debug(
+                f"Preloaded {len(to_load)} market(s) and {len(group_addresses)} group(s) with a single fetch."
+            )
+
+    def __parse_market(self, found: Market, account_info: AccountInfo) -> LoadedMarket:
+        if isinstance(found, SerumMarketStub):
+            return SerumMarket(
+                found.program_address,
+                found.address,
+                found.base,
+                found.quote,
+                parse_pyserum_market(
+                    self.context, account_info, found.base, found.quote
+                ),
+            )
+        elif isinstance(found, SpotMarketStub):
+            return SpotMarket(
+                found.program_address,
+                found.address,
+                found.base,
+                found.quote,
+                self.__groups[str(found.group_address)],
+                parse_pyserum_market(
+                    self.context, account_info, found.base, found.quote
+                ),
+            )
+        elif isinstance(found, PerpMarketStub):
+            return PerpMarket(
+                found.program_address,
+                found.address,
+                found.base,
+                found.quote,
+                PerpMarketDetails.parse(
+                    account_info, self.__groups[str(found.group_address)]
+                ),
+            )
+
+        raise Exception(f"Market {found} could not be loaded.")
+
+    def __str__(self) -> str:
+        return f"« MarketRegistry {len(self.__markets)} market(s), {len(self.__groups)} group(s) »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
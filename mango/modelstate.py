@@ -14,9 +14,11 @@
 #   [Email](mailto:hello@blockworks.foundation)
 
 
+import copy
 import logging
 import typing
 
+from dataclasses import dataclass
 from decimal import Decimal
 from solana.publickey import PublicKey
 
@@ -27,7 +29,7 @@ from .markets import Market
 from .oracle import Price
 from .orders import Order, OrderBook
 from .placedorder import PlacedOrdersContainer
-from .watcher import Watcher
+from .watcher import ManualUpdateWatcher, Watcher
 
 
 # # 🥭 EventQueue protocol
@@ -51,6 +53,42 @@ class NullEventQueue:
         return []
 
 
+# # 🥭 SlotSkew class
+#
+# The slots of the watched values in one `ModelState` snapshot, keyed by watcher name, and how long the
+# snapshot waited for them to come within the allowed skew of each other. `lagging` names any watchers
+# that were still too far behind when the snapshot was taken.
+#
+# Only watchers that know their slot (and have had at least one update) are included.
+#
+@dataclass
+class SlotSkew:
+    slots: typing.Dict[str, int]
+    waited: float
+    lagging: typing.Sequence[str]
+
+    @property
+    def newest(self) -> int:
+        return max(self.slots.values()) if len(self.slots) > 0 else 0
+
+    @property
+    def oldest(self) -> int:
+        return min(self.slots.values()) if len(self.slots) > 0 else 0
+
+    @property
+    def skew(self) -> int:
+        return self.newest - self.oldest
+
+    def __str__(self) -> str:
+        lagging: str = (
+            f", lagging: {list(self.lagging)}" if len(self.lagging) > 0 else ""
+        )
+        return f"« SlotSkew {self.skew} slot(s) [{self.oldest} - {self.newest}], waited {self.waited:.3f}s{lagging} »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
 # # 🥭 ModelState class
 #
 # Provides simple access to the latest state of market and account data.
@@ -83,6 +121,19 @@ class ModelState:
 
         self.not_quoting: bool = False
         self.state: typing.Dict[str, typing.Any] = {}
+        self.slot_skew: typing.Optional[SlotSkew] = None
+
+    @property
+    def watchers(self) -> typing.Dict[str, Watcher[typing.Any]]:
+        return {
+            "group": self.group_watcher,
+            "account": self.account_watcher,
+            "price": self.price_watcher,
+            "placed_orders_container": self.placed_orders_container_watcher,
+            "inventory": self.inventory_watcher,
+            "orderbook": self.orderbook_watcher,
+            "event_queue": self.event_queue_watcher,
+        }
 
     @property
     def group(self) -> Group:
@@ -137,6 +188,27 @@ class ModelState:
     def current_orders(self) -> typing.Sequence[Order]:
         return self.orderbook.all_orders_for_owner(self.order_owner, cutoff=None)
 
+    # A `ModelState` whose values are the current latest values of this one's watchers, and don't change
+    # afterwards. The orderbook watcher updates its `OrderBook` in place, so the snapshot takes a copy.
+    #
+    # The snapshot shares this `ModelState`'s `state` dictionary and starts with its `not_quoting` flag, so
+    # orderchain elements see the same state from pulse to pulse whether or not they're given snapshots.
+    def snapshot(self) -> "ModelState":
+        snapshot = ModelState(
+            self.order_owner,
+            self.market,
+            ManualUpdateWatcher(self.group),
+            ManualUpdateWatcher(self.account),
+            ManualUpdateWatcher(self.price),
+            ManualUpdateWatcher(self.placed_orders_container),
+            ManualUpdateWatcher(self.inventory),
+            ManualUpdateWatcher(copy.copy(self.orderbook)),
+            ManualUpdateWatcher(self.event_queue_watcher.latest),
+        )
+        snapshot.not_quoting = self.not_quoting
+        snapshot.state = self.state
+        return snapshot
+
     def __str__(self) -> str:
         return f"""« ModelState for market '{self.market.fully_qualified_symbol}'
     Group: {self.group_watcher.latest.address}
@@ -16,9 +16,14 @@
 
 import abc
 import logging
+import queue
 import requests
+import rx
+import threading
+import time
 import typing
 
+from datetime import timedelta
 from urllib.parse import unquote
 
 from .output import output
@@ -284,6 +289,219 @@ class CompoundNotificationTarget(NotificationTarget):
 »"""
 
 
+# # 🥭 QueuedNotificationTarget class
+#
+# The `QueuedNotificationTarget` acts as a single `NotificationTarget`, like the
+# `CompoundNotificationTarget`, but it never sends a notification on the calling thread.
+# `send_notification()` just puts the item on a bounded queue and returns immediately. A
+# single background worker thread takes items from the queue and sends them on to the
+# inner targets.
+#
+# For each inner target, the worker:
+# * Collects messages for `batch_window` before sending them together in a single
+#   notification. Identical messages within a batch are only sent once, with a count of how
+#   many times they were seen.
+# * Won't send to the target more than once every `minimum_send_interval`. Messages that
+#   arrive while a target is rate-limited are added to its next batch.
+# * Retries a failed send up to `retry_count` times, pausing `retry_pause` (multiplied by the
+#   attempt number) between attempts. A batch that fails every retry is abandoned.
+#
+# Items arriving while the queue is full (holding `max_queue_depth` items) are dropped, as
+# are new distinct messages once a target already has `max_batch_size` distinct messages
+# waiting. Each drop is counted, and the counts are available through `dropped_count` and
+# `queue_depth` so they can be monitored.
+#
+# This is the target to use with a `NotificationHandler`, since then an ERROR log in, say, a
+# market-maker pulse doesn't have to wait on Telegram or Discord.
+#
+# Remember to `dispose()` the `QueuedNotificationTarget` at shutdown. It makes a best-effort
+# attempt to send any pending batches, ignoring rate limits.
+#
+class QueuedNotificationTarget(NotificationTarget, rx.core.typing.Disposable):
+    def __init__(
+        self,
+        targets: typing.Sequence[NotificationTarget],
+        batch_window: timedelta = timedelta(seconds=2),
+        minimum_send_interval: timedelta = timedelta(seconds=1),
+        max_queue_depth: int = 1000,
+        max_batch_size: int = 50,
+        retry_count: int = 3,
+        retry_pause: timedelta = timedelta(seconds=2),
+    ) -> None:
+        super().__init__()
+        self.targets: typing.Sequence[NotificationTarget] = targets
+        self.batch_window: timedelta = batch_window
+        self.minimum_send_interval: timedelta = minimum_send_interval
+        self.max_queue_depth: int = max_queue_depth
+        self.max_batch_size: int = max_batch_size
+        self.retry_count: int = retry_count
+        self.retry_pause: timedelta = retry_pause
+
+        self.dropped_count: int = 0
+        self.sent_count: int = 0
+        self.failed_count: int = 0
+
+        self.__queue: "queue.Queue[str]" = queue.Queue(maxsize=max_queue_depth)
+        self.__batches: typing.List[_PendingNotificationBatch] = [
+            _PendingNotificationBatch(target) for target in targets
+        ]
+        self.__stop_requested: threading.Event = threading.Event()
+        self.__counter_lock: threading.Lock = threading.Lock()
+        self.__worker: threading.Thread = threading.Thread(
+            target=self._run, name="QueuedNotificationTarget", daemon=True
+        )
+        self.__worker.start()
+
+    @property
+    def queue_depth(self) -> int:
+        return self.__queue.qsize()
+
+    @property
+    def pending_count(self) -> int:
+        return sum(batch.message_count for batch in self.__batches)
+
+    def send_notification(self, item: typing.Any) -> None:
+        try:
+            self.__queue.put_nowait(str(item))
+        except queue.Full:
+            self.__count_drops(1)
+
+    def dispose(self) -> None:
+        self.__stop_requested.set()
+        self.__worker.join()
+
+    def _run(self) -> None:
+        tick: float = min(self.batch_window.total_seconds(), 0.25)
+        while not self.__stop_requested.is_set():
+            try:
+                message: typing.Optional[str] = self.__queue.get(timeout=tick)
+            except queue.Empty:
+                message = None
+
+            while message is not None:
+                self.__add_to_batches(message)
+                try:
+                    message = self.__queue.get_nowait()
+                except queue.Empty:
+                    message = None
+
+            self.__send_due_batches(time.monotonic(), False)
+
+        # Stopping - drain whatever's left and make one attempt to send it all.
+        while True:
+            try:
+                self.__add_to_batches(self.__queue.get_nowait())
+            except queue.Empty:
+                break
+        self.__send_due_batches(time.monotonic(), True)
+
+    def __add_to_batches(self, message: str) -> None:
+        now: float = time.monotonic()
+        for batch in self.__batches:
+            if not batch.add(message, now, self.max_batch_size):
+                self.__count_drops(1)
+
+    def __send_due_batches(self, now: float, flushing: bool) -> None:
+        for batch in self.__batches:
+            if batch.first_added_at is None:
+                continue
+
+            if not flushing:
+                if now - batch.first_added_at < self.batch_window.total_seconds():
+                    continue
+                if (
+                    now - batch.last_sent_at
+                    < self.minimum_send_interval.total_seconds()
+                ):
+                    continue
+                if now < batch.next_attempt_at:
+                    continue
+
+            try:
+                batch.target.send_notification(batch.render())
+                batch.last_sent_at = now
+                with self.__counter_lock:
+                    self.sent_count += batch.message_count
+                batch.clear()
+            except Exception as exception:
+                batch.attempts += 1
+                if flushing or batch.attempts > self.retry_count:
+                    # Not an error - a `NotificationHandler` sending errors to this target would
+                    # queue this message to the target that's failing, and it would never stop.
+                    self._logger.warning(
+                        f"Abandoning notification batch of {batch.message_count} message(s) to {batch.target} after {batch.attempts} attempt(s) - {exception}"
+                    )
+                    with self.__counter_lock:
+                        self.failed_count += batch.message_count
+                    batch.clear()
+                else:
+                    pause: float = self.retry_pause.total_seconds() * batch.attempts
+                    self._logger.warning(
+                        f"Failed to send notification batch to {batch.target} (attempt {batch.attempts}) - will retry in {pause} second(s) - {exception}"
+                    )
+                    batch.next_attempt_at = now + pause
+
+    def __count_drops(self, count: int) -> None:
+        with self.__counter_lock:
+            self.dropped_count += count
+
+    def __str__(self) -> str:
+        inner: typing.List[str] = []
+        for target in self.targets:
+            inner += [f"{target}"]
+        inner_text: str = "\n    ".join(inner)
+        return f"""« QueuedNotificationTarget [queue depth: {self.queue_depth}, dropped: {self.dropped_count}] with {len(self.targets)} inner targets:
+    {inner_text}
+»"""
+
+
+# # 🥭 _PendingNotificationBatch class
+#
+# Internal state used by `QueuedNotificationTarget` to track the batch of messages waiting to
+# be sent to a single `NotificationTarget`. Only ever accessed from the worker thread.
+#
+class _PendingNotificationBatch:
+    def __init__(self, target: NotificationTarget) -> None:
+        self.target: NotificationTarget = target
+        self.messages: typing.Dict[str, int] = {}
+        self.first_added_at: typing.Optional[float] = None
+        self.last_sent_at: float = float("-inf")
+        self.next_attempt_at: float = float("-inf")
+        self.attempts: int = 0
+
+    @property
+    def message_count(self) -> int:
+        return sum(self.messages.values())
+
+    def add(self, message: str, now: float, max_batch_size: int) -> bool:
+        if message in self.messages:
+            self.messages[message] += 1
+            return True
+
+        if len(self.messages) >= max_batch_size:
+            return False
+
+        self.messages[message] = 1
+        if self.first_added_at is None:
+            self.first_added_at = now
+        return True
+
+    def render(self) -> str:
+        rendered: typing.List[str] = []
+        for message, count in self.messages.items():
+            if count == 1:
+                rendered += [message]
+            else:
+                rendered += [f"{message}\n(Repeated {count} times.)"]
+        return "\n\n".join(rendered)
+
+    def clear(self) -> None:
+        self.messages = {}
+        self.first_added_at = None
+        self.next_attempt_at = float("-inf")
+        self.attempts = 0
+
+
 # # 🥭 parse_notification_target() function
 #
 # `parse_notification_target()` takes a parameter as a string and returns a notification
@@ -155,6 +155,23 @@ class LatestItemObserverSubscriber(
         pass
 
 
+# # 🥭 SlotTrackingObserverSubscriber class
+#
+# A `LatestItemObserverSubscriber` that also keeps the slot its latest item came from, as given by
+# `slot_source` whenever an item arrives. The slot is 0 until the first item arrives, since the slot of
+# the initial item isn't known.
+#
+class SlotTrackingObserverSubscriber(LatestItemObserverSubscriber[TItem]):
+    def __init__(self, initial: TItem, slot_source: typing.Callable[[], int]) -> None:
+        super().__init__(initial)
+        self.slot_source: typing.Callable[[], int] = slot_source
+        self.slot: int = 0
+
+    def on_next(self, item: TItem) -> None:
+        super().on_next(item)
+        self.slot = self.slot_source()
+
+
 # # 🥭 FunctionObserver
 #
 # This class takes functions for `on_next()`, `on_error()` and `on_completed()` and returns
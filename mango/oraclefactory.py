@@ -13,9 +13,12 @@
 #   [Github](https://github.com/blockworks-foundation)
 #   [Email](mailto:hello@blockworks.foundation)
 
+import typing
+
 from .context import Context
 from .contextbuilder import ContextBuilder
 from .oracle import OracleProvider
+from .oracles.aggregate import aggregate
 from .oracles.ftx import ftx
 from .oracles.market import market
 from .oracles.pythnetwork import pythnetwork
@@ -26,7 +29,15 @@ from .oracles.stub import stub
 #
 # This file allows you to create a concreate OracleProvider for a specified provider name.
 #
+# A comma-separated list of provider names creates an `AggregateOracleProvider` combining them all. Each
+# name in the list can be followed by a colon and the number of seconds after which that provider's prices
+# are considered stale (e.g. `pyth:5,ftx:2,market`), and the list can also include `median` (the default) or
+# `confidence-weighted` to choose how the prices are combined.
+#
 def create_oracle_provider(context: Context, provider_name: str) -> OracleProvider:
+    if "," in provider_name:
+        return _create_aggregate_oracle_provider(context, provider_name)
+
     proper_provider_name: str = provider_name.upper()
     if proper_provider_name == "FTX":
         return ftx.FtxOracleProvider()
@@ -47,3 +58,26 @@ def create_oracle_provider(context: Context, provider_name: str) -> OracleProvid
     elif proper_provider_name == "STUB":
         return stub.StubOracleProvider()
     raise Exception(f"Unknown oracle provider '{proper_provider_name}'.")
+
+
+def _create_aggregate_oracle_provider(
+    context: Context, provider_names: str
+) -> OracleProvider:
+    providers: typing.List[OracleProvider] = []
+    staleness_cutoffs: typing.List[float] = []
+    method: aggregate.AggregationMethod = aggregate.AggregationMethod.MEDIAN
+    for entry in provider_names.split(","):
+        name, _, cutoff = entry.strip().partition(":")
+        if name.upper() == "MEDIAN":
+            method = aggregate.AggregationMethod.MEDIAN
+        elif name.upper() == "CONFIDENCE-WEIGHTED":
+            method = aggregate.AggregationMethod.CONFIDENCE_WEIGHTED
+        else:
+            providers += [create_oracle_provider(context, name)]
+            staleness_cutoffs += [
+                float(cutoff)
+                if cutoff
+                else aggregate.AggregateOracle.DEFAULT_STALENESS_CUTOFF
+            ]
+
+    return aggregate.AggregateOracleProvider(providers, staleness_cutoffs, method)
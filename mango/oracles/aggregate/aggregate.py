@@ -0,0 +1,386 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+
+import enum
+import rx
+import rx.core.typing
+import rx.operators
+import threading
+import typing
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+from ...context import Context
+from ...datetimes import utc_now
+from ...loadedmarket import LoadedMarket
+from ...observables import Disposable
+from ...oracle import (
+    Oracle,
+    OracleProvider,
+    OracleSource,
+    Price,
+    SupportedOracleFeature,
+)
+
+
+# # 🥭 Aggregate
+#
+# This file contains an oracle that combines the prices from several other oracles.
+#
+# Each source oracle's streaming prices are watched concurrently. Whenever one of them updates, the latest
+# prices from all sources that aren't stale are combined into a single price, either by taking the median
+# or by weighting each price by its confidence. A new price is only published if it differs meaningfully
+# from the last one published, or if the set of sources contributing to it has changed.
+#
+# A source is stale if its latest price was received more than its staleness cutoff (in seconds) ago.
+#
+
+
+# # 🥭 AggregationMethod enum
+#
+# How the prices from the fresh sources are combined.
+#
+class AggregationMethod(enum.Enum):
+    MEDIAN = enum.auto()
+    CONFIDENCE_WEIGHTED = enum.auto()
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 AggregateOracleSourceStatistics class
+#
+# Monitoring details for one source of an `AggregateOracle`.
+#
+# `latency` is the number of seconds between the source's timestamp on its latest price and that price
+# being received. `divergence` is how far (as a fraction) the source's latest mid price was from the
+# aggregate price computed at the same time.
+#
+@dataclass
+class AggregateOracleSourceStatistics:
+    name: str
+    staleness_cutoff: float
+    updates: int = 0
+    last_received: typing.Optional[datetime] = None
+    latency: float = 0
+    divergence: Decimal = Decimal(0)
+    stale: bool = True
+
+    def __str__(self) -> str:
+        return f"« AggregateOracleSourceStatistics '{self.name}' updates: {self.updates}, latency: {self.latency:.3f}s, divergence: {self.divergence:.6f}, stale: {self.stale} »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+class _SourcePrice(typing.NamedTuple):
+    price: Price
+    received: datetime
+
+
+# # 🥭 AggregateOracle class
+#
+# Implements the `Oracle` abstract base class by combining several other `Oracle`s for the same market.
+#
+class AggregateOracle(Oracle):
+    DEFAULT_STALENESS_CUTOFF: float = 10
+    DEFAULT_MINIMUM_CHANGE: Decimal = Decimal("0.0001")
+
+    def __init__(
+        self,
+        market: LoadedMarket,
+        oracles: typing.Sequence[Oracle],
+        staleness_cutoffs: typing.Optional[typing.Sequence[float]] = None,
+        method: AggregationMethod = AggregationMethod.MEDIAN,
+        minimum_change: Decimal = DEFAULT_MINIMUM_CHANGE,
+    ) -> None:
+        if len(oracles) == 0:
+            raise Exception("AggregateOracle needs at least one source oracle.")
+        cutoffs: typing.Sequence[float] = staleness_cutoffs or [
+            AggregateOracle.DEFAULT_STALENESS_CUTOFF
+        ] * len(oracles)
+        if len(cutoffs) != len(oracles):
+            raise Exception(
+                f"AggregateOracle given {len(cutoffs)} staleness cutoffs for {len(oracles)} oracles."
+            )
+
+        name = f"Aggregate Oracle ({method}) for {market.fully_qualified_symbol}"
+        super().__init__(name, market)
+        self.oracles: typing.Sequence[Oracle] = oracles
+        self.staleness_cutoffs: typing.Sequence[float] = cutoffs
+        self.method: AggregationMethod = method
+        self.minimum_change: Decimal = minimum_change
+        features: SupportedOracleFeature = (
+            SupportedOracleFeature.MID_PRICE
+            | SupportedOracleFeature.TOP_BID_AND_OFFER
+            | SupportedOracleFeature.CONFIDENCE
+        )
+        self.source: OracleSource = OracleSource("Aggregate", name, features, market)
+
+        self.__lock: threading.Lock = threading.Lock()
+        self.__latest: typing.List[typing.Optional[_SourcePrice]] = [None] * len(
+            oracles
+        )
+        self.__statistics: typing.List[AggregateOracleSourceStatistics] = [
+            AggregateOracleSourceStatistics(oracle.name, cutoff)
+            for oracle, cutoff in zip(oracles, cutoffs)
+        ]
+        self.__last_published: typing.Optional[Price] = None
+        self.__last_published_sources: typing.Set[int] = set()
+        self.__streaming: typing.Optional[rx.core.typing.Observable[Price]] = None
+
+    def statistics(self) -> typing.Sequence[AggregateOracleSourceStatistics]:
+        now: datetime = utc_now()
+        with self.__lock:
+            for index, statistics in enumerate(self.__statistics):
+                statistics.stale = self.__is_stale(index, now)
+            return [
+                AggregateOracleSourceStatistics(**statistics.__dict__)
+                for statistics in self.__statistics
+            ]
+
+    def fetch_price(self, context: Context) -> Price:
+        received: datetime = utc_now()
+        prices: typing.List[Price] = []
+        for oracle in self.oracles:
+            try:
+                prices += [oracle.fetch_price(context)]
+            except Exception as exception:
+                self._logger.warning(
+                    f"Could not fetch price from {oracle.name}: {exception}"
+                )
+
+        if len(prices) == 0:
+            raise Exception(f"[{self.name}] No source oracle returned a price.")
+
+        return self._aggregate(prices, received)
+
+    # All subscribers share one subscription to the source oracles, made when the first subscriber arrives
+    # and disposed when the last one leaves. The aggregation state belongs to the `AggregateOracle`, so each
+    # source price must only be counted once no matter how many subscribers there are.
+    def to_streaming_observable(
+        self, context: Context
+    ) -> rx.core.typing.Observable[Price]:
+        with self.__lock:
+            if self.__streaming is None:
+                self.__streaming = rx.create(self.__build_subscribe(context)).pipe(
+                    rx.operators.share()
+                )
+            return self.__streaming
+
+    def __build_subscribe(
+        self, context: Context
+    ) -> typing.Callable[
+        [
+            rx.core.typing.Observer[Price],
+            typing.Optional[rx.core.typing.Scheduler],
+        ],
+        rx.core.typing.Disposable,
+    ]:
+        def subscribe(
+            observer: rx.core.typing.Observer[Price],
+            scheduler_: typing.Optional[rx.core.typing.Scheduler] = None,
+        ) -> rx.core.typing.Disposable:
+            disposable = Disposable()
+            for index, oracle in enumerate(self.oracles):
+                disposable.add_disposable(
+                    oracle.to_streaming_observable(context).subscribe(  # type: ignore[call-arg]
+                        on_next=self.__build_on_next(index, observer),
+                        on_error=lambda exception: self._logger.warning(
+                            f"Source oracle error: {exception}"
+                        ),
+                    )
+                )
+
+            return disposable
+
+        return subscribe
+
+    def __build_on_next(
+        self, index: int, observer: rx.core.typing.Observer[Price]
+    ) -> typing.Callable[[Price], None]:
+        def _on_next(price: Price) -> None:
+            aggregated: typing.Optional[Price] = self._on_source_price(index, price)
+            if aggregated is not None:
+                observer.on_next(aggregated)
+
+        return _on_next
+
+    # Records a source's new price and returns the new aggregate price if it should be published.
+    def _on_source_price(
+        self, index: int, price: Price, received: typing.Optional[datetime] = None
+    ) -> typing.Optional[Price]:
+        now: datetime = received or utc_now()
+        with self.__lock:
+            self.__latest[index] = _SourcePrice(price, now)
+            statistics = self.__statistics[index]
+            statistics.updates += 1
+            statistics.last_received = now
+            statistics.latency = max((now - price.timestamp).total_seconds(), 0)
+
+            fresh: typing.Set[int] = {
+                source_index
+                for source_index in range(len(self.oracles))
+                if not self.__is_stale(source_index, now)
+            }
+            fresh_prices: typing.List[Price] = []
+            for source_index in sorted(fresh):
+                latest = self.__latest[source_index]
+                if latest is not None:
+                    fresh_prices += [latest.price]
+            aggregated: Price = self._aggregate(fresh_prices, now)
+
+            for source_index, source_statistics in enumerate(self.__statistics):
+                latest = self.__latest[source_index]
+                if latest is not None and aggregated.mid_price != 0:
+                    source_statistics.divergence = (
+                        latest.price.mid_price - aggregated.mid_price
+                    ) / aggregated.mid_price
+
+            if not self.__should_publish(aggregated, fresh):
+                return None
+
+            self.__last_published = aggregated
+            self.__last_published_sources = fresh
+            return aggregated
+
+    def __is_stale(self, index: int, now: datetime) -> bool:
+        latest = self.__latest[index]
+        if latest is None:
+            return True
+        age: float = (now - latest.received).total_seconds()
+        return age > self.staleness_cutoffs[index]
+
+    def __should_publish(self, aggregated: Price, sources: typing.Set[int]) -> bool:
+        if self.__last_published is None or sources != self.__last_published_sources:
+            return True
+        previous: Decimal = self.__last_published.mid_price
+        if previous == 0:
+            return aggregated.mid_price != 0
+        change: Decimal = abs(aggregated.mid_price - previous) / previous
+        return change >= self.minimum_change
+
+    def _aggregate(self, prices: typing.Sequence[Price], timestamp: datetime) -> Price:
+        if self.method == AggregationMethod.CONFIDENCE_WEIGHTED:
+            weights = self.__confidence_weights(prices)
+            top_bid = self.__weighted([price.top_bid for price in prices], weights)
+            mid_price = self.__weighted([price.mid_price for price in prices], weights)
+            top_ask = self.__weighted([price.top_ask for price in prices], weights)
+            confidence = self.__weighted(
+                [price.confidence for price in prices], weights
+            )
+        else:
+            top_bid = self.__median([price.top_bid for price in prices])
+            mid_price = self.__median([price.mid_price for price in prices])
+            top_ask = self.__median([price.top_ask for price in prices])
+            confidence = self.__median([price.confidence for price in prices])
+
+        return Price(
+            self.source, timestamp, self.market, top_bid, mid_price, top_ask, confidence
+        )
+
+    # Prices are weighted by the inverse of their confidence. Sources that don't provide a confidence get
+    # the average weight of those that do (or everything is weighted equally if none of them do).
+    def __confidence_weights(
+        self, prices: typing.Sequence[Price]
+    ) -> typing.Sequence[Decimal]:
+        weights: typing.List[typing.Optional[Decimal]] = []
+        for price in prices:
+            has_confidence: bool = bool(
+                price.source.supports & SupportedOracleFeature.CONFIDENCE
+            )
+            if has_confidence and price.confidence > 0:
+                weights += [Decimal(1) / price.confidence]
+            else:
+                weights += [None]
+
+        known: typing.List[Decimal] = [
+            weight for weight in weights if weight is not None
+        ]
+        default: Decimal = (
+            (sum(known, Decimal(0)) / len(known)) if len(known) > 0 else Decimal(1)
+        )
+        return [weight if weight is not None else default for weight in weights]
+
+    def __weighted(
+        self, values: typing.Sequence[Decimal], weights: typing.Sequence[Decimal]
+    ) -> Decimal:
+        total: Decimal = sum(weights, Decimal(0))
+        return (
+            sum((value * weight for value, weight in zip(values, weights)), Decimal(0))
+            / total
+        )
+
+    def __median(self, values: typing.Sequence[Decimal]) -> Decimal:
+        ordered: typing.List[Decimal] = sorted(values)
+        middle: int = len(ordered) // 2
+        if len(ordered) % 2 == 1:
+            return ordered[middle]
+        return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+# # 🥭 AggregateOracleProvider class
+#
+# Implements the `OracleProvider` abstract base class by combining the oracles from several other
+# `OracleProvider`s.
+#
+class AggregateOracleProvider(OracleProvider):
+    def __init__(
+        self,
+        providers: typing.Sequence[OracleProvider],
+        staleness_cutoffs: typing.Optional[typing.Sequence[float]] = None,
+        method: AggregationMethod = AggregationMethod.MEDIAN,
+        minimum_change: Decimal = AggregateOracle.DEFAULT_MINIMUM_CHANGE,
+    ) -> None:
+        names: str = ", ".join(provider.name for provider in providers)
+        super().__init__(f"Aggregate Oracle Factory [{names}]")
+        self.providers: typing.Sequence[OracleProvider] = providers
+        self.staleness_cutoffs: typing.Sequence[float] = staleness_cutoffs or [
+            AggregateOracle.DEFAULT_STALENESS_CUTOFF
+        ] * len(providers)
+        self.method: AggregationMethod = method
+        self.minimum_change: Decimal = minimum_change
+
+    def oracle_for_market(
+        self, context: Context, market: LoadedMarket
+    ) -> typing.Optional[Oracle]:
+        oracles: typing.List[Oracle] = []
+        cutoffs: typing.List[float] = []
+        for provider, cutoff in zip(self.providers, self.staleness_cutoffs):
+            oracle = provider.oracle_for_market(context, market)
+            if oracle is not None:
+                oracles += [oracle]
+                cutoffs += [cutoff]
+
+        if len(oracles) == 0:
+            return None
+
+        return AggregateOracle(
+            market, oracles, cutoffs, self.method, self.minimum_change
+        )
+
+    def all_available_symbols(self, context: Context) -> typing.Sequence[str]:
+        symbols: typing.List[str] = []
+        for provider in self.providers:
+            for symbol in provider.all_available_symbols(context):
+                if symbol not in symbols:
+                    symbols += [symbol]
+        return symbols
@@ -17,16 +17,22 @@
 import re
 import rx
 import rx.operators
+import struct
+import threading
+import time
 import typing
 
+from dataclasses import dataclass
 from decimal import Decimal
 from solana.publickey import PublicKey
+from solana.rpc.types import RPCResponse
 
 from ...accountinfo import AccountInfo
 from ...context import Context
 from ...datetimes import utc_now
+from ...encoding import decode_binary
 from ...loadedmarket import LoadedMarket
-from ...observables import observable_pipeline_error_reporter
+from ...observables import Disposable, observable_pipeline_error_reporter
 from ...oracle import (
     Oracle,
     OracleProvider,
@@ -43,6 +49,10 @@ from .layouts import (
     PYTH_DEVNET_MAPPING_ROOT,
     PYTH_MAINNET_MAPPING_ROOT,
 )
+from ...websocketsubscription import (
+    IndividualWebSocketSubscriptionManager,
+    WebSocketAccountSubscription,
+)
 
 
 # # 🥭 Pyth
@@ -67,15 +77,56 @@ from .layouts import (
 #
 
 
+# # 🥭 PythOracleStatistics class
+#
+# Counts how a `PythOracle`'s streamed prices arrived and how fresh they were.
+#
+# `slot_lag` is how many slots had passed since the aggregate price was published when the websocket
+# notification for it was sent. `update_interval` is the time (in seconds) between successive prices.
+#
+@dataclass
+class PythOracleStatistics:
+    websocket_updates: int = 0
+    polled_updates: int = 0
+    last_slot_lag: int = 0
+    maximum_slot_lag: int = 0
+    last_update_interval: float = 0
+    maximum_update_interval: float = 0
+
+    def __str__(self) -> str:
+        return f"« PythOracleStatistics websocket: {self.websocket_updates}, polled: {self.polled_updates}, slot lag: {self.last_slot_lag} (max {self.maximum_slot_lag}), update interval: {self.last_update_interval:.3f}s (max {self.maximum_update_interval:.3f}s) »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# The only fields of the Pyth price account a `Price` needs are the magic number, the exponent and the
+# aggregate price, confidence and publish slot. These are read straight from the account data at their
+# offsets in the `PRICE` layout instead of parsing the whole 3,312-byte structure.
+_PRICE_MAGIC = struct.Struct("<I")
+_PRICE_EXPONENT = struct.Struct("<i")
+_PRICE_EXPONENT_OFFSET = 20
+_PRICE_AGGREGATE = struct.Struct("<QQIIQ")
+_PRICE_AGGREGATE_OFFSET = 208
+
+
 # # 🥭 PythOracle class
 #
 # Implements the `Oracle` abstract base class specialised to the Pyth Network.
 #
+# Streaming prices come from an `accountSubscribe` websocket subscription to the price account. If no
+# update arrives for `polling_fallback_interval` seconds, the price account is polled instead (once a
+# second) until the websocket updates resume.
+#
 
 
 class PythOracle(Oracle):
     def __init__(
-        self, context: Context, market: LoadedMarket, product_data: typing.Any
+        self,
+        context: Context,
+        market: LoadedMarket,
+        product_data: typing.Any,
+        polling_fallback_interval: float = 5,
     ):
         name = f"Pyth Oracle for {market.fully_qualified_symbol}"
         super().__init__(name, market)
@@ -83,10 +134,13 @@ class PythOracle(Oracle):
         self.market: LoadedMarket = market
         self.product_data: typing.Any = product_data
         self.address: PublicKey = product_data.address
+        self.polling_fallback_interval: float = polling_fallback_interval
         features: SupportedOracleFeature = (
             SupportedOracleFeature.MID_PRICE | SupportedOracleFeature.CONFIDENCE
         )
         self.source: OracleSource = OracleSource("Pyth", name, features, market)
+        self.statistics: PythOracleStatistics = PythOracleStatistics()
+        self.__last_update: float = 0
 
     def fetch_price(self, _: Context) -> Price:
         price_account_info = AccountInfo.load(self.context, self.product_data.px_acc)
@@ -95,43 +149,129 @@ class PythOracle(Oracle):
                 f"[{self.context.name}] Price account {self.product_data.px_acc} not found."
             )
 
-        if len(price_account_info.data) != PRICE.sizeof():
+        return self._price_from_data(price_account_info.data)[0]
+
+    def _price_from_data(self, data: bytes) -> typing.Tuple[Price, int]:
+        if len(data) != PRICE.sizeof():
             raise Exception(
-                f"[{self.context.name}] Price account data has incorrect size. Expected: {PRICE.sizeof()}, got {len(price_account_info.data)}."
+                f"[{self.context.name}] Price account data has incorrect size. Expected: {PRICE.sizeof()}, got {len(data)}."
             )
 
-        price_data = PRICE.parse(price_account_info.data)
-        if price_data.magic != MAGIC:
+        (magic,) = _PRICE_MAGIC.unpack_from(data, 0)
+        if magic != MAGIC:
             raise Exception(
-                f"[{self.context.name}] Price account {price_account_info.address} is not a Pyth account."
+                f"[{self.context.name}] Price account {self.product_data.px_acc} is not a Pyth account."
             )
 
-        factor = Decimal(10) ** price_data.expo
-        price = price_data.agg.price * factor
-        confidence = price_data.agg.conf * factor
+        (exponent,) = _PRICE_EXPONENT.unpack_from(data, _PRICE_EXPONENT_OFFSET)
+        (
+            aggregate_price,
+            aggregate_confidence,
+            _,
+            _,
+            publish_slot,
+        ) = _PRICE_AGGREGATE.unpack_from(data, _PRICE_AGGREGATE_OFFSET)
+        factor = Decimal(10) ** exponent
+        price = Decimal(aggregate_price) * factor
+        confidence = Decimal(aggregate_confidence) * factor
 
         # Pyth has no notion of bids, asks, or spreads so just provide the single price.
-        return Price(
-            self.source,
-            utc_now(),
-            self.market,
-            price,
-            price,
-            price,
-            confidence,
+        return (
+            Price(
+                self.source,
+                utc_now(),
+                self.market,
+                price,
+                price,
+                price,
+                confidence,
+            ),
+            publish_slot,
+        )
+
+    def _price_from_notification(self, response: RPCResponse) -> Price:
+        value = response["result"]["value"]
+        price, publish_slot = self._price_from_data(decode_binary(value["data"]))
+        slot_lag: int = max(
+            int(response["result"]["context"]["slot"]) - publish_slot, 0
+        )
+        self.statistics.last_slot_lag = slot_lag
+        self.statistics.maximum_slot_lag = max(
+            self.statistics.maximum_slot_lag, slot_lag
         )
+        self.statistics.websocket_updates += 1
+        self.__record_update()
+        return price
+
+    def __poll_price(self) -> Price:
+        price = self.fetch_price(self.context)
+        self.statistics.polled_updates += 1
+        self.__record_update()
+        return price
+
+    def __record_update(self) -> None:
+        now: float = time.monotonic()
+        if self.__last_update != 0:
+            interval: float = now - self.__last_update
+            self.statistics.last_update_interval = interval
+            self.statistics.maximum_update_interval = max(
+                self.statistics.maximum_update_interval, interval
+            )
+        self.__last_update = now
+
+    def __websocket_is_stale(self) -> bool:
+        return (time.monotonic() - self.__last_update) >= self.polling_fallback_interval
 
     def to_streaming_observable(
         self, context: Context
     ) -> rx.core.typing.Observable[Price]:
-        prices = rx.interval(1).pipe(
-            rx.operators.observe_on(context.create_thread_pool_scheduler()),
-            rx.operators.start_with(-1),
-            rx.operators.map(lambda _: self.fetch_price(context)),
-            rx.operators.catch(observable_pipeline_error_reporter),
-            rx.operators.retry(),
+        def subscribe(
+            observer: rx.core.typing.Observer[Price],
+            scheduler_: typing.Optional[rx.core.typing.Scheduler] = None,
+        ) -> rx.core.typing.Disposable:
+            disposable = Disposable()
+
+            manager = IndividualWebSocketSubscriptionManager(
+                self.context, ping_interval=self.context.ping_interval
+            )
+            subscription = _PythPriceSubscription(self)
+            manager.add(subscription)
+            disposable.add_disposable(manager)
+            disposable.add_disposable(subscription.publisher.subscribe(observer))
+
+            polled = rx.interval(1).pipe(
+                rx.operators.observe_on(context.create_thread_pool_scheduler()),
+                rx.operators.start_with(-1),
+                rx.operators.filter(lambda _: self.__websocket_is_stale()),
+                rx.operators.map(lambda _: self.__poll_price()),
+                rx.operators.catch(observable_pipeline_error_reporter),
+                rx.operators.retry(),
+            )
+            disposable.add_disposable(polled.subscribe(observer))
+
+            manager.open()
+
+            return disposable
+
+        return rx.core.observable.observable.Observable(subscribe)
+
+
+# # 🥭 _PythPriceSubscription class
+#
+# An `accountSubscribe` subscription to a Pyth price account that builds `Price`s directly from the
+# notification data.
+#
+class _PythPriceSubscription(WebSocketAccountSubscription[Price]):
+    def __init__(self, oracle: PythOracle) -> None:
+        super().__init__(
+            oracle.context,
+            oracle.product_data.px_acc,
+            lambda _: oracle.fetch_price(oracle.context),
         )
-        return typing.cast(rx.core.typing.Observable[Price], prices)
+        self.oracle: PythOracle = oracle
+
+    def build_subscribed_instance(self, response: RPCResponse) -> Price:
+        return self.oracle._price_from_notification(response)
 
 
 # # 🥭 PythOracleProvider class
@@ -141,9 +281,15 @@ class PythOracle(Oracle):
 # In order to allow it to vary its cluster without affecting other programs, this takes a `Context` in its
 # constructor and uses that to access the data. It ignores the context passed as a parameter to its methods.
 # This allows the context-fudging to only happen on construction.
+#
+# Finding the product for a symbol needs the mapping account and every product account. These are loaded
+# once and indexed by symbol, and the index is shared by all providers for the same cluster and mapping.
 
 
 class PythOracleProvider(OracleProvider):
+    __product_indexes: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+    __product_indexes_lock: threading.Lock = threading.Lock()
+
     def __init__(self, context: Context) -> None:
         self.address: PublicKey = (
             PYTH_MAINNET_MAPPING_ROOT
@@ -159,17 +305,24 @@ class PythOracleProvider(OracleProvider):
         self, _: Context, market: LoadedMarket
     ) -> typing.Optional[Oracle]:
         pyth_symbol = self._market_symbol_to_pyth_symbol(market.symbol)
-        products = self._fetch_all_pyth_products(self.context, self.address)
-        for product in products:
-            if product.attr["symbol"] == pyth_symbol:
-                return PythOracle(self.context, market, product)
-        return None
+        product = self._product_index().get(pyth_symbol)
+        if product is None:
+            return None
+        return PythOracle(self.context, market, product)
+
+    def _product_index(self) -> typing.Dict[str, typing.Any]:
+        key: str = f"{self.context.client.cluster_name}:{self.address}"
+        with PythOracleProvider.__product_indexes_lock:
+            if key not in PythOracleProvider.__product_indexes:
+                products = self._fetch_all_pyth_products(self.context, self.address)
+                PythOracleProvider.__product_indexes[key] = {
+                    product.attr["symbol"]: product for product in products
+                }
+            return PythOracleProvider.__product_indexes[key]
 
     def all_available_symbols(self, _: Context) -> typing.Sequence[str]:
-        products = self._fetch_all_pyth_products(self.context, self.address)
         symbols: typing.List[str] = []
-        for product in products:
-            symbol = product.attr["symbol"]
+        for symbol in self._product_index():
             symbols += self._pyth_symbol_to_market_symbols(symbol)
         return symbols
 
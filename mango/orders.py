@@ -14,6 +14,7 @@
 #   [Email](mailto:hello@blockworks.foundation)
 
 
+import dataclasses
 import enum
 import pandas
 import pyserum.enums
@@ -36,6 +37,45 @@ from .lotsizeconverter import LotSizeConverter
 #
 
 
+# # 🥭 TDataclass type parameter
+#
+# The `TDataclass` type parameter is the type parameter for the `_with_slots()` decorator.
+#
+TDataclass = typing.TypeVar("TDataclass")
+
+
+# # 🥭 _with_slots() decorator
+#
+# Python 3.10 added a `slots` parameter to `@dataclass` but we still support Python 3.9, so
+# this decorator does the same job. It rebuilds a dataclass with `__slots__` for its fields,
+# so each instance is a compact fixed-size object instead of carrying its own `__dict__`.
+#
+# It must be applied *after* (i.e. above) the `@dataclass` decorator.
+#
+def _with_slots(cls: typing.Type[TDataclass]) -> typing.Type[TDataclass]:
+    field_names = tuple(field.name for field in dataclasses.fields(cls))  # type: ignore[arg-type]
+    class_dict = dict(cls.__dict__)
+    class_dict["__slots__"] = field_names
+    for name in [*field_names, "__dict__", "__weakref__"]:
+        class_dict.pop(name, None)
+
+    # Frozen dataclasses block `__setattr__()`, so pickling and copying need to be told how
+    # to restore the slots.
+    def __getstate__(self: typing.Any) -> typing.List[typing.Any]:
+        return [getattr(self, name) for name in field_names]
+
+    def __setstate__(self: typing.Any, state: typing.List[typing.Any]) -> None:
+        for name, value in zip(field_names, state):
+            object.__setattr__(self, name, value)
+
+    class_dict["__getstate__"] = __getstate__
+    class_dict["__setstate__"] = __setstate__
+
+    return typing.cast(
+        typing.Type[TDataclass], type(cls.__name__, cls.__bases__, class_dict)
+    )
+
+
 # # 🥭 Side enum
 #
 # Is an order a Buy or a Sell?
@@ -142,6 +182,10 @@ class OrderType(enum.Enum):
 #
 # A package that encapsulates common information about an order.
 #
+# Orders are created by the hundreds on every orderbook update, so they use `__slots__` to
+# keep them small and quick to build.
+#
+@_with_slots
 @dataclass(frozen=True)
 class Order:
     DefaultMatchLimit: typing.ClassVar[int] = 20
@@ -39,7 +39,12 @@ from .websocketsubscription import (
 #
 # `PerpEvent` is the base class of all perp event objects.
 #
+# Events are built by the hundreds on every event queue update, so `PerpEvent` and its
+# derived classes use `__slots__` to keep them compact.
+#
 class PerpEvent(metaclass=abc.ABCMeta):
+    __slots__ = ("event_type", "original_index")
+
     def __init__(self, event_type: int, original_index: Decimal) -> None:
         self.event_type: int = event_type
         self.original_index: Decimal = original_index
@@ -57,17 +62,39 @@ class PerpEvent(metaclass=abc.ABCMeta):
 
 # # 🥭 PerpFillEvent class
 #
-# `PerpOutEvent` stores details of a perp 'fill' event.
+# `PerpFillEvent` stores details of a perp 'fill' event.
+#
+# The price and quantity are held as the integer lot values from the event queue. They're
+# only converted to `Decimal` UI values (using the `LotSizeConverter`) when the `price` or
+# `quantity` properties are accessed.
 #
 class PerpFillEvent(PerpEvent):
+    __slots__ = (
+        "timestamp",
+        "taker_side",
+        "price_lots",
+        "quantity_lots",
+        "lot_size_converter",
+        "best_initial",
+        "maker_slot",
+        "maker_out",
+        "maker",
+        "maker_order_id",
+        "maker_client_order_id",
+        "taker",
+        "taker_order_id",
+        "taker_client_order_id",
+    )
+
     def __init__(
         self,
         event_type: int,
         original_index: Decimal,
         timestamp: datetime,
         taker_side: Side,
-        price: Decimal,
-        quantity: Decimal,
+        price_lots: int,
+        quantity_lots: int,
+        lot_size_converter: LotSizeConverter,
         best_initial: Decimal,
         maker_slot: Decimal,
         maker_out: bool,
@@ -81,8 +108,9 @@ class PerpFillEvent(PerpEvent):
         super().__init__(event_type, original_index)
         self.timestamp: datetime = timestamp
         self.taker_side: Side = taker_side
-        self.price: Decimal = price
-        self.quantity: Decimal = quantity
+        self.price_lots: int = price_lots
+        self.quantity_lots: int = quantity_lots
+        self.lot_size_converter: LotSizeConverter = lot_size_converter
 
         self.best_initial: Decimal = best_initial
         self.maker_slot: Decimal = maker_slot
@@ -96,6 +124,16 @@ class PerpFillEvent(PerpEvent):
         self.taker_order_id: Decimal = taker_order_id
         self.taker_client_order_id: Decimal = taker_client_order_id
 
+    @property
+    def price(self) -> Decimal:
+        return self.lot_size_converter.price_lots_to_number(Decimal(self.price_lots))
+
+    @property
+    def quantity(self) -> Decimal:
+        return self.lot_size_converter.base_size_lots_to_number(
+            Decimal(self.quantity_lots)
+        )
+
     @property
     def key(self) -> str:
         return f"{self.maker_order_id}/{self.taker_order_id}"
@@ -119,6 +157,8 @@ class PerpFillEvent(PerpEvent):
 # `PerpOutEvent` stores details of a perp 'out' event.
 #
 class PerpOutEvent(PerpEvent):
+    __slots__ = ("owner", "side", "quantity", "slot")
+
     def __init__(
         self,
         event_type: int,
@@ -147,6 +187,16 @@ class PerpOutEvent(PerpEvent):
 # `PerpLiquidateEvent` stores details of a perp 'liquidate' event.
 #
 class PerpLiquidateEvent(PerpEvent):
+    __slots__ = (
+        "timestamp",
+        "seq_num",
+        "liquidatee",
+        "liquidator",
+        "price",
+        "quantity",
+        "liquidation_fee",
+    )
+
     def __init__(
         self,
         event_type: int,
@@ -182,6 +232,8 @@ class PerpLiquidateEvent(PerpEvent):
 # the event queue data is upgraded before this code.
 #
 class PerpUnknownEvent(PerpEvent):
+    __slots__ = ("owner",)
+
     def __init__(
         self, event_type: int, original_index: Decimal, owner: PublicKey
     ) -> None:
@@ -209,17 +261,14 @@ def event_builder(
         if event_layout.maker is None and event_layout.taker is None:
             return None
         taker_side: Side = Side.from_value(event_layout.taker_side)
-        quantity: Decimal = lot_size_converter.base_size_lots_to_number(
-            event_layout.quantity
-        )
-        price: Decimal = lot_size_converter.price_lots_to_number(event_layout.price)
         return PerpFillEvent(
             event_layout.event_type,
             original_index,
             event_layout.timestamp,
             taker_side,
-            price,
-            quantity,
+            int(event_layout.price),
+            int(event_layout.quantity),
+            lot_size_converter,
             event_layout.best_initial,
             event_layout.maker_slot,
             event_layout.maker_out,
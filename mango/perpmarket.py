@@ -254,6 +254,18 @@ class PerpOrderBookSide(AddressableAccount):
         else:
             order_side = Side.SELL
 
+        # These conversion factors are the same for every order on the side, so work them out
+        # once rather than for each leaf.
+        decimals_differential = (
+            self.perp_market_details.base_instrument.decimals
+            - self.perp_market_details.quote_token.token.decimals
+        )
+        native_to_ui = Decimal(10) ** decimals_differential
+        quote_lot_size = self.perp_market_details.quote_lot_size
+        base_lot_size = self.perp_market_details.base_lot_size
+        lot_size_ratio = quote_lot_size / base_lot_size
+        base_factor = Decimal(10) ** self.perp_market_details.base_instrument.decimals
+
         stack = [self.root_node]
         orders: typing.List[Order] = []
         while len(stack) > 0:
@@ -267,24 +279,8 @@ class PerpOrderBookSide(AddressableAccount):
                         seconds=float(node.time_in_force)
                     )
 
-                price = node.key["price"]
-                quantity = node.quantity
-
-                decimals_differential = (
-                    self.perp_market_details.base_instrument.decimals
-                    - self.perp_market_details.quote_token.token.decimals
-                )
-                native_to_ui = Decimal(10) ** decimals_differential
-                quote_lot_size = self.perp_market_details.quote_lot_size
-                base_lot_size = self.perp_market_details.base_lot_size
-                actual_price = price * (quote_lot_size / base_lot_size) * native_to_ui
-
-                base_factor = (
-                    Decimal(10) ** self.perp_market_details.base_instrument.decimals
-                )
-                actual_quantity = (
-                    quantity * self.perp_market_details.base_lot_size
-                ) / base_factor
+                actual_price = node.key["price"] * lot_size_ratio * native_to_ui
+                actual_quantity = (node.quantity * base_lot_size) / base_factor
 
                 orders += [
                     Order(
@@ -119,6 +119,23 @@ def instruction_builder(
     dry_run: bool = False,
 ) -> MarketInstructionBuilder:
     loaded_market: LoadedMarket = market(context, symbol)
+    return instruction_builder_for_market(
+        context, wallet, account, loaded_market, dry_run
+    )
+
+
+# # 🥭 instruction_builder_for_market
+#
+# This function deals with the creation of a `MarketInstructionBuilder` object for an
+# already-loaded market.
+#
+def instruction_builder_for_market(
+    context: Context,
+    wallet: Wallet,
+    account: Account,
+    loaded_market: LoadedMarket,
+    dry_run: bool = False,
+) -> MarketInstructionBuilder:
     if dry_run:
         return NullMarketInstructionBuilder(loaded_market.fully_qualified_symbol)
 
@@ -145,7 +162,9 @@ def instruction_builder(
             account,
         )
 
-    raise Exception(f"Could not find instructions builder for market {symbol}")
+    raise Exception(
+        f"Could not find instructions builder for market {loaded_market.fully_qualified_symbol}"
+    )
 
 
 # # 🥭 operations
@@ -160,39 +179,35 @@ def operations(
     dry_run: bool = False,
 ) -> MarketOperations:
     loaded_market: LoadedMarket = market(context, symbol)
-    if dry_run:
-        return NullMarketOperations(loaded_market)
+    builder: MarketInstructionBuilder = instruction_builder_for_market(
+        context, wallet, account, loaded_market, dry_run
+    )
+    return operations_for_instruction_builder(
+        context, wallet, account, loaded_market, builder
+    )
 
-    if SerumMarket.isa(loaded_market):
-        serum_market_instruction_builder: SerumMarketInstructionBuilder = (
-            SerumMarketInstructionBuilder.load(
-                context, wallet, SerumMarket.ensure(loaded_market)
-            )
-        )
-        return SerumMarketOperations(context, wallet, serum_market_instruction_builder)
-    elif SpotMarket.isa(loaded_market):
-        spot_market = SpotMarket.ensure(loaded_market)
-        spot_market_instruction_builder: SpotMarketInstructionBuilder = (
-            SpotMarketInstructionBuilder.load(
-                context, wallet, spot_market, spot_market.group, account
-            )
-        )
-        return SpotMarketOperations(
-            context, wallet, account, spot_market_instruction_builder
-        )
-    elif PerpMarket.isa(loaded_market):
-        perp_market = PerpMarket.ensure(loaded_market)
-        perp_market_instruction_builder: PerpMarketInstructionBuilder = (
-            PerpMarketInstructionBuilder.load(
-                context,
-                wallet,
-                perp_market,
-                perp_market.underlying_perp_market.group,
-                account,
-            )
-        )
-        return PerpMarketOperations(
-            context, wallet, account, perp_market_instruction_builder
-        )
 
-    raise Exception(f"Could not find operations for market {symbol}")
+# # 🥭 operations_for_instruction_builder
+#
+# This function deals with the creation of a `MarketOperations` object for an already-loaded
+# market, using an existing `MarketInstructionBuilder` for that market.
+#
+def operations_for_instruction_builder(
+    context: Context,
+    wallet: Wallet,
+    account: Account,
+    loaded_market: LoadedMarket,
+    builder: MarketInstructionBuilder,
+) -> MarketOperations:
+    if isinstance(builder, NullMarketInstructionBuilder):
+        return NullMarketOperations(loaded_market)
+    elif isinstance(builder, SerumMarketInstructionBuilder):
+        return SerumMarketOperations(context, wallet, builder)
+    elif isinstance(builder, SpotMarketInstructionBuilder):
+        return SpotMarketOperations(context, wallet, account, builder)
+    elif isinstance(builder, PerpMarketInstructionBuilder):
+        return PerpMarketOperations(context, wallet, account, builder)
+
+    raise Exception(
+        f"Could not find operations for market {loaded_market.fully_qualified_symbol}"
+    )
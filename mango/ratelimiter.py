@@ -0,0 +1,378 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+import abc
+import contextlib
+import contextvars
+import enum
+import logging
+import threading
+import time
+import typing
+
+from dataclasses import dataclass, field
+
+
+# # 🥭 RequestPriority enum
+#
+# How important an RPC request is. When a provider's budget is tight, `TRANSACTION` requests
+# (sending transactions) go first, then `MODEL` requests (refreshing the data used to decide what
+# to do), and `BACKGROUND` requests (scans, reports, balance checks) wait until there's budget to
+# spare.
+#
+class RequestPriority(enum.Enum):
+    # We use strings here so that argparse can work with these as parameters.
+    TRANSACTION = "TRANSACTION"
+    MODEL = "MODEL"
+    BACKGROUND = "BACKGROUND"
+
+    @property
+    def rank(self) -> int:
+        return _PRIORITY_RANKS[self]
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+_PRIORITY_RANKS: typing.Dict[RequestPriority, int] = {
+    RequestPriority.TRANSACTION: 0,
+    RequestPriority.MODEL: 1,
+    RequestPriority.BACKGROUND: 2,
+}
+
+# Methods that are almost always part of a scan or a report rather than the trading loop.
+_BACKGROUND_METHODS: typing.Set[str] = {
+    "getConfirmedSignaturesForAddress2",
+    "getConfirmedTransaction",
+    "getProgramAccounts",
+    "getSignaturesForAddress",
+    "getTokenAccountsByOwner",
+    "getTransaction",
+}
+
+_requested_priority: contextvars.ContextVar[
+    typing.Optional[RequestPriority]
+] = contextvars.ContextVar("requested_priority", default=None)
+
+
+# # 🥭 request_priority function
+#
+# Runs the requests made inside the `with` block at the given priority, whatever their RPC
+# method. For example:
+# ```
+# with mango.request_priority(mango.RequestPriority.BACKGROUND):
+#     balances = mango.InstrumentValue.fetch_total_values(context, wallet.address, tokens)
+# ```
+#
+@contextlib.contextmanager
+def request_priority(priority: RequestPriority) -> typing.Iterator[None]:
+    token = _requested_priority.set(priority)
+    try:
+        yield
+    finally:
+        _requested_priority.reset(token)
+
+
+# # 🥭 priority_for_method function
+#
+# The priority of a request for the given RPC method - the priority set by `request_priority()`
+# if there is one, otherwise one based on the method.
+#
+def priority_for_method(method: str) -> RequestPriority:
+    requested = _requested_priority.get()
+    if requested is not None:
+        return requested
+    if method == "sendTransaction":
+        return RequestPriority.TRANSACTION
+    if method in _BACKGROUND_METHODS:
+        return RequestPriority.BACKGROUND
+    return RequestPriority.MODEL
+
+
+# # 🥭 RateLimitSettings class
+#
+# The budgets for one RPC provider. `requests_per_second` and `bytes_per_second` are refill
+# rates, and the bursts are how much can be used at once after a quiet period. A rate of `None`
+# means there's no budget for that dimension.
+#
+# `reserves` is the fraction of each budget a priority has to leave for more important
+# requests.
+#
+@dataclass(frozen=True)
+class RateLimitSettings:
+    requests_per_second: typing.Optional[float] = None
+    bytes_per_second: typing.Optional[float] = None
+    request_burst: typing.Optional[float] = None
+    bytes_burst: typing.Optional[float] = None
+    reserves: typing.Dict[RequestPriority, float] = field(
+        default_factory=lambda: {
+            RequestPriority.TRANSACTION: 0.0,
+            RequestPriority.MODEL: 0.2,
+            RequestPriority.BACKGROUND: 0.5,
+        }
+    )
+
+    # One second's worth of requests, but never so few that a request from the priority with the
+    # biggest reserve can't go ahead from a full bucket.
+    @property
+    def default_request_burst(self) -> float:
+        largest_reserve = max(self.reserves.values(), default=0.0)
+        smallest_useful = 1.0 / (1.0 - min(largest_reserve, 0.9))
+        return max(self.requests_per_second or 0.0, smallest_useful)
+
+    @property
+    def is_limited(self) -> bool:
+        return self.requests_per_second is not None or self.bytes_per_second is not None
+
+    def __str__(self) -> str:
+        return f"« RateLimitSettings [requests per second: {self.requests_per_second}, bytes per second: {self.bytes_per_second}] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 RateLimiterStatistics class
+#
+# How many requests each priority has made, and how long in total they were held back waiting
+# for budget.
+#
+@dataclass
+class RateLimiterStatistics:
+    requests: typing.Dict[RequestPriority, int]
+    throttled_seconds: typing.Dict[RequestPriority, float]
+    bytes_received: int
+
+    def __str__(self) -> str:
+        by_priority = ", ".join(
+            f"{priority}: {self.requests[priority]} requests, {self.throttled_seconds[priority]:.2f}s throttled"
+            for priority in RequestPriority
+        )
+        return f"« RateLimiterStatistics [{by_priority}, bytes received: {self.bytes_received:,}] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 TokenBucket class
+#
+# A token bucket that refills at `rate` tokens per second up to `capacity`. The level can go
+# negative if more is used than was available, which is how response bandwidth (only known
+# after the fact) is charged.
+#
+# Not thread-safe - `TokenBucketRateLimiter` does the locking.
+#
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.level: float = capacity
+        self.__updated_at: float = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        elapsed = max(now - self.__updated_at, 0.0)
+        self.level = min(self.capacity, self.level + (elapsed * self.rate))
+        self.__updated_at = now
+
+    # How long until `amount` can be taken while leaving `reserve` (a fraction of the capacity)
+    # behind. The level never goes above the capacity, so the reserve is cut down to whatever
+    # still lets `amount` be taken from a full bucket - otherwise the wait would never end.
+    def seconds_until_available(self, amount: float, reserve: float) -> float:
+        needed = min(amount + (reserve * self.capacity), max(self.capacity, amount))
+        shortfall = needed - self.level
+        if shortfall <= 0:
+            return 0.0
+        return shortfall / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def __str__(self) -> str:
+        return f"« TokenBucket {self.level:,.1f}/{self.capacity:,.1f} (+{self.rate:,.1f}/s) »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 RateLimiter class
+#
+# Decides when an RPC request can be made. `acquire()` is called before a request and blocks
+# until it's allowed, and `record_response()` is called with the size of the response.
+#
+class RateLimiter(metaclass=abc.ABCMeta):
+    @abc.abstractmethod
+    def acquire(self, priority: RequestPriority) -> None:
+        raise NotImplementedError(
+            "RateLimiter.acquire() is not implemented on the base type."
+        )
+
+    @abc.abstractmethod
+    def record_response(self, size: int) -> None:
+        raise NotImplementedError(
+            "RateLimiter.record_response() is not implemented on the base type."
+        )
+
+    @abc.abstractmethod
+    def statistics(self) -> RateLimiterStatistics:
+        raise NotImplementedError(
+            "RateLimiter.statistics() is not implemented on the base type."
+        )
+
+
+# # 🥭 NullRateLimiter class
+#
+# A `RateLimiter` that never holds anything back.
+#
+class NullRateLimiter(RateLimiter):
+    def acquire(self, priority: RequestPriority) -> None:
+        pass
+
+    def record_response(self, size: int) -> None:
+        pass
+
+    def statistics(self) -> RateLimiterStatistics:
+        return RateLimiterStatistics(
+            {priority: 0 for priority in RequestPriority},
+            {priority: 0.0 for priority in RequestPriority},
+            0,
+        )
+
+    def __str__(self) -> str:
+        return "« NullRateLimiter »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 TokenBucketRateLimiter class
+#
+# A `RateLimiter` with a token bucket for requests and another for response bytes.
+#
+# A request can go ahead when there's a request token available and the bandwidth bucket isn't
+# in debt, in both cases leaving behind its priority's reserve. Transactions are the exception for
+# bandwidth: response sizes are only charged after the fact, so the debt is usually from someone
+# else's big response (like a background `getProgramAccounts`), and a transaction's own response is
+# tiny. While a more important request is
+# waiting, less important ones wait too, so a background scan can't take the budget from under
+# an order being placed.
+#
+class TokenBucketRateLimiter(RateLimiter):
+    def __init__(self, settings: RateLimitSettings) -> None:
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self.settings: RateLimitSettings = settings
+        self.__requests: typing.Optional[TokenBucket] = None
+        if settings.requests_per_second is not None:
+            self.__requests = TokenBucket(
+                settings.requests_per_second,
+                settings.request_burst or settings.default_request_burst,
+            )
+        self.__bandwidth: typing.Optional[TokenBucket] = None
+        if settings.bytes_per_second is not None:
+            self.__bandwidth = TokenBucket(
+                settings.bytes_per_second,
+                settings.bytes_burst or settings.bytes_per_second,
+            )
+
+        self.__condition: threading.Condition = threading.Condition()
+        self.__waiting: typing.Dict[RequestPriority, int] = {
+            priority: 0 for priority in RequestPriority
+        }
+        self.__request_counts: typing.Dict[RequestPriority, int] = {
+            priority: 0 for priority in RequestPriority
+        }
+        self.__throttled_seconds: typing.Dict[RequestPriority, float] = {
+            priority: 0.0 for priority in RequestPriority
+        }
+        self.__bytes_received: int = 0
+
+    def __more_important_waiting(self, priority: RequestPriority) -> bool:
+        return any(
+            count > 0
+            for other, count in self.__waiting.items()
+            if other.rank < priority.rank
+        )
+
+    def __seconds_until_allowed(self, priority: RequestPriority, now: float) -> float:
+        reserve = self.settings.reserves.get(priority, 0.0)
+        wait = 0.0
+        if self.__requests is not None:
+            self.__requests.refill(now)
+            wait = max(wait, self.__requests.seconds_until_available(1, reserve))
+        if self.__bandwidth is not None and priority != RequestPriority.TRANSACTION:
+            self.__bandwidth.refill(now)
+            wait = max(wait, self.__bandwidth.seconds_until_available(0, reserve))
+        return wait
+
+    def acquire(self, priority: RequestPriority) -> None:
+        started_at = time.monotonic()
+        with self.__condition:
+            self.__waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = self.__seconds_until_allowed(priority, now)
+                    if wait <= 0 and not self.__more_important_waiting(priority):
+                        if self.__requests is not None:
+                            self.__requests.take(1)
+                        break
+
+                    # Woken early if a more important request goes ahead, since that changes
+                    # the budget left.
+                    self.__condition.wait(max(wait, 0.001))
+            finally:
+                self.__waiting[priority] -= 1
+                self.__condition.notify_all()
+
+            throttled = time.monotonic() - started_at
+            self.__request_counts[priority] += 1
+            self.__throttled_seconds[priority] += throttled
+
+        if throttled > 1:
+            self._logger.debug(
+                f"{priority} request throttled for {throttled:.2f} seconds."
+            )
+
+    def record_response(self, size: int) -> None:
+        with self.__condition:
+            self.__bytes_received += size
+            if self.__bandwidth is not None:
+                self.__bandwidth.refill(time.monotonic())
+                self.__bandwidth.take(size)
+
+    def statistics(self) -> RateLimiterStatistics:
+        with self.__condition:
+            return RateLimiterStatistics(
+                dict(self.__request_counts),
+                dict(self.__throttled_seconds),
+                self.__bytes_received,
+            )
+
+    def __str__(self) -> str:
+        return f"« TokenBucketRateLimiter [requests: {self.__requests}, bandwidth: {self.__bandwidth}] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 build_rate_limiter function
+#
+# Builds the `RateLimiter` for one RPC provider from its settings.
+#
+def build_rate_limiter(settings: typing.Optional[RateLimitSettings]) -> RateLimiter:
+    if settings is None or not settings.is_limited:
+        return NullRateLimiter()
+    return TokenBucketRateLimiter(settings)
@@ -14,7 +14,6 @@
 #   [Email](mailto:hello@blockworks.foundation)
 
 
-import json
 import logging
 import rx
 import rx.subject
@@ -27,6 +26,7 @@ import websocket
 from threading import Thread
 
 from .datetimes import local_now
+from .jsonbackend import json_loads
 
 
 # # 🥭 ReconnectingWebsocket class
@@ -35,6 +35,9 @@ from .datetimes import local_now
 # mechanism. If an error disconnects the websocket, it will automatically reconnect. It
 # will continue to automatically reconnect, until it is explicitly closed.
 #
+# Set `daemon` to `True` before calling `open()` if the websocket shouldn't keep the process
+# running on its own.
+#
 class ReconnectingWebsocket:
     def __init__(
         self, url: str, on_open_call: typing.Callable[[websocket.WebSocketApp], None]
@@ -45,6 +48,7 @@ class ReconnectingWebsocket:
         self.reconnect_required: bool = True
         self.pause_on_error: float = 0.0
         self.ping_interval: int = 0
+        self.daemon: bool = False
         self.connecting: rx.subject.behaviorsubject.BehaviorSubject = (
             rx.subject.behaviorsubject.BehaviorSubject(local_now())
         )
@@ -81,7 +85,7 @@ class ReconnectingWebsocket:
 
     def _on_message(self, _: typing.Any, message: str) -> None:
         try:
-            data = json.loads(message)
+            data = json_loads(message)
             self.item.on_next(data)
         except Exception:
             self._logger.error(f"Problem sending update: {traceback.format_exc()}")
@@ -96,7 +100,7 @@ class ReconnectingWebsocket:
         self.pong.on_next(local_now())
 
     def open(self) -> None:
-        thread = Thread(target=self._run)
+        thread = Thread(target=self._run, daemon=self.daemon)
         thread.start()
 
     def send(self, message: str) -> None:
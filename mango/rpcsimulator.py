@@ -0,0 +1,782 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+
+import base58
+import base64
+import glob
+import hashlib
+import http.server
+import io
+import itertools
+import json
+import logging
+import os.path
+import random
+import socket
+import struct
+import threading
+import time
+import types
+import typing
+
+from dataclasses import dataclass, field
+from solana.utils import shortvec_encoding
+
+from .accountinfo import AccountInfo
+from .client import ClusterUrlData
+from .encoding import decode_binary
+
+
+# # 🥭 RPC Simulator
+#
+# A local stand-in for a Solana RPC node, for load-testing market makers, keepers and crankers without
+# touching a real node.
+#
+# The `RPCSimulator` serves JSON-RPC over HTTP and the websocket subscription API on the same port, so a
+# `ClusterUrlData` built from its `rpc_url` gets the right websocket URL automatically. It serves:
+# * `getAccountInfo`, `getMultipleAccounts` and `getProgramAccounts` from recorded `AccountInfo`s (for example
+#   the JSON files in `tests/testdata`, or anything written by `AccountInfo.save_json()`),
+# * `getRecentBlockhash`, `getLatestBlockhash`, `getSlot` and `getSignatureStatuses`,
+# * `sendTransaction`, which 'confirms' the transaction after a configurable delay,
+# * `accountSubscribe`, `programSubscribe` and `signatureSubscribe` (and their `Unsubscribe`s) on the websocket.
+#
+# Nothing is executed - transactions are accepted, given a status, and otherwise ignored. Accounts only
+# change when `update_account()` is called, but with a non-zero `account_update_interval` all subscribed
+# accounts are re-sent to their subscribers at that interval, to simulate a busy market.
+#
+
+
+# # 🥭 RPCSimulatorSettings class
+#
+# How the `RPCSimulator` should behave. All times are in seconds and all rates are fractions between 0 and 1.
+#
+# * `latency` and `jitter`: every HTTP response is delayed by `latency` plus a random amount up to `jitter`.
+# * `rate_limit_rate`: the fraction of HTTP requests rejected with a 429 'Too Many Requests' status.
+# * `error_rate`: the fraction of HTTP requests that get a JSON-RPC error - 'node is behind' for reads, and
+#   'blockhash not found' for `sendTransaction`.
+# * `transaction_failure_rate`: the fraction of sent transactions that are given a failed status.
+# * `confirmation_delay`: how long after `sendTransaction` a transaction's status becomes available.
+# * `slot_interval`: how often the slot advances.
+# * `account_update_interval`: how often subscribed accounts are re-sent to subscribers (0 to turn this off).
+# * `seed`: seed for the random number generator, for repeatable runs.
+#
+@dataclass
+class RPCSimulatorSettings:
+    latency: float = 0.0
+    jitter: float = 0.0
+    rate_limit_rate: float = 0.0
+    error_rate: float = 0.0
+    transaction_failure_rate: float = 0.0
+    confirmation_delay: float = 0.0
+    slot_interval: float = 0.4
+    account_update_interval: float = 0.0
+    seed: typing.Optional[int] = None
+
+
+# # 🥭 RPCSimulatorStatistics class
+#
+# Counts of what the `RPCSimulator` has done, as returned by `RPCSimulator.statistics()`.
+#
+@dataclass
+class RPCSimulatorStatistics:
+    requests: typing.Dict[str, int] = field(default_factory=dict)
+    rate_limited: int = 0
+    errors: int = 0
+    transactions: int = 0
+    notifications: int = 0
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def __str__(self) -> str:
+        requests = "\n        ".join(
+            f"{method:<25} {count:>10,}"
+            for method, count in sorted(self.requests.items())
+        )
+        return f"""« RPCSimulatorStatistics:
+    Requests: {self.total_requests:,}
+        {requests or "None"}
+    Rate Limited: {self.rate_limited:,}
+    Errors: {self.errors:,}
+    Transactions: {self.transactions:,}
+    Notifications: {self.notifications:,}
+»"""
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+class _RPCError(Exception):
+    def __init__(
+        self, code: int, message: str, data: typing.Optional[typing.Any] = None
+    ) -> None:
+        super().__init__(message)
+        self.code: int = code
+        self.message: str = message
+        self.data: typing.Optional[typing.Any] = data
+
+    def to_json(self) -> typing.Dict[str, typing.Any]:
+        error: typing.Dict[str, typing.Any] = {
+            "code": self.code,
+            "message": self.message,
+        }
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+# # 🥭 _WebSocketConnection class
+#
+# Just enough of RFC 6455 to talk to websocket clients: text messages, fragmentation, ping/pong and close.
+# Clients must mask their frames, servers must not.
+#
+class _WebSocketConnection:
+    _GUID: str = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+    _TEXT: int = 0x1
+    _CLOSE: int = 0x8
+    _PING: int = 0x9
+    _PONG: int = 0xA
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        reader: io.BufferedIOBase,
+        writer: io.BufferedIOBase,
+    ) -> None:
+        self.socket: socket.socket = sock
+        self.reader: io.BufferedIOBase = reader
+        self.writer: io.BufferedIOBase = writer
+        self.subscriptions: typing.Set[int] = set()
+        self.__write_lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def accept_key(key: str) -> str:
+        digest = hashlib.sha1(f"{key}{_WebSocketConnection._GUID}".encode()).digest()
+        return base64.b64encode(digest).decode()
+
+    def receive(self) -> typing.Optional[str]:
+        message: bytes = b""
+        while True:
+            header: bytes = self.reader.read(2)
+            if len(header) < 2:
+                return None
+            final: bool = (header[0] & 0x80) != 0
+            opcode: int = header[0] & 0x0F
+            length: int = header[1] & 0x7F
+            if length == 126:
+                length = struct.unpack(">H", self.reader.read(2))[0]
+            elif length == 127:
+                length = struct.unpack(">Q", self.reader.read(8))[0]
+            mask: bytes = self.reader.read(4) if header[1] & 0x80 else b""
+            payload: bytes = self.reader.read(length)
+            if mask:
+                payload = bytes(
+                    byte ^ mask[index % 4] for index, byte in enumerate(payload)
+                )
+
+            if opcode == _WebSocketConnection._CLOSE:
+                self.send_frame(_WebSocketConnection._CLOSE, payload[:2])
+                return None
+            elif opcode == _WebSocketConnection._PING:
+                self.send_frame(_WebSocketConnection._PONG, payload)
+            elif opcode != _WebSocketConnection._PONG:
+                message += payload
+                if final:
+                    return message.decode()
+
+    def send(self, message: str) -> None:
+        self.send_frame(_WebSocketConnection._TEXT, message.encode())
+
+    def send_frame(self, opcode: int, payload: bytes) -> None:
+        length: int = len(payload)
+        header: bytes
+        if length < 126:
+            header = struct.pack(">BB", 0x80 | opcode, length)
+        elif length < 65536:
+            header = struct.pack(">BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack(">BBQ", 0x80 | opcode, 127, length)
+        with self.__write_lock:
+            self.writer.write(header + payload)
+            self.writer.flush()
+
+    def close(self) -> None:
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _RPCSimulatorRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_RPCSimulatorHTTPServer"
+
+    def do_POST(self) -> None:
+        body: bytes = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status, response = self.server.simulator._handle_http(body)
+        encoded: bytes = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def do_GET(self) -> None:
+        key: typing.Optional[str] = self.headers.get("Sec-WebSocket-Key")
+        if self.headers.get("Upgrade", "").lower() != "websocket" or key is None:
+            self.send_error(400, "Only websocket upgrades are supported by GET")
+            return
+
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", _WebSocketConnection.accept_key(key))
+        self.end_headers()
+        self.wfile.flush()
+
+        self.server.simulator._serve_websocket(
+            _WebSocketConnection(self.connection, self.rfile, self.wfile)
+        )
+        self.close_connection = True
+
+    def log_message(self, format: str, *args: typing.Any) -> None:
+        self.server.simulator._logger.debug(format % args)
+
+
+class _RPCSimulatorHTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: typing.Tuple[str, int], simulator: "RPCSimulator"):
+        super().__init__(address, _RPCSimulatorRequestHandler)
+        self.simulator: RPCSimulator = simulator
+
+
+# # 🥭 RPCSimulator class
+#
+# Serves recorded accounts as if it were a Solana RPC node. Use it as a context manager, or call `start()` and
+# `dispose()` yourself:
+# ```
+# accounts = RPCSimulator.load_account_infos("tests/testdata/account4")
+# with RPCSimulator(accounts, RPCSimulatorSettings(latency=0.05, jitter=0.02)) as simulator:
+#     context = mango.ContextBuilder.build(cluster_urls=[simulator.cluster_url], ...)
+# ```
+# A `port` of 0 lets the operating system choose a free port.
+#
+class RPCSimulator:
+    def __init__(
+        self,
+        account_infos: typing.Sequence[AccountInfo],
+        settings: RPCSimulatorSettings = RPCSimulatorSettings(),
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self.settings: RPCSimulatorSettings = settings
+        self.host: str = host
+        self.port: int = port
+
+        self.__lock: threading.Lock = threading.Lock()
+        self.__random: random.Random = random.Random(settings.seed)
+        self.__slot: int = 1
+        self.__accounts: typing.Dict[str, AccountInfo] = {
+            str(account_info.address): account_info for account_info in account_infos
+        }
+        self.__subscription_ids: typing.Iterator[int] = itertools.count(1)
+        self.__subscriptions: typing.Dict[
+            int, typing.Tuple[str, str, _WebSocketConnection]
+        ] = {}
+        self.__pending_transactions: typing.Dict[str, float] = {}
+        self.__transaction_statuses: typing.Dict[
+            str, typing.Tuple[int, typing.Optional[typing.Any]]
+        ] = {}
+        self.__connections: typing.Set[_WebSocketConnection] = set()
+        self.__statistics: RPCSimulatorStatistics = RPCSimulatorStatistics()
+        self.__server: typing.Optional[_RPCSimulatorHTTPServer] = None
+        self.__stop: threading.Event = threading.Event()
+        self.__threads: typing.List[threading.Thread] = []
+
+    @staticmethod
+    def load_account_infos(
+        *paths: str,
+    ) -> typing.Sequence[AccountInfo]:
+        filenames: typing.List[str] = []
+        for path in paths:
+            if os.path.isdir(path):
+                filenames += sorted(glob.glob(os.path.join(path, "*.json")))
+            else:
+                filenames += [path]
+
+        account_infos: typing.List[AccountInfo] = []
+        for filename in filenames:
+            with open(filename) as json_file:
+                if "address" not in json.load(json_file):
+                    continue
+            account_infos += [AccountInfo.load_json(filename)]
+        return account_infos
+
+    @property
+    def rpc_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    @property
+    def cluster_url(self) -> ClusterUrlData:
+        return ClusterUrlData(rpc=self.rpc_url, ws=self.ws_url)
+
+    @property
+    def slot(self) -> int:
+        with self.__lock:
+            return self.__slot
+
+    def start(self) -> None:
+        self.__stop.clear()
+        self.__server = _RPCSimulatorHTTPServer((self.host, self.port), self)
+        self.port = self.__server.server_address[1]
+        self.__threads = [
+            threading.Thread(target=self.__server.serve_forever, daemon=True),
+            threading.Thread(target=self.__run_clock, daemon=True),
+        ]
+        for thread in self.__threads:
+            thread.start()
+        self._logger.info(
+            f"RPC simulator serving {len(self.__accounts)} accounts on {self.rpc_url}"
+        )
+
+    def dispose(self) -> None:
+        self.__stop.set()
+        if self.__server is not None:
+            self.__server.shutdown()
+            with self.__lock:
+                connections = list(self.__connections)
+            for connection in connections:
+                connection.close()
+            self.__server.server_close()
+            self.__server = None
+        for thread in self.__threads:
+            thread.join()
+        self.__threads = []
+
+    def __enter__(self) -> "RPCSimulator":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: typing.Optional[typing.Type[BaseException]],
+        exc_value: typing.Optional[BaseException],
+        traceback: typing.Optional[types.TracebackType],
+    ) -> None:
+        self.dispose()
+
+    def statistics(self) -> RPCSimulatorStatistics:
+        with self.__lock:
+            return RPCSimulatorStatistics(
+                dict(self.__statistics.requests),
+                self.__statistics.rate_limited,
+                self.__statistics.errors,
+                self.__statistics.transactions,
+                self.__statistics.notifications,
+            )
+
+    def update_account(self, account_info: AccountInfo) -> None:
+        address: str = str(account_info.address)
+        with self.__lock:
+            self.__accounts[address] = account_info
+        self.__notify_account(address)
+
+    def _handle_http(
+        self, body: bytes
+    ) -> typing.Tuple[int, typing.Dict[str, typing.Any]]:
+        request: typing.Dict[str, typing.Any] = json.loads(body)
+        method: str = request.get("method", "")
+        id: typing.Any = request.get("id")
+        params: typing.Sequence[typing.Any] = request.get("params") or []
+
+        with self.__lock:
+            self.__count(method)
+            delay: float = self.settings.latency + self.__random.uniform(
+                0, self.settings.jitter
+            )
+            rate_limited: bool = self.__random.random() < self.settings.rate_limit_rate
+            errored: bool = self.__random.random() < self.settings.error_rate
+            if rate_limited:
+                self.__statistics.rate_limited += 1
+            elif errored:
+                self.__statistics.errors += 1
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if rate_limited:
+            return 429, self.__error_response(id, _RPCError(429, "Too many requests"))
+
+        try:
+            if errored:
+                raise self.__injected_error(method)
+            return 200, {
+                "jsonrpc": "2.0",
+                "id": id,
+                "result": self.__call(method, params),
+            }
+        except _RPCError as exception:
+            return 200, self.__error_response(id, exception)
+
+    def _serve_websocket(self, connection: _WebSocketConnection) -> None:
+        with self.__lock:
+            self.__connections.add(connection)
+        try:
+            while not self.__stop.is_set():
+                message: typing.Optional[str] = connection.receive()
+                if message is None:
+                    break
+                request: typing.Dict[str, typing.Any] = json.loads(message)
+                response: typing.Dict[str, typing.Any]
+                try:
+                    result = self.__subscribe(connection, request)
+                    response = {
+                        "jsonrpc": "2.0",
+                        "id": request.get("id"),
+                        "result": result,
+                    }
+                except _RPCError as exception:
+                    response = self.__error_response(request.get("id"), exception)
+                connection.send(json.dumps(response))
+                self.__notify_settled_signatures()
+        except (OSError, ValueError) as exception:
+            self._logger.debug(f"Websocket connection closed: {exception}")
+        finally:
+            with self.__lock:
+                self.__connections.discard(connection)
+                for subscription_id in connection.subscriptions:
+                    self.__subscriptions.pop(subscription_id, None)
+
+    def __call(self, method: str, params: typing.Sequence[typing.Any]) -> typing.Any:
+        config: typing.Dict[str, typing.Any]
+        if method == "getAccountInfo":
+            config = params[1] if len(params) > 1 else {}
+            with self.__lock:
+                return self.__with_context(
+                    self.__account_value(self.__accounts.get(params[0]), config)
+                )
+        elif method == "getMultipleAccounts":
+            config = params[1] if len(params) > 1 else {}
+            with self.__lock:
+                return self.__with_context(
+                    [
+                        self.__account_value(self.__accounts.get(address), config)
+                        for address in params[0]
+                    ]
+                )
+        elif method == "getProgramAccounts":
+            config = params[1] if len(params) > 1 else {}
+            with self.__lock:
+                program_accounts = [
+                    {
+                        "pubkey": address,
+                        "account": self.__account_value(account_info, config),
+                    }
+                    for address, account_info in self.__accounts.items()
+                    if str(account_info.owner) == params[0]
+                    and self.__matches_filters(account_info, config.get("filters", []))
+                ]
+                if config.get("withContext"):
+                    return self.__with_context(program_accounts)
+                return program_accounts
+        elif method == "getRecentBlockhash":
+            with self.__lock:
+                return self.__with_context(
+                    {
+                        "blockhash": self.__blockhash(),
+                        "feeCalculator": {"lamportsPerSignature": 5000},
+                    }
+                )
+        elif method == "getLatestBlockhash":
+            with self.__lock:
+                return self.__with_context(
+                    {
+                        "blockhash": self.__blockhash(),
+                        "lastValidBlockHeight": self.__slot + 150,
+                    }
+                )
+        elif method == "getSlot":
+            return self.slot
+        elif method == "getSignatureStatuses":
+            self.__settle_transactions()
+            with self.__lock:
+                return self.__with_context(
+                    [self.__signature_status(signature) for signature in params[0]]
+                )
+        elif method == "sendTransaction":
+            return self.__send_transaction(params[0])
+
+        raise _RPCError(-32601, "Method not found")
+
+    def __subscribe(
+        self, connection: _WebSocketConnection, request: typing.Dict[str, typing.Any]
+    ) -> typing.Any:
+        method: str = request.get("method", "")
+        params: typing.Sequence[typing.Any] = request.get("params") or []
+        with self.__lock:
+            self.__count(method)
+            if method in {"accountSubscribe", "programSubscribe", "signatureSubscribe"}:
+                subscription_id: int = next(self.__subscription_ids)
+                self.__subscriptions[subscription_id] = (method, params[0], connection)
+                connection.subscriptions.add(subscription_id)
+                return subscription_id
+            elif method in {
+                "accountUnsubscribe",
+                "programUnsubscribe",
+                "signatureUnsubscribe",
+            }:
+                connection.subscriptions.discard(params[0])
+                return self.__subscriptions.pop(params[0], None) is not None
+
+        raise _RPCError(-32601, "Method not found")
+
+    def __send_transaction(self, encoded: str) -> str:
+        transaction: bytes = base64.b64decode(encoded)
+        _, offset = shortvec_encoding.decode_length(transaction)
+        signature: str = base58.b58encode(transaction[offset : offset + 64]).decode()
+        with self.__lock:
+            self.__statistics.transactions += 1
+            self.__pending_transactions[signature] = (
+                time.monotonic() + self.settings.confirmation_delay
+            )
+        if self.settings.confirmation_delay <= 0:
+            self.__settle_transactions()
+        return signature
+
+    def __settle_transactions(self) -> None:
+        now: float = time.monotonic()
+        with self.__lock:
+            settled = [
+                signature
+                for signature, due in self.__pending_transactions.items()
+                if due <= now
+            ]
+            for signature in settled:
+                del self.__pending_transactions[signature]
+                failed: bool = (
+                    self.__random.random() < self.settings.transaction_failure_rate
+                )
+                error = {"InstructionError": [0, {"Custom": 1}]} if failed else None
+                self.__transaction_statuses[signature] = (self.__slot, error)
+
+        if len(settled) > 0:
+            self.__notify_settled_signatures()
+
+    def __notify_settled_signatures(self) -> None:
+        notifications: typing.List[typing.Tuple[_WebSocketConnection, str]] = []
+        with self.__lock:
+            for subscription_id, (method, signature, connection) in list(
+                self.__subscriptions.items()
+            ):
+                if method != "signatureSubscribe":
+                    continue
+                status = self.__transaction_statuses.get(signature)
+                if status is None:
+                    continue
+                # Signature subscriptions only ever fire once.
+                del self.__subscriptions[subscription_id]
+                connection.subscriptions.discard(subscription_id)
+                slot, error = status
+                notifications += [
+                    (
+                        connection,
+                        self.__notification(
+                            "signatureNotification",
+                            subscription_id,
+                            {"context": {"slot": slot}, "value": {"err": error}},
+                        ),
+                    )
+                ]
+        self.__send_notifications(notifications)
+
+    def __notify_account(self, address: str) -> None:
+        notifications: typing.List[typing.Tuple[_WebSocketConnection, str]] = []
+        with self.__lock:
+            account_info: typing.Optional[AccountInfo] = self.__accounts.get(address)
+            if account_info is None:
+                return
+            for subscription_id, (
+                method,
+                key,
+                connection,
+            ) in self.__subscriptions.items():
+                value: typing.Any
+                if method == "accountSubscribe" and key == address:
+                    value = self.__account_value(account_info, {})
+                    notifications += [
+                        (
+                            connection,
+                            self.__notification(
+                                "accountNotification",
+                                subscription_id,
+                                self.__with_context(value),
+                            ),
+                        )
+                    ]
+                elif method == "programSubscribe" and key == str(account_info.owner):
+                    value = {
+                        "pubkey": address,
+                        "account": self.__account_value(account_info, {}),
+                    }
+                    notifications += [
+                        (
+                            connection,
+                            self.__notification(
+                                "programNotification",
+                                subscription_id,
+                                self.__with_context(value),
+                            ),
+                        )
+                    ]
+        self.__send_notifications(notifications)
+
+    def __send_notifications(
+        self, notifications: typing.Sequence[typing.Tuple[_WebSocketConnection, str]]
+    ) -> None:
+        for connection, notification in notifications:
+            try:
+                connection.send(notification)
+            except (OSError, ValueError) as exception:
+                self._logger.debug(f"Could not send notification: {exception}")
+        if len(notifications) > 0:
+            with self.__lock:
+                self.__statistics.notifications += len(notifications)
+
+    def __run_clock(self) -> None:
+        next_slot_at: float = time.monotonic() + self.settings.slot_interval
+        next_update_at: float = time.monotonic() + self.settings.account_update_interval
+        while not self.__stop.wait(0.01):
+            now: float = time.monotonic()
+            if now >= next_slot_at:
+                with self.__lock:
+                    self.__slot += 1
+                next_slot_at = now + self.settings.slot_interval
+
+            if self.settings.account_update_interval > 0 and now >= next_update_at:
+                with self.__lock:
+                    subscribed: typing.Set[str] = {
+                        key
+                        for method, key, _ in self.__subscriptions.values()
+                        if method == "accountSubscribe"
+                    }
+                for address in subscribed:
+                    self.__notify_account(address)
+                next_update_at = now + self.settings.account_update_interval
+
+            self.__settle_transactions()
+
+    # These methods expect the lock to already be held.
+    def __count(self, method: str) -> None:
+        self.__statistics.requests[method] = (
+            self.__statistics.requests.get(method, 0) + 1
+        )
+
+    def __with_context(self, value: typing.Any) -> typing.Dict[str, typing.Any]:
+        return {"context": {"slot": self.__slot}, "value": value}
+
+    def __blockhash(self) -> str:
+        return base58.b58encode(
+            hashlib.sha256(f"blockhash {self.__slot}".encode()).digest()
+        ).decode()
+
+    def __signature_status(
+        self, signature: str
+    ) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        status = self.__transaction_statuses.get(signature)
+        if status is None:
+            return None
+        slot, error = status
+        return {
+            "slot": slot,
+            "confirmations": None,
+            "err": error,
+            "status": {"Ok": None} if error is None else {"Err": error},
+            "confirmationStatus": "finalized",
+        }
+
+    def __injected_error(self, method: str) -> _RPCError:
+        if method == "sendTransaction":
+            return _RPCError(
+                -32002,
+                "Transaction simulation failed: Blockhash not found",
+                {"accounts": None, "err": "BlockhashNotFound", "logs": []},
+            )
+        return _RPCError(-32005, "Node is behind by 42 slots", {"numSlotsBehind": 42})
+
+    @staticmethod
+    def __account_value(
+        account_info: typing.Optional[AccountInfo], config: typing.Dict[str, typing.Any]
+    ) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        if account_info is None:
+            return None
+        data: bytes = account_info.data
+        data_slice: typing.Optional[typing.Dict[str, int]] = config.get("dataSlice")
+        if data_slice is not None:
+            data = data[
+                data_slice["offset"] : data_slice["offset"] + data_slice["length"]
+            ]
+        return {
+            "data": [base64.b64encode(data).decode(), "base64"],
+            "executable": account_info.executable,
+            "lamports": int(account_info.lamports),
+            "owner": str(account_info.owner),
+            "rentEpoch": int(account_info.rent_epoch),
+        }
+
+    @staticmethod
+    def __matches_filters(
+        account_info: AccountInfo,
+        filters: typing.Sequence[typing.Dict[str, typing.Any]],
+    ) -> bool:
+        for account_filter in filters:
+            if "dataSize" in account_filter:
+                if len(account_info.data) != account_filter["dataSize"]:
+                    return False
+            elif "memcmp" in account_filter:
+                offset: int = account_filter["memcmp"]["offset"]
+                expected: bytes = decode_binary(account_filter["memcmp"]["bytes"])
+                if account_info.data[offset : offset + len(expected)] != expected:
+                    return False
+        return True
+
+    @staticmethod
+    def __notification(method: str, subscription_id: int, result: typing.Any) -> str:
+        return json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": {"result": result, "subscription": subscription_id},
+            }
+        )
+
+    @staticmethod
+    def __error_response(
+        id: typing.Any, error: _RPCError
+    ) -> typing.Dict[str, typing.Any]:
+        return {"jsonrpc": "2.0", "id": id, "error": error.to_json()}
+
+    def __str__(self) -> str:
+        return f"« RPCSimulator [{self.rpc_url}]: {len(self.__accounts)} accounts, slot {self.slot} »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
@@ -37,6 +37,8 @@ from .websocketsubscription import (
 # `SerumEventFlags` stores flags describing a `SerumEvent`.
 #
 class SerumEventFlags:
+    __slots__ = ("version", "fill", "out", "bid", "maker")
+
     def __init__(
         self, version: Version, fill: bool, out: bool, bid: bool, maker: bool
     ) -> None:
@@ -73,7 +75,26 @@ class SerumEventFlags:
 #
 # `SerumEvent` stores details of an actual event in Serum.
 #
+# Like `PerpEvent`s, `SerumEvent`s are built in bulk on every event queue update so they use
+# `__slots__` to keep them compact.
+#
 class SerumEvent:
+    __slots__ = (
+        "version",
+        "event_flags",
+        "base",
+        "quote",
+        "open_order_slot",
+        "fee_tier",
+        "native_quantity_released",
+        "native_quantity_paid",
+        "native_fee_or_rebate",
+        "order_id",
+        "public_key",
+        "client_order_id",
+        "original_index",
+    )
+
     def __init__(
         self,
         version: Version,
@@ -20,6 +20,7 @@ from datetime import datetime
 from decimal import Decimal
 from pyserum.market.market import Market as PySerumMarket
 from pyserum.market.orderbook import OrderBook as PySerumOrderBook
+from pyserum.market.state import MarketState as PySerumMarketState
 from solana.publickey import PublicKey
 
 from mango.datetimes import utc_now
@@ -52,6 +53,39 @@ from .websocketsubscription import (
 )
 
 
+# # 🥭 load_pyserum_market function
+#
+# pyserum's `Market.load()` fetches the market account and both mint accounts itself. This loads the market
+# account through `AccountInfo.load()` instead (so it can come from the account cache) and takes the mint
+# decimals from the `Token`s we already have.
+#
+def load_pyserum_market(
+    context: Context, address: PublicKey, base: Token, quote: Token
+) -> PySerumMarket:
+    account_info: typing.Optional[AccountInfo] = AccountInfo.load(context, address)
+    if account_info is None:
+        raise Exception(f"Serum market account not found at address '{address}'")
+
+    return parse_pyserum_market(context, account_info, base, quote)
+
+
+# # 🥭 parse_pyserum_market function
+#
+# Builds a pyserum `Market` from an already-fetched market `AccountInfo`, for callers that fetch many
+# market accounts at once.
+#
+def parse_pyserum_market(
+    context: Context, account_info: AccountInfo, base: Token, quote: Token
+) -> PySerumMarket:
+    market_state: PySerumMarketState = PySerumMarketState(
+        PySerumMarketState._make_parsed_market(account_info.data),
+        context.serum_program_address,
+        int(base.decimals),
+        int(quote.decimals),
+    )
+    return PySerumMarket(context.client.compatible_client, market_state)
+
+
 # # 🥭 SerumMarket class
 #
 # This class encapsulates our knowledge of a Serum spot market.
@@ -232,10 +266,8 @@ class SerumMarketInstructionBuilder(MarketInstructionBuilder):
     def load(
         context: Context, wallet: Wallet, serum_market: SerumMarket
     ) -> "SerumMarketInstructionBuilder":
-        raw_market: PySerumMarket = PySerumMarket.load(
-            context.client.compatible_client,
-            serum_market.address,
-            context.serum_program_address,
+        raw_market: PySerumMarket = load_pyserum_market(
+            context, serum_market.address, serum_market.base, serum_market.quote
         )
 
         fee_discount_token_address: PublicKey = SYSTEM_PROGRAM_ADDRESS
@@ -459,11 +491,21 @@ class SerumMarketOperations(MarketOperations):
     def place_order(
         self, order: Order, crank_limit: Decimal = Decimal(5)
     ) -> typing.Sequence[str]:
-        client_id: int = order.client_id or self.context.generate_client_id()
         signers: CombinableInstructions = CombinableInstructions.from_wallet(
             self.wallet
         )
+        place: CombinableInstructions = self.build_place_order_instructions(
+            order, crank_limit
+        )
 
+        return (signers + place).execute(self.context)
+
+    # Builds the instructions to place the order, crank the market and settle, without executing them,
+    # so they can be combined with other instructions.
+    def build_place_order_instructions(
+        self, order: Order, crank_limit: Decimal = Decimal(5)
+    ) -> CombinableInstructions:
+        client_id: int = order.client_id or self.context.generate_client_id()
         open_orders_address = (
             self.market_instruction_builder.open_orders_address
             or SYSTEM_PROGRAM_ADDRESS
@@ -491,7 +533,7 @@ class SerumMarketOperations(MarketOperations):
             self.market_instruction_builder.build_settle_instructions()
         )
 
-        return (signers + place + crank + settle).execute(self.context)
+        return place + crank + settle
 
     def settle(self) -> typing.Sequence[str]:
         signers: CombinableInstructions = CombinableInstructions.from_wallet(
@@ -593,10 +635,8 @@ class SerumMarketStub(Market):
         return f"serum:{self.symbol}"
 
     def load(self, context: Context) -> SerumMarket:
-        underlying_serum_market: PySerumMarket = PySerumMarket.load(
-            context.client.compatible_client,
-            self.address,
-            context.serum_program_address,
+        underlying_serum_market: PySerumMarket = load_pyserum_market(
+            context, self.address, self.base, self.quote
         )
         return SerumMarket(
             self.program_address,
@@ -0,0 +1,555 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+
+import json
+import logging
+import mmap
+import os
+import rx
+import rx.operators
+import struct
+import time
+import typing
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from solana.publickey import PublicKey
+
+from .accountinfo import AccountInfo
+from .cache import Cache
+from .constants import SYSTEM_PROGRAM_ADDRESS
+from .context import Context
+from .group import Group
+from .healthcheck import HealthCheck
+from .observables import Disposable
+from .oracle import Oracle, Price
+from .watcher import TWatched
+from .websocketsubscription import (
+    WebSocketAccountSubscription,
+    WebSocketSubscriptionManager,
+)
+
+
+# # 🥭 Shared Market Data
+#
+# Every market-maker process normally subscribes to the same group, cache and oracle accounts, and parses
+# every update. When several market-makers run on the same machine, a single publisher process can own those
+# subscriptions instead, writing the latest raw data into a memory-mapped file (usually in `/dev/shm`) that
+# all the market-makers read.
+#
+# The file holds a fixed set of named entries, each a seqlock: the writer makes the entry's sequence number
+# odd while it writes and even again when it's done, and readers retry if the sequence was odd or changed
+# while they read. There's only ever one writer. Readers never block the writer, and a reader only copies
+# the data out (once) and parses it when the sequence number shows it has changed.
+#
+# Python has no memory barriers, so this relies on the processor not reordering stores to the mapped memory
+# (which x86-64 guarantees).
+#
+# Parsed Python objects can't be shared between processes, so each reading process still parses an update
+# itself - but only once, and only when it next asks for it.
+#
+# The publisher also writes the time to a 'heartbeat' entry every second or so. Readers can't tell from
+# the other entries whether the publisher is still running (a quiet market doesn't change much), so they
+# check the heartbeat's age instead.
+#
+
+_MAGIC: bytes = b"MANGOSHM"
+_VERSION: int = 1
+_HEADER: struct.Struct = struct.Struct("<8sII")
+# sequence, slot, lamports, rent epoch, capacity, length, executable, name, owner
+_ENTRY_HEADER: struct.Struct = struct.Struct("<QQQQIIB7x64s32s")
+_SEQUENCE: struct.Struct = struct.Struct("<Q")
+_MAXIMUM_NAME_LENGTH: int = 64
+_HEARTBEAT_NAME: str = "heartbeat"
+_HEARTBEAT: struct.Struct = struct.Struct("<d")
+
+
+# # 🥭 SharedMarketDataEntry class
+#
+# A consistent snapshot of one entry in a `SharedMarketDataRegion`. A `sequence` of 0 means the entry has
+# never been written.
+#
+@dataclass
+class SharedMarketDataEntry:
+    name: str
+    sequence: int
+    slot: int
+    lamports: int
+    rent_epoch: int
+    executable: bool
+    owner: PublicKey
+    data: bytes
+
+    def to_account_info(self) -> AccountInfo:
+        return AccountInfo(
+            PublicKey(self.name),
+            self.executable,
+            Decimal(self.lamports),
+            self.owner,
+            Decimal(self.rent_epoch),
+            self.data,
+        )
+
+    def __str__(self) -> str:
+        return f"« SharedMarketDataEntry '{self.name}' [sequence: {self.sequence}, slot: {self.slot}]: {len(self.data)} bytes »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 SharedMarketDataRegion class
+#
+# A memory-mapped file of named, fixed-capacity entries. The publisher uses `create()` to lay out the file
+# and is the only process that writes. Readers use `open()`.
+#
+# Entries are named by account address for accounts, or by `shared_price_name()` for prices.
+#
+class SharedMarketDataRegion(Disposable):
+    def __init__(
+        self, filename: str, memory: mmap.mmap, offsets: typing.Dict[str, int]
+    ) -> None:
+        super().__init__()
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self.filename: str = filename
+        self.__memory: mmap.mmap = memory
+        self.__offsets: typing.Dict[str, int] = offsets
+
+    @staticmethod
+    def create(
+        filename: str, entries: typing.Sequence[typing.Tuple[str, int]]
+    ) -> "SharedMarketDataRegion":
+        size: int = _HEADER.size
+        offsets: typing.Dict[str, int] = {}
+        for name, capacity in entries:
+            if len(name.encode()) > _MAXIMUM_NAME_LENGTH:
+                raise Exception(
+                    f"Shared market data name '{name}' is longer than {_MAXIMUM_NAME_LENGTH} bytes."
+                )
+            offsets[name] = size
+            # Keep every entry 8-byte aligned so the sequence numbers are too.
+            size += _ENTRY_HEADER.size + ((capacity + 7) & ~7)
+
+        # Write to a temporary file and rename it, so readers never see a partly laid-out region.
+        temporary_filename: str = f"{filename}.{os.getpid()}.tmp"
+        with open(temporary_filename, "wb") as file:
+            file.truncate(size)
+        with open(temporary_filename, "r+b") as file:
+            memory = mmap.mmap(file.fileno(), size)
+        _HEADER.pack_into(memory, 0, _MAGIC, _VERSION, len(entries))
+        for name, capacity in entries:
+            _ENTRY_HEADER.pack_into(
+                memory,
+                offsets[name],
+                0,
+                0,
+                0,
+                0,
+                capacity,
+                0,
+                0,
+                name.encode(),
+                bytes(SYSTEM_PROGRAM_ADDRESS),
+            )
+        os.replace(temporary_filename, filename)
+        return SharedMarketDataRegion(filename, memory, offsets)
+
+    @staticmethod
+    def open(filename: str) -> "SharedMarketDataRegion":
+        with open(filename, "r+b") as file:
+            memory = mmap.mmap(file.fileno(), 0)
+        magic, version, entry_count = _HEADER.unpack_from(memory, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise Exception(
+                f"File '{filename}' is not version {_VERSION} shared market data."
+            )
+
+        offsets: typing.Dict[str, int] = {}
+        offset: int = _HEADER.size
+        for _ in range(entry_count):
+            capacity: int = _ENTRY_HEADER.unpack_from(memory, offset)[4]
+            name: bytes = _ENTRY_HEADER.unpack_from(memory, offset)[7]
+            offsets[name.rstrip(b"\0").decode()] = offset
+            offset += _ENTRY_HEADER.size + ((capacity + 7) & ~7)
+        return SharedMarketDataRegion(filename, memory, offsets)
+
+    @property
+    def names(self) -> typing.Sequence[str]:
+        return list(self.__offsets.keys())
+
+    def capacity(self, name: str) -> int:
+        capacity: int = _ENTRY_HEADER.unpack_from(self.__memory, self.__offsets[name])[
+            4
+        ]
+        return capacity
+
+    def sequence(self, name: str) -> int:
+        sequence: int = _SEQUENCE.unpack_from(self.__memory, self.__offsets[name])[0]
+        return sequence
+
+    def write(
+        self,
+        name: str,
+        slot: int,
+        data: bytes,
+        lamports: int = 0,
+        rent_epoch: int = 0,
+        executable: bool = False,
+        owner: PublicKey = SYSTEM_PROGRAM_ADDRESS,
+    ) -> None:
+        offset: int = self.__offsets[name]
+        capacity: int = self.capacity(name)
+        if len(data) > capacity:
+            raise Exception(
+                f"Data for shared market data '{name}' is {len(data)} bytes but the entry can only hold {capacity}."
+            )
+
+        sequence: int = self.sequence(name)
+        _SEQUENCE.pack_into(self.__memory, offset, sequence + 1)
+        _ENTRY_HEADER.pack_into(
+            self.__memory,
+            offset,
+            sequence + 1,
+            slot,
+            lamports,
+            rent_epoch,
+            capacity,
+            len(data),
+            executable,
+            name.encode(),
+            bytes(owner),
+        )
+        start: int = offset + _ENTRY_HEADER.size
+        self.__memory[start : start + len(data)] = data
+        _SEQUENCE.pack_into(self.__memory, offset, sequence + 2)
+
+    def write_account_info(self, slot: int, account_info: AccountInfo) -> None:
+        self.write(
+            str(account_info.address),
+            slot,
+            account_info.data,
+            int(account_info.lamports),
+            int(account_info.rent_epoch),
+            account_info.executable,
+            account_info.owner,
+        )
+
+    def read(self, name: str) -> SharedMarketDataEntry:
+        offset: int = self.__offsets[name]
+        start: int = offset + _ENTRY_HEADER.size
+        attempts: int = 0
+        while True:
+            before: int = self.sequence(name)
+            if before % 2 == 0:
+                (
+                    _,
+                    slot,
+                    lamports,
+                    rent_epoch,
+                    _,
+                    length,
+                    executable,
+                    _,
+                    owner,
+                ) = _ENTRY_HEADER.unpack_from(self.__memory, offset)
+                data: bytes = self.__memory[start : start + length]
+                if self.sequence(name) == before:
+                    return SharedMarketDataEntry(
+                        name,
+                        before,
+                        slot,
+                        lamports,
+                        rent_epoch,
+                        bool(executable),
+                        PublicKey(owner),
+                        data,
+                    )
+
+            # The writer is part-way through an update. It won't be long, but give it a chance to finish.
+            attempts += 1
+            time.sleep(0 if attempts < 100 else 0.001)
+
+    def write_heartbeat(self, slot: int) -> None:
+        self.write(_HEARTBEAT_NAME, slot, _HEARTBEAT.pack(time.time()))
+
+    # How many seconds ago the publisher last wrote its heartbeat, or `None` if it never has.
+    def heartbeat_age(self) -> typing.Optional[float]:
+        if _HEARTBEAT_NAME not in self.__offsets:
+            return None
+        entry: SharedMarketDataEntry = self.read(_HEARTBEAT_NAME)
+        if entry.sequence == 0:
+            return None
+        published_at: float = _HEARTBEAT.unpack(entry.data)[0]
+        return time.time() - published_at
+
+    # Checks the heartbeat every `interval` and emits its age if it's no older than `maximum_age`. Nothing
+    # is emitted while the publisher is stale, so adding this to a `HealthCheck` stops its file being
+    # touched when the shared data stops being updated.
+    def to_liveness_observable(
+        self,
+        maximum_age: timedelta = timedelta(seconds=10),
+        interval: timedelta = timedelta(seconds=1),
+    ) -> rx.core.typing.Observable[float]:
+        stale: typing.List[bool] = [False]
+
+        def _check(_: typing.Any) -> typing.Optional[float]:
+            age: typing.Optional[float] = self.heartbeat_age()
+            fresh: bool = age is not None and age <= maximum_age.total_seconds()
+            if not fresh and not stale[0]:
+                self._logger.warning(
+                    f"Shared market data '{self.filename}' is stale - last heartbeat: {'never' if age is None else f'{age:.1f} seconds ago'}."
+                )
+            elif fresh and stale[0]:
+                self._logger.info(
+                    f"Shared market data '{self.filename}' is fresh again."
+                )
+            stale[0] = not fresh
+            return age if fresh else None
+
+        return rx.interval(interval.total_seconds()).pipe(
+            rx.operators.map(_check),
+            rx.operators.filter(lambda age: age is not None),
+        )
+
+    def dispose(self) -> None:
+        super().dispose()
+        self.__memory.close()
+
+    def __str__(self) -> str:
+        return f"« SharedMarketDataRegion '{self.filename}': {len(self.__offsets)} entries »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 shared_price_name function
+#
+# The name of the entry a `SharedMarketDataPublisher` uses for prices from an `Oracle`.
+#
+def shared_price_name(oracle: Oracle) -> str:
+    return f"price:{oracle.name}"[:_MAXIMUM_NAME_LENGTH]
+
+
+def _encode_price(price: Price) -> bytes:
+    return json.dumps(
+        [
+            price.timestamp.isoformat(),
+            str(price.top_bid),
+            str(price.mid_price),
+            str(price.top_ask),
+            str(price.confidence),
+        ]
+    ).encode()
+
+
+def _decode_price(data: bytes, template: Price) -> Price:
+    timestamp, top_bid, mid_price, top_ask, confidence = json.loads(data)
+    return Price(
+        template.source,
+        datetime.fromisoformat(timestamp),
+        template.market,
+        Decimal(top_bid),
+        Decimal(mid_price),
+        Decimal(top_ask),
+        Decimal(confidence),
+    )
+
+
+# # 🥭 SharedMemoryWatcher class
+#
+# A `Watcher` that reads its latest value from a `SharedMarketDataRegion`. Nothing is read or parsed until
+# `latest` is accessed, and then only if the entry has changed since the last time.
+#
+class SharedMemoryWatcher(typing.Generic[TWatched]):
+    def __init__(
+        self,
+        region: SharedMarketDataRegion,
+        name: str,
+        parser: typing.Callable[[SharedMarketDataEntry], TWatched],
+        initial: TWatched,
+    ) -> None:
+        if name not in region.names:
+            raise Exception(
+                f"Shared market data '{region.filename}' has no entry '{name}' - is its publisher watching the same group and oracle?"
+            )
+        self.region: SharedMarketDataRegion = region
+        self.name: str = name
+        self.parser: typing.Callable[[SharedMarketDataEntry], TWatched] = parser
+        self.sequence: int = 0
+        self.slot: int = 0
+        self.__latest: TWatched = initial
+
+    @property
+    def latest(self) -> TWatched:
+        if self.region.sequence(self.name) != self.sequence:
+            entry: SharedMarketDataEntry = self.region.read(self.name)
+            if entry.sequence != 0:
+                self.__latest = self.parser(entry)
+                self.sequence = entry.sequence
+                self.slot = entry.slot
+        return self.__latest
+
+    def __str__(self) -> str:
+        return f"« SharedMemoryWatcher '{self.name}' [sequence: {self.sequence}, slot: {self.slot}] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+def build_shared_group_watcher(
+    context: Context, region: SharedMarketDataRegion, group: Group
+) -> SharedMemoryWatcher[Group]:
+    return SharedMemoryWatcher(
+        region,
+        str(group.address),
+        lambda entry: Group.parse(
+            entry.to_account_info(),
+            group.name,
+            context.instrument_lookup,
+            context.market_lookup,
+        ),
+        group,
+    )
+
+
+def build_shared_cache_watcher(
+    region: SharedMarketDataRegion, cache: Cache
+) -> SharedMemoryWatcher[Cache]:
+    return SharedMemoryWatcher(
+        region,
+        str(cache.address),
+        lambda entry: Cache.parse(entry.to_account_info()),
+        cache,
+    )
+
+
+def build_shared_price_watcher(
+    region: SharedMarketDataRegion, oracle: Oracle, initial_price: Price
+) -> SharedMemoryWatcher[Price]:
+    return SharedMemoryWatcher(
+        region,
+        shared_price_name(oracle),
+        lambda entry: _decode_price(entry.data, initial_price),
+        initial_price,
+    )
+
+
+# # 🥭 SharedMarketDataPublisher class
+#
+# Owns the subscriptions for accounts and prices and writes every update to a `SharedMarketDataRegion`.
+#
+# Prices don't come with a slot, so they're given the slot of the most recent account update.
+#
+# The heartbeat is written every `heartbeat_interval` from its own timer, so it's the only thing writing
+# that entry.
+#
+class SharedMarketDataPublisher(Disposable):
+    # Prices are small JSON documents, and this leaves plenty of room for them.
+    PRICE_CAPACITY: int = 256
+
+    def __init__(
+        self,
+        context: Context,
+        manager: WebSocketSubscriptionManager,
+        health_check: HealthCheck,
+        region: SharedMarketDataRegion,
+        heartbeat_interval: timedelta = timedelta(seconds=1),
+    ) -> None:
+        super().__init__()
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self.context: Context = context
+        self.manager: WebSocketSubscriptionManager = manager
+        self.health_check: HealthCheck = health_check
+        self.region: SharedMarketDataRegion = region
+        self.latest_slot: int = 0
+        if _HEARTBEAT_NAME in region.names:
+            region.write_heartbeat(0)
+            self.add_disposable(
+                rx.interval(heartbeat_interval.total_seconds()).subscribe(
+                    on_next=lambda _: self.region.write_heartbeat(self.latest_slot)
+                )
+            )
+        else:
+            self._logger.warning(
+                f"Shared market data '{region.filename}' has no heartbeat entry - readers won't be able to tell if this publisher stops."
+            )
+
+    @staticmethod
+    def entries_for(
+        account_infos: typing.Sequence[AccountInfo], oracles: typing.Sequence[Oracle]
+    ) -> typing.Sequence[typing.Tuple[str, int]]:
+        return [
+            *[
+                (str(account_info.address), len(account_info.data))
+                for account_info in account_infos
+            ],
+            *[
+                (shared_price_name(oracle), SharedMarketDataPublisher.PRICE_CAPACITY)
+                for oracle in oracles
+            ],
+            (_HEARTBEAT_NAME, _HEARTBEAT.size),
+        ]
+
+    def add_account(self, account_info: AccountInfo) -> None:
+        self.region.write_account_info(0, account_info)
+        subscription = WebSocketAccountSubscription[AccountInfo](
+            self.context, account_info.address, lambda account_info: account_info
+        )
+        self.manager.add(subscription)
+        # The subscription's `latest_slot` is updated before each update is published, so it's
+        # the slot of the update being handled.
+        self.add_disposable(
+            subscription.publisher.subscribe(
+                on_next=lambda updated: self.__on_account_update(
+                    subscription.latest_slot, updated
+                )
+            )
+        )
+        self.health_check.add(
+            f"shared_{account_info.address}_subscription", subscription.publisher
+        )
+
+    def add_oracle(self, oracle: Oracle) -> None:
+        name: str = shared_price_name(oracle)
+        self.__on_price_update(name, oracle.fetch_price(self.context))
+        price_feed = oracle.to_streaming_observable(self.context)
+        price_disposable = price_feed.subscribe(
+            on_next=lambda price: self.__on_price_update(name, price)
+        )  # type: ignore[call-arg]
+        self.add_disposable(price_disposable)
+        self.health_check.add(f"shared_{name}_subscription", price_feed)
+
+    def __on_account_update(self, slot: int, account_info: AccountInfo) -> None:
+        self.latest_slot = max(self.latest_slot, slot)
+        self.region.write_account_info(slot, account_info)
+
+    # A price that doesn't fit is skipped rather than raising, which would end the price subscription and
+    # leave readers with that price forever.
+    def __on_price_update(self, name: str, price: Price) -> None:
+        encoded: bytes = _encode_price(price)
+        capacity: int = self.region.capacity(name)
+        if len(encoded) > capacity:
+            self._logger.warning(
+                f"Skipping price for '{name}' - it is {len(encoded)} bytes but the entry can only hold {capacity}: {price}"
+            )
+            return
+        self.region.write(name, self.latest_slot, encoded)
+
+    def __str__(self) -> str:
+        return f"« SharedMarketDataPublisher [latest slot: {self.latest_slot}] {self.region} »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
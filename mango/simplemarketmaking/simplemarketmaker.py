@@ -23,6 +23,7 @@ import typing
 from datetime import timedelta
 from decimal import Decimal
 from pathlib import Path
+from solana.publickey import PublicKey
 
 
 # # 🥭 SimpleMarketMaker class
@@ -78,6 +79,9 @@ class SimpleMarketMaker:
         self.pause: timedelta = pause
         self.stop_requested = False
         self.health_filename = "/var/tmp/mango_healthcheck_simple_market_maker"
+        self.__inventory_token_account_addresses: typing.Optional[
+            typing.Tuple[PublicKey, PublicKey]
+        ] = None
 
     def start(self) -> None:
         # On startup there should be no existing orders. If we didn't exit cleanly last time though,
@@ -153,20 +157,20 @@ class SimpleMarketMaker:
         self,
     ) -> typing.Sequence[typing.Optional[mango.InstrumentValue]]:
         if self.market.inventory_source == mango.InventorySource.SPL_TOKENS:
-            base_account = mango.TokenAccount.fetch_largest_for_owner_and_token(
-                self.context, self.wallet.address, self.market.base
-            )
-            if base_account is None:
-                raise Exception(
-                    f"Could not find token account owned by {self.wallet.address} for base token {self.market.base}."
+            # Searching for the token accounts is expensive so it's only done once. After that
+            # both are reloaded with a single getMultipleAccounts() call.
+            if self.__inventory_token_account_addresses is None:
+                self.__inventory_token_account_addresses = (
+                    self.__find_inventory_token_account(self.market.base),
+                    self.__find_inventory_token_account(self.market.quote),
                 )
-            quote_account = mango.TokenAccount.fetch_largest_for_owner_and_token(
-                self.context, self.wallet.address, self.market.quote
+            base_account_info, quote_account_info = mango.AccountInfo.load_multiple(
+                self.context, list(self.__inventory_token_account_addresses)
+            )
+            base_account = mango.TokenAccount.parse(base_account_info, self.market.base)
+            quote_account = mango.TokenAccount.parse(
+                quote_account_info, self.market.quote
             )
-            if quote_account is None:
-                raise Exception(
-                    f"Could not find token account owned by {self.wallet.address} for quote token {self.market.quote}."
-                )
             return [base_account.value, quote_account.value]
         else:
             group = mango.Group.load(self.context)
@@ -179,6 +183,16 @@ class SimpleMarketMaker:
             account = accounts[0]
             return account.net_values_by_index
 
+    def __find_inventory_token_account(self, token: mango.Token) -> PublicKey:
+        token_account = mango.TokenAccount.fetch_largest_for_owner_and_token(
+            self.context, self.wallet.address, token
+        )
+        if token_account is None:
+            raise Exception(
+                f"Could not find token account owned by {self.wallet.address} for token {token}."
+            )
+        return token_account.address
+
     def calculate_order_prices(
         self, price: mango.Price
     ) -> typing.Tuple[Decimal, Decimal]:
@@ -45,6 +45,7 @@ from .observables import Disposable
 from .orders import Order, OrderBook
 from .publickey import encode_public_key_for_sorting
 from .serumeventqueue import SerumEvent, SerumEventQueue, UnseenSerumEventChangesTracker
+from .serummarket import load_pyserum_market
 from .tokens import Token
 from .wallet import Wallet
 from .websocketsubscription import (
@@ -245,10 +246,8 @@ class SpotMarketInstructionBuilder(MarketInstructionBuilder):
         group: Group,
         account: Account,
     ) -> "SpotMarketInstructionBuilder":
-        raw_market: PySerumMarket = PySerumMarket.load(
-            context.client.compatible_client,
-            spot_market.address,
-            context.serum_program_address,
+        raw_market: PySerumMarket = load_pyserum_market(
+            context, spot_market.address, spot_market.base, spot_market.quote
         )
 
         msrm_balance = context.client.get_token_account_balance(group.msrm_vault)
@@ -638,10 +637,8 @@ class SpotMarketStub(Market):
 
     def load(self, context: Context, group: typing.Optional[Group]) -> SpotMarket:
         actual_group: Group = group or Group.load(context, self.group_address)
-        underlying_serum_market: PySerumMarket = PySerumMarket.load(
-            context.client.compatible_client,
-            self.address,
-            context.serum_program_address,
+        underlying_serum_market: PySerumMarket = load_pyserum_market(
+            context, self.address, self.base, self.quote
         )
         return SpotMarket(
             self.program_address,
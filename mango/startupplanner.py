@@ -0,0 +1,402 @@
+# # ⚠ Warning
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+# LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+# NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# [🥭 Mango Markets](https://mango.markets/) support is available at:
+#   [Docs](https://docs.mango.markets/)
+#   [Discord](https://discord.gg/67jySBhxrg)
+#   [Twitter](https://twitter.com/mangomarkets)
+#   [Github](https://github.com/blockworks-foundation)
+#   [Email](mailto:hello@blockworks.foundation)
+
+import logging
+import threading
+import time
+import typing
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from solana.publickey import PublicKey
+from solana.rpc.types import MemcmpOpts
+
+from .account import Account
+from .accountcache import AccountCache
+from .accountinfo import AccountInfo
+from .cache import Cache
+from .context import Context
+from .encoding import encode_key
+from .group import Group
+from .layouts import layouts
+from .loadedmarket import LoadedMarket
+from .marketregistry import MarketRegistry
+from .observables import DisposeWrapper
+from .oracle import Oracle, OracleProvider, Price
+
+
+# # 🥭 Startup Planner
+#
+# Starting a market maker used to mean one RPC round-trip after another: the `Group`, then the
+# `Account`, then the market, then the `Cache`, then each watcher's own initial load of the orderbook,
+# event queue and `OpenOrders`. None of those waited on anything they needed - they just ran in the
+# order the code happened to ask for them.
+#
+# The `StartupPlanner` loads everything a market maker needs in two waves, where each wave only
+# depends on the one before:
+#
+# 1. The `Group` and markets (one `load_multiple()` through the `MarketRegistry`), alongside the
+#    `Account` (by address, or by the `getProgramAccounts` owner lookup).
+# 2. One `load_multiple()` of every address those point to - the `Cache`, the `Account`'s spot
+#    `OpenOrders` and each market's bids, asks and event queue - alongside finding the `Oracle` and
+#    fetching its first `Price`.
+#
+# The steps in a wave run in parallel, so a wave takes as long as its slowest step. The `StartupReport`
+# records every step and the critical path through the waves.
+#
+# The resulting `StartupSnapshot` can then `seed()` a `Context` so that the initial loads made by the
+# watchers are served from the snapshot instead of going back to the RPC node. Accounts found by
+# `getProgramAccounts` (like a Serum market's token accounts) can't be served from a snapshot and are
+# still loaded as before.
+#
+
+
+# # 🥭 StartupStep class
+#
+# One timed step of a startup wave. `started` is seconds since the start of the whole load.
+#
+@dataclass
+class StartupStep:
+    name: str
+    wave: int
+    started: float
+    duration: float
+
+    def __str__(self) -> str:
+        return f"« StartupStep [{self.wave}] {self.name} at {self.started:.3f}s took {self.duration:.3f}s »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 StartupReport class
+#
+# All the timed steps of a startup load. The critical path is the slowest step of each wave - those are
+# the steps that made startup take as long as it did.
+#
+class StartupReport:
+    def __init__(self, steps: typing.Sequence[StartupStep], elapsed: float) -> None:
+        self.steps: typing.Sequence[StartupStep] = steps
+        self.elapsed: float = elapsed
+
+    @property
+    def critical_path(self) -> typing.Sequence[StartupStep]:
+        slowest: typing.Dict[int, StartupStep] = {}
+        for step in self.steps:
+            current: typing.Optional[StartupStep] = slowest.get(step.wave)
+            if current is None or step.duration > current.duration:
+                slowest[step.wave] = step
+        return [slowest[wave] for wave in sorted(slowest)]
+
+    def __str__(self) -> str:
+        path: str = " → ".join(
+            f"{step.name} ({step.duration:.3f}s)" for step in self.critical_path
+        )
+        steps: str = ", ".join(
+            f"{step.wave}/{step.name}: {step.duration:.3f}s" for step in self.steps
+        )
+        return f"« StartupReport {self.elapsed:.3f}s, critical path: {path} [{steps}] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 SnapshotAccountCache class
+#
+# An `AccountCache` that serves accounts from a startup snapshot, and passes everything else (including
+# all stores) through to the `Context`'s own `AccountCache`.
+#
+class SnapshotAccountCache(AccountCache):
+    def __init__(
+        self,
+        inner: AccountCache,
+        values: typing.Dict[str, typing.Dict[str, typing.Any]],
+    ) -> None:
+        super().__init__()
+        self.inner: AccountCache = inner
+        self.__lock: threading.Lock = threading.Lock()
+        self.__values: typing.Dict[str, typing.Dict[str, typing.Any]] = dict(values)
+        self.hits: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    def lookup(
+        self,
+        addresses: typing.Sequence[PublicKey],
+        refresh: typing.Callable[[typing.Sequence[PublicKey]], typing.Any],
+    ) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        found: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        missing: typing.List[PublicKey] = []
+        with self.__lock:
+            for address in addresses:
+                values: typing.Optional[
+                    typing.Dict[str, typing.Any]
+                ] = self.__values.get(str(address))
+                if values is None:
+                    missing += [address]
+                else:
+                    found[str(address)] = values
+            self.hits += len(found)
+
+        if len(missing) > 0:
+            found.update(self.inner.lookup(missing, refresh))
+        return found
+
+    def store(
+        self, address: PublicKey, slot: int, values: typing.Dict[str, typing.Any]
+    ) -> None:
+        self.inner.store(address, slot, values)
+
+    def clear(self) -> None:
+        self.inner.clear()
+
+    # Stops serving the given accounts from the snapshot, for when they're known to have changed.
+    def forget(self, addresses: typing.Sequence[PublicKey]) -> None:
+        with self.__lock:
+            for address in addresses:
+                self.__values.pop(str(address), None)
+
+    def __str__(self) -> str:
+        return f"« SnapshotAccountCache {len(self.__values)} account(s), {self.hits} hit(s), wrapping {self.inner} »"
+
+
+# # 🥭 StartupSnapshot class
+#
+# Everything loaded by a `StartupPlanner`.
+#
+class StartupSnapshot:
+    def __init__(
+        self,
+        group: Group,
+        cache: Cache,
+        account: Account,
+        markets: typing.Dict[str, LoadedMarket],
+        oracle: typing.Optional[Oracle],
+        price: typing.Optional[Price],
+        account_infos: typing.Sequence[AccountInfo],
+        report: StartupReport,
+    ) -> None:
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self.group: Group = group
+        self.cache: Cache = cache
+        self.account: Account = account
+        self.markets: typing.Dict[str, LoadedMarket] = markets
+        self.oracle: typing.Optional[Oracle] = oracle
+        self.price: typing.Optional[Price] = price
+        self.account_infos: typing.Sequence[AccountInfo] = account_infos
+        self.report: StartupReport = report
+        self.__seeded: typing.Optional[SnapshotAccountCache] = None
+
+    def market(self, symbol: str) -> LoadedMarket:
+        return self.markets[symbol.upper()]
+
+    # Until the returned `DisposeWrapper` is disposed, the `Context`'s `AccountCache` serves every account
+    # in the snapshot. Disposing puts the original `AccountCache` back, so nothing after startup ever sees
+    # snapshot data.
+    def seed(self, context: Context) -> DisposeWrapper:
+        original: AccountCache = context.account_cache
+        seeded = SnapshotAccountCache(
+            original,
+            {
+                str(account_info.address): account_info.to_response_values()
+                for account_info in self.account_infos
+            },
+        )
+        self.__seeded = seeded
+        context.account_cache = seeded
+
+        def _unseed() -> None:
+            if context.account_cache is seeded:
+                context.account_cache = original
+            self.__seeded = None
+            self._logger.debug(f"Startup snapshot served {seeded.hits} account(s).")
+
+        return DisposeWrapper(_unseed)
+
+    # Stops serving the given accounts from the snapshot. Call this after doing something at startup
+    # (like cancelling orders) that changes accounts the watchers have yet to load.
+    def forget(self, addresses: typing.Sequence[PublicKey]) -> None:
+        if self.__seeded is not None:
+            self.__seeded.forget(addresses)
+
+    def __str__(self) -> str:
+        return f"« StartupSnapshot {len(self.account_infos)} account(s) for {list(self.markets.keys())}: {self.report} »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 StartupPlanner class
+#
+# Plans and runs the startup loads for an owner's `Account` and a set of markets, as described above.
+#
+class StartupPlanner:
+    def __init__(self, context: Context, registry: MarketRegistry) -> None:
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self.context: Context = context
+        self.registry: MarketRegistry = registry
+
+    def load(
+        self,
+        owner: PublicKey,
+        account_address: typing.Optional[PublicKey],
+        symbols: typing.Sequence[str],
+        oracle_provider: typing.Optional[OracleProvider] = None,
+        oracle_symbol: typing.Optional[str] = None,
+    ) -> StartupSnapshot:
+        steps: typing.List[StartupStep] = []
+        started: float = time.monotonic()
+
+        def _load_markets() -> Group:
+            self.registry.preload(symbols)
+            return self.registry.group(self.context.group_address)
+
+        def _load_account_info() -> AccountInfo:
+            return self.__load_account_info(owner, account_address)
+
+        group, account_info = self.__run_wave(
+            1,
+            started,
+            steps,
+            [("markets", _load_markets), ("account", _load_account_info)],
+        )
+        markets: typing.Dict[str, LoadedMarket] = {
+            symbol.upper(): self.registry.market(symbol) for symbol in symbols
+        }
+
+        addresses: typing.List[PublicKey] = [group.cache]
+        for open_orders_address in layouts.MANGO_ACCOUNT.parse(
+            account_info.data
+        ).spot_open_orders:
+            if open_orders_address is not None:
+                addresses += [open_orders_address]
+        for market in markets.values():
+            addresses += [
+                market.bids_address,
+                market.asks_address,
+                market.event_queue_address,
+            ]
+        unique_addresses: typing.List[PublicKey] = list(
+            {str(address): address for address in addresses}.values()
+        )
+
+        def _load_accounts() -> typing.Sequence[AccountInfo]:
+            return AccountInfo.load_multiple(self.context, unique_addresses)
+
+        def _load_oracle() -> typing.Tuple[
+            typing.Optional[Oracle], typing.Optional[Price]
+        ]:
+            if oracle_provider is None or oracle_symbol is None:
+                return None, None
+            oracle_market: LoadedMarket = self.registry.market(oracle_symbol)
+            oracle: typing.Optional[Oracle] = oracle_provider.oracle_for_market(
+                self.context, oracle_market
+            )
+            if oracle is None:
+                raise Exception(
+                    f"Could not find oracle for market {oracle_market.fully_qualified_symbol} from provider {oracle_provider.name}."
+                )
+            return oracle, oracle.fetch_price(self.context)
+
+        account_infos, (oracle, price) = self.__run_wave(
+            2, started, steps, [("accounts", _load_accounts), ("oracle", _load_oracle)]
+        )
+        cache: Cache = Cache.parse(account_infos[0])
+        account: Account = Account.parse(account_info, group, cache)
+
+        report = StartupReport(steps, time.monotonic() - started)
+        self._logger.debug(f"Startup loaded: {report}")
+        return StartupSnapshot(
+            group,
+            cache,
+            account,
+            markets,
+            oracle,
+            price,
+            [account_info, *account_infos],
+            report,
+        )
+
+    def __load_account_info(
+        self, owner: PublicKey, account_address: typing.Optional[PublicKey]
+    ) -> AccountInfo:
+        if account_address is not None:
+            loaded: typing.Optional[AccountInfo] = AccountInfo.load(
+                self.context, account_address
+            )
+            if loaded is None:
+                raise Exception(
+                    f"Account account not found at address '{account_address}'"
+                )
+            return loaded
+
+        # These filters are the same as the ones used by `Account.load_all_for_owner()`.
+        group_offset = layouts.METADATA.sizeof()
+        owner_offset = group_offset + 32
+        account_infos = AccountInfo.load_by_program(
+            self.context,
+            self.context.mango_program_address,
+            memcmp_opts=[
+                MemcmpOpts(
+                    offset=group_offset, bytes=encode_key(self.context.group_address)
+                ),
+                MemcmpOpts(offset=owner_offset, bytes=encode_key(owner)),
+            ],
+            data_size=layouts.MANGO_ACCOUNT.sizeof(),
+        )
+        if len(account_infos) == 0:
+            raise Exception(f"No Mango account found for owner '{owner}'.")
+        if len(account_infos) > 1:
+            raise Exception(
+                f"More than 1 Mango account for owner '{owner}' and which to choose not specified."
+            )
+        return account_infos[0]
+
+    def __run_wave(
+        self,
+        wave: int,
+        started: float,
+        steps: typing.List[StartupStep],
+        actions: typing.Sequence[typing.Tuple[str, typing.Callable[[], typing.Any]]],
+    ) -> typing.Sequence[typing.Any]:
+        def _timed(name: str, action: typing.Callable[[], typing.Any]) -> typing.Any:
+            step_started: float = time.monotonic()
+            try:
+                return action()
+            finally:
+                steps.append(
+                    StartupStep(
+                        name,
+                        wave,
+                        step_started - started,
+                        time.monotonic() - step_started,
+                    )
+                )
+
+        with ThreadPoolExecutor(
+            max_workers=len(actions), thread_name_prefix=f"startup-wave-{wave}"
+        ) as executor:
+            futures: typing.List[Future[typing.Any]] = [
+                executor.submit(_timed, name, action) for name, action in actions
+            ]
+            return [future.result() for future in futures]
+
+    def __str__(self) -> str:
+        return f"« StartupPlanner for {self.context.group_address} »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
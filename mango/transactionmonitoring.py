@@ -14,12 +14,17 @@
 #   [Email](mailto:hello@blockworks.foundation)
 
 import abc
+import atexit
 import enum
+import heapq
+import itertools
 import logging
 import threading
+import time
 import typing
 
 from collections import deque
+from concurrent.futures import Future
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from solana.rpc.commitment import Commitment, Finalized
@@ -89,18 +94,24 @@ class DequeTransactionStatusCollector(TransactionStatusCollector):
 
 class SignatureSubscription:
     def __init__(
-        self, signature: str, on_outcome: typing.Callable[[TransactionStatus], None]
+        self,
+        signature: str,
+        on_outcome: typing.Callable[[TransactionStatus], None],
+        commitment: Commitment = Finalized,
+        timeout: float = 90.0,
     ) -> None:
         self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
         self.signature: str = signature
         self.on_outcome: typing.Callable[[TransactionStatus], None] = on_outcome
+        self.commitment: Commitment = commitment
+        self.future: "Future[TransactionStatus]" = Future()
 
         self.id: int = 0
         self.subscribe_request_id: int = 0
         self.unsubscribe_request_id: int = 0
         self.started_at: datetime = local_now()
+        self.deadline: float = time.monotonic() + timeout
         self.completed_at: typing.Optional[datetime] = None
-        self.timeout_timer: typing.Optional[threading.Timer] = None
         self.__final_status: typing.Optional[str] = None
 
     @property
@@ -161,7 +172,45 @@ class SignatureSubscription:
         )
 
 
+# # 🥭 TransactionMonitorStatistics class
+#
+# A snapshot of what a `WebSocketTransactionMonitor` is doing. Latency percentiles are in
+# seconds, taken over the most recent successful confirmations.
+#
+@dataclass
+class TransactionMonitorStatistics:
+    in_flight: int
+    succeeded: int
+    failed: int
+    timed_out: int
+    latency_p50: float
+    latency_p90: float
+    latency_p99: float
+
+    def __str__(self) -> str:
+        return f"« TransactionMonitorStatistics [in flight: {self.in_flight}, succeeded: {self.succeeded}, failed: {self.failed}, timed out: {self.timed_out}, latency p50/p90/p99: {self.latency_p50:.2f}s/{self.latency_p90:.2f}s/{self.latency_p99:.2f}s] »"
+
+    def __repr__(self) -> str:
+        return f"{self}"
+
+
+# # 🥭 WebSocketTransactionMonitor class
+#
+# Watches transaction signatures over a single websocket until they reach the required
+# commitment, fail, or time out.
+#
+# Subscriptions are indexed by request ID and by subscription ID, and all timeouts are handled
+# by one thread working through a heap of deadlines, so monitoring many signatures at once
+# doesn't need a thread per signature or a scan of every pending subscription per response.
+#
+# `monitor()` returns a `Future` that completes with the `TransactionStatus`. `shared()` gives a
+# long-lived monitor per websocket URL, which is what `wait_for_all()` uses instead of opening
+# a new websocket for every call. Shared monitors are disposed when the process exits.
+#
 class WebSocketTransactionMonitor(TransactionMonitor):
+    __shared: typing.Dict[str, "WebSocketTransactionMonitor"] = {}
+    __shared_lock: threading.Lock = threading.Lock()
+
     def __init__(
         self,
         cluster_ws_url: str,
@@ -170,26 +219,75 @@ class WebSocketTransactionMonitor(TransactionMonitor):
         transaction_timeout: float = 90.0,
         collector: TransactionStatusCollector = NullTransactionStatusCollector(),
         slot_holder: AbstractSlotHolder = NullSlotHolder(),
+        latency_sample_size: int = 1000,
     ) -> None:
         super().__init__(
             commitment=commitment,
             transaction_timeout=transaction_timeout,
             slot_holder=slot_holder,
         )
+        self.cluster_ws_url: str = cluster_ws_url
         self.collector: TransactionStatusCollector = collector
 
         self.__id_generator: IdGenerator = MonotonicIdGenerator()
 
-        self.__subscriptions: typing.List[SignatureSubscription] = []
+        self.__lock: threading.Lock = threading.Lock()
+        self.__by_request_id: typing.Dict[int, SignatureSubscription] = {}
+        self.__by_subscription_id: typing.Dict[int, SignatureSubscription] = {}
+        self.__unsubscribe_request_ids: typing.Set[int] = set()
+        self.__latencies: typing.Deque[float] = deque(maxlen=latency_sample_size)
+        self.__succeeded: int = 0
+        self.__failed: int = 0
+        self.__timed_out: int = 0
+
+        self.__deadlines: typing.List[
+            typing.Tuple[float, int, SignatureSubscription]
+        ] = []
+        self.__deadline_counter: typing.Iterator[int] = itertools.count()
+        self.__deadlines_changed: threading.Condition = threading.Condition(self.__lock)
+        self.__timeout_thread: threading.Thread = threading.Thread(
+            target=self.__process_timeouts, daemon=True
+        )
+        self.__disposed: bool = False
+        self.__timeout_thread.start()
+
         self.__ws: typing.Optional[ReconnectingWebsocket] = ReconnectingWebsocket(
             cluster_ws_url,
             lambda _: None,
         )
         self.__ws.ping_interval = ping_interval
+        # The monitor only ever serves other code, so it mustn't stop the process exiting
+        # when that code is done.
+        self.__ws.daemon = True
         self.__ws.item.subscribe(on_next=self.__on_response)  # type: ignore[call-arg]
         self.__ws.open()
         self.__ws.connected.subscribe(on_next=self.__on_reconnect)  # type: ignore[call-arg]
 
+    @staticmethod
+    def shared(cluster_ws_url: str) -> "WebSocketTransactionMonitor":
+        with WebSocketTransactionMonitor.__shared_lock:
+            monitor = WebSocketTransactionMonitor.__shared.get(cluster_ws_url)
+            if monitor is None or monitor.__disposed:
+                monitor = WebSocketTransactionMonitor(cluster_ws_url)
+                WebSocketTransactionMonitor.__shared[cluster_ws_url] = monitor
+            return monitor
+
+    # Disposes all the monitors handed out by `shared()`. This is called automatically when the
+    # process exits.
+    @staticmethod
+    def dispose_shared() -> None:
+        with WebSocketTransactionMonitor.__shared_lock:
+            monitors = list(WebSocketTransactionMonitor.__shared.values())
+            WebSocketTransactionMonitor.__shared.clear()
+
+        for monitor in monitors:
+            try:
+                monitor.dispose()
+            except Exception as exception:
+                monitor._logger.warning(
+                    f"Could not dispose shared WebSocketTransactionMonitor: {exception}"
+                )
+
     @staticmethod
     def wait_for_all(
         cluster_ws_url: str,
@@ -197,39 +295,48 @@ class WebSocketTransactionMonitor(TransactionMonitor):
         commitment: Commitment = Finalized,
         timeout: float = 90.0,
     ) -> typing.Sequence[TransactionStatus]:
-        started_at: datetime = local_now()
-        collector = DequeTransactionStatusCollector()
-        monitor = WebSocketTransactionMonitor(
-            cluster_ws_url,
-            commitment=commitment,
-            transaction_timeout=timeout,
-            collector=collector,
-        )
-
+        monitor = WebSocketTransactionMonitor.shared(cluster_ws_url)
         if not monitor.wait_until_open():
             raise Exception("Timed out waiting for websocket to open.")
 
-        waiters: typing.List[threading.Event] = []
-        for signature in signatures:
-            waiter = threading.Event()
-            monitor.monitor(signature, lambda _: waiter.set())
-            waiters += [waiter]
-
-        for active_waiter in waiters:
-            time_spent = local_now() - started_at
-            seconds_so_far: float = (
-                time_spent.seconds + time_spent.microseconds / 1000000
-            )
-
-            remaining = max(0, timeout - seconds_so_far)
+        futures = [
+            monitor.monitor(signature, commitment=commitment, timeout=timeout)
+            for signature in signatures
+        ]
 
-            # Add a little longer to this timeout so the websocket transaction timeout has
-            # the opportunity to fire first.
-            active_waiter.wait(0.1 + remaining)
+        # The monitor's own timeout completes every future, so this only guards against the
+        # monitor being disposed while we wait.
+        return [future.result(timeout + 5) for future in futures]
 
-        monitor.dispose()
+    @property
+    def in_flight(self) -> int:
+        with self.__lock:
+            return len(self.__by_request_id)
+
+    def statistics(self) -> TransactionMonitorStatistics:
+        with self.__lock:
+            latencies = sorted(self.__latencies)
+            in_flight = len(self.__by_request_id)
+            succeeded, failed, timed_out = (
+                self.__succeeded,
+                self.__failed,
+                self.__timed_out,
+            )
 
-        return list(collector.transactions)
+        def _percentile(fraction: float) -> float:
+            if len(latencies) == 0:
+                return 0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+        return TransactionMonitorStatistics(
+            in_flight,
+            succeeded,
+            failed,
+            timed_out,
+            _percentile(0.5),
+            _percentile(0.9),
+            _percentile(0.99),
+        )
 
     def wait_until_open(self, timeout: float = 5.0) -> bool:
         if self.__ws is None:
@@ -241,78 +348,135 @@ class WebSocketTransactionMonitor(TransactionMonitor):
         self,
         signature: str,
         on_outcome: typing.Callable[[TransactionStatus], None] = lambda _: None,
-    ) -> None:
-        subscription = SignatureSubscription(signature, on_outcome)
-        self.__subscriptions += [subscription]
-
+        commitment: typing.Optional[Commitment] = None,
+        timeout: typing.Optional[float] = None,
+    ) -> "Future[TransactionStatus]":
         if self.__ws is None:
             raise Exception("Cannot send to websocket - it has been closed.")
 
-        self.__ws.send(
-            subscription.build_subscription(
-                self.__id_generator.generate_id(), self.commitment
-            )
+        subscription = SignatureSubscription(
+            signature,
+            on_outcome,
+            commitment or self.commitment,
+            timeout or self.transaction_timeout,
         )
-        timer = threading.Timer(
-            self.transaction_timeout, lambda: self.__on_timeout(subscription)
+        request_id: int = self.__id_generator.generate_id()
+        request: str = subscription.build_subscription(
+            request_id, subscription.commitment
         )
-        timer.start()
-        subscription.timeout_timer = timer
+        with self.__lock:
+            self.__by_request_id[request_id] = subscription
+            heapq.heappush(
+                self.__deadlines,
+                (subscription.deadline, next(self.__deadline_counter), subscription),
+            )
+            self.__deadlines_changed.notify()
+
+        self.__ws.send(request)
+        return subscription.future
+
+    # Removes the subscription from the indexes, returning `False` if it had already completed.
+    def __complete(self, subscription: SignatureSubscription) -> bool:
+        with self.__lock:
+            if (
+                self.__by_request_id.pop(subscription.subscribe_request_id, None)
+                is None
+            ):
+                return False
+            self.__by_subscription_id.pop(subscription.id, None)
+            return True
+
+    def __report(
+        self, subscription: SignatureSubscription, status: TransactionStatus
+    ) -> None:
+        self.collector.add_transaction(status)
+        subscription.on_outcome(status)
+        subscription.future.set_result(status)
+
+    def __process_timeouts(self) -> None:
+        while True:
+            expired: typing.List[SignatureSubscription] = []
+            with self.__deadlines_changed:
+                while not self.__disposed and len(expired) == 0:
+                    now: float = time.monotonic()
+                    while len(self.__deadlines) > 0 and self.__deadlines[0][0] <= now:
+                        expired += [heapq.heappop(self.__deadlines)[2]]
+                    if len(expired) == 0:
+                        wait: typing.Optional[float] = (
+                            self.__deadlines[0][0] - now
+                            if len(self.__deadlines) > 0
+                            else None
+                        )
+                        self.__deadlines_changed.wait(wait)
+                if self.__disposed:
+                    return
+
+            for subscription in expired:
+                self.__on_timeout(subscription)
 
     def __on_timeout(self, subscription: SignatureSubscription) -> None:
+        if not self.__complete(subscription):
+            return
+
         subscription.final_status = "timeout"
         self._logger.warning(
-            f"Timed out waiting for transaction with signature {subscription.signature} to reach '{self.commitment}' - gave up after {subscription.time_taken_seconds:.2f} seconds."
+            f"Timed out waiting for transaction with signature {subscription.signature} to reach '{subscription.commitment}' - gave up after {subscription.time_taken_seconds:.2f} seconds."
+        )
+        with self.__lock:
+            self.__timed_out += 1
+        self.__report(
+            subscription, subscription.build_status(TransactionOutcome.TIMEOUT)
         )
-        status = subscription.build_status(TransactionOutcome.TIMEOUT)
-        subscription.on_outcome(status)
-        self.collector.add_transaction(status)
-
-        self.__subscriptions.remove(subscription)
 
         if self.__ws is None:
             return
 
-        self.__ws.send(
-            subscription.build_unsubscription(self.__id_generator.generate_id())
-        )
+        unsubscribe_request_id: int = self.__id_generator.generate_id()
+        with self.__lock:
+            self.__unsubscribe_request_ids.add(unsubscribe_request_id)
+        self.__ws.send(subscription.build_unsubscription(unsubscribe_request_id))
 
     def __on_response(self, response: typing.Any) -> None:
         if "method" not in response:
             id: int = int(response["id"])
-            to_remove = [
-                sub for sub in self.__subscriptions if sub.unsubscribe_request_id == id
-            ]
-            if len(to_remove) > 0:
-                self.__subscriptions.remove(to_remove[0])
-            elif "result" in response:
-                self.__add_subscription_id(id, int(response["result"]))
-            else:
-                self._logger.warning(f"Unexpected response from websocket: {response}")
+            with self.__lock:
+                if id in self.__unsubscribe_request_ids:
+                    self.__unsubscribe_request_ids.remove(id)
+                    return
+                subscription = self.__by_request_id.get(id)
+                if subscription is not None and "result" in response:
+                    subscription.id = int(response["result"])
+                    self.__by_subscription_id[subscription.id] = subscription
+                    return
+            self._logger.warning(f"Unexpected response from websocket: {response}")
         elif response["method"] == "signatureNotification":
             params = response["params"]
-            id = params["subscription"]
-            subscription = self.__subscription_by_subscription_id(id)
-            if subscription.timeout_timer is not None:
-                subscription.timeout_timer.cancel()
-            self.__subscriptions.remove(subscription)
-            subscription.final_status = Finalized
+            with self.__lock:
+                found = self.__by_subscription_id.get(params["subscription"])
+            if found is None or not self.__complete(found):
+                self._logger.debug(
+                    f"Ignoring notification for unknown subscription {params['subscription']}."
+                )
+                return
+
+            found.final_status = found.commitment
             slot = params["result"]["context"]["slot"]
             err = params["result"]["value"]["err"]
             if err is not None:
-                status = subscription.build_status(TransactionOutcome.FAIL, err)
-                self.collector.add_transaction(status)
-                subscription.on_outcome(status)
+                with self.__lock:
+                    self.__failed += 1
+                self.__report(found, found.build_status(TransactionOutcome.FAIL, err))
                 self._logger.warning(
-                    f"Transaction {subscription.signature} failed after {subscription.time_taken_seconds:.2f} seconds with error: {err}"
+                    f"Transaction {found.signature} failed after {found.time_taken_seconds:.2f} seconds with error: {err}"
                 )
             else:
                 self.slot_holder.require_data_from_fresh_slot(slot)
-                status = subscription.build_status(TransactionOutcome.SUCCESS)
-                self.collector.add_transaction(status)
-                subscription.on_outcome(status)
+                with self.__lock:
+                    self.__succeeded += 1
+                    self.__latencies.append(found.time_taken_seconds)
+                self.__report(found, found.build_status(TransactionOutcome.SUCCESS))
                 self._logger.debug(
-                    f"Transaction {subscription.signature} reached status '{self.commitment}' in slot {slot} after {subscription.time_taken_seconds:.2f} seconds."
+                    f"Transaction {found.signature} reached status '{found.commitment}' in slot {slot} after {found.time_taken_seconds:.2f} seconds."
                 )
         else:
             self._logger.error(f"Unknown response: {response}")
@@ -323,38 +487,42 @@ class WebSocketTransactionMonitor(TransactionMonitor):
         # don't reset the timeout.
         if self.__ws is not None:
             if self.wait_until_open():
-                for subscription in self.__subscriptions:
-                    self.__ws.send(
-                        subscription.build_subscription(
-                            self.__id_generator.generate_id(), self.commitment
-                        )
-                    )
-
-    def __add_subscription_id(self, subscribe_request_id: int, id: int) -> None:
-        for subscription in self.__subscriptions:
-            if subscription.subscribe_request_id == subscribe_request_id:
-                subscription.id = id
-                return
-        self._logger.error(f"Subscription ID {subscribe_request_id} not found")
-
-    def __subscription_by_subscription_id(self, id: int) -> SignatureSubscription:
-        for subscription in self.__subscriptions:
-            if subscription.id == id:
-                return subscription
-        raise Exception(f"No subscription with subscription ID {id} could be found.")
+                requests: typing.List[str] = []
+                with self.__lock:
+                    pending = list(self.__by_request_id.values())
+                    self.__by_request_id.clear()
+                    self.__by_subscription_id.clear()
+                    for subscription in pending:
+                        request_id: int = self.__id_generator.generate_id()
+                        requests += [
+                            subscription.build_subscription(
+                                request_id, subscription.commitment
+                            )
+                        ]
+                        self.__by_request_id[request_id] = subscription
+                for request in requests:
+                    self.__ws.send(request)
 
     def dispose(self) -> None:
         if self.__ws is not None:
-            for subscription in self.__subscriptions:
-                if subscription.timeout_timer is not None:
-                    subscription.timeout_timer.cancel()
+            with self.__lock:
+                self.__disposed = True
+                pending = list(self.__by_request_id.values())
+                self.__by_request_id.clear()
+                self.__by_subscription_id.clear()
+                self.__deadlines_changed.notify()
+
+            for subscription in pending:
                 subscription.final_status = "timeout"
                 self._logger.warning(
-                    f"Closing WebSocketTransactionMonitor while waiting for transaction with signature {subscription.signature} to reach '{self.commitment}'."
+                    f"Closing WebSocketTransactionMonitor while waiting for transaction with signature {subscription.signature} to reach '{subscription.commitment}'."
+                )
+                self.__report(
+                    subscription, subscription.build_status(TransactionOutcome.TIMEOUT)
                 )
-                status = subscription.build_status(TransactionOutcome.TIMEOUT)
-                self.collector.add_transaction(status)
-                subscription.on_outcome(status)
 
             self.__ws.close()
             self.__ws = None
+
+
+atexit.register(WebSocketTransactionMonitor.dispose_shared)
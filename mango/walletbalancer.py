@@ -19,14 +19,21 @@ import logging
 import typing
 
 from decimal import Decimal
+from solana.rpc.commitment import Confirmed
 
 from .account import Account
+from .combinableinstructions import CombinableInstructions
 from .context import Context
 from .group import Group
 from .marketoperations import MarketOperations
+from .marketregistry import MarketRegistry
+from .orders import Order, Side
 from .porcelain import operations
+from .ratelimiter import RequestPriority, request_priority
+from .serummarket import SerumMarketOperations
 from .tokens import Instrument, Token
 from .instrumentvalue import InstrumentValue
+from .transactionmonitoring import TransactionOutcome, WebSocketTransactionMonitor
 from .wallet import Wallet
 
 
@@ -341,6 +348,7 @@ class LiveWalletBalancer(WalletBalancer):
         action_threshold: Decimal,
         max_slippage: Decimal,
         dry_run: bool,
+        confirmation_timeout: float = 90,
     ) -> None:
         super().__init__()
         self.context: Context = context
@@ -351,6 +359,7 @@ class LiveWalletBalancer(WalletBalancer):
         self.action_threshold: Decimal = action_threshold
         self.max_slippage: Decimal = max_slippage
         self.dry_run: bool = dry_run
+        self.confirmation_timeout: float = confirmation_timeout
 
     def balance(
         self, context: Context, prices: typing.Sequence[InstrumentValue]
@@ -408,29 +417,63 @@ class LiveWalletBalancer(WalletBalancer):
             f"Finishing balances: {padding}{balances_report(updated_balances)}"
         )
 
+    # Sells are all sent together in one batch of transactions, and they're confirmed before all the
+    # buys are sent together, so the buys can spend the proceeds of the sells.
     def _make_changes(self, balance_changes: typing.Sequence[InstrumentValue]) -> None:
-        quote = self.quote_token.symbol
+        if self.dry_run:
+            for change in balance_changes:
+                ops: MarketOperations = self._operations(change.token.symbol)
+                if change.value < 0:
+                    ops.market_sell(change.value.copy_abs(), self.max_slippage)
+                else:
+                    ops.market_buy(change.value.copy_abs(), self.max_slippage)
+            return
+
+        sells = [change for change in balance_changes if change.value < 0]
+        buys = [change for change in balance_changes if change.value >= 0]
+        for batch in [sells, buys]:
+            self._execute_batch(batch)
+
+    def _execute_batch(self, balance_changes: typing.Sequence[InstrumentValue]) -> None:
+        if len(balance_changes) == 0:
+            return
+
+        instructions: CombinableInstructions = CombinableInstructions.from_wallet(
+            self.wallet
+        )
         for change in balance_changes:
-            market_symbol = f"serum:{change.token.symbol}/{quote}"
-            ops: MarketOperations = operations(
-                self.context, self.wallet, self.account, market_symbol, self.dry_run
+            ops = SerumMarketOperations.ensure(self._operations(change.token.symbol))
+            side: Side = Side.SELL if change.value < 0 else Side.BUY
+            order: Order = ops.build_market_order(
+                side, change.value.copy_abs(), self.max_slippage
             )
-            if change.value < 0:
-                ops.market_sell(change.value.copy_abs(), self.max_slippage)
-            else:
-                ops.market_buy(change.value.copy_abs(), self.max_slippage)
+            instructions += ops.build_place_order_instructions(order)
+
+        signatures: typing.Sequence[str] = instructions.execute(self.context)
+        statuses = WebSocketTransactionMonitor.wait_for_all(
+            self.context.client.cluster_ws_url,
+            signatures,
+            commitment=Confirmed,
+            timeout=self.confirmation_timeout,
+        )
+        for status in statuses:
+            if status.outcome != TransactionOutcome.SUCCESS:
+                self._logger.warning(f"Balancing transaction did not succeed: {status}")
+
+    def _operations(self, symbol: str) -> MarketOperations:
+        market_symbol = f"serum:{symbol}/{self.quote_token.symbol}"
+        return MarketRegistry.for_context(self.context).operations(
+            self.wallet, self.account, market_symbol, self.dry_run
+        )
 
     def _fetch_balances(
         self, context: Context, tokens: typing.Sequence[Token]
     ) -> typing.Sequence[InstrumentValue]:
-        balances: typing.List[InstrumentValue] = []
-        for token in tokens:
-            balance = InstrumentValue.fetch_total_value(
-                context, self.wallet.address, token
+        # Balance checks can wait - they shouldn't hold up orders being placed.
+        with request_priority(RequestPriority.BACKGROUND):
+            return InstrumentValue.fetch_total_values(
+                context, self.wallet.address, tokens
             )
-            balances += [balance]
-
-        return balances
 
 
 # # 🥭 LiveAccountBalancer class
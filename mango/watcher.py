@@ -39,6 +39,22 @@ class Watcher(typing.Protocol[TWatched]):
         raise NotImplementedError("Watcher.latest is not implemented on the Protocol.")
 
 
+# # 🥭 SlotWatcher protocol
+#
+# The `SlotWatcher` protocol is a `Watcher` that also has a property `slot` - the slot its `latest` value
+# came from, or 0 if that isn't known.
+#
+# It's runtime-checkable so code given plain `Watcher`s can check which ones know their slot.
+#
+@typing.runtime_checkable
+class SlotWatcher(Watcher[TWatched], typing.Protocol):
+    @property
+    def slot(self) -> int:
+        raise NotImplementedError(
+            "SlotWatcher.slot is not implemented on the Protocol."
+        )
+
+
 # # 🥭 ManualUpdateWatcher class
 #
 # The `ManualUpdateWatcher` class provides a basic implementation of the `Watcher` protocol that
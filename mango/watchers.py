@@ -17,7 +17,6 @@ import logging
 import typing
 
 from decimal import Decimal
-from pyserum.market.market import Market as PySerumMarket
 from solana.publickey import PublicKey
 
 from .account import Account
@@ -29,11 +28,14 @@ from .group import GroupSlot, Group
 from .healthcheck import HealthCheck
 from .instructions import build_serum_create_openorders_instructions
 from .instrumentvalue import InstrumentValue
-from .inventory import Inventory
+from .inventory import SerumInventoryWatcher
 from .loadedmarket import LoadedMarket
-from .markets import InventorySource
 from .modelstate import EventQueue
-from .observables import Disposable, LatestItemObserverSubscriber
+from .observables import (
+    Disposable,
+    LatestItemObserverSubscriber,
+    SlotTrackingObserverSubscriber,
+)
 from .openorders import OpenOrders
 from .oracle import Price
 from .oracle import OracleProvider
@@ -43,12 +45,12 @@ from .perpeventqueue import PerpEventQueue
 from .perpmarket import PerpMarket
 from .placedorder import PlacedOrdersContainer
 from .serumeventqueue import SerumEventQueue
-from .serummarket import SerumMarket
+from .serummarket import SerumMarket, load_pyserum_market
 from .spotmarket import SpotMarket, SpotMarketInstructionBuilder, SpotMarketOperations
 from .tokenaccount import TokenAccount
 from .tokens import Instrument, Token
 from .wallet import Wallet
-from .watcher import Watcher, LamdaUpdateWatcher
+from .watcher import Watcher
 from .websocketsubscription import (
     WebSocketAccountSubscription,
     WebSocketSubscription,
@@ -70,7 +72,9 @@ def build_group_watcher(
         ),
     )
     manager.add(group_subscription)
-    latest_group_observer = LatestItemObserverSubscriber[Group](group)
+    latest_group_observer = SlotTrackingObserverSubscriber[Group](
+        group, lambda: group_subscription.latest_slot
+    )
     group_subscription.publisher.subscribe(latest_group_observer)
     health_check.add("group_subscription", group_subscription.publisher)
     return latest_group_observer
@@ -92,7 +96,9 @@ def build_account_watcher(
         ),
     )
     manager.add(account_subscription)
-    latest_account_observer = LatestItemObserverSubscriber[Account](account)
+    latest_account_observer = SlotTrackingObserverSubscriber[Account](
+        account, lambda: account_subscription.latest_slot
+    )
     account_subscription.publisher.subscribe(latest_account_observer)
     health_check.add("account_subscription", account_subscription.publisher)
     return account_subscription, latest_account_observer
@@ -109,7 +115,9 @@ def build_cache_watcher(
         context, group.cache, lambda account_info: Cache.parse(account_info)
     )
     manager.add(cache_subscription)
-    latest_cache_observer = LatestItemObserverSubscriber[Cache](cache)
+    latest_cache_observer = SlotTrackingObserverSubscriber[Cache](
+        cache, lambda: cache_subscription.latest_slot
+    )
     cache_subscription.publisher.subscribe(latest_cache_observer)
     health_check.add("cache_subscription", cache_subscription.publisher)
     return latest_cache_observer
@@ -154,8 +162,8 @@ def build_spot_open_orders_watcher(
         spot_market.base,
         spot_market.quote,
     )
-    latest_open_orders_observer = LatestItemObserverSubscriber[OpenOrders](
-        initial_spot_open_orders
+    latest_open_orders_observer = SlotTrackingObserverSubscriber[OpenOrders](
+        initial_spot_open_orders, lambda: spot_open_orders_subscription.latest_slot
     )
     spot_open_orders_subscription.publisher.subscribe(latest_open_orders_observer)
     health_check.add(
@@ -171,6 +179,23 @@ def build_serum_open_orders_watcher(
     serum_market: SerumMarket,
     wallet: Wallet,
 ) -> Watcher[PlacedOrdersContainer]:
+    _, latest_serum_open_orders_observer = build_serum_open_orders_subscription(
+        context, manager, health_check, serum_market, wallet
+    )
+    return latest_serum_open_orders_observer
+
+
+# Finds (or creates) the wallet's `OpenOrders` account for the market and subscribes to it,
+# returning the subscription as well as the watcher so other watchers can share the updates.
+def build_serum_open_orders_subscription(
+    context: Context,
+    manager: WebSocketSubscriptionManager,
+    health_check: HealthCheck,
+    serum_market: SerumMarket,
+    wallet: Wallet,
+) -> typing.Tuple[
+    WebSocketSubscription[OpenOrders], LatestItemObserverSubscriber[OpenOrders]
+]:
     all_open_orders = OpenOrders.load_for_market_and_owner(
         context,
         serum_market.address,
@@ -183,8 +208,8 @@ def build_serum_open_orders_watcher(
         initial_serum_open_orders: OpenOrders = all_open_orders[0]
         open_orders_address = initial_serum_open_orders.address
     else:
-        raw_market = PySerumMarket.load(
-            context.client.compatible_client, serum_market.address
+        raw_market = load_pyserum_market(
+            context, serum_market.address, serum_market.base, serum_market.quote
         )
         create_open_orders = build_serum_create_openorders_instructions(
             context, wallet, raw_market
@@ -215,16 +240,16 @@ def build_serum_open_orders_watcher(
 
     manager.add(serum_open_orders_subscription)
 
-    latest_serum_open_orders_observer = LatestItemObserverSubscriber[
-        PlacedOrdersContainer
-    ](initial_serum_open_orders)
+    latest_serum_open_orders_observer = SlotTrackingObserverSubscriber[OpenOrders](
+        initial_serum_open_orders, lambda: serum_open_orders_subscription.latest_slot
+    )
     serum_open_orders_subscription.publisher.subscribe(
         latest_serum_open_orders_observer
     )
     health_check.add(
         "open_orders_subscription", serum_open_orders_subscription.publisher
     )
-    return latest_serum_open_orders_observer
+    return serum_open_orders_subscription, latest_serum_open_orders_observer
 
 
 def build_perp_open_orders_watcher(
@@ -244,8 +269,8 @@ def build_perp_open_orders_watcher(
             f"Could not find perp account at index {slot.index} of account {account.address}."
         )
     initial_open_orders = initial_perp_account.open_orders
-    latest_open_orders_observer = LatestItemObserverSubscriber[PlacedOrdersContainer](
-        initial_open_orders
+    latest_open_orders_observer = SlotTrackingObserverSubscriber[PlacedOrdersContainer](
+        initial_open_orders, lambda: account_subscription.latest_slot
     )
     account_subscription.publisher.subscribe(
         on_next=lambda updated_account: latest_open_orders_observer.on_next(
@@ -288,7 +313,12 @@ def build_serum_inventory_watcher(
     wallet: Wallet,
     market: SerumMarket,
     price_watcher: Watcher[Price],
-) -> Watcher[Inventory]:
+    open_orders_subscription: typing.Optional[
+        typing.Tuple[WebSocketSubscription[OpenOrders], Watcher[OpenOrders]]
+    ] = None,
+) -> SerumInventoryWatcher:
+    # The token accounts are only looked up once, here. After that everything comes from the
+    # websocket subscriptions.
     base_account = TokenAccount.fetch_largest_for_owner_and_token(
         context, wallet.address, market.base
     )
@@ -296,64 +326,60 @@ def build_serum_inventory_watcher(
         raise Exception(
             f"Could not find token account owned by {wallet.address} for base token {market.base}."
         )
+    quote_account = TokenAccount.fetch_largest_for_owner_and_token(
+        context, wallet.address, market.quote
+    )
+    if quote_account is None:
+        raise Exception(
+            f"Could not find token account owned by {wallet.address} for quote token {market.quote}."
+        )
+
+    # Serum markets don't accrue MNGO liquidity incentives
+    mngo: typing.Optional[Instrument] = context.instrument_lookup.find_by_symbol("MNGO")
+    if mngo is None:
+        raise Exception("Could not find details of MNGO token.")
+    mngo_accrued: InstrumentValue = InstrumentValue(Token.ensure(mngo), Decimal(0))
+
+    initial_open_orders: typing.Optional[OpenOrders] = None
+    if open_orders_subscription is not None:
+        initial_open_orders = open_orders_subscription[1].latest
+
+    inventory_watcher = SerumInventoryWatcher(
+        mngo_accrued, price_watcher, base_account, quote_account, initial_open_orders
+    )
+
     base_token_subscription = WebSocketAccountSubscription[TokenAccount](
         context,
         base_account.address,
         lambda account_info: TokenAccount.parse(account_info, market.base),
     )
     manager.add(base_token_subscription)
-    latest_base_token_account_observer = LatestItemObserverSubscriber[TokenAccount](
-        base_account
-    )
-    base_subscription_disposable = base_token_subscription.publisher.subscribe(
-        latest_base_token_account_observer
+    disposer.add_disposable(
+        base_token_subscription.publisher.subscribe(
+            on_next=inventory_watcher.on_base_token_account
+        )
     )
-    disposer.add_disposable(base_subscription_disposable)
 
-    quote_account = TokenAccount.fetch_largest_for_owner_and_token(
-        context, wallet.address, market.quote
-    )
-    if quote_account is None:
-        raise Exception(
-            f"Could not find token account owned by {wallet.address} for quote token {market.quote}."
-        )
     quote_token_subscription = WebSocketAccountSubscription[TokenAccount](
         context,
         quote_account.address,
         lambda account_info: TokenAccount.parse(account_info, market.quote),
     )
     manager.add(quote_token_subscription)
-    latest_quote_token_account_observer = LatestItemObserverSubscriber[TokenAccount](
-        quote_account
-    )
-    quote_subscription_disposable = quote_token_subscription.publisher.subscribe(
-        latest_quote_token_account_observer
+    disposer.add_disposable(
+        quote_token_subscription.publisher.subscribe(
+            on_next=inventory_watcher.on_quote_token_account
+        )
     )
-    disposer.add_disposable(quote_subscription_disposable)
-
-    # Serum markets don't accrue MNGO liquidity incentives
-    mngo: typing.Optional[Instrument] = context.instrument_lookup.find_by_symbol("MNGO")
-    if mngo is None:
-        raise Exception("Could not find details of MNGO token.")
-    mngo_accrued: InstrumentValue = InstrumentValue(Token.ensure(mngo), Decimal(0))
 
-    def serum_inventory_accessor() -> Inventory:
-        available: Decimal = (
-            latest_base_token_account_observer.latest.value.value
-            * price_watcher.latest.mid_price
-        ) + latest_quote_token_account_observer.latest.value.value
-        available_collateral: InstrumentValue = InstrumentValue(
-            latest_quote_token_account_observer.latest.value.token, available
-        )
-        return Inventory(
-            InventorySource.SPL_TOKENS,
-            mngo_accrued,
-            available_collateral,
-            latest_base_token_account_observer.latest.value,
-            latest_quote_token_account_observer.latest.value,
+    if open_orders_subscription is not None:
+        disposer.add_disposable(
+            open_orders_subscription[0].publisher.subscribe(
+                on_next=inventory_watcher.on_open_orders
+            )
         )
 
-    return LamdaUpdateWatcher(serum_inventory_accessor)
+    return inventory_watcher
 
 
 def build_orderbook_watcher(
@@ -402,7 +428,10 @@ def build_orderbook_watcher(
     )
     manager.add(asks_subscription)
 
-    orderbook_observer = LatestItemObserverSubscriber[OrderBook](initial_orderbook)
+    orderbook_observer = SlotTrackingObserverSubscriber[OrderBook](
+        initial_orderbook,
+        lambda: max(bids_subscription.latest_slot, asks_subscription.latest_slot),
+    )
 
     bids_subscription.publisher.subscribe(orderbook_observer)
     asks_subscription.publisher.subscribe(orderbook_observer)
@@ -428,7 +457,9 @@ def build_serum_event_queue_watcher(
         ),
     )
     manager.add(subscription)
-    latest_observer = LatestItemObserverSubscriber[EventQueue](initial)
+    latest_observer = SlotTrackingObserverSubscriber[EventQueue](
+        initial, lambda: subscription.latest_slot
+    )
     subscription.publisher.subscribe(latest_observer)
     health_check.add("event_queue_subscription", subscription.publisher)
     return latest_observer
@@ -451,7 +482,9 @@ def build_spot_event_queue_watcher(
         ),
     )
     manager.add(subscription)
-    latest_observer = LatestItemObserverSubscriber[EventQueue](initial)
+    latest_observer = SlotTrackingObserverSubscriber[EventQueue](
+        initial, lambda: subscription.latest_slot
+    )
     subscription.publisher.subscribe(latest_observer)
     health_check.add("event_queue_subscription", subscription.publisher)
     return latest_observer
@@ -474,7 +507,9 @@ def build_perp_event_queue_watcher(
         ),
     )
     manager.add(subscription)
-    latest_observer = LatestItemObserverSubscriber[EventQueue](initial)
+    latest_observer = SlotTrackingObserverSubscriber[EventQueue](
+        initial, lambda: subscription.latest_slot
+    )
     subscription.publisher.subscribe(latest_observer)
     health_check.add("event_queue_subscription", subscription.publisher)
     return latest_observer
@@ -14,6 +14,7 @@
 #   [Email](mailto:hello@blockworks.foundation)
 
 import abc
+import json
 import logging
 import typing
 import websocket
@@ -22,7 +23,7 @@ from dataclasses import dataclass
 from rx.subject.behaviorsubject import BehaviorSubject
 from rx.core.typing import Disposable as RxDisposable
 from solana.publickey import PublicKey
-from solana.rpc.types import RPCResponse
+from solana.rpc.types import MemcmpOpts, RPCResponse
 
 from .accountinfo import AccountInfo
 from .context import Context
@@ -52,6 +53,7 @@ class WebSocketSubscription(
         self.context: Context = context
         self.id: int = context.generate_client_id()
         self.subscription_id: int = 0
+        self.latest_slot: int = 0
         self.publisher: EventSource[TSubscriptionInstance] = EventSource[
             TSubscriptionInstance
         ]()
@@ -70,6 +72,11 @@ class WebSocketSubscription(
                 self._logger.info(f"Subscription created with id {subscription_id}.")
         else:
             subscription_id = response["params"]["subscription"]
+            # Notifications carry the slot they're for in their context. It's recorded before the
+            # update is published so observers can tell which slot the published item came from.
+            result: typing.Any = response["params"].get("result")
+            if isinstance(result, dict) and "context" in result:
+                self.latest_slot = max(self.latest_slot, int(result["context"]["slot"]))
             built = self.build_subscribed_instance(response["params"])
             self.publisher.publish(built)
 
@@ -102,16 +109,36 @@ class AddressWebSocketSubscription(WebSocketSubscription[TSubscriptionInstance])
         return built
 
 
+# # 🥭 WebSocketProgramSubscription class
+#
+# Subscribes to all accounts owned by a program (optionally just those matching the `filters` and
+# `data_size`). Notifications carry the address of the account that changed along with its data, so
+# the `AccountInfo` passed to the constructor has that account's address, not the program's.
+#
 class WebSocketProgramSubscription(AddressWebSocketSubscription[TSubscriptionInstance]):
     def __init__(
         self,
         context: Context,
         address: PublicKey,
         constructor: typing.Callable[[AccountInfo], TSubscriptionInstance],
+        filters: typing.Sequence[MemcmpOpts] = [],
+        data_size: typing.Optional[int] = None,
     ) -> None:
         super().__init__(context, address, constructor)
+        self.filters: typing.Sequence[MemcmpOpts] = filters
+        self.data_size: typing.Optional[int] = data_size
 
     def build_request(self) -> str:
+        all_filters: typing.List[typing.Dict[str, typing.Any]] = [
+            {"memcmp": {"offset": memcmp.offset, "bytes": memcmp.bytes}}
+            for memcmp in self.filters
+        ]
+        if self.data_size is not None:
+            all_filters += [{"dataSize": self.data_size}]
+        filters: str = ""
+        if len(all_filters) > 0:
+            filters = f""",
+            "filters": {json.dumps(all_filters)}"""
         return f"""{{
     "jsonrpc": "2.0",
     "id": {self.id},
@@ -120,11 +147,19 @@ class WebSocketProgramSubscription(AddressWebSocketSubscription[TSubscriptionIns
         "{self.address}",
         {{
             "encoding": "base64",
-            "commitment": "{self.context.client.commitment}"
+            "commitment": "{self.context.client.commitment}"{filters}
         }}
     ]
 }}"""
 
+    def build_subscribed_instance(self, response: RPCResponse) -> TSubscriptionInstance:
+        value: typing.Dict[str, typing.Any] = response["result"]["value"]
+        account_info: AccountInfo = AccountInfo._from_response_values(
+            value["account"], PublicKey(value["pubkey"])
+        )
+        built: TSubscriptionInstance = self.from_account_info(account_info)
+        return built
+
 
 class WebSocketAccountSubscription(AddressWebSocketSubscription[TSubscriptionInstance]):
     def __init__(
@@ -98,6 +98,19 @@ def fake_context(
     return context
 
 
+def fake_simulator_context(
+    simulator: mango.RPCSimulator, **overrides: typing.Any
+) -> mango.Context:
+    settings: typing.Dict[str, typing.Any] = {
+        "cluster_name": "devnet",
+        "cluster_urls": [simulator.cluster_url],
+        "blockhash_cache_duration": 0,
+        "stale_data_pauses_before_retry": [],
+    }
+    settings.update(overrides)
+    return mango.ContextBuilder.build(**settings)
+
+
 def fake_account_info(
     address: typing.Optional[PublicKey] = None,
     executable: bool = False,
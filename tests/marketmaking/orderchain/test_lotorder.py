@@ -0,0 +1,186 @@
+import typing
+
+from ...context import mango
+from ...fakes import (
+    fake_context,
+    fake_loaded_market,
+    fake_model_state,
+    fake_order,
+    fake_price,
+)
+
+from decimal import Decimal
+
+from mango.marketmaking.orderchain.biasquoteelement import BiasQuoteElement
+from mango.marketmaking.orderchain.chain import Chain
+from mango.marketmaking.orderchain.element import Element
+from mango.marketmaking.orderchain.fixedpositionsizeelement import (
+    FixedPositionSizeElement,
+)
+from mango.marketmaking.orderchain.fixedspreadelement import FixedSpreadElement
+from mango.marketmaking.orderchain.lotorder import LotOrder
+from mango.marketmaking.orderchain.minimumchargeelement import MinimumChargeElement
+from mango.marketmaking.orderchain.preventpostonlycrossingbookelement import (
+    PreventPostOnlyCrossingBookElement,
+)
+from mango.marketmaking.orderchain.quotesinglesideelement import (
+    QuoteSingleSideElement,
+)
+from mango.marketmaking.orderchain.roundtolotsizeelement import RoundToLotSizeElement
+
+
+# Tick size of 0.1 and lot size of 0.0001.
+market = fake_loaded_market(base_lot_size=Decimal(100), quote_lot_size=Decimal(10))
+orderbook: mango.OrderBook = mango.OrderBook(
+    "TEST",
+    market.lot_size_converter,
+    [fake_order(price=Decimal("90.3"), side=mango.Side.BUY)],
+    [fake_order(price=Decimal("110.7"), side=mango.Side.SELL)],
+)
+model_state = fake_model_state(
+    market=market,
+    orderbook=orderbook,
+    price=fake_price(
+        market=market,
+        price=Decimal("100.03"),
+        bid=Decimal("99.87"),
+        ask=Decimal("100.21"),
+    ),
+)
+
+
+def _orders() -> typing.Sequence[mango.Order]:
+    return [
+        fake_order(
+            price=Decimal("99.9"),
+            quantity=Decimal("1.2345"),
+            side=mango.Side.BUY,
+            order_type=mango.OrderType.POST_ONLY,
+        ),
+        fake_order(
+            price=Decimal("97.3"),
+            quantity=Decimal("2.5"),
+            side=mango.Side.BUY,
+            order_type=mango.OrderType.POST_ONLY,
+        ),
+        fake_order(
+            price=Decimal("100.1"),
+            quantity=Decimal("0.0007"),
+            side=mango.Side.SELL,
+            order_type=mango.OrderType.POST_ONLY,
+        ),
+        fake_order(
+            price=Decimal("111.2"),
+            quantity=Decimal("3"),
+            side=mango.Side.SELL,
+            order_type=mango.OrderType.POST_ONLY,
+        ),
+    ]
+
+
+def _summary(
+    orders: typing.Sequence[mango.Order],
+) -> typing.Sequence[typing.Tuple[mango.Side, Decimal, Decimal]]:
+    return [(order.side, order.price, order.quantity) for order in orders]
+
+
+# The lot-mode result must be the same as the Decimal result rounded to lots.
+def _assert_lot_mode_matches(element: Element) -> None:
+    context = fake_context()
+    converter = market.lot_size_converter
+    lot_orders = LotOrder.from_orders(_orders(), converter)
+    aligned = LotOrder.to_orders(lot_orders, converter)
+
+    expected = LotOrder.to_orders(
+        LotOrder.from_orders(element.process(context, model_state, aligned), converter),
+        converter,
+    )
+    actual = LotOrder.to_orders(
+        element.process_lots(context, model_state, lot_orders), converter
+    )
+
+    assert _summary(actual) == _summary(expected)
+
+
+def test_round_trip() -> None:
+    converter = market.lot_size_converter
+    order = fake_order(price=Decimal("99.96"), quantity=Decimal("1.23456"))
+
+    actual = LotOrder.from_order(order, converter)
+    assert actual.price == 1000
+    assert actual.quantity == 12346
+    assert actual.side == mango.Side.BUY
+
+    rounded = actual.to_order(converter)
+    assert rounded.price == converter.round_quote(order.price)
+    assert rounded.quantity == converter.round_base(order.quantity)
+    assert rounded.order_type == order.order_type
+
+
+def test_aligned_order_is_not_copied() -> None:
+    converter = market.lot_size_converter
+    order = fake_order(price=Decimal("99.9"), quantity=Decimal("1.2345"))
+
+    actual = LotOrder.from_order(order, converter).to_order(converter)
+    assert actual is order
+
+
+def test_fixed_spread_matches_decimal() -> None:
+    _assert_lot_mode_matches(FixedSpreadElement([Decimal("0.55"), Decimal("3")]))
+
+
+def test_bias_quote_matches_decimal() -> None:
+    _assert_lot_mode_matches(BiasQuoteElement([Decimal("1.0013"), Decimal("0.997")]))
+
+
+def test_minimum_charge_matches_decimal() -> None:
+    _assert_lot_mode_matches(MinimumChargeElement([Decimal("0.0015")], False))
+
+
+def test_minimum_charge_from_bid_ask_matches_decimal() -> None:
+    _assert_lot_mode_matches(MinimumChargeElement([Decimal("0.0015")], True))
+
+
+def test_prevent_post_only_crossing_book_matches_decimal() -> None:
+    _assert_lot_mode_matches(PreventPostOnlyCrossingBookElement())
+
+
+def test_round_to_lot_size_matches_decimal() -> None:
+    _assert_lot_mode_matches(RoundToLotSizeElement())
+
+
+def test_fallback_elements_match_decimal() -> None:
+    _assert_lot_mode_matches(FixedPositionSizeElement([Decimal("0.12345")]))
+    _assert_lot_mode_matches(QuoteSingleSideElement(mango.Side.SELL))
+
+
+def test_chain_lot_mode_matches_decimal() -> None:
+    context = fake_context()
+    elements = [
+        FixedPositionSizeElement([Decimal("0.5"), Decimal("1.25")]),
+        FixedSpreadElement([Decimal("0.55"), Decimal("3")]),
+        BiasQuoteElement([Decimal("1.0013")]),
+        MinimumChargeElement([Decimal("0.0015")], False),
+        PreventPostOnlyCrossingBookElement(),
+        RoundToLotSizeElement(),
+    ]
+
+    class _SeedElement(Element):
+        def process(
+            self,
+            context: mango.Context,
+            model_state: mango.ModelState,
+            orders: typing.Sequence[mango.Order],
+        ) -> typing.Sequence[mango.Order]:
+            return _orders()
+
+    # Lot mode rounds after every element, so compare with a Decimal chain that does the same.
+    rounded: typing.List[Element] = [_SeedElement()]
+    for element in elements:
+        rounded += [element, RoundToLotSizeElement()]
+
+    expected = Chain(rounded).process(context, model_state)
+    actual = Chain([_SeedElement(), *elements], True).process(context, model_state)
+
+    assert len(actual) == 4
+    assert _summary(actual) == _summary(expected)
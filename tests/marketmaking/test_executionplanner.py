@@ -0,0 +1,116 @@
+import typing
+
+from ..context import mango
+from ..fakes import fake_context, fake_seeded_public_key, fake_wallet
+
+from decimal import Decimal
+from solana.transaction import AccountMeta, TransactionInstruction
+
+
+PROGRAM = fake_seeded_public_key("program")
+SHARED = [fake_seeded_public_key(f"shared {index}") for index in range(6)]
+
+
+def _instruction(name: str, size: int = 40) -> TransactionInstruction:
+    return TransactionInstruction(
+        keys=[
+            AccountMeta(pubkey=key, is_signer=False, is_writable=True)
+            for key in [*SHARED, fake_seeded_public_key(name)]
+        ],
+        program_id=PROGRAM,
+        data=name.encode().ljust(size, b"\0"),
+    )
+
+
+def _name(instruction: TransactionInstruction) -> bytes:
+    return bytes(instruction.data).rstrip(b"\0")
+
+
+def _unit(
+    name: str, distance: typing.Optional[Decimal], sequence: int, stage: int = 0
+) -> mango.marketmaking.ExecutionUnit:
+    return mango.marketmaking.ExecutionUnit(
+        name,
+        mango.CombinableInstructions.from_instruction(_instruction(name)),
+        distance,
+        sequence,
+        stage,
+    )
+
+
+def test_packs_most_price_sensitive_first() -> None:
+    payer = mango.CombinableInstructions.from_wallet(fake_wallet())
+    units = [
+        _unit(f"order {index}", Decimal(index % 7) / 100, index) for index in range(14)
+    ]
+    units += [_unit("crank", None, 14)]
+    plan = mango.marketmaking.ExecutionPlanner().plan(payer, units)
+
+    in_order = [unit.instructions.instructions[0] for unit in units]
+    greedy = mango.combinableinstructions._split_instructions_into_chunks(
+        fake_context(), payer.signers, in_order
+    )
+    assert plan.instruction_count == len(units)
+    assert 1 < plan.transaction_count <= len(greedy)
+
+    for transaction, size in zip(plan.transactions, plan.sizes):
+        assert size == mango.CombinableInstructions.transaction_size(
+            transaction.signers, transaction.instructions
+        )
+        assert size < 1232
+        # Units in a transaction keep their original order.
+        names = [_name(instruction) for instruction in transaction.instructions]
+        sequences = [int(name.split(b" ")[1]) for name in names if name != b"crank"]
+        assert sequences == sorted(sequences)
+
+    first = {_name(instruction) for instruction in plan.transactions[0].instructions}
+    assert {b"order 0", b"order 7"} <= first
+    last = {_name(instruction) for instruction in plan.transactions[-1].instructions}
+    assert b"crank" in last
+
+
+def test_cancels_are_never_sent_after_places() -> None:
+    payer = mango.CombinableInstructions.from_wallet(fake_wallet())
+    cancels = [_unit(f"cancel {index}", Decimal("0.05"), index) for index in range(10)]
+    places = [
+        _unit(f"place {index}", Decimal("0.01"), index + 10, 1) for index in range(10)
+    ]
+    plan = mango.marketmaking.ExecutionPlanner().plan(payer, cancels + places)
+    assert plan.instruction_count == 20
+    assert plan.transaction_count > 1
+
+    transaction_of: typing.Dict[bytes, int] = {}
+    for index, transaction in enumerate(plan.transactions):
+        for instruction in transaction.instructions:
+            transaction_of[_name(instruction)] = index
+    last_cancel = max(
+        index for name, index in transaction_of.items() if name.startswith(b"cancel")
+    )
+    first_place = min(
+        index for name, index in transaction_of.items() if name.startswith(b"place")
+    )
+    assert last_cancel <= first_place
+
+
+def test_prologue_and_epilogue() -> None:
+    payer = mango.CombinableInstructions.from_wallet(fake_wallet())
+    prologue = mango.CombinableInstructions.from_instruction(_instruction("prologue"))
+    epilogue = mango.CombinableInstructions.from_instruction(_instruction("epilogue"))
+    units = [_unit(f"order {index}", Decimal(0), index) for index in range(14)]
+    plan = mango.marketmaking.ExecutionPlanner().plan(
+        payer, units, prologue, epilogue, ["settle"]
+    )
+
+    assert plan.transaction_count > 1
+    assert plan.transactions[0].instructions[0] == prologue.instructions[0]
+    assert plan.transactions[-1].instructions[-1] == epilogue.instructions[0]
+    assert plan.dropped == ["settle"]
+
+    statistics = mango.marketmaking.ExecutionStatistics()
+    statistics.record(plan)
+    statistics.record(None)
+    assert statistics.pulses == 2
+    assert statistics.transactions == plan.transaction_count
+    assert statistics.maximum == plan.transaction_count
+    assert statistics.transactions_per_pulse == {0: 1, plan.transaction_count: 1}
+    assert statistics.dropped == {"settle": 1}
@@ -0,0 +1,197 @@
+import decimal
+import mango
+import random
+import typing
+
+from datetime import timedelta
+from decimal import Decimal
+from mango.marketmaking.indexedtoleranceorderreconciler import (
+    IndexedToleranceOrderReconciler,
+)
+from mango.marketmaking.toleranceorderreconciler import ToleranceOrderReconciler
+
+from ..fakes import fake_model_state
+
+
+def _random_orders(
+    generator: random.Random, count: int
+) -> typing.Sequence[mango.Order]:
+    return [
+        mango.Order.from_values(
+            generator.choice([mango.Side.BUY, mango.Side.SELL]),
+            price=Decimal(generator.randint(9900, 10100)) / 100,
+            quantity=Decimal(generator.randint(95, 105)) / 10,
+        )
+        for _ in range(count)
+    ]
+
+
+def _ladder_reconciliation() -> typing.Tuple[
+    typing.Sequence[mango.Order], typing.Sequence[mango.Order]
+]:
+    existing = [
+        mango.Order.from_values(
+            mango.Side.BUY, price=Decimal(100), quantity=Decimal(10)
+        ),
+        mango.Order.from_values(
+            mango.Side.BUY, price=Decimal("100.15"), quantity=Decimal(10)
+        ),
+    ]
+    desired = [
+        mango.Order.from_values(
+            mango.Side.BUY, price=Decimal("100.05"), quantity=Decimal(10)
+        ),
+        mango.Order.from_values(
+            mango.Side.BUY, price=Decimal("99.95"), quantity=Decimal(10)
+        ),
+    ]
+    return existing, desired
+
+
+def test_greedy_matches_tolerance_order_reconciler() -> None:
+    generator = random.Random(42)
+    model_state = fake_model_state()
+    original = ToleranceOrderReconciler(
+        Decimal("0.002"), Decimal("0.05"), timedelta(seconds=0)
+    )
+    actual = IndexedToleranceOrderReconciler(
+        Decimal("0.002"), Decimal("0.05"), timedelta(seconds=0)
+    )
+    for _ in range(50):
+        existing = _random_orders(generator, 40)
+        desired = _random_orders(generator, 40)
+
+        expected = original.reconcile(model_state, existing, desired)
+        result = actual.reconcile(model_state, existing, desired)
+
+        assert result.to_keep == expected.to_keep
+        assert result.to_ignore == expected.to_ignore
+        assert result.to_place == expected.to_place
+        assert result.to_cancel == expected.to_cancel
+
+
+def test_price_tolerance_boundaries_match() -> None:
+    existing = [
+        mango.Order.from_values(
+            mango.Side.SELL, price=Decimal(100), quantity=Decimal(10)
+        ),
+        mango.Order.from_values(
+            mango.Side.SELL, price=Decimal(200), quantity=Decimal(10)
+        ),
+    ]
+    desired = [
+        mango.Order.from_values(
+            mango.Side.SELL, price=Decimal("100.1"), quantity=Decimal(10)
+        ),
+        mango.Order.from_values(
+            mango.Side.SELL, price=Decimal("199.8"), quantity=Decimal(10)
+        ),
+    ]
+    actual = IndexedToleranceOrderReconciler(
+        Decimal("0.001"), Decimal(0), timedelta(seconds=0)
+    )
+    result = actual.reconcile(fake_model_state(), existing, desired)
+
+    assert result.to_keep == existing
+    assert result.to_ignore == desired
+    assert result.to_place == []
+    assert result.to_cancel == []
+
+
+def test_price_tolerance_boundary_at_default_precision() -> None:
+    # With 28 digits, dividing this desired price by (1 - tolerance) rounds to just below the existing
+    # price, even though the existing order is exactly on the tolerance boundary.
+    with decimal.localcontext() as context:
+        context.prec = 28
+        price_tolerance = Decimal("0.00000426748033")
+        existing_price = Decimal("2528829803.77735")
+        existing = [
+            mango.Order.from_values(
+                mango.Side.BUY, price=existing_price, quantity=Decimal(1)
+            )
+        ]
+        desired = [
+            mango.Order.from_values(
+                mango.Side.BUY,
+                price=existing_price - (existing_price * price_tolerance),
+                quantity=Decimal(1),
+            )
+        ]
+        assert desired[0].price / (1 - price_tolerance) < existing_price
+
+        expected = ToleranceOrderReconciler(
+            price_tolerance, Decimal(0), timedelta(seconds=0)
+        ).reconcile(fake_model_state(), existing, desired)
+        result = IndexedToleranceOrderReconciler(
+            price_tolerance, Decimal(0), timedelta(seconds=0)
+        ).reconcile(fake_model_state(), existing, desired)
+
+    assert expected.to_keep == existing
+    assert result.to_keep == expected.to_keep
+    assert result.to_place == expected.to_place
+
+
+def test_large_price_tolerance_matches() -> None:
+    existing = [
+        mango.Order.from_values(mango.Side.BUY, price=Decimal(1), quantity=Decimal(10)),
+    ]
+    desired = [
+        mango.Order.from_values(
+            mango.Side.BUY, price=Decimal("1.9"), quantity=Decimal(10)
+        ),
+    ]
+    actual = IndexedToleranceOrderReconciler(
+        Decimal(1), Decimal(0), timedelta(seconds=0)
+    )
+    result = actual.reconcile(fake_model_state(), existing, desired)
+
+    assert result.to_keep == existing
+    assert result.to_place == []
+
+
+def test_greedy_leaves_unmatched_orders() -> None:
+    existing, desired = _ladder_reconciliation()
+    actual = IndexedToleranceOrderReconciler(
+        Decimal("0.001"), Decimal(0), timedelta(seconds=0)
+    )
+    result = actual.reconcile(fake_model_state(), existing, desired)
+
+    assert result.to_keep == [existing[0]]
+    assert result.to_ignore == [desired[0]]
+    assert result.to_place == [desired[1]]
+    assert result.to_cancel == [existing[1]]
+
+
+def test_optimal_matches_all_orders() -> None:
+    existing, desired = _ladder_reconciliation()
+    actual = IndexedToleranceOrderReconciler(
+        Decimal("0.001"), Decimal(0), timedelta(seconds=0), optimal=True
+    )
+    result = actual.reconcile(fake_model_state(), existing, desired)
+
+    assert result.to_keep == [existing[1], existing[0]]
+    assert result.to_ignore == desired
+    assert result.to_place == []
+    assert result.to_cancel == []
+
+
+def test_optimal_never_worse_than_greedy() -> None:
+    generator = random.Random(7)
+    model_state = fake_model_state()
+    greedy = IndexedToleranceOrderReconciler(
+        Decimal("0.005"), Decimal("0.05"), timedelta(seconds=0)
+    )
+    optimal = IndexedToleranceOrderReconciler(
+        Decimal("0.005"), Decimal("0.05"), timedelta(seconds=0), optimal=True
+    )
+    for _ in range(50):
+        existing = _random_orders(generator, 30)
+        desired = _random_orders(generator, 30)
+
+        greedy_result = greedy.reconcile(model_state, existing, desired)
+        optimal_result = optimal.reconcile(model_state, existing, desired)
+
+        assert len(optimal_result.to_keep) >= len(greedy_result.to_keep)
+        for kept, ignored in zip(optimal_result.to_keep, optimal_result.to_ignore):
+            assert optimal.is_within_tolderance(kept, ignored)
+        assert len(set(map(id, optimal_result.to_keep))) == len(optimal_result.to_keep)
@@ -0,0 +1,151 @@
+import threading
+import time
+import typing
+
+from ..context import mango
+from ..fakes import (
+    fake_account,
+    fake_account_info,
+    fake_context,
+    fake_model_state,
+    fake_seeded_public_key,
+)
+
+
+def _slot_watched_model_state(
+    slots: typing.Dict[str, int]
+) -> typing.Tuple[
+    mango.ModelState,
+    mango.SlotTrackingObserverSubscriber[mango.Account],
+    mango.SlotTrackingObserverSubscriber[mango.OrderBook],
+]:
+    model_state = fake_model_state()
+    account_watcher = mango.SlotTrackingObserverSubscriber[mango.Account](
+        model_state.account, lambda: slots["account"]
+    )
+    orderbook_watcher = mango.SlotTrackingObserverSubscriber[mango.OrderBook](
+        model_state.orderbook, lambda: slots["orderbook"]
+    )
+    account_watcher.on_next(model_state.account)
+    orderbook_watcher.on_next(model_state.orderbook)
+    model_state.account_watcher = account_watcher
+    model_state.orderbook_watcher = orderbook_watcher
+    return model_state, account_watcher, orderbook_watcher
+
+
+def test_subscription_records_notification_slot() -> None:
+    address = fake_seeded_public_key("account")
+    subscription = mango.WebSocketAccountSubscription[mango.AccountInfo](
+        fake_context(), address, lambda account_info: account_info
+    )
+    observer = mango.SlotTrackingObserverSubscriber[mango.AccountInfo](
+        fake_account_info(address),
+        lambda: subscription.latest_slot,
+    )
+    subscription.publisher.subscribe(observer)
+    assert observer.slot == 0
+    assert isinstance(observer, mango.SlotWatcher)
+
+    subscription._on_item(
+        {
+            "method": "accountNotification",
+            "params": {
+                "result": {
+                    "context": {"slot": 7},
+                    "value": {
+                        "data": ["AwQ=", "base64"],
+                        "executable": False,
+                        "lamports": 1,
+                        "owner": str(address),
+                        "rentEpoch": 0,
+                    },
+                },
+                "subscription": 1,
+            },
+        }
+    )
+    assert observer.slot == 7
+    assert observer.latest.data == bytes([3, 4])
+
+
+def test_waits_for_lagging_watcher() -> None:
+    slots = {"account": 100, "orderbook": 110}
+    model_state, account_watcher, _ = _slot_watched_model_state(slots)
+    builder = mango.marketmaking.SlotConsistentModelStateBuilder(
+        model_state, max_skew=2, max_wait=5
+    )
+    updated_account = fake_account(fake_seeded_public_key("updated"))
+
+    def _catch_up() -> None:
+        time.sleep(0.05)
+        slots["account"] = 109
+        account_watcher.on_next(updated_account)
+
+    threading.Thread(target=_catch_up).start()
+    snapshot = builder.build(fake_context())
+
+    assert snapshot.account == updated_account
+    assert snapshot.slot_skew is not None
+    assert snapshot.slot_skew.slots == {"account": 109, "orderbook": 110}
+    assert snapshot.slot_skew.skew == 1
+    assert snapshot.slot_skew.lagging == []
+    assert 0.05 <= snapshot.slot_skew.waited < 5
+
+    # The snapshot doesn't change when the watchers do.
+    account_watcher.on_next(fake_account())
+    assert snapshot.account == updated_account
+
+
+def test_quiet_watcher_is_only_waited_for_once() -> None:
+    slots = {"account": 100, "orderbook": 110}
+    model_state, _, _ = _slot_watched_model_state(slots)
+    builder = mango.marketmaking.SlotConsistentModelStateBuilder(
+        model_state, max_skew=2, max_wait=0.05
+    )
+    skews: typing.List[mango.SlotSkew] = []
+    builder.skews.subscribe(on_next=skews.append)
+
+    builder.build(fake_context())
+    builder.build(fake_context())
+
+    assert [skew.lagging for skew in skews] == [["account"], []]
+    assert skews[0].waited >= 0.05
+    assert skews[1].waited < 0.05
+    assert skews[1].skew == 10
+
+
+def test_watcher_that_updates_while_lagging_is_not_quiet() -> None:
+    slots = {"account": 100, "orderbook": 110}
+    model_state, account_watcher, _ = _slot_watched_model_state(slots)
+    builder = mango.marketmaking.SlotConsistentModelStateBuilder(
+        model_state, max_skew=2, max_wait=0.2
+    )
+    skews: typing.List[mango.SlotSkew] = []
+    builder.skews.subscribe(on_next=skews.append)
+
+    def _move_but_stay_behind() -> None:
+        time.sleep(0.05)
+        slots["account"] = 105
+        account_watcher.on_next(fake_account())
+
+    threading.Thread(target=_move_but_stay_behind).start()
+    builder.build(fake_context())
+    builder.build(fake_context())
+
+    # The account watcher is active, so the second pulse waits for it too.
+    assert [skew.lagging for skew in skews] == [["account"], ["account"]]
+    assert skews[1].waited >= 0.2
+
+
+def test_snapshots_share_state() -> None:
+    slots = {"account": 100, "orderbook": 100}
+    model_state, _, _ = _slot_watched_model_state(slots)
+    builder = mango.marketmaking.SlotConsistentModelStateBuilder(model_state, 2)
+
+    first = builder.build(fake_context())
+    first.state["seen"] = 1
+    model_state.not_quoting = True
+    second = builder.build(fake_context())
+
+    assert second.state == {"seen": 1}
+    assert second.not_quoting
@@ -0,0 +1,151 @@
+import os
+import typing
+
+from ..context import mango
+from ..fakes import fake_context, fake_model_state, fake_order
+
+from decimal import Decimal
+from pathlib import Path
+
+from mango.marketmaking.orderchain.chain import Chain
+from mango.marketmaking.orderchain.element import Element
+from mango.marketmaking.orderchain.roundtolotsizeelement import RoundToLotSizeElement
+
+
+def _summary(
+    report: mango.marketmaking.PulseTimingsReport, stage: str
+) -> mango.marketmaking.StageTimingSummary:
+    return next(summary for summary in report.stages if summary.stage == stage)
+
+
+def test_rolling_histogram_summary() -> None:
+    actual = mango.marketmaking.RollingHistogram(100)
+    for milliseconds in range(1, 101):
+        actual.add(milliseconds / 1000)
+
+    summary = actual.summarise("test")
+
+    assert summary.stage == "test"
+    assert summary.count == 100
+    assert summary.p50 == 0.051
+    assert summary.p90 == 0.091
+    assert summary.p99 == 0.1
+    assert summary.maximum == 0.1
+    assert summary.buckets[0.001] == 1
+    assert summary.buckets[0.005] == 4
+    assert summary.buckets[0.01] == 5
+    assert summary.buckets[0.05] == 40
+    assert summary.buckets[0.1] == 50
+    assert sum(summary.buckets.values()) == 100
+
+
+def test_rolling_histogram_keeps_window() -> None:
+    actual = mango.marketmaking.RollingHistogram(3)
+    for seconds in [10.0, 1.0, 2.0, 3.0]:
+        actual.add(seconds)
+
+    summary = actual.summarise("test")
+
+    assert summary.count == 3
+    assert summary.maximum == 3.0
+
+
+def test_empty_rolling_histogram_summary() -> None:
+    summary = mango.marketmaking.RollingHistogram(3).summarise("test")
+
+    assert summary.count == 0
+    assert summary.mean == 0
+    assert summary.maximum == 0
+
+
+def test_stages_recorded() -> None:
+    actual = mango.marketmaking.PulseProfiler(report_every=0)
+    with actual.pulse():
+        with actual.stage("first"):
+            pass
+        with actual.stage("second"):
+            pass
+
+    report = actual.report()
+
+    assert report.pulse_count == 1
+    assert [summary.stage for summary in report.stages] == [
+        "first",
+        "second",
+        "pulse",
+    ]
+
+
+def test_stage_recorded_on_exception() -> None:
+    actual = mango.marketmaking.PulseProfiler(report_every=0)
+    try:
+        with actual.stage("failing"):
+            raise Exception("Test exception")
+    except Exception:
+        pass
+
+    assert _summary(actual.report(), "failing").count == 1
+
+
+def test_report_published_every_n_pulses() -> None:
+    actual = mango.marketmaking.PulseProfiler(report_every=2)
+    reports: typing.List[mango.marketmaking.PulseTimingsReport] = []
+    actual.timings.subscribe(on_next=reports.append)
+
+    for _ in range(5):
+        with actual.pulse():
+            pass
+
+    assert [report.pulse_count for report in reports] == [2, 4]
+    assert _summary(reports[-1], "pulse").count == 4
+
+
+def test_capture_profile_writes_file(tmp_path: Path) -> None:
+    actual = mango.marketmaking.PulseProfiler(
+        report_every=0, profile_directory=str(tmp_path)
+    )
+    actual.capture_profile(2)
+
+    with actual.pulse():
+        pass
+    assert os.listdir(tmp_path) == []
+
+    with actual.pulse():
+        pass
+    written = os.listdir(tmp_path)
+    assert len(written) == 1
+    assert written[0].startswith("mango_pulse_profile_")
+
+    # Profiling stops after the requested number of pulses.
+    with actual.pulse():
+        pass
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_chain_records_element_stages() -> None:
+    class _SeedElement(Element):
+        def process(
+            self,
+            context: mango.Context,
+            model_state: mango.ModelState,
+            orders: typing.Sequence[mango.Order],
+        ) -> typing.Sequence[mango.Order]:
+            return [fake_order(price=Decimal(10))]
+
+    profiler = mango.marketmaking.PulseProfiler(report_every=0)
+    chain = Chain([_SeedElement(), RoundToLotSizeElement()])
+    result = chain.process(fake_context(), fake_model_state(), profiler)
+
+    assert len(result) == 1
+    report = profiler.report()
+    assert _summary(report, "chain:_SeedElement").count == 1
+    assert _summary(report, "chain:RoundToLotSizeElement").count == 1
+
+
+def test_null_profiler_records_nothing() -> None:
+    actual = mango.marketmaking.NullPulseProfiler()
+    with actual.pulse():
+        with actual.stage("first"):
+            pass
+
+    assert actual.report().stages == []
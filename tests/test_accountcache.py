@@ -0,0 +1,222 @@
+from .context import mango
+from .fakes import (
+    fake_account_info,
+    fake_seeded_public_key,
+    fake_simulator_context,
+)
+
+import argparse
+import time
+import typing
+
+from pathlib import Path
+from solana.publickey import PublicKey
+
+
+MANGO_PROGRAM = fake_seeded_public_key("mango program")
+SERUM_PROGRAM = fake_seeded_public_key("serum program")
+
+
+def _values(owner: PublicKey, data: bytes) -> typing.Dict[str, typing.Any]:
+    return {
+        "data": mango.encode_binary(data),
+        "executable": False,
+        "lamports": 1,
+        "owner": str(owner),
+        "rentEpoch": 0,
+    }
+
+
+def _cache(directory: Path, ttl: float = 60) -> mango.DiskAccountCache:
+    return mango.DiskAccountCache(
+        str(directory), "devnet", MANGO_PROGRAM, SERUM_PROGRAM, ttl
+    )
+
+
+def _no_refresh(addresses: typing.Sequence[PublicKey]) -> None:
+    raise Exception(f"Unexpected refresh of {addresses}")
+
+
+def test_classify(tmp_path: Path) -> None:
+    cache = _cache(tmp_path)
+    pyth_product = (0xA1B2C3D4).to_bytes(4, "little") + bytes([2, 0, 0, 0, 2, 0, 0, 0])
+    pyth_price = (0xA1B2C3D4).to_bytes(4, "little") + bytes([2, 0, 0, 0, 3, 0, 0, 0])
+    pyth_product += bytes(500)
+    pyth_price += bytes(500)
+
+    assert (
+        cache.classify(_values(MANGO_PROGRAM, bytes([0, 1, 1])))
+        == mango.AccountCacheType.GROUP
+    )
+    assert cache.classify(_values(MANGO_PROGRAM, bytes([1, 1, 1]))) is None
+    assert (
+        cache.classify(_values(MANGO_PROGRAM, bytes([2, 1, 1])))
+        == mango.AccountCacheType.ROOT_BANK
+    )
+    assert (
+        cache.classify(_values(MANGO_PROGRAM, bytes([4, 1, 1])))
+        == mango.AccountCacheType.PERP_MARKET
+    )
+    assert (
+        cache.classify(_values(SERUM_PROGRAM, bytes(388)))
+        == mango.AccountCacheType.SERUM_MARKET
+    )
+    assert cache.classify(_values(SERUM_PROGRAM, bytes(3228))) is None
+    assert (
+        cache.classify(_values(fake_seeded_public_key("pyth"), pyth_product))
+        == mango.AccountCacheType.PYTH_PRODUCT
+    )
+    assert cache.classify(_values(fake_seeded_public_key("pyth"), pyth_price)) is None
+
+
+def test_store_and_lookup(tmp_path: Path) -> None:
+    address = fake_seeded_public_key("group")
+    cache = _cache(tmp_path)
+    cache.store(address, 10, _values(MANGO_PROGRAM, bytes([0, 1])))
+    cache.store(
+        fake_seeded_public_key("account"), 10, _values(MANGO_PROGRAM, bytes([1, 1]))
+    )
+    assert cache.lookup([address], _no_refresh)[str(address)][
+        "data"
+    ] == mango.encode_binary(bytes([0, 1]))
+
+    # Older data never replaces newer data.
+    cache.store(address, 9, _values(MANGO_PROGRAM, bytes([0, 2])))
+    assert cache.lookup([address], _no_refresh)[str(address)][
+        "data"
+    ] == mango.encode_binary(bytes([0, 1]))
+
+    refreshed: typing.List[PublicKey] = []
+    reloaded = _cache(tmp_path)
+    actual = reloaded.lookup(
+        [address, fake_seeded_public_key("account")], refreshed.extend
+    )
+    assert list(actual.keys()) == [str(address)]
+    deadline = time.time() + 5
+    while len(refreshed) == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert refreshed == [address]
+
+    reloaded.clear()
+    assert _cache(tmp_path).lookup([address], _no_refresh) == {}
+
+
+def test_expired_entries_are_misses(tmp_path: Path) -> None:
+    address = fake_seeded_public_key("group")
+    cache = _cache(tmp_path, ttl=-1)
+    cache.store(address, 10, _values(MANGO_PROGRAM, bytes([0, 1])))
+    assert cache.lookup([address], _no_refresh) == {}
+
+
+def test_mutable_types_are_not_cached_by_default(tmp_path: Path) -> None:
+    root_bank = fake_seeded_public_key("root bank")
+    perp_market = fake_seeded_public_key("perp market")
+    cache = _cache(tmp_path)
+    cache.store(root_bank, 10, _values(MANGO_PROGRAM, bytes([2, 1])))
+    cache.store(perp_market, 10, _values(MANGO_PROGRAM, bytes([4, 1])))
+    assert cache.lookup([root_bank, perp_market], _no_refresh) == {}
+
+    # Accounts cached by a run that asked for them aren't served to one that didn't.
+    opted_in = mango.DiskAccountCache(
+        str(tmp_path),
+        "devnet",
+        MANGO_PROGRAM,
+        SERUM_PROGRAM,
+        types=list(mango.AccountCacheType),
+    )
+    opted_in.store(root_bank, 10, _values(MANGO_PROGRAM, bytes([2, 1])))
+    assert list(opted_in.lookup([root_bank], _no_refresh).keys()) == [str(root_bank)]
+    assert _cache(tmp_path).lookup([root_bank], _no_refresh) == {}
+
+
+def test_mutable_types_use_mutable_ttl(tmp_path: Path) -> None:
+    group = fake_seeded_public_key("group")
+    root_bank = fake_seeded_public_key("root bank")
+    cache = mango.DiskAccountCache(
+        str(tmp_path),
+        "devnet",
+        MANGO_PROGRAM,
+        SERUM_PROGRAM,
+        types=list(mango.AccountCacheType),
+        mutable_ttl=-1,
+    )
+    cache.store(group, 10, _values(MANGO_PROGRAM, bytes([0, 1])))
+    cache.store(root_bank, 10, _values(MANGO_PROGRAM, bytes([2, 1])))
+    assert list(cache.lookup([group, root_bank], _no_refresh).keys()) == [str(group)]
+
+
+def test_clear_account_cache_without_using_it(tmp_path: Path) -> None:
+    parser = argparse.ArgumentParser()
+    mango.ContextBuilder.add_command_line_parameters(parser)
+    context = mango.ContextBuilder.from_command_line_parameters(
+        parser.parse_args(
+            ["--cluster-name", "devnet", "--account-cache-directory", str(tmp_path)]
+        )
+    )
+    address = fake_seeded_public_key("group")
+    context.account_cache.store(
+        address, 10, _values(context.mango_program_address, bytes([0, 1]))
+    )
+    assert len(list((tmp_path / "devnet").iterdir())) == 1
+
+    cleared = mango.ContextBuilder.from_command_line_parameters(
+        parser.parse_args(
+            [
+                "--cluster-name",
+                "devnet",
+                "--account-cache-directory",
+                str(tmp_path),
+                "--no-account-cache",
+                "--clear-account-cache",
+            ]
+        )
+    )
+    assert not cleared.account_cache.enabled
+    assert list((tmp_path / "devnet").iterdir()) == []
+
+
+def test_account_info_loads_use_cache(tmp_path: Path) -> None:
+    group_address = fake_seeded_public_key("group")
+    other_address = fake_seeded_public_key("other")
+    devnet_mango_program = mango.ContextBuilder.build(
+        cluster_name="devnet"
+    ).mango_program_address
+    accounts = [
+        fake_account_info(
+            group_address, owner=devnet_mango_program, data=bytes([0, 1, 1])
+        ),
+        fake_account_info(
+            other_address, owner=devnet_mango_program, data=bytes([1, 1, 1])
+        ),
+    ]
+    with mango.RPCSimulator(accounts) as simulator:
+
+        def _context() -> mango.Context:
+            return fake_simulator_context(
+                simulator, account_cache_directory=str(tmp_path)
+            )
+
+        first = mango.AccountInfo.load(_context(), group_address)
+        assert first is not None
+        assert simulator.statistics().requests == {"getAccountInfo": 1}
+
+        multiple = mango.AccountInfo.load_multiple(
+            _context(), [other_address, group_address]
+        )
+        assert [account_info.address for account_info in multiple] == [
+            other_address,
+            group_address,
+        ]
+        assert multiple[1].data == bytes([0, 1, 1])
+
+        # One call for the uncached account, one for the background revalidation of the cached one.
+        deadline = time.time() + 5
+        while (
+            simulator.statistics().requests.get("getMultipleAccounts", 0) < 2
+            and time.time() < deadline
+        ):
+            time.sleep(0.01)
+        assert simulator.statistics().requests == {
+            "getAccountInfo": 1,
+            "getMultipleAccounts": 2,
+        }
@@ -40,3 +40,30 @@ def test_split_list_into_chunks() -> None:
     split_20 = mango.AccountInfo._split_list_into_chunks(list_to_split, 20)
     assert len(split_20) == 1
     assert split_20[0] == ["a", "b", "c", "d", "e", "f", "g", "h", "i", "j"]
+
+
+def test_from_response_defers_decoding_data() -> None:
+    address: PublicKey = PublicKey("11111111111111111111111111111118")
+    encoded = ["AQID", "base64"]
+    actual = mango.AccountInfo.from_response(
+        {
+            "result": {
+                "context": {"slot": 1},
+                "value": {
+                    "data": encoded,
+                    "executable": False,
+                    "lamports": 12345,
+                    "owner": "11111111111111111111111111111119",
+                    "rentEpoch": 250,
+                },
+            }
+        },
+        address,
+    )
+    assert actual.encoded_data() is encoded
+    assert actual.data == bytes([1, 2, 3])
+    assert actual.encoded_data() == encoded
+
+    actual.data = bytes([4])
+    assert actual.data == bytes([4])
+    assert actual.encoded_data() == ["BA==", "base64"]
@@ -0,0 +1,109 @@
+from .context import mango
+from .data import load_data_from_directory
+from .fakes import (
+    fake_account_info,
+    fake_seeded_public_key,
+    fake_simulator_context,
+)
+
+import numpy
+import typing
+import pytest
+
+from solana.publickey import PublicKey
+
+
+def _accounts() -> typing.Tuple[mango.Group, mango.AccountInfo, mango.AccountInfo]:
+    group, _, _, _ = load_data_from_directory("tests/testdata/account4")
+    original = mango.AccountInfo.load_json("tests/testdata/account4/account.json")
+
+    data = bytearray(original.data)
+    owner = mango.ACCOUNT_PROJECTION_FIELDS["owner"]
+    data[owner.offset : owner.offset + owner.size] = bytes(
+        fake_seeded_public_key("other owner")
+    )
+    data[mango.ACCOUNT_PROJECTION_FIELDS["being_liquidated"].offset] = 1
+    liquidating = fake_account_info(
+        fake_seeded_public_key("liquidating"), owner=original.owner, data=bytes(data)
+    )
+    return group, original, liquidating
+
+
+def _simulator(*account_infos: mango.AccountInfo) -> mango.RPCSimulator:
+    return mango.RPCSimulator(
+        [
+            *account_infos,
+            mango.AccountInfo.load_json("tests/testdata/account4/group.json"),
+            mango.AccountInfo.load_json("tests/testdata/account4/cache.json"),
+        ]
+    )
+
+
+def test_projection_matches_full_parse() -> None:
+    group, original, liquidating = _accounts()
+    with _simulator(original, liquidating) as simulator:
+        context = fake_simulator_context(simulator)
+        actual = mango.AccountProjection.load(
+            context,
+            group,
+            ["owner", "deposits", "borrows", "being_liquidated", "delegate"],
+        )
+        # owner/deposits/borrows are one slice, being_liquidated/delegate another.
+        assert simulator.statistics().requests == {"getProgramAccounts": 2}
+
+    layout = mango.layouts.MANGO_ACCOUNT.parse(original.data)
+    assert len(actual) == 2
+    index = actual.addresses.index(original.address)
+    assert actual.public_key_at("owner", index) == layout.owner
+    # The layout parses the all-zeroes 'no delegate' key as None.
+    assert layout.delegate is None
+    assert actual.public_key_at("delegate", index) == mango.SYSTEM_PROGRAM_ADDRESS
+    assert actual.column("deposits")[index] == pytest.approx(
+        [float(deposit) for deposit in layout.deposits]
+    )
+    assert actual.column("borrows")[index] == pytest.approx(
+        [float(borrow) for borrow in layout.borrows]
+    )
+    assert list(actual.column("being_liquidated")) == [
+        address == liquidating.address for address in actual.addresses
+    ]
+
+    frame = actual.to_dataframe()
+    assert len(frame) == 2
+    assert frame["owner"][index] == str(layout.owner)
+    assert frame[f"deposits_{mango.layouts.MAX_TOKENS - 1}"][index] == pytest.approx(
+        float(layout.deposits[-1])
+    )
+
+    with pytest.raises(Exception):
+        actual.column("msrm_amount")
+
+
+def test_filter_and_load_accounts() -> None:
+    group, original, liquidating = _accounts()
+    with _simulator(original, liquidating) as simulator:
+        context = fake_simulator_context(simulator)
+        projection = mango.AccountProjection.load(
+            context, group, ["being_liquidated", "perp_base_positions"]
+        )
+        candidates = projection.filter(projection.column("being_liquidated"))
+        assert candidates.addresses == [liquidating.address]
+        assert numpy.array_equal(
+            candidates.column("perp_base_positions")[0],
+            projection.column("perp_base_positions")[0],
+        )
+
+        accounts = candidates.load_accounts(context, group)
+        assert [account.address for account in accounts] == [liquidating.address]
+        assert accounts[0].owner == PublicKey(
+            bytes(fake_seeded_public_key("other owner"))
+        )
+
+
+def test_unknown_field() -> None:
+    group, original, _ = _accounts()
+    with _simulator(original) as simulator:
+        with pytest.raises(Exception):
+            mango.AccountProjection.load(
+                fake_simulator_context(simulator), group, ["info"]
+            )
@@ -0,0 +1,165 @@
+from .context import mango
+from .fakes import fake_context, fake_loaded_market, fake_price
+
+import rx
+import typing
+
+from datetime import timedelta
+from decimal import Decimal
+from rx.subject.subject import Subject
+from mango.oracles.aggregate.aggregate import (
+    AggregateOracle,
+    AggregateOracleProvider,
+    AggregationMethod,
+)
+
+
+class FakeOracle(mango.Oracle):
+    def __init__(self, name: str, prices: typing.Sequence[mango.Price]) -> None:
+        super().__init__(name, prices[0].market if prices else fake_loaded_market())
+        self.prices: typing.Sequence[mango.Price] = prices
+
+    def fetch_price(self, context: mango.Context) -> mango.Price:
+        if len(self.prices) == 0:
+            raise Exception("No price")
+        return self.prices[0]
+
+    def to_streaming_observable(
+        self, context: mango.Context
+    ) -> rx.core.typing.Observable[mango.Price]:
+        return rx.from_iterable(self.prices)
+
+
+def _confident_price(price: str, confidence: str) -> mango.Price:
+    market = fake_loaded_market()
+    return mango.Price(
+        mango.OracleSource(
+            "test", "test", mango.SupportedOracleFeature.CONFIDENCE, market
+        ),
+        mango.utc_now(),
+        market,
+        Decimal(price),
+        Decimal(price),
+        Decimal(price),
+        Decimal(confidence),
+    )
+
+
+def test_median_fetch_ignores_failing_sources() -> None:
+    oracle = AggregateOracle(
+        fake_loaded_market(),
+        [
+            FakeOracle("one", [fake_price(price=Decimal(100))]),
+            FakeOracle("two", [fake_price(price=Decimal(104))]),
+            FakeOracle("three", [fake_price(price=Decimal(101))]),
+            FakeOracle("broken", []),
+        ],
+    )
+    actual = oracle.fetch_price(fake_context())
+    assert actual.mid_price == Decimal(101)
+    assert actual.top_bid == Decimal(99)
+
+
+def test_confidence_weighted() -> None:
+    oracle = AggregateOracle(
+        fake_loaded_market(),
+        [
+            FakeOracle("one", [_confident_price("100", "1")]),
+            FakeOracle("two", [_confident_price("110", "4")]),
+        ],
+        method=AggregationMethod.CONFIDENCE_WEIGHTED,
+    )
+    # Weights are 1 and 0.25, so (100 + 27.5) / 1.25
+    assert oracle.fetch_price(fake_context()).mid_price == Decimal(102)
+
+
+def test_publishes_only_meaningful_changes_from_fresh_sources() -> None:
+    oracle = AggregateOracle(
+        fake_loaded_market(),
+        [FakeOracle("one", []), FakeOracle("two", [])],
+        staleness_cutoffs=[5, 5],
+        minimum_change=Decimal("0.01"),
+    )
+    start = mango.utc_now()
+
+    first = oracle._on_source_price(0, fake_price(price=Decimal(100)), start)
+    assert first is not None and first.mid_price == Decimal(100)
+
+    # A new source contributing is always published.
+    second = oracle._on_source_price(1, fake_price(price=Decimal(102)), start)
+    assert second is not None and second.mid_price == Decimal(101)
+
+    # Less than 1% change from 101.
+    unchanged = oracle._on_source_price(0, fake_price(price=Decimal("100.5")), start)
+    assert unchanged is None
+
+    # Source one is now stale, so only source two counts.
+    later = start + timedelta(seconds=6)
+    stale = oracle._on_source_price(1, fake_price(price=Decimal(103)), later)
+    assert stale is not None and stale.mid_price == Decimal(103)
+
+    statistics = oracle.statistics()
+    assert [source.updates for source in statistics] == [2, 2]
+    assert statistics[0].divergence == (Decimal("100.5") - 103) / 103
+
+
+def test_streaming() -> None:
+    oracle = AggregateOracle(
+        fake_loaded_market(),
+        [
+            FakeOracle("one", [fake_price(price=Decimal(100))]),
+            FakeOracle("two", [fake_price(price=Decimal(110))]),
+        ],
+    )
+    prices: typing.List[mango.Price] = []
+    oracle.to_streaming_observable(fake_context()).subscribe(
+        on_next=prices.append  # type: ignore[call-arg]
+    )
+    assert [price.mid_price for price in prices] == [Decimal(100), Decimal(105)]
+
+
+class SubjectOracle(mango.Oracle):
+    def __init__(self, name: str) -> None:
+        super().__init__(name, fake_loaded_market())
+        self.subject: Subject = Subject()
+
+    def fetch_price(self, context: mango.Context) -> mango.Price:
+        raise Exception("No price")
+
+    def to_streaming_observable(
+        self, context: mango.Context
+    ) -> rx.core.typing.Observable[mango.Price]:
+        return self.subject
+
+
+def test_streaming_shared_between_subscribers() -> None:
+    source = SubjectOracle("one")
+    oracle = AggregateOracle(fake_loaded_market(), [source])
+    first: typing.List[mango.Price] = []
+    second: typing.List[mango.Price] = []
+    price_feed = oracle.to_streaming_observable(fake_context())
+    first_disposable = price_feed.subscribe(on_next=first.append)  # type: ignore[call-arg]
+    oracle.to_streaming_observable(fake_context()).subscribe(
+        on_next=second.append  # type: ignore[call-arg]
+    )
+
+    source.subject.on_next(fake_price(price=Decimal(100)))
+    assert [price.mid_price for price in first] == [Decimal(100)]
+    assert [price.mid_price for price in second] == [Decimal(100)]
+    assert [source.updates for source in oracle.statistics()] == [1]
+
+    # Disposing one subscriber leaves the other one working.
+    first_disposable.dispose()
+    source.subject.on_next(fake_price(price=Decimal(110)))
+    assert [price.mid_price for price in first] == [Decimal(100)]
+    assert [price.mid_price for price in second] == [Decimal(100), Decimal(110)]
+    assert [source.updates for source in oracle.statistics()] == [2]
+
+
+def test_factory() -> None:
+    provider = mango.create_oracle_provider(
+        fake_context(), "market:3, market, confidence-weighted"
+    )
+    assert isinstance(provider, AggregateOracleProvider)
+    assert provider.staleness_cutoffs == [3, AggregateOracle.DEFAULT_STALENESS_CUTOFF]
+    assert provider.method == AggregationMethod.CONFIDENCE_WEIGHTED
@@ -0,0 +1,128 @@
+from .context import mango
+from .fakes import fake_market, fake_seeded_public_key, fake_token
+
+import numpy
+import pytest
+import typing
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from pyserum.market.orderbook import OrderBook as PySerumOrderBook
+
+from mango.columnarorderbook import _PERP_NODE_DTYPE, _SERUM_NODE_DTYPE
+
+
+CONVERTER = mango.LotSizeConverter(
+    fake_token("BASE", 6), Decimal(100), fake_token("QUOTE", 6), Decimal(10)
+)
+
+# (price lots, quantity lots, sequence number, client ID)
+ORDERS = [(100, 5, 1, 11), (102, 1, 2, 12), (100, 2, 3, 13), (99, 7, 4, 14)]
+
+
+def _nodes(dtype: numpy.dtype) -> numpy.typing.NDArray[numpy.void]:  # type: ignore[type-arg]
+    # One free node amongst the leaves, which must be skipped.
+    nodes = numpy.zeros(len(ORDERS) + 1, dtype=dtype)
+    for index, (price, quantity, sequence_number, client_id) in enumerate(ORDERS):
+        node = nodes[index + 1]
+        node["tag"] = 2
+        node["price_lots"] = price
+        node["quantity_lots"] = quantity
+        node["sequence_number"] = sequence_number
+        node["client_id"] = client_id
+        node["owner"] = numpy.frombuffer(
+            bytes(fake_seeded_public_key(f"owner {index}")), dtype=numpy.uint8
+        )
+    nodes[0]["tag"] = 3
+    return nodes
+
+
+def _perp_data() -> bytes:
+    nodes = _nodes(_PERP_NODE_DTYPE)
+    nodes[1]["timestamp"] = 1000
+    nodes[1]["time_in_force"] = 10
+    header = bytearray(40)
+    header[8:16] = len(nodes).to_bytes(8, "little")
+    padding = bytes((1024 - len(nodes)) * _PERP_NODE_DTYPE.itemsize)
+    return bytes(header) + nodes.tobytes() + padding
+
+
+def _serum_data(flags: int) -> bytes:
+    # pyserum walks the tree, so add inner nodes above the leaves: 5 -> (1, 2), 6 -> (3, 4),
+    # and the root 7 -> (5, 6).
+    nodes = bytearray(_nodes(_SERUM_NODE_DTYPE).tobytes())
+    for index, children in [(5, (1, 2)), (6, (3, 4)), (7, (5, 6))]:
+        inner = bytearray(_SERUM_NODE_DTYPE.itemsize)
+        inner[0:4] = (1).to_bytes(4, "little")
+        inner[24:28] = children[0].to_bytes(4, "little")
+        inner[28:32] = children[1].to_bytes(4, "little")
+        nodes += inner
+    header = bytearray(45)
+    header[0:5] = b"serum"
+    header[5:13] = flags.to_bytes(8, "little")
+    header[13:17] = (8).to_bytes(4, "little")
+    header[33:37] = (7).to_bytes(4, "little")
+    header[37:41] = len(ORDERS).to_bytes(4, "little")
+    return bytes(header) + bytes(nodes) + bytes(7)
+
+
+def _lots(columns: mango.OrderBookSideColumns) -> typing.List[typing.Tuple[int, int]]:
+    return list(zip(columns.price_lots.tolist(), columns.sequence_number.tolist()))
+
+
+def test_decode_perp_side() -> None:
+    bids = mango.decode_perp_orderbook_side(_perp_data(), mango.Side.BUY, CONVERTER)
+    assert _lots(bids) == [(102, 2), (100, 3), (100, 1), (99, 4)]
+    assert bids.client_id.tolist() == [12, 13, 11, 14]
+    assert bids.owner_at(2) == fake_seeded_public_key("owner 0")
+    assert bids.price.tolist() == pytest.approx([10.2, 10.0, 10.0, 9.9])
+    assert bids.quantity.tolist() == pytest.approx([0.0001, 0.0002, 0.0005, 0.0007])
+    assert bids.expiration.tolist() == [0, 0, 1010, 0]
+
+    asks = mango.decode_perp_orderbook_side(_perp_data(), mango.Side.SELL, CONVERTER)
+    assert _lots(asks) == [(99, 4), (100, 1), (100, 3), (102, 2)]
+
+    unexpired = bids.unexpired_at(datetime.fromtimestamp(1020, tz=timezone.utc))
+    assert _lots(unexpired) == [(102, 2), (100, 3), (99, 4)]
+
+
+def test_decode_serum_side_matches_pyserum() -> None:
+    data = _serum_data(1 | 32)
+    asks = mango.decode_serum_orderbook_side(data, mango.Side.SELL, CONVERTER)
+    expected = PySerumOrderBook.from_bytes(fake_market().state, data)
+    assert sorted(
+        (order.info.price_lots, order.info.size_lots, order.client_id)
+        for order in expected.orders()
+    ) == sorted(
+        zip(
+            asks.price_lots.tolist(),
+            asks.quantity_lots.tolist(),
+            asks.client_id.tolist(),
+        )
+    )
+
+
+def test_levels() -> None:
+    data = _perp_data()
+    book = mango.ColumnarOrderBook(
+        "PERP",
+        mango.decode_perp_orderbook_side(data, mango.Side.BUY, CONVERTER),
+        mango.decode_perp_orderbook_side(data, mango.Side.SELL, CONVERTER),
+    )
+    bids, asks = book.l2()
+    assert bids.price_lots.tolist() == [102, 100, 99]
+    assert bids.quantity_lots.tolist() == [1, 7, 7]
+    assert bids.order_count.tolist() == [1, 2, 1]
+    assert asks.price_lots.tolist() == [99, 100, 102]
+
+    top_bids, top_asks = book.l1()
+    assert top_bids.price_lots.tolist() == [102]
+    assert top_asks.quantity_lots.tolist() == [7]
+    assert book.bids.levels(2).quantity_lots.tolist() == [1, 7]
+
+    frame = book.to_l2_dataframe(depth=1)
+    assert frame["PriceLots"].tolist() == [102, 99]
+    assert len(book.to_l3_dataframe(include_owners=True)) == 8
+
+    empty = mango.OrderBookSideColumns.empty(mango.Side.BUY)
+    assert len(empty.levels()) == 0
@@ -0,0 +1,100 @@
+from .context import mango
+from .fakes import fake_context, fake_seeded_public_key
+
+import random
+import typing
+
+from solana.keypair import Keypair
+from solana.transaction import AccountMeta, TransactionInstruction
+
+
+def _random_instructions(
+    seed: int, count: int
+) -> typing.Sequence[TransactionInstruction]:
+    generator = random.Random(seed)
+    shared = [fake_seeded_public_key(f"shared {index}") for index in range(10)]
+    programs = [fake_seeded_public_key(f"program {index}") for index in range(3)]
+    instructions: typing.List[TransactionInstruction] = []
+    for index in range(count):
+        keys = generator.sample(shared, generator.randint(0, 6))
+        keys += [
+            fake_seeded_public_key(f"instruction {index} key {counter}")
+            for counter in range(generator.randint(0, 3))
+        ]
+        instructions += [
+            TransactionInstruction(
+                keys=[
+                    AccountMeta(pubkey=key, is_signer=False, is_writable=True)
+                    for key in keys
+                ],
+                program_id=generator.choice(programs),
+                data=bytes(generator.randint(0, 140)),
+            )
+        ]
+    return instructions
+
+
+def test_accumulator_matches_pyserum() -> None:
+    signers = [Keypair(), Keypair()]
+    instructions = _random_instructions(1, 12)
+
+    accumulator = mango.TransactionSizeAccumulator(signers)
+    for index, instruction in enumerate(instructions):
+        expected = mango.CombinableInstructions._transaction_size_from_pyserum(
+            signers, instructions[: index + 1]
+        )
+        assert accumulator.size_with([instruction]) == expected
+        accumulator.add(instruction)
+        assert accumulator.size == expected
+        assert accumulator.instruction_count == index + 1
+
+
+def test_size_with_does_not_change_accumulator() -> None:
+    signer = Keypair()
+    instructions = _random_instructions(2, 4)
+    accumulator = mango.TransactionSizeAccumulator()
+    accumulator.add(instructions[0])
+    before = accumulator.size
+
+    assert accumulator.size_with(instructions[1:], [signer]) == (
+        mango.CombinableInstructions._transaction_size_from_pyserum(
+            [signer], instructions
+        )
+    )
+    assert accumulator.size == before
+
+    accumulator.add_signer(signer)
+    for instruction in instructions[1:]:
+        accumulator.add(instruction)
+    assert accumulator.size == (
+        mango.CombinableInstructions._transaction_size_from_pyserum(
+            [signer], instructions
+        )
+    )
+
+
+def test_split_instructions_into_chunks() -> None:
+    signers = [Keypair()]
+    instructions = _random_instructions(3, 60)
+    chunks = mango.combinableinstructions._split_instructions_into_chunks(
+        fake_context(), signers, instructions
+    )
+
+    assert len(chunks) > 1
+    assert [instruction for chunk in chunks for instruction in chunk] == list(
+        instructions
+    )
+    for index, chunk in enumerate(chunks):
+        size = mango.CombinableInstructions._transaction_size_from_pyserum(
+            signers, chunk
+        )
+        assert size < mango.combinableinstructions._MAXIMUM_TRANSACTION_LENGTH
+        if index < len(chunks) - 1:
+            # Each chunk is as full as it can be - the next instruction wouldn't fit.
+            with_next = [*chunk, chunks[index + 1][0]]
+            assert (
+                mango.CombinableInstructions._transaction_size_from_pyserum(
+                    signers, with_next
+                )
+                >= mango.combinableinstructions._MAXIMUM_TRANSACTION_LENGTH
+            )
@@ -0,0 +1,269 @@
+from .context import mango
+from .data import load_data_from_directory
+from .fakes import fake_simulator_context
+
+import glob
+import threading
+import time
+import typing
+import unittest.mock
+
+from solana.publickey import PublicKey
+
+
+def _recorded(directory: str, name: str) -> mango.AccountInfo:
+    return mango.AccountInfo.load_json(f"tests/testdata/{directory}/{name}.json")
+
+
+def _context(
+    simulator: mango.RPCSimulator,
+    cluster_name: str = "devnet",
+    group_address: str = "Ec2enZyoC4nGpEfu2sUNAa2nUGJHWxoUWYSEJ2hNTWTA",
+    program_address: str = "4skJ85cdxQAFVKbcGgfun8iZPL7BadVYXG3kGEGkufqA",
+) -> mango.Context:
+    return fake_simulator_context(
+        simulator,
+        cluster_name=cluster_name,
+        group_address=PublicKey(group_address),
+        program_address=PublicKey(program_address),
+    )
+
+
+def _wait_for(condition: typing.Callable[[], bool]) -> None:
+    timeout_at: float = time.monotonic() + 10
+    while not condition():
+        assert time.monotonic() < timeout_at, "Timed out waiting for the watchdog."
+        time.sleep(0.01)
+
+
+def test_health_matches_dataframe() -> None:
+    for directory in ["account3", "account4", "empty"]:
+        group, cache, account, open_orders = load_data_from_directory(
+            f"tests/testdata/{directory}"
+        )
+        frame = account.to_dataframe(group, open_orders, cache)
+        rows = account.to_rows(group, open_orders, cache)
+        for weighting in ["Init", "Maint"]:
+            assert mango.healthwatchdog._weighted_assets(
+                rows, "USDC", weighting
+            ) == account.weighted_assets(frame, weighting)
+
+
+def test_recorded_updates() -> None:
+    # account3 and account4 are recordings of the same account (with their caches) at different times.
+    # account3 is healthy, and the account3 account is below maint with the account4 cache.
+    account = _recorded("account3", "account")
+    empty = _recorded("empty", "account")
+    with mango.RPCSimulator(
+        [account, empty, _recorded("account3", "group"), _recorded("account3", "cache")]
+    ) as simulator:
+        context = _context(simulator)
+        manager = mango.IndividualWebSocketSubscriptionManager(context)
+        watchdog = mango.HealthWatchdog(context, manager, mango.Group.load(context))
+        crossings: typing.List[mango.HealthCrossing] = []
+        received = threading.Semaphore(0)
+
+        def _on_crossing(crossing: mango.HealthCrossing) -> None:
+            crossings.append(crossing)
+            received.release()
+
+        watchdog.crossings.subscribe(on_next=_on_crossing)
+        watchdog.start()
+        try:
+            assert {str(health.address) for health in watchdog.health} == {
+                str(account.address),
+                str(empty.address),
+            }
+            started = watchdog.health_for(account.address)
+            assert started is not None
+            assert started.band == mango.HealthBand.HEALTHY
+            assert watchdog.recalculations == 2
+
+            _wait_for(
+                lambda: simulator.statistics().requests.get("accountSubscribe", 0) == 1
+                and simulator.statistics().requests.get("programSubscribe", 0) == 1
+            )
+
+            # Prices move - only the account with positions is recalculated.
+            simulator.update_account(_recorded("account4", "cache"))
+            assert received.acquire(timeout=10)
+            assert watchdog.recalculations == 3
+            worsened = crossings[-1]
+            assert worsened.address == account.address
+            assert worsened.previous == mango.HealthBand.HEALTHY
+            assert worsened.health.band == mango.HealthBand.BELOW_MAINT
+            assert worsened.worsened
+
+            # The account changes but stays below maint - recalculated, but no crossing.
+            simulator.update_account(_recorded("account4", "account"))
+            _wait_for(lambda: watchdog.recalculations == 4)
+            assert len(crossings) == 1
+
+            # Prices move back and the account recovers.
+            simulator.update_account(_recorded("account3", "cache"))
+            assert received.acquire(timeout=10)
+            assert watchdog.recalculations == 5
+            recovered = crossings[-1]
+            assert recovered.previous == mango.HealthBand.BELOW_MAINT
+            assert recovered.health.band == mango.HealthBand.HEALTHY
+            assert not recovered.worsened
+            assert recovered.health.slot > 0
+        finally:
+            watchdog.dispose()
+            manager.close()
+            manager.dispose()
+
+
+def test_updates_during_startup_are_applied() -> None:
+    account = _recorded("account3", "account")
+    with mango.RPCSimulator(
+        [
+            account,
+            _recorded("account3", "group"),
+            _recorded("account3", "cache"),
+        ],
+        mango.RPCSimulatorSettings(slot_interval=0.01),
+    ) as simulator:
+        context = _context(simulator)
+        manager = mango.IndividualWebSocketSubscriptionManager(context)
+        group = mango.Group.load(context)
+        watchdog = mango.HealthWatchdog(context, manager, group)
+        crossings: typing.List[mango.HealthCrossing] = []
+        watchdog.crossings.subscribe(on_next=crossings.append)
+
+        # The account and the cache both change after the load has started but before it has finished.
+        # Observers see updates after the watchdog does, so once both are received the watchdog has them.
+        received = threading.Semaphore(0)
+        load_cache = group.fetch_cache
+
+        def _fetch_cache_while_updating(context: mango.Context) -> mango.Cache:
+            cache = load_cache(context)
+            for subscription in manager.subscriptions:
+                subscription.publisher.subscribe(on_next=lambda _: received.release())
+            _wait_for(
+                lambda: simulator.statistics().requests.get("accountSubscribe", 0) == 1
+                and simulator.statistics().requests.get("programSubscribe", 0) == 1
+            )
+            started_at_slot: int = simulator.slot
+            _wait_for(lambda: simulator.slot > started_at_slot)
+            simulator.update_account(_recorded("account4", "cache"))
+            simulator.update_account(_recorded("account4", "account"))
+            assert received.acquire(timeout=10)
+            assert received.acquire(timeout=10)
+            return cache
+
+        with unittest.mock.patch.object(
+            group, "fetch_cache", side_effect=_fetch_cache_while_updating
+        ):
+            watchdog.start()
+        try:
+            # The held cache is applied as soon as the load finishes, the held account update shortly after.
+            assert len(crossings) == 1
+            assert crossings[0].health.band == mango.HealthBand.BELOW_MAINT
+            _wait_for(lambda: watchdog.recalculations == 3)
+            health = watchdog.health_for(account.address)
+            assert health is not None
+            assert health.band == mango.HealthBand.BELOW_MAINT
+        finally:
+            watchdog.dispose()
+            manager.close()
+            manager.dispose()
+
+
+def test_account_updates_reload_spot_open_orders() -> None:
+    # account1 is a mainnet account with spot open orders.
+    account = _recorded("account1", "account")
+    open_orders = [
+        mango.AccountInfo.load_json(filename)
+        for filename in sorted(glob.glob("tests/testdata/account1/openorders*.json"))
+    ]
+    with mango.RPCSimulator(
+        [
+            account,
+            _recorded("account1", "group"),
+            _recorded("account1", "cache"),
+            *open_orders,
+        ]
+    ) as simulator:
+        context = _context(
+            simulator,
+            "mainnet",
+            "98pjRuQjK3qA6gXts96PqZT4Ze5QmnCmt3QYjhbUSPue",
+            "mv3ekLzLbnVPNxjSKvqBpU3ZeZXPQdEC3bp5MDEBG68",
+        )
+        manager = mango.IndividualWebSocketSubscriptionManager(context)
+        watchdog = mango.HealthWatchdog(context, manager, mango.Group.load(context))
+        watchdog.start()
+        try:
+            assert watchdog.recalculations == 1
+            assert simulator.statistics().requests["getMultipleAccounts"] == 1
+            _wait_for(
+                lambda: simulator.statistics().requests.get("programSubscribe", 0) == 1
+            )
+
+            # The account's open orders are loaded again before its health is recalculated.
+            simulator.update_account(account)
+            _wait_for(lambda: watchdog.recalculations == 2)
+            assert simulator.statistics().requests["getMultipleAccounts"] == 2
+            health = watchdog.health_for(account.address)
+            assert health is not None
+            assert health.band == mango.HealthBand.HEALTHY
+            assert health.slot > 0
+        finally:
+            watchdog.dispose()
+            manager.close()
+            manager.dispose()
+
+
+def test_accounts_with_missing_spot_open_orders_are_left_out() -> None:
+    account = _recorded("account1", "account")
+    open_orders = [
+        mango.AccountInfo.load_json(filename)
+        for filename in sorted(glob.glob("tests/testdata/account1/openorders*.json"))
+    ]
+    missing = open_orders[0]
+    with mango.RPCSimulator(
+        [
+            account,
+            _recorded("account1", "group"),
+            _recorded("account1", "cache"),
+            *open_orders[1:],
+        ]
+    ) as simulator:
+        context = _context(
+            simulator,
+            "mainnet",
+            "98pjRuQjK3qA6gXts96PqZT4Ze5QmnCmt3QYjhbUSPue",
+            "mv3ekLzLbnVPNxjSKvqBpU3ZeZXPQdEC3bp5MDEBG68",
+        )
+        manager = mango.IndividualWebSocketSubscriptionManager(context)
+        watchdog = mango.HealthWatchdog(context, manager, mango.Group.load(context))
+        # Starting up doesn't fail - the account is just left out.
+        watchdog.start()
+        try:
+            assert watchdog.health_for(account.address) is None
+            _wait_for(
+                lambda: simulator.statistics().requests.get("programSubscribe", 0) == 1
+            )
+
+            # Once the open orders exist, an update to the account brings it back.
+            simulator.update_account(missing)
+            simulator.update_account(account)
+            _wait_for(lambda: watchdog.health_for(account.address) is not None)
+
+            # If the open orders are closed, the next update forgets the account.
+            closed = mango.AccountInfo(
+                missing.address,
+                False,
+                missing.lamports,
+                missing.owner,
+                missing.rent_epoch,
+                bytes(),
+            )
+            simulator.update_account(closed)
+            simulator.update_account(account)
+            _wait_for(lambda: watchdog.health_for(account.address) is None)
+        finally:
+            watchdog.dispose()
+            manager.close()
+            manager.dispose()
@@ -1,7 +1,10 @@
 from .context import mango
-from .fakes import fake_token
+from .fakes import fake_context, fake_seeded_public_key, fake_token
+
+import typing
 
 from decimal import Decimal
+from solana.publickey import PublicKey
 
 
 def test_constructor() -> None:
@@ -11,3 +14,32 @@ def test_constructor() -> None:
     assert actual is not None
     assert actual.token == token
     assert actual.value == value
+
+
+def test_fetch_total_values() -> None:
+    owner = fake_seeded_public_key("owner")
+    first = fake_token("FIRST", 6)
+    second = fake_token("SECOND", 2)
+    missing = fake_token("MISSING", 2)
+
+    def _token_account(mint: PublicKey, amount: int) -> typing.Dict[str, typing.Any]:
+        data = mango.layouts.TOKEN_ACCOUNT.build(
+            {"mint": mint, "owner": owner, "amount": Decimal(amount)}
+        )
+        return {
+            "pubkey": str(fake_seeded_public_key(f"{mint}{amount}")),
+            "account": {"data": mango.encode_binary(data)},
+        }
+
+    context = fake_context()
+    context.client.get_token_accounts_by_owner = lambda *_: [  # type: ignore[method-assign]
+        _token_account(first.mint, 1500000),
+        _token_account(second.mint, 250),
+        _token_account(first.mint, 500000),
+    ]
+
+    actual = mango.InstrumentValue.fetch_total_values(
+        context, owner, [first, second, missing]
+    )
+    assert [value.value for value in actual] == [Decimal(2), Decimal("2.5"), Decimal(0)]
+    assert [value.token for value in actual] == [first, second, missing]
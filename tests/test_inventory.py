@@ -0,0 +1,56 @@
+from .context import mango
+from .fakes import (
+    fake_account_info,
+    fake_instrument_value,
+    fake_open_orders,
+    fake_price,
+    fake_seeded_public_key,
+    fake_token,
+)
+
+from decimal import Decimal
+
+
+def _token_account(token: mango.Token, value: str) -> mango.TokenAccount:
+    return mango.TokenAccount(
+        fake_account_info(fake_seeded_public_key(token.symbol)),
+        mango.Version.V1,
+        fake_seeded_public_key("owner"),
+        mango.InstrumentValue(token, Decimal(value)),
+    )
+
+
+def test_serum_inventory_watcher_updates() -> None:
+    base = fake_token("FAKEBASE")
+    quote = fake_token("FAKEQUOTE")
+    price_watcher = mango.ManualUpdateWatcher(fake_price(price=Decimal(10)))
+    actual = mango.SerumInventoryWatcher(
+        fake_instrument_value(Decimal(0)),
+        price_watcher,
+        _token_account(base, "2"),
+        _token_account(quote, "100"),
+    )
+    assert actual.latest.inventory_source == mango.InventorySource.SPL_TOKENS
+    assert actual.latest.base == mango.InstrumentValue(base, Decimal(2))
+    assert actual.latest.quote == mango.InstrumentValue(quote, Decimal(100))
+    assert actual.latest.available_collateral.value == Decimal(120)
+
+    # Free and locked tokens in the OpenOrders account count towards the inventory.
+    actual.on_open_orders(
+        fake_open_orders(
+            base_token_free=Decimal(1),
+            base_token_total=Decimal(3),
+            quote_token_free=Decimal(5),
+            quote_token_total=Decimal(50),
+        )
+    )
+    assert actual.latest.base.value == Decimal(5)
+    assert actual.latest.quote.value == Decimal(150)
+
+    actual.on_base_token_account(_token_account(base, "1"))
+    actual.on_quote_token_account(_token_account(quote, "10"))
+    assert actual.latest.base.value == Decimal(4)
+    assert actual.latest.quote.value == Decimal(60)
+
+    price_watcher.value = fake_price(price=Decimal(20))
+    assert actual.latest.available_collateral.value == Decimal(140)
@@ -0,0 +1,25 @@
+from .context import mango
+
+import pytest
+
+
+def test_stdlib_backend_always_available() -> None:
+    assert "json" in mango.available_json_backends()
+    assert mango.json_backend() == mango.available_json_backends()[0]
+
+
+def test_set_json_backend() -> None:
+    previous = mango.json_backend()
+    try:
+        for backend in mango.available_json_backends():
+            mango.set_json_backend(backend)
+            assert mango.json_backend() == backend
+            assert mango.json_loads(b'{"a": [1, "b", null]}') == {"a": [1, "b", None]}
+            assert mango.json_loads('{"a": 2}') == {"a": 2}
+    finally:
+        mango.set_json_backend(previous)
+
+
+def test_set_unknown_json_backend() -> None:
+    with pytest.raises(Exception):
+        mango.set_json_backend("unknown")
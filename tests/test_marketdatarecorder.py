@@ -0,0 +1,77 @@
+from .context import mango
+from .fakes import fake_account_info, fake_context, fake_seeded_public_key
+
+import typing
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+def _record(name: str, slot: int, data: bytes) -> mango.MarketDataRecord:
+    return mango.MarketDataRecord.from_account_info(
+        fake_account_info(fake_seeded_public_key(name), data=data),
+        slot,
+        datetime(2022, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=slot),
+    )
+
+
+def test_write_and_read_with_rotation(tmp_path: Path) -> None:
+    records = [_record("bids", slot, bytes([slot] * 100)) for slot in range(1, 21)]
+    writer = mango.MarketDataLogWriter(
+        str(tmp_path), max_file_size=1, flush_interval=timedelta(0)
+    )
+    for record in records:
+        writer.write(record)
+    writer.dispose()
+
+    reader = mango.MarketDataLogReader.from_directory(str(tmp_path))
+    assert len(reader.filenames) > 1
+    assert list(reader.records()) == records
+
+
+def test_truncated_file_is_readable(tmp_path: Path) -> None:
+    writer = mango.MarketDataLogWriter(str(tmp_path), flush_interval=timedelta(0))
+    writer.write(_record("bids", 1, bytes([1, 2, 3])))
+    writer.write(_record("asks", 2, bytes(range(200))))
+    writer.dispose()
+
+    assert writer.filename is not None
+    data = Path(writer.filename).read_bytes()
+    Path(writer.filename).write_bytes(data[:-10])
+
+    actual = list(mango.MarketDataLogReader([writer.filename]).records())
+    assert [record.slot for record in actual] == [1]
+
+
+def test_replay(tmp_path: Path) -> None:
+    writer = mango.MarketDataLogWriter(str(tmp_path))
+    writer.write(_record("bids", 0, bytes([1])))
+    writer.write(_record("asks", 5, bytes([2])))
+    writer.write(_record("bids", 7, bytes([3])))
+    writer.dispose()
+
+    reader = mango.MarketDataLogReader.from_directory(str(tmp_path))
+    assert [account_info.data for account_info in reader.initial_account_infos()] == [
+        bytes([1]),
+        bytes([2]),
+    ]
+
+    context = fake_context()
+    manager = mango.ReplayWebSocketSubscriptionManager(context, reader)
+    subscription = mango.WebSocketAccountSubscription[mango.AccountInfo](
+        context, fake_seeded_public_key("bids"), lambda account_info: account_info
+    )
+    manager.add(subscription)
+    received: typing.List[typing.Tuple[int, mango.AccountInfo]] = []
+    subscription.publisher.subscribe(
+        on_next=lambda account_info: received.append(
+            (subscription.latest_slot, account_info)
+        )
+    )
+
+    manager.replay()
+    assert manager.records_replayed == 2
+    assert [(slot, account_info.data) for slot, account_info in received] == [
+        (0, bytes([1])),
+        (7, bytes([3])),
+    ]
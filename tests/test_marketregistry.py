@@ -0,0 +1,113 @@
+from .context import mango
+from .fakes import (
+    fake_account_info,
+    fake_seeded_public_key,
+    fake_simulator_context,
+    fake_token,
+)
+
+import typing
+
+from pyserum._layouts.market import MARKET_LAYOUT
+from solana.publickey import PublicKey
+
+
+class FakeMarketLookup(mango.MarketLookup):
+    def __init__(self, markets: typing.Sequence[mango.Market]) -> None:
+        super().__init__()
+        self.markets: typing.Sequence[mango.Market] = markets
+
+    def find_by_symbol(self, symbol: str) -> typing.Optional[mango.Market]:
+        for market in self.markets:
+            if symbol.upper() in [
+                market.symbol.upper(),
+                market.fully_qualified_symbol.upper(),
+            ]:
+                return market
+        return None
+
+    def find_by_address(self, address: PublicKey) -> typing.Optional[mango.Market]:
+        return None
+
+    def all_markets(self) -> typing.Sequence[mango.Market]:
+        return self.markets
+
+
+def _serum_market_data() -> bytes:
+    parsed = MARKET_LAYOUT.parse(bytes(MARKET_LAYOUT.sizeof()))
+    parsed.account_flags.initialized = True
+    parsed.account_flags.market = True
+    return MARKET_LAYOUT.build(parsed)
+
+
+STUBS = [
+    mango.SerumMarketStub(
+        fake_seeded_public_key("program ID"),
+        fake_seeded_public_key(symbol),
+        fake_token(symbol),
+        fake_token("QUOTE"),
+    )
+    for symbol in ["BASE", "OTHER"]
+]
+ACCOUNTS = [
+    fake_account_info(stub.address, data=_serum_market_data()) for stub in STUBS
+]
+
+
+def _context(simulator: mango.RPCSimulator) -> mango.Context:
+    context = fake_simulator_context(simulator)
+    context.market_lookup = FakeMarketLookup(STUBS)
+    return context
+
+
+def test_for_context_is_shared() -> None:
+    with mango.RPCSimulator(ACCOUNTS) as simulator:
+        context = _context(simulator)
+        registry = mango.MarketRegistry.for_context(context)
+        assert mango.MarketRegistry.for_context(context) is registry
+        assert mango.MarketRegistry.for_context(_context(simulator)) is not registry
+
+
+def test_market_is_cached_until_invalidated() -> None:
+    with mango.RPCSimulator(ACCOUNTS) as simulator:
+        registry = mango.MarketRegistry(_context(simulator))
+        market = registry.market("base/quote")
+        assert mango.SerumMarket.isa(market)
+        assert registry.market("BASE/QUOTE") is market
+        assert simulator.statistics().requests == {"getAccountInfo": 1}
+
+        registry.invalidate("base/quote")
+        assert registry.market("BASE/QUOTE") is not market
+        assert simulator.statistics().requests == {"getAccountInfo": 2}
+
+
+def test_market_symbol_and_fully_qualified_symbol_share_cache() -> None:
+    with mango.RPCSimulator(ACCOUNTS) as simulator:
+        registry = mango.MarketRegistry(_context(simulator))
+        market = registry.market("BASE/QUOTE")
+        assert registry.market(market.fully_qualified_symbol) is market
+        assert simulator.statistics().requests == {"getAccountInfo": 1}
+
+        registry.invalidate(market.fully_qualified_symbol)
+        assert registry.market("BASE/QUOTE") is not market
+        assert simulator.statistics().requests == {"getAccountInfo": 2}
+
+
+def test_preload_uses_single_fetch() -> None:
+    with mango.RPCSimulator(ACCOUNTS) as simulator:
+        registry = mango.MarketRegistry(_context(simulator))
+        registry.preload(["BASE/QUOTE", "OTHER/QUOTE"])
+        first = registry.market("BASE/QUOTE")
+        second = registry.market("OTHER/QUOTE")
+        assert first.address == STUBS[0].address
+        assert second.address == STUBS[1].address
+        assert simulator.statistics().requests == {"getMultipleAccounts": 1}
+
+        # Already-loaded markets aren't fetched again.
+        registry.preload(["BASE/QUOTE"])
+        assert simulator.statistics().requests == {"getMultipleAccounts": 1}
+
+        registry.invalidate()
+        registry.preload(["BASE/QUOTE"])
+        assert registry.market("BASE/QUOTE") is not first
+        assert simulator.statistics().requests == {"getMultipleAccounts": 2}
@@ -1,7 +1,12 @@
-from .context import mango
+from .context import disable_logging, mango
 
+import logging
+import threading
+import time
 import typing
 
+from datetime import timedelta
+
 
 class MockNotificationTarget(mango.NotificationTarget):
     def __init__(self) -> None:
@@ -86,3 +91,134 @@ def test_parse_notification_target() -> None:
         "mailjet:user:secret:subject:from%20name:from@address:to%20name%20with%20colon%3A:to@address"
     )
     assert mailjet_target is not None
+
+
+class RecordingNotificationTarget(mango.NotificationTarget):
+    def __init__(self, failures: int = 0) -> None:
+        super().__init__()
+        self.failures = failures
+        self.received: typing.List[str] = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def send_notification(self, item: typing.Any) -> None:
+        self.entered.set()
+        self.release.wait()
+        if self.failures > 0:
+            self.failures -= 1
+            raise Exception("Deliberate failure")
+        self.received += [item]
+
+
+def test_queued_notification_target_batches_and_dedupes() -> None:
+    recorder = RecordingNotificationTarget()
+    queued = mango.QueuedNotificationTarget(
+        [recorder], batch_window=timedelta(seconds=30)
+    )
+    queued.send_notification("first")
+    queued.send_notification("second")
+    queued.send_notification("first")
+    queued.dispose()
+
+    assert len(recorder.received) == 1
+    assert recorder.received[0] == "first\n(Repeated 2 times.)\n\nsecond"
+    assert queued.sent_count == 3
+    assert queued.dropped_count == 0
+    assert queued.failed_count == 0
+
+
+def test_queued_notification_target_drops_when_queue_full() -> None:
+    recorder = RecordingNotificationTarget()
+    recorder.release.clear()
+    queued = mango.QueuedNotificationTarget(
+        [recorder],
+        batch_window=timedelta(seconds=0),
+        minimum_send_interval=timedelta(seconds=0),
+        max_queue_depth=1,
+    )
+    queued.send_notification("first")
+    assert recorder.entered.wait(5)
+
+    # The worker is now blocked sending "first", so the queue can only hold one more item.
+    queued.send_notification("second")
+    queued.send_notification("third")
+    assert queued.queue_depth == 1
+    assert queued.dropped_count == 1
+
+    recorder.release.set()
+    queued.dispose()
+    assert recorder.received == ["first", "second"]
+
+
+def test_queued_notification_target_retries_failures() -> None:
+    recorder = RecordingNotificationTarget(failures=1)
+    queued = mango.QueuedNotificationTarget(
+        [recorder],
+        batch_window=timedelta(seconds=0),
+        minimum_send_interval=timedelta(seconds=0),
+        retry_pause=timedelta(seconds=0),
+    )
+    with disable_logging():
+        queued.send_notification("message")
+        for _ in range(100):
+            if len(recorder.received) > 0:
+                break
+            time.sleep(0.05)
+        queued.dispose()
+
+    assert recorder.received == ["message"]
+    assert queued.sent_count == 1
+    assert queued.failed_count == 0
+
+
+def test_queued_notification_target_abandons_after_retries() -> None:
+    recorder = RecordingNotificationTarget(failures=10)
+    queued = mango.QueuedNotificationTarget(
+        [recorder],
+        batch_window=timedelta(seconds=0),
+        minimum_send_interval=timedelta(seconds=0),
+        retry_count=2,
+        retry_pause=timedelta(seconds=0),
+    )
+    with disable_logging():
+        queued.send_notification("message")
+        for _ in range(100):
+            if queued.failed_count > 0:
+                break
+            time.sleep(0.05)
+        queued.dispose()
+
+    assert recorder.received == []
+    assert recorder.failures == 7
+    assert queued.failed_count == 1
+
+
+def test_queued_notification_target_does_not_notify_itself_of_abandoned_batches() -> None:
+    recorder = RecordingNotificationTarget(failures=10)
+    queued = mango.QueuedNotificationTarget(
+        [recorder],
+        batch_window=timedelta(seconds=0),
+        minimum_send_interval=timedelta(seconds=0),
+        retry_count=0,
+        retry_pause=timedelta(seconds=0),
+    )
+    # Errors logged by the queue are sent back to the queue, just as they would be with a
+    # `NotificationHandler` on the root logger.
+    handler = mango.NotificationHandler(queued)
+    handler.setLevel(logging.ERROR)
+    logger = logging.getLogger(queued.__class__.__name__)
+    logger.addHandler(handler)
+    try:
+        queued.send_notification("message")
+        for _ in range(100):
+            if queued.failed_count > 0:
+                break
+            time.sleep(0.05)
+        time.sleep(0.2)
+    finally:
+        logger.removeHandler(handler)
+        queued.dispose()
+
+    assert recorder.failures == 9
+    assert queued.failed_count == 1
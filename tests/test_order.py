@@ -1,3 +1,8 @@
+import copy
+import dataclasses
+import pickle
+import pytest
+
 from .context import mango
 
 from datetime import timedelta
@@ -391,3 +396,27 @@ def test_client_id_set_properly() -> None:
 
     # Should NOT override the explicit client ID of 27
     assert __update_like_market_operations(explicit_client_id, 48).client_id == 27
+
+
+def test_order_uses_slots() -> None:
+    actual = __build_initial_order()
+
+    assert not hasattr(actual, "__dict__")
+    assert set(getattr(mango.Order, "__slots__")) == {
+        field.name for field in dataclasses.fields(actual)
+    }
+
+
+def test_order_is_immutable() -> None:
+    actual = __build_initial_order()
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        actual.price = Decimal(1)  # type: ignore[misc]
+
+
+def test_order_copy_and_pickle() -> None:
+    initial = __build_initial_order()
+
+    assert copy.copy(initial) == initial
+    assert copy.deepcopy(initial) == initial
+    assert pickle.loads(pickle.dumps(initial)) == initial
@@ -3,7 +3,7 @@ import typing
 from solana.publickey import PublicKey
 
 from .context import mango
-from .fakes import fake_account_info, fake_seeded_public_key
+from .fakes import fake_account_info, fake_seeded_public_key, fake_token
 
 from decimal import Decimal
 
@@ -88,8 +88,9 @@ class TstFillPE(mango.PerpFillEvent):
             Decimal(0),
             mango.utc_now(),
             mango.Side.BUY,
-            Decimal(1),
-            Decimal(1),
+            1,
+            1,
+            mango.NullLotSizeConverter(),
             Decimal(1),
             Decimal(1),
             True,
@@ -348,3 +349,33 @@ def test_no_changes_in_unseen_fills_for_account() -> None:
 
     my_unseen_fills = actual.unseen(pev2)
     assert len(my_unseen_fills) == 0
+
+
+def test_fill_event_converts_lots_on_access() -> None:
+    lot_size_converter = mango.LotSizeConverter(
+        fake_token("BASE", 9), Decimal(100), fake_token("QUOTE", 6), Decimal(10)
+    )
+    actual = mango.PerpFillEvent(
+        0,
+        Decimal(0),
+        mango.utc_now(),
+        mango.Side.SELL,
+        25000,
+        3,
+        lot_size_converter,
+        Decimal(0),
+        Decimal(0),
+        False,
+        fake_seeded_public_key("maker"),
+        Decimal(1),
+        Decimal(0),
+        fake_seeded_public_key("taker"),
+        Decimal(2),
+        Decimal(0),
+    )
+
+    assert actual.price_lots == 25000
+    assert actual.quantity_lots == 3
+    assert actual.price == lot_size_converter.price_lots_to_number(Decimal(25000))
+    assert actual.quantity == lot_size_converter.base_size_lots_to_number(Decimal(3))
+    assert not hasattr(actual, "__dict__")
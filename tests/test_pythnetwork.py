@@ -0,0 +1,83 @@
+from .context import mango
+from .fakes import (
+    fake_account_info,
+    fake_loaded_market,
+    fake_seeded_public_key,
+    fake_simulator_context,
+)
+
+import struct
+import time
+import types
+import typing
+
+from decimal import Decimal
+from mango.oracles.pythnetwork.layouts import PRICE
+from mango.oracles.pythnetwork.pythnetwork import PythOracle
+
+
+PRICE_ADDRESS = fake_seeded_public_key("pyth price")
+PRODUCT = types.SimpleNamespace(
+    address=fake_seeded_public_key("pyth product"), px_acc=PRICE_ADDRESS
+)
+
+
+def _price_data(price: int, confidence: int, publish_slot: int) -> bytes:
+    data = bytearray(PRICE.sizeof())
+    struct.pack_into("<IIII", data, 0, 0xA1B2C3D4, 2, 3, PRICE.sizeof())
+    struct.pack_into("<i", data, 20, -4)
+    struct.pack_into("<QQIIQ", data, 208, price, confidence, 1, 0, publish_slot)
+    return bytes(data)
+
+
+def test_price_from_data() -> None:
+    data = _price_data(1234567, 89, 10)
+    oracle = PythOracle(
+        mango.ContextBuilder.build(cluster_name="devnet"), fake_loaded_market(), PRODUCT
+    )
+    price, publish_slot = oracle._price_from_data(data)
+
+    parsed: typing.Any = PRICE.parse(data)
+    assert price.mid_price == Decimal("123.4567")
+    assert price.mid_price == parsed.agg.price * (Decimal(10) ** parsed.expo)
+    assert price.confidence == Decimal("0.0089")
+    assert publish_slot == 10
+
+
+def test_streams_websocket_updates() -> None:
+    price_account = fake_account_info(PRICE_ADDRESS, data=_price_data(1000000, 1, 0))
+    with mango.RPCSimulator([price_account]) as simulator:
+        context = fake_simulator_context(simulator)
+        oracle = PythOracle(
+            context, fake_loaded_market(), PRODUCT, polling_fallback_interval=60
+        )
+        prices: typing.List[mango.Price] = []
+        subscription = oracle.to_streaming_observable(context).subscribe(
+            on_next=prices.append  # type: ignore[call-arg]
+        )
+
+        deadline = time.time() + 5
+        while len(prices) == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert prices[0].mid_price == Decimal(100)
+        assert oracle.statistics.polled_updates == 1
+
+        # Only send the update once the websocket subscription exists.
+        while (
+            "accountSubscribe" not in simulator.statistics().requests
+            and time.time() < deadline
+        ):
+            time.sleep(0.01)
+        simulator.update_account(
+            fake_account_info(
+                PRICE_ADDRESS, data=_price_data(2000000, 1, simulator.slot)
+            )
+        )
+        while len(prices) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        subscription.dispose()
+
+        assert prices[1].mid_price == Decimal(200)
+        assert oracle.statistics.websocket_updates >= 1
+        assert oracle.statistics.polled_updates == 1
+        assert oracle.statistics.maximum_slot_lag >= 0
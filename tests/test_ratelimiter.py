@@ -0,0 +1,130 @@
+from .context import mango
+from .fakes import (
+    fake_account_info,
+    fake_seeded_public_key,
+    fake_simulator_context,
+)
+
+import pytest
+import threading
+
+
+def test_priority_for_method() -> None:
+    assert (
+        mango.priority_for_method("sendTransaction")
+        == mango.RequestPriority.TRANSACTION
+    )
+    assert mango.priority_for_method("getAccountInfo") == mango.RequestPriority.MODEL
+    assert (
+        mango.priority_for_method("getProgramAccounts")
+        == mango.RequestPriority.BACKGROUND
+    )
+
+    with mango.request_priority(mango.RequestPriority.BACKGROUND):
+        assert (
+            mango.priority_for_method("getAccountInfo")
+            == mango.RequestPriority.BACKGROUND
+        )
+    assert mango.priority_for_method("getAccountInfo") == mango.RequestPriority.MODEL
+
+
+def test_token_bucket() -> None:
+    bucket = mango.TokenBucket(10, 5)
+    assert bucket.seconds_until_available(5, 0) == 0
+    assert bucket.seconds_until_available(1, 0.5) == 0
+    bucket.take(5)
+    assert bucket.seconds_until_available(1, 0) == pytest.approx(0.1)
+    assert bucket.seconds_until_available(1, 0.5) == pytest.approx(0.35)
+
+    # A reserve that would need more than a full bucket is cut down to what a full bucket allows.
+    small = mango.TokenBucket(10, 1)
+    assert small.seconds_until_available(1, 0.5) == 0
+    small.take(1)
+    assert small.seconds_until_available(1, 0.5) == pytest.approx(0.1)
+
+
+def test_null_rate_limiter() -> None:
+    assert isinstance(mango.build_rate_limiter(None), mango.NullRateLimiter)
+    assert isinstance(
+        mango.build_rate_limiter(mango.RateLimitSettings()), mango.NullRateLimiter
+    )
+
+
+def test_background_waits_for_reserve() -> None:
+    limiter = mango.TokenBucketRateLimiter(
+        mango.RateLimitSettings(requests_per_second=10, request_burst=2)
+    )
+    limiter.acquire(mango.RequestPriority.TRANSACTION)
+    limiter.acquire(mango.RequestPriority.TRANSACTION)
+    limiter.acquire(mango.RequestPriority.BACKGROUND)
+
+    statistics = limiter.statistics()
+    assert statistics.requests[mango.RequestPriority.TRANSACTION] == 2
+    assert statistics.requests[mango.RequestPriority.BACKGROUND] == 1
+    assert statistics.throttled_seconds[mango.RequestPriority.TRANSACTION] < 0.05
+    # The bucket is empty, and background requests have to leave half of it.
+    assert statistics.throttled_seconds[mango.RequestPriority.BACKGROUND] >= 0.15
+
+
+def test_low_rates_do_not_block_forever() -> None:
+    assert mango.RateLimitSettings(requests_per_second=1).default_request_burst == 2
+    assert mango.RateLimitSettings(requests_per_second=1.5).default_request_burst == 2
+    assert mango.RateLimitSettings(requests_per_second=5).default_request_burst == 5
+
+    for settings in [
+        mango.RateLimitSettings(requests_per_second=1),
+        mango.RateLimitSettings(requests_per_second=1.5),
+        mango.RateLimitSettings(requests_per_second=10, request_burst=1),
+    ]:
+        limiter = mango.TokenBucketRateLimiter(settings)
+
+        def _acquire_all() -> None:
+            limiter.acquire(mango.RequestPriority.BACKGROUND)
+            limiter.acquire(mango.RequestPriority.MODEL)
+
+        thread = threading.Thread(target=_acquire_all, daemon=True)
+        thread.start()
+        thread.join(5)
+        assert not thread.is_alive(), f"Requests blocked with {settings}"
+
+
+def test_bandwidth_is_charged_after_the_response() -> None:
+    limiter = mango.TokenBucketRateLimiter(
+        mango.RateLimitSettings(bytes_per_second=100000)
+    )
+    limiter.acquire(mango.RequestPriority.MODEL)
+    limiter.record_response(110000)
+    limiter.acquire(mango.RequestPriority.MODEL)
+
+    statistics = limiter.statistics()
+    assert statistics.bytes_received == 110000
+    assert statistics.throttled_seconds[mango.RequestPriority.MODEL] >= 0.05
+
+
+def test_transactions_are_not_held_back_by_background_bandwidth() -> None:
+    limiter = mango.TokenBucketRateLimiter(
+        mango.RateLimitSettings(bytes_per_second=1000000)
+    )
+    limiter.acquire(mango.RequestPriority.BACKGROUND)
+    limiter.record_response(3000000)
+    limiter.acquire(mango.RequestPriority.TRANSACTION)
+
+    statistics = limiter.statistics()
+    assert statistics.throttled_seconds[mango.RequestPriority.TRANSACTION] < 0.05
+
+
+def test_client_requests_are_rate_limited() -> None:
+    account_info = fake_account_info(fake_seeded_public_key("account"))
+    with mango.RPCSimulator([account_info]) as simulator:
+        context = fake_simulator_context(
+            simulator,
+            rate_limit_settings=mango.RateLimitSettings(requests_per_second=1000),
+        )
+        mango.AccountInfo.load(context, account_info.address)
+        with mango.request_priority(mango.RequestPriority.BACKGROUND):
+            mango.AccountInfo.load(context, account_info.address)
+
+        statistics = context.client.rate_limiter_statistics()[simulator.cluster_url.rpc]
+        assert statistics.requests[mango.RequestPriority.MODEL] == 1
+        assert statistics.requests[mango.RequestPriority.BACKGROUND] == 1
+        assert statistics.bytes_received > 0
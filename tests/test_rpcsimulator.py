@@ -0,0 +1,148 @@
+from .context import mango
+from .fakes import (
+    fake_account_info,
+    fake_seeded_public_key,
+    fake_simulator_context,
+)
+
+import json
+import pytest
+import typing
+import websocket
+
+from decimal import Decimal
+from solana.keypair import Keypair
+from solana.system_program import TransferParams, transfer
+from solana.transaction import Transaction
+
+
+OWNER = fake_seeded_public_key("owner")
+ACCOUNTS = [
+    fake_account_info(fake_seeded_public_key("first"), owner=OWNER, data=bytes([1, 2])),
+    fake_account_info(
+        fake_seeded_public_key("second"), owner=OWNER, data=bytes([3, 4, 5])
+    ),
+    fake_account_info(fake_seeded_public_key("third"), data=bytes([6])),
+]
+
+
+def _subscribe(
+    simulator: mango.RPCSimulator, method: str, key: str
+) -> websocket.WebSocket:
+    ws = websocket.create_connection(simulator.ws_url, timeout=5)
+    ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": [key]}))
+    response = json.loads(ws.recv())
+    assert response["id"] == 1
+    assert response["result"] > 0
+    return ws
+
+
+def _send_transaction(context: mango.Context) -> str:
+    keypair = Keypair()
+    transaction = Transaction()
+    transaction.add(
+        transfer(
+            TransferParams(
+                from_pubkey=keypair.public_key,
+                to_pubkey=keypair.public_key,
+                lamports=1,
+            )
+        )
+    )
+    return context.client.send_transaction(transaction, keypair)
+
+
+def test_load_account_infos() -> None:
+    actual = mango.RPCSimulator.load_account_infos("tests/testdata/account4")
+    assert len(actual) == 3
+    assert {str(account_info.address) for account_info in actual} == {
+        "DRUZRfLQtki4ZYvRXhi5yGmyqCf6iMfTzxtBpxo6rbHu",
+        "8mFQbdXsFXt3R3cu3oSNS3bDZRwJRP18vyzd9J278J9z",
+        "Ec2enZyoC4nGpEfu2sUNAa2nUGJHWxoUWYSEJ2hNTWTA",
+    }
+
+
+def test_serves_accounts() -> None:
+    with mango.RPCSimulator(ACCOUNTS) as simulator:
+        context = fake_simulator_context(simulator)
+
+        single = mango.AccountInfo.load(context, ACCOUNTS[1].address)
+        assert single is not None
+        assert single.data == bytes([3, 4, 5])
+        assert mango.AccountInfo.load(context, fake_seeded_public_key("?")) is None
+
+        multiple = mango.AccountInfo.load_multiple(
+            context, [account_info.address for account_info in ACCOUNTS]
+        )
+        assert [account_info.data for account_info in multiple] == [
+            bytes([1, 2]),
+            bytes([3, 4, 5]),
+            bytes([6]),
+        ]
+
+        by_program = mango.AccountInfo.load_by_program(context, OWNER)
+        assert {str(account_info.address) for account_info in by_program} == {
+            str(ACCOUNTS[0].address),
+            str(ACCOUNTS[1].address),
+        }
+        sized = mango.AccountInfo.load_by_program(context, OWNER, data_size=3)
+        assert [account_info.address for account_info in sized] == [ACCOUNTS[1].address]
+
+        assert context.client.get_recent_blockhash() is not None
+        assert simulator.statistics().requests == {
+            "getAccountInfo": 2,
+            "getMultipleAccounts": 1,
+            "getProgramAccounts": 2,
+            "getRecentBlockhash": 1,
+        }
+
+
+def test_rate_limit_injection() -> None:
+    settings = mango.RPCSimulatorSettings(rate_limit_rate=1)
+    with mango.RPCSimulator(ACCOUNTS, settings) as simulator:
+        with pytest.raises(mango.TooManyRequestsRateLimitException):
+            mango.AccountInfo.load(
+                fake_simulator_context(simulator), ACCOUNTS[0].address
+            )
+        assert simulator.statistics().rate_limited == 1
+
+
+def test_error_injection() -> None:
+    settings = mango.RPCSimulatorSettings(error_rate=1)
+    with mango.RPCSimulator(ACCOUNTS, settings) as simulator:
+        with pytest.raises(mango.NodeIsBehindException):
+            mango.AccountInfo.load(
+                fake_simulator_context(simulator), ACCOUNTS[0].address
+            )
+        assert simulator.statistics().errors == 1
+
+
+def test_account_subscription() -> None:
+    with mango.RPCSimulator(ACCOUNTS) as simulator:
+        ws = _subscribe(simulator, "accountSubscribe", str(ACCOUNTS[0].address))
+        updated = fake_account_info(
+            ACCOUNTS[0].address, owner=OWNER, lamports=Decimal(5), data=bytes([9])
+        )
+        simulator.update_account(updated)
+
+        notification: typing.Dict[str, typing.Any] = json.loads(ws.recv())
+        assert notification["method"] == "accountNotification"
+        actual = mango.AccountInfo.from_response(
+            notification["params"], ACCOUNTS[0].address
+        )
+        assert actual.data == bytes([9])
+        assert actual.lamports == Decimal(5)
+        ws.close()
+
+
+def test_signature_subscription() -> None:
+    settings = mango.RPCSimulatorSettings(transaction_failure_rate=1)
+    with mango.RPCSimulator(ACCOUNTS, settings) as simulator:
+        signature = _send_transaction(fake_simulator_context(simulator))
+        ws = _subscribe(simulator, "signatureSubscribe", signature)
+
+        notification: typing.Dict[str, typing.Any] = json.loads(ws.recv())
+        assert notification["method"] == "signatureNotification"
+        assert notification["params"]["result"]["value"]["err"] is not None
+        assert simulator.statistics().transactions == 1
+        ws.close()
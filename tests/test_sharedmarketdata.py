@@ -0,0 +1,242 @@
+from .context import mango
+from .fakes import fake_account_info, fake_context, fake_price, fake_seeded_public_key
+
+import pytest
+import rx
+import time
+import typing
+
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+
+class FakeOracle(mango.Oracle):
+    def __init__(self, prices: typing.Sequence[mango.Price]) -> None:
+        super().__init__("Fake Oracle", prices[0].market)
+        self.prices: typing.Sequence[mango.Price] = prices
+
+    def fetch_price(self, context: mango.Context) -> mango.Price:
+        return self.prices[0]
+
+    def to_streaming_observable(
+        self, context: mango.Context
+    ) -> rx.core.typing.Observable[mango.Price]:
+        return rx.from_iterable(self.prices[1:])
+
+
+class FakeWebSocketSubscriptionManager(mango.WebSocketSubscriptionManager):
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def test_write_and_read(tmp_path: Path) -> None:
+    filename = str(tmp_path / "shared")
+    writer = mango.SharedMarketDataRegion.create(filename, [("first", 10), ("b", 3)])
+    reader = mango.SharedMarketDataRegion.open(filename)
+    assert reader.names == ["first", "b"]
+    assert reader.sequence("first") == 0
+
+    writer.write("first", 5, bytes([1, 2, 3]))
+    writer.write("b", 6, bytes([4, 5, 6]))
+    writer.write("first", 7, bytes([7]))
+
+    first = reader.read("first")
+    assert first.sequence == 4
+    assert first.slot == 7
+    assert first.data == bytes([7])
+    assert reader.read("b").data == bytes([4, 5, 6])
+
+    with pytest.raises(Exception):
+        writer.write("b", 8, bytes([1, 2, 3, 4]))
+
+    reader.dispose()
+    writer.dispose()
+
+
+def test_open_rejects_other_files(tmp_path: Path) -> None:
+    filename = tmp_path / "other"
+    filename.write_bytes(bytes(64))
+    with pytest.raises(Exception):
+        mango.SharedMarketDataRegion.open(str(filename))
+
+
+def test_account_info_round_trip(tmp_path: Path) -> None:
+    account_info = fake_account_info(
+        fake_seeded_public_key("account"),
+        lamports=Decimal(123),
+        owner=fake_seeded_public_key("owner"),
+        rent_epoch=Decimal(9),
+        data=bytes([1, 2, 3, 4]),
+    )
+    filename = str(tmp_path / "shared")
+    writer = mango.SharedMarketDataRegion.create(
+        filename, [(str(account_info.address), 4)]
+    )
+    writer.write_account_info(99, account_info)
+
+    entry = mango.SharedMarketDataRegion.open(filename).read(str(account_info.address))
+    actual = entry.to_account_info()
+    assert entry.slot == 99
+    assert actual.address == account_info.address
+    assert actual.owner == account_info.owner
+    assert actual.lamports == Decimal(123)
+    assert actual.rent_epoch == Decimal(9)
+    assert actual.data == bytes([1, 2, 3, 4])
+
+
+def test_watcher_only_parses_changes(tmp_path: Path) -> None:
+    filename = str(tmp_path / "shared")
+    writer = mango.SharedMarketDataRegion.create(filename, [("value", 8)])
+    parsed: typing.List[bytes] = []
+
+    def _parse(entry: mango.SharedMarketDataEntry) -> int:
+        parsed.append(entry.data)
+        return int.from_bytes(entry.data, "little")
+
+    watcher = mango.SharedMemoryWatcher(
+        mango.SharedMarketDataRegion.open(filename), "value", _parse, -1
+    )
+    assert watcher.latest == -1
+    assert parsed == []
+
+    writer.write("value", 1, (5).to_bytes(8, "little"))
+    assert watcher.latest == 5
+    assert watcher.latest == 5
+    assert watcher.slot == 1
+    assert len(parsed) == 1
+
+    writer.write("value", 2, (6).to_bytes(8, "little"))
+    assert watcher.latest == 6
+    assert len(parsed) == 2
+
+
+def test_watcher_rejects_missing_entries(tmp_path: Path) -> None:
+    prices = [fake_price(price=Decimal(100))]
+    filename = str(tmp_path / "shared")
+    mango.SharedMarketDataRegion.create(filename, [("other", 8)])
+    with pytest.raises(Exception):
+        mango.build_shared_price_watcher(
+            mango.SharedMarketDataRegion.open(filename), FakeOracle(prices), prices[0]
+        )
+
+
+def test_liveness(tmp_path: Path) -> None:
+    filename = str(tmp_path / "shared")
+    writer = mango.SharedMarketDataRegion.create(
+        filename, mango.SharedMarketDataPublisher.entries_for([], [])
+    )
+    reader = mango.SharedMarketDataRegion.open(filename)
+    assert reader.heartbeat_age() is None
+
+    ages: typing.List[float] = []
+    liveness = reader.to_liveness_observable(
+        timedelta(seconds=5), timedelta(seconds=0.01)
+    ).subscribe(
+        on_next=ages.append
+    )  # type: ignore[call-arg]
+    time.sleep(0.1)
+    assert ages == []
+
+    writer.write_heartbeat(1)
+    age = reader.heartbeat_age()
+    assert age is not None and 0 <= age < 5
+    time.sleep(0.1)
+    assert len(ages) > 0
+
+    # The publisher stops.
+    writer.write(
+        "heartbeat", 2, mango.sharedmarketdata._HEARTBEAT.pack(time.time() - 60)
+    )
+    time.sleep(0.05)
+    count = len(ages)
+    time.sleep(0.1)
+    assert len(ages) == count
+
+    liveness.dispose()
+    reader.dispose()
+    writer.dispose()
+
+
+def test_publisher(tmp_path: Path) -> None:
+    context = fake_context()
+    account_info = fake_account_info(
+        fake_seeded_public_key("account"), data=bytes([1, 2])
+    )
+    prices = [fake_price(price=Decimal(100)), fake_price(price=Decimal("100.5"))]
+    oracle = FakeOracle(prices)
+    filename = str(tmp_path / "shared")
+    region = mango.SharedMarketDataRegion.create(
+        filename, mango.SharedMarketDataPublisher.entries_for([account_info], [oracle])
+    )
+    manager = FakeWebSocketSubscriptionManager(context)
+    publisher = mango.SharedMarketDataPublisher(
+        context, manager, mango.HealthCheck(str(tmp_path)), region
+    )
+    publisher.add_account(account_info)
+    publisher.add_oracle(oracle)
+
+    reader = mango.SharedMarketDataRegion.open(filename)
+    price_watcher = mango.build_shared_price_watcher(reader, oracle, prices[0])
+    assert price_watcher.latest.mid_price == Decimal("100.5")
+    assert price_watcher.latest.market == prices[0].market
+    assert reader.read(str(account_info.address)).data == bytes([1, 2])
+
+    subscription = manager.subscriptions[0]
+    subscription._on_item(
+        {
+            "method": "accountNotification",
+            "params": {
+                "result": {
+                    "context": {"slot": 7},
+                    "value": {
+                        "data": ["AwQ=", "base64"],
+                        "executable": False,
+                        "lamports": 1,
+                        "owner": str(account_info.owner),
+                        "rentEpoch": 0,
+                    },
+                },
+                "subscription": 1,
+            },
+        }
+    )
+    entry = reader.read(str(account_info.address))
+    assert entry.slot == 7
+    assert entry.data == bytes([3, 4])
+    assert publisher.latest_slot == 7
+    assert reader.heartbeat_age() is not None
+
+    publisher.dispose()
+
+
+def test_publisher_skips_prices_too_big_for_entry(tmp_path: Path) -> None:
+    context = fake_context()
+    prices = [
+        fake_price(price=Decimal(100)),
+        fake_price(price=Decimal("1." + ("1" * 300))),
+        fake_price(price=Decimal(101)),
+    ]
+    oracle = FakeOracle(prices)
+    filename = str(tmp_path / "shared")
+    region = mango.SharedMarketDataRegion.create(
+        filename, mango.SharedMarketDataPublisher.entries_for([], [oracle])
+    )
+    publisher = mango.SharedMarketDataPublisher(
+        context,
+        FakeWebSocketSubscriptionManager(context),
+        mango.HealthCheck(str(tmp_path)),
+        region,
+    )
+    publisher.add_oracle(oracle)
+
+    reader = mango.SharedMarketDataRegion.open(filename)
+    price_watcher = mango.build_shared_price_watcher(reader, oracle, prices[0])
+    assert price_watcher.latest.mid_price == Decimal(101)
+
+    publisher.dispose()
+    reader.dispose()
+    region.dispose()
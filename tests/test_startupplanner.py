@@ -0,0 +1,58 @@
+from .context import mango
+from .fakes import fake_simulator_context
+
+import typing
+
+from solana.publickey import PublicKey
+
+
+def _account_infos() -> typing.List[mango.AccountInfo]:
+    return [
+        mango.AccountInfo.load_json(f"tests/testdata/account4/{name}.json")
+        for name in ["account", "group", "cache"]
+    ]
+
+
+def _context(simulator: mango.RPCSimulator) -> mango.Context:
+    return fake_simulator_context(
+        simulator,
+        group_address=PublicKey("Ec2enZyoC4nGpEfu2sUNAa2nUGJHWxoUWYSEJ2hNTWTA"),
+        program_address=PublicKey("4skJ85cdxQAFVKbcGgfun8iZPL7BadVYXG3kGEGkufqA"),
+    )
+
+
+def test_load_and_seed() -> None:
+    account_info, group_info, cache_info = _account_infos()
+    owner = mango.layouts.MANGO_ACCOUNT.parse(account_info.data).owner
+    with mango.RPCSimulator(_account_infos()) as simulator:
+        context = _context(simulator)
+        planner = mango.StartupPlanner(context, mango.MarketRegistry(context))
+        snapshot = planner.load(owner, None, [])
+
+        assert snapshot.account.address == account_info.address
+        assert snapshot.group.address == group_info.address
+        assert snapshot.cache.address == cache_info.address
+        assert snapshot.oracle is None
+        assert [step.wave for step in snapshot.report.critical_path] == [1, 2]
+        assert {step.name for step in snapshot.report.steps} == {
+            "markets",
+            "account",
+            "accounts",
+            "oracle",
+        }
+        loads = simulator.statistics().requests
+
+        original_cache = context.account_cache
+        seeding = snapshot.seed(context)
+        cache = mango.Cache.load(context, cache_info.address)
+        assert cache.address == cache_info.address
+        assert simulator.statistics().requests == loads
+
+        snapshot.forget([cache_info.address])
+        mango.Cache.load(context, cache_info.address)
+        assert simulator.statistics().requests["getAccountInfo"] == (
+            loads.get("getAccountInfo", 0) + 1
+        )
+
+        seeding.dispose()
+        assert context.account_cache is original_cache
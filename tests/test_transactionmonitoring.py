@@ -0,0 +1,79 @@
+from .context import mango
+from .fakes import fake_simulator_context
+
+import threading
+
+from solana.keypair import Keypair
+from solana.rpc.commitment import Confirmed
+from solana.system_program import TransferParams, transfer
+from solana.transaction import Transaction
+
+
+def _send_transaction(context: mango.Context) -> str:
+    keypair = Keypair()
+    transaction = Transaction()
+    transaction.add(
+        transfer(
+            TransferParams(
+                from_pubkey=keypair.public_key,
+                to_pubkey=keypair.public_key,
+                lamports=1,
+            )
+        )
+    )
+    return context.client.send_transaction(transaction, keypair)
+
+
+def test_monitor_returns_future() -> None:
+    with mango.RPCSimulator([]) as simulator:
+        context = fake_simulator_context(simulator)
+        monitor = mango.WebSocketTransactionMonitor(simulator.ws_url)
+        assert monitor.wait_until_open()
+
+        signature = _send_transaction(context)
+        future = monitor.monitor(signature, commitment=Confirmed)
+        status = future.result(10)
+        assert status.signature == signature
+        assert status.outcome == mango.TransactionOutcome.SUCCESS
+
+        timed_out = monitor.monitor("never-sent", timeout=0.2).result(10)
+        assert timed_out.outcome == mango.TransactionOutcome.TIMEOUT
+
+        statistics = monitor.statistics()
+        assert statistics.in_flight == 0
+        assert statistics.succeeded == 1
+        assert statistics.timed_out == 1
+        assert statistics.latency_p50 > 0
+        monitor.dispose()
+
+
+def test_wait_for_all_shares_monitor() -> None:
+    settings = mango.RPCSimulatorSettings(transaction_failure_rate=1)
+    with mango.RPCSimulator([], settings) as simulator:
+        context = fake_simulator_context(simulator)
+        signatures = [_send_transaction(context), _send_transaction(context)]
+        statuses = mango.WebSocketTransactionMonitor.wait_for_all(
+            simulator.ws_url, signatures, commitment=Confirmed, timeout=10
+        )
+        assert [status.signature for status in statuses] == signatures
+        assert all(
+            status.outcome == mango.TransactionOutcome.FAIL for status in statuses
+        )
+
+        shared = mango.WebSocketTransactionMonitor.shared(simulator.ws_url)
+        assert mango.WebSocketTransactionMonitor.shared(simulator.ws_url) is shared
+        assert shared.statistics().failed == 2
+        shared.dispose()
+
+
+def test_shared_monitor_does_not_keep_process_alive() -> None:
+    with mango.RPCSimulator([]) as simulator:
+        before = {thread for thread in threading.enumerate() if not thread.daemon}
+        shared = mango.WebSocketTransactionMonitor.shared(simulator.ws_url)
+        assert shared.wait_until_open()
+        after = {thread for thread in threading.enumerate() if not thread.daemon}
+        assert after == before
+
+        mango.WebSocketTransactionMonitor.dispose_shared()
+        assert mango.WebSocketTransactionMonitor.shared(simulator.ws_url) is not shared
+        mango.WebSocketTransactionMonitor.dispose_shared()